@@ -27,54 +27,104 @@ Example:
     db.add(doc)
 """
 
-# Import time module (Phase 4)
-# Import daq and file modules (Phase 5)
-# Import epoch module (Phase 6)
-# Import Phase 10: Cloud API client
-# Import Phase 11: Schema validation
-from . import (
-    calc,
-    cloud,
-    common,
-    daq,
-    epoch,
-    file,
-    session,
-    setup,
-    time,
-    util,
-    validate,
-    validators,
-)
-
-# Import Phase 9: ndi_app framework and calculators
-from .app import ndi_app
-from .app.appdoc import DocExistsAction, ndi_app_appdoc
-
-# Import session and cache modules (Phase 7)
-from .cache import ndi_cache
-from .calculator import ndi_calculator
-from .common import getLogger, ndi_common_PathConstants, timestamp
-from .database import ndi_database, open_database
-from .dataset import ndi_dataset, ndi_dataset_dir
-from .document import ndi_document
-from .documentservice import ndi_documentservice
-from .element import ndi_element
-from .element_timeseries import ndi_element_timeseries
-from .ido import ndi_ido
-from .neuron import ndi_neuron
-from .probe import ndi_probe
-from .query import ndi_query
-
-# Expose ndi_query as ``ndi.query`` so that MATLAB-style calling
-# conventions (``ndi.query('','isa','base')``) work directly.
-# The underlying ``ndi.query`` *module* remains importable via
-# ``from ndi.query import ...``.
-query = ndi_query
-from .session import empty_id, ndi_session, ndi_session_dir
-
-# Import Phase 8 classes
-from .subject import ndi_subject
+from typing import TYPE_CHECKING
+
+from . import _lazy
+
+# Public names are imported on first access, so that ``import ndi`` does
+# not load pandas, networkx, pydantic, the cloud client, ... until they
+# are used.  ``ndi.query`` is ``ndi_query`` itself, so that MATLAB-style
+# calling conventions (``ndi.query('','isa','base')``) work directly; the
+# ``ndi.query`` *module* remains importable via ``from ndi.query import ...``.
+_LAZY_IMPORTS = {
+    # Phase 4-11 subpackages
+    "calc": (".calc", None),
+    "cloud": (".cloud", None),
+    "common": (".common", None),
+    "daq": (".daq", None),
+    "epoch": (".epoch", None),
+    "file": (".file", None),
+    "session": (".session", None),
+    "setup": (".setup", None),
+    "time": (".time", None),
+    "util": (".util", None),
+    "validate": (".validate", None),
+    "validators": (".validators", None),
+    # Modules that were previously loaded as a side effect of ``import ndi``
+    "app": (".app", None),
+    "cache": (".cache", None),
+    "calculator": (".calculator", None),
+    "database": (".database", None),
+    "dataset": (".dataset", None),
+    "document": (".document", None),
+    "documentservice": (".documentservice", None),
+    "element": (".element", None),
+    "element_timeseries": (".element_timeseries", None),
+    "ido": (".ido", None),
+    "neuron": (".neuron", None),
+    "probe": (".probe", None),
+    "subject": (".subject", None),
+    # Classes and functions
+    "ndi_app": (".app", "ndi_app"),
+    "DocExistsAction": (".app.appdoc", "DocExistsAction"),
+    "ndi_app_appdoc": (".app.appdoc", "ndi_app_appdoc"),
+    "ndi_cache": (".cache", "ndi_cache"),
+    "ndi_calculator": (".calculator", "ndi_calculator"),
+    "getLogger": (".common", "getLogger"),
+    "ndi_common_PathConstants": (".common", "ndi_common_PathConstants"),
+    "timestamp": (".common", "timestamp"),
+    "ndi_database": (".database", "ndi_database"),
+    "open_database": (".database", "open_database"),
+    "ndi_dataset": (".dataset", "ndi_dataset"),
+    "ndi_dataset_dir": (".dataset", "ndi_dataset_dir"),
+    "ndi_document": (".document", "ndi_document"),
+    "ndi_documentservice": (".documentservice", "ndi_documentservice"),
+    "ndi_element": (".element", "ndi_element"),
+    "ndi_element_timeseries": (".element_timeseries", "ndi_element_timeseries"),
+    "ndi_ido": (".ido", "ndi_ido"),
+    "ndi_neuron": (".neuron", "ndi_neuron"),
+    "ndi_probe": (".probe", "ndi_probe"),
+    "ndi_query": (".query", "ndi_query"),
+    "query": (".query", "ndi_query"),
+    "empty_id": (".session", "empty_id"),
+    "ndi_session": (".session", "ndi_session"),
+    "ndi_session_dir": (".session", "ndi_session_dir"),
+    "ndi_subject": (".subject", "ndi_subject"),
+}
+
+if TYPE_CHECKING:
+    from . import (
+        calc,
+        cloud,
+        common,
+        daq,
+        epoch,
+        file,
+        session,
+        setup,
+        time,
+        util,
+        validate,
+        validators,
+    )
+    from .app import ndi_app
+    from .app.appdoc import DocExistsAction, ndi_app_appdoc
+    from .cache import ndi_cache
+    from .calculator import ndi_calculator
+    from .common import getLogger, ndi_common_PathConstants, timestamp
+    from .database import ndi_database, open_database
+    from .dataset import ndi_dataset, ndi_dataset_dir
+    from .document import ndi_document
+    from .documentservice import ndi_documentservice
+    from .element import ndi_element
+    from .element_timeseries import ndi_element_timeseries
+    from .ido import ndi_ido
+    from .neuron import ndi_neuron
+    from .probe import ndi_probe
+    from .query import ndi_query
+    from .query import ndi_query as query
+    from .session import empty_id, ndi_session, ndi_session_dir
+    from .subject import ndi_subject
 
 __version__ = "0.1.0"
 __author__ = "VH-ndi_gui_Lab"
@@ -149,3 +199,5 @@ __all__ = [
     "validators",
     "version",
 ]
+
+_lazy.install(__name__)
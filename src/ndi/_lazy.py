@@ -0,0 +1,80 @@
+"""
+ndi._lazy - Deferred loading of package attributes.
+
+Python-specific: no MATLAB equivalent.
+
+Packages whose names pull in heavy dependencies (pandas, networkx,
+pydantic, openMINDS, ...) list their public names in a ``_LAZY_IMPORTS``
+table instead of importing them eagerly, so that ``import ndi`` stays
+cheap and each dependency is loaded only when something uses it.
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import sys
+import types
+from typing import Any
+
+
+class LazyModule(types.ModuleType):
+    """Module type that imports the names in ``_LAZY_IMPORTS`` on first access.
+
+    ``_LAZY_IMPORTS`` maps an attribute name to ``(module, attr)``, where
+    ``module`` is relative to the package and ``attr`` is None for the
+    module itself.
+
+    The import system binds every imported submodule as an attribute of
+    its package. Where a package exports something else under a
+    submodule's name (``ndi.query`` is the ``ndi_query`` class, and
+    ``ndi.util.hexDump`` the function of that name), the export is kept.
+    """
+
+    def _lazy_target(self, name: str) -> tuple[str, str | None] | None:
+        entry = self.__dict__.get("_LAZY_IMPORTS", {}).get(name)
+        if entry is None:
+            return None
+        module_name, attr = entry
+        return importlib.util.resolve_name(module_name, self.__name__), attr
+
+    def __getattr__(self, name: str) -> Any:
+        target = self._lazy_target(name)
+        if target is None:
+            raise AttributeError(f"module {self.__name__!r} has no attribute {name!r}")
+        module_name, attr = target
+        value = importlib.import_module(module_name)
+        if attr is not None:
+            value = getattr(value, attr)
+        super().__setattr__(name, value)
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if isinstance(value, types.ModuleType):
+            target = self._lazy_target(name)
+            if target is not None and target[1] is not None and value.__name__ == target[0]:
+                value = getattr(value, target[1])
+        super().__setattr__(name, value)
+
+    def __dir__(self) -> list[str]:
+        return sorted(set(super().__dir__()) | set(self.__dict__.get("_LAZY_IMPORTS", {})))
+
+
+def install(module_name: str) -> None:
+    """Make the names in a package's ``_LAZY_IMPORTS`` load on first access.
+
+    Call at the end of the package's ``__init__``::
+
+        _lazy.install(__name__)
+
+    Args:
+        module_name: ``__name__`` of the package.
+    """
+    module = sys.modules[module_name]
+    module.__class__ = LazyModule
+    # Rebind exports already shadowed by submodules imported while the
+    # package was initializing.
+    for name in module.__dict__.get("_LAZY_IMPORTS", {}):
+        value = module.__dict__.get(name)
+        if isinstance(value, types.ModuleType):
+            setattr(module, name, value)
@@ -4,11 +4,20 @@ ndi.app.spikesorter - Spike sorting and clustering.
 Provides the ndi_app_spikesorter app for clustering extracted spike waveforms
 into putative single-neuron units.
 
+Waveforms from all epochs are gathered into one memory-mapped array, PCA
+features are computed in mini-batches, and the features are clustered with
+a chunked k-means whose restarts run in parallel, so a probe with millions
+of spikes is sorted in bounded memory.
+
 MATLAB equivalent: src/ndi/+ndi/+app/spikesorter.m
 """
 
 from __future__ import annotations
 
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 import numpy as np
@@ -20,6 +29,356 @@ if TYPE_CHECKING:
     from ..document import ndi_document
     from ..session.session_base import ndi_session
 
+# Size of the header of a VH-lab spike waveform (.vsw) file, in bytes
+VSW_HEADER_SIZE = 512
+
+# Number of spikes processed per block when streaming waveforms
+SPIKE_BLOCK_SIZE = 65536
+
+# Maximum number of observations used for k-means++ seeding
+KMEANS_SEED_SAMPLE = 10000
+
+# Maximum number of observations used for the k-means restarts
+KMEANS_SAMPLE = 100000
+
+
+def read_vsw_header(filename: str | Path) -> dict[str, Any]:
+    """
+    Read the header of a VH-lab spike waveform (.vsw) file.
+
+    MATLAB equivalent: vlt.file.custom_file_formats.readvhlspikewaveformfile
+    (header portion)
+
+    Args:
+        filename: Path to the .vsw file
+
+    Returns:
+        Dict with keys numchannels, S0, S1, name, ref, comment,
+        samplingrate and num_samples (samples per waveform)
+    """
+    with open(filename, "rb") as fid:
+        raw = fid.read(VSW_HEADER_SIZE)
+    if len(raw) < 167:
+        raise ValueError(f"'{filename}' is too short to be a spike waveform file")
+    numchannels = int(np.frombuffer(raw, dtype="<u1", count=1, offset=0)[0])
+    S0 = int(np.frombuffer(raw, dtype="<i1", count=1, offset=1)[0])
+    S1 = int(np.frombuffer(raw, dtype="<i1", count=1, offset=2)[0])
+    name = raw[3:83].split(b"\x00", 1)[0].decode("latin-1").strip()
+    ref = int(np.frombuffer(raw, dtype="<u1", count=1, offset=83)[0])
+    comment = raw[84:164].split(b"\x00", 1)[0].decode("latin-1").strip()
+    samplingrate = float(np.frombuffer(raw, dtype="<f4", count=1, offset=164)[0])
+    return {
+        "numchannels": numchannels,
+        "S0": S0,
+        "S1": S1,
+        "name": name,
+        "ref": ref,
+        "comment": comment,
+        "samplingrate": samplingrate,
+        "num_samples": S1 - S0 + 1,
+    }
+
+
+def memmap_vsw(filename: str | Path, header: dict[str, Any] | None = None) -> np.ndarray:
+    """
+    Memory-map the waveforms of a VH-lab spike waveform (.vsw) file.
+
+    Each spike is stored as a column-major ``samples x channels`` block of
+    little-endian float32, so the file maps directly onto an array of
+    shape ``(num_spikes, num_channels, num_samples)``.
+
+    Args:
+        filename: Path to the .vsw file
+        header: Header from read_vsw_header(), read if not given
+
+    Returns:
+        Read-only memory-mapped array of shape (spikes, channels, samples)
+    """
+    if header is None:
+        header = read_vsw_header(filename)
+    per_spike = header["numchannels"] * header["num_samples"]
+    n_bytes = os.path.getsize(filename) - VSW_HEADER_SIZE
+    num_spikes = max(n_bytes, 0) // (4 * per_spike) if per_spike else 0
+    shape = (num_spikes, header["numchannels"], header["num_samples"])
+    if num_spikes == 0:
+        return np.zeros(shape, dtype=np.float32)
+    return np.memmap(filename, dtype="<f4", mode="r", offset=VSW_HEADER_SIZE, shape=shape)
+
+
+def pca_minibatch(
+    X: np.ndarray,
+    num_features: int,
+    block_size: int = SPIKE_BLOCK_SIZE,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Principal components of the rows of X, accumulated block by block.
+
+    The mean and scatter matrix are summed over blocks of rows, so X can
+    be a memory-mapped array larger than RAM.
+
+    Args:
+        X: Array of shape (n_observations, n_dimensions)
+        num_features: Number of principal components to keep
+        block_size: Rows per block
+
+    Returns:
+        Tuple of (mean, components) where components has shape
+        (n_dimensions, num_features), ordered by decreasing variance
+    """
+    n, d = X.shape
+    total = np.zeros(d)
+    scatter = np.zeros((d, d))
+    for s in range(0, n, block_size):
+        block = np.asarray(X[s : s + block_size], dtype=np.float64)
+        total += block.sum(axis=0)
+        scatter += block.T @ block
+    mean = total / max(n, 1)
+    cov = (scatter - n * np.outer(mean, mean)) / max(n - 1, 1)
+    evals, evecs = np.linalg.eigh(cov)
+    order = np.argsort(evals)[::-1][: min(num_features, d)]
+    return mean, evecs[:, order]
+
+
+def _project(
+    X: np.ndarray, mean: np.ndarray, components: np.ndarray, block_size: int
+) -> np.ndarray:
+    """Project the rows of X onto principal components, block by block."""
+    features = np.empty((X.shape[0], components.shape[1]), dtype=np.float64)
+    for s in range(0, X.shape[0], block_size):
+        block = np.asarray(X[s : s + block_size], dtype=np.float64)
+        features[s : s + block.shape[0]] = (block - mean) @ components
+    return features
+
+
+def _assign(X: np.ndarray, centers: np.ndarray, block_size: int) -> tuple[np.ndarray, np.ndarray]:
+    """Nearest-center labels and squared distances, computed in blocks."""
+    labels = np.empty(X.shape[0], dtype=np.int64)
+    dist = np.empty(X.shape[0])
+    c2 = (centers**2).sum(axis=1)
+    for s in range(0, X.shape[0], block_size):
+        xb = X[s : s + block_size]
+        d2 = c2[np.newaxis, :] - 2.0 * (xb @ centers.T)
+        idx = np.argmin(d2, axis=1)
+        labels[s : s + xb.shape[0]] = idx
+        dist[s : s + xb.shape[0]] = d2[np.arange(xb.shape[0]), idx] + (xb**2).sum(axis=1)
+    return labels, np.maximum(dist, 0.0)
+
+
+def kmeans(
+    X: np.ndarray,
+    k: int,
+    rng: np.random.Generator,
+    max_iter: int = 100,
+    tol: float = 1e-6,
+    block_size: int = SPIKE_BLOCK_SIZE,
+) -> tuple[np.ndarray, np.ndarray, float]:
+    """
+    Lloyd's k-means with k-means++ seeding and blockwise assignment.
+
+    Memory use is bounded by ``block_size * k`` distances plus the
+    label vector, independent of the number of observations.
+
+    Args:
+        X: Array of shape (n_observations, n_dimensions)
+        k: Number of clusters
+        rng: Random generator used for seeding
+        max_iter: Maximum Lloyd iterations
+        tol: Stop when the relative decrease in inertia is below tol
+        block_size: Rows per assignment block
+
+    Returns:
+        Tuple of (labels, centers, inertia) where labels are 0-based
+    """
+    n, d = X.shape
+    k = max(1, min(k, n))
+
+    # k-means++ seeding on a bounded subsample
+    sample = X[rng.choice(n, size=min(n, max(KMEANS_SEED_SAMPLE, 10 * k)), replace=False)]
+    centers = np.empty((k, d))
+    centers[0] = sample[rng.integers(len(sample))]
+    closest = ((sample - centers[0]) ** 2).sum(axis=1)
+    for j in range(1, k):
+        total = closest.sum()
+        if total <= 0:
+            centers[j:] = centers[0]
+            break
+        centers[j] = sample[rng.choice(len(sample), p=closest / total)]
+        closest = np.minimum(closest, ((sample - centers[j]) ** 2).sum(axis=1))
+
+    inertia = np.inf
+    labels = np.zeros(n, dtype=np.int64)
+    for _ in range(max_iter):
+        labels, dist = _assign(X, centers, block_size)
+        new_inertia = float(dist.sum())
+        counts = np.bincount(labels, minlength=k)
+        for j in range(d):
+            centers[:, j] = np.bincount(labels, weights=X[:, j], minlength=k)
+        empty = counts == 0
+        centers[~empty] /= counts[~empty, np.newaxis]
+        if empty.any():
+            # Re-seed empty clusters at the points farthest from their centers
+            far = np.argsort(dist)[::-1][: int(empty.sum())]
+            centers[empty] = X[far]
+        if np.isfinite(inertia) and inertia - new_inertia <= tol * max(inertia, 1e-12):
+            inertia = new_inertia
+            break
+        inertia = new_inertia
+
+    labels, dist = _assign(X, centers, block_size)
+    return labels, centers, float(dist.sum())
+
+
+def gmm_diag(
+    X: np.ndarray,
+    labels: np.ndarray,
+    k: int,
+    max_iter: int = 50,
+    tol: float = 1e-6,
+    block_size: int = SPIKE_BLOCK_SIZE,
+) -> tuple[np.ndarray, float]:
+    """
+    Refine a hard clustering with a diagonal-covariance Gaussian mixture.
+
+    EM starts from the given labels; the E-step is evaluated in blocks
+    of rows so only ``block_size * k`` responsibilities are held at once.
+
+    Args:
+        X: Array of shape (n_observations, n_dimensions)
+        labels: 0-based initial labels, e.g. from kmeans()
+        k: Number of components
+        max_iter: Maximum EM iterations
+        tol: Stop when the per-observation log-likelihood gain is below tol
+        block_size: Rows per E-step block
+
+    Returns:
+        Tuple of (labels, log_likelihood) where labels are 0-based
+    """
+    n, d = X.shape
+    floor = 1e-6 * max(float(X.var(axis=0).mean()), 1e-12)
+
+    # Initial parameters from the hard assignment
+    resp_sum = np.bincount(labels, minlength=k).astype(np.float64) + 1e-10
+    sx = np.stack([np.bincount(labels, weights=X[:, j], minlength=k) for j in range(d)], axis=1)
+    sxx = np.stack(
+        [np.bincount(labels, weights=X[:, j] ** 2, minlength=k) for j in range(d)], axis=1
+    )
+
+    loglik = -np.inf
+    for _ in range(max_iter + 1):
+        weights = resp_sum / resp_sum.sum()
+        means = sx / resp_sum[:, np.newaxis]
+        variances = np.maximum(sxx / resp_sum[:, np.newaxis] - means**2, floor)
+        const = np.log(weights) - 0.5 * np.log(2 * np.pi * variances).sum(axis=1)
+        inv = 1.0 / variances
+
+        resp_sum = np.zeros(k)
+        sx = np.zeros((k, d))
+        sxx = np.zeros((k, d))
+        new_loglik = 0.0
+        new_labels = np.empty(n, dtype=np.int64)
+        for s in range(0, n, block_size):
+            xb = X[s : s + block_size]
+            # -0.5 * sum_j (x_j - mu_kj)^2 / var_kj, expanded as matrix products
+            logp = const - 0.5 * (
+                (xb**2) @ inv.T - 2.0 * xb @ (means * inv).T + (means**2 * inv).sum(axis=1)
+            )
+            top = logp.max(axis=1, keepdims=True)
+            norm = top[:, 0] + np.log(np.exp(logp - top).sum(axis=1))
+            r = np.exp(logp - norm[:, np.newaxis])
+            new_loglik += float(norm.sum())
+            new_labels[s : s + xb.shape[0]] = np.argmax(logp, axis=1)
+            resp_sum += r.sum(axis=0)
+            sx += r.T @ xb
+            sxx += r.T @ (xb**2)
+        resp_sum += 1e-10
+        labels = new_labels
+        if new_loglik - loglik < tol * n:
+            loglik = new_loglik
+            break
+        loglik = new_loglik
+
+    return labels, loglik
+
+
+def cluster_features(
+    features: np.ndarray,
+    min_clusters: int,
+    max_clusters: int,
+    num_start: int = 5,
+    seed: int | None = None,
+    max_workers: int | None = None,
+    block_size: int = SPIKE_BLOCK_SIZE,
+) -> np.ndarray:
+    """
+    Cluster feature vectors, choosing the number of clusters by BIC.
+
+    Every (number of clusters, restart) k-means run is executed on a
+    thread pool over a subsample of at most KMEANS_SAMPLE spikes; numpy
+    releases the GIL in its matrix kernels, so the runs use all
+    available cores. The best restart for each cluster count seeds a
+    diagonal Gaussian mixture fit to all spikes, and the count with the
+    lowest Bayesian information criterion wins.
+
+    Args:
+        features: Array of shape (n_spikes, n_features)
+        min_clusters: Smallest number of clusters to consider
+        max_clusters: Largest number of clusters to consider
+        num_start: Random restarts per cluster count
+        seed: Seed for reproducible results
+        max_workers: Thread pool size (default: os.cpu_count())
+        block_size: Rows per assignment block
+
+    Returns:
+        1-based cluster number for each spike
+    """
+    n, d = features.shape
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    min_clusters = max(1, int(min_clusters))
+    max_clusters = max(min_clusters, min(int(max_clusters), n))
+    min_clusters = min(min_clusters, max_clusters)
+    ks = list(range(min_clusters, max_clusters + 1))
+    seeds = np.random.SeedSequence(seed).spawn(len(ks) * num_start)
+    jobs = [
+        (k, np.random.default_rng(seeds[i * num_start + r]))
+        for i, k in enumerate(ks)
+        for r in range(num_start)
+    ]
+
+    # Restarts run on a bounded subsample; the mixture is fit on all spikes
+    rng = np.random.default_rng(seed)
+    sample = features
+    if n > KMEANS_SAMPLE:
+        sample = features[np.sort(rng.choice(n, size=KMEANS_SAMPLE, replace=False))]
+
+    def run_kmeans(job):
+        k, rng = job
+        _, centers, inertia = kmeans(sample, k, rng, block_size=block_size)
+        return k, centers, inertia
+
+    def run_gmm(item):
+        k, centers = item
+        labels, _ = _assign(features, centers, block_size)
+        labels, loglik = gmm_diag(features, labels, k, block_size=block_size)
+        n_params = k * 2 * d + (k - 1)
+        return k, labels, -2.0 * loglik + n_params * np.log(n)
+
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        best: dict[int, tuple[np.ndarray, float]] = {}
+        for k, centers, inertia in pool.map(run_kmeans, jobs):
+            if k not in best or inertia < best[k][1]:
+                best[k] = (centers, inertia)
+        scored = list(pool.map(run_gmm, [(k, best[k][0]) for k in ks]))
+
+    k_best, labels, _ = min(scored, key=lambda item: item[2])
+
+    # Number clusters 1..K in order of decreasing size, dropping empty ones
+    counts = np.bincount(labels, minlength=k_best)
+    rank = np.zeros(k_best, dtype=np.int64)
+    order = [j for j in np.argsort(-counts, kind="stable") if counts[j] > 0]
+    rank[order] = np.arange(1, len(order) + 1)
+    return rank[labels]
+
 
 class ndi_app_spikesorter(ndi_app, ndi_app_appdoc):
     """
@@ -89,6 +448,12 @@ class ndi_app_spikesorter(ndi_app, ndi_app_appdoc):
         """
         Load extracted spike waveforms.
 
+        The waveforms of every epoch are gathered into a single
+        memory-mapped array; with one epoch the epoch's own file is
+        mapped directly, otherwise the epochs are copied block by block
+        into an anonymous temporary file, so no epoch is ever fully
+        loaded into RAM.
+
         MATLAB equivalent: ndi.app.spikesorter/loadwaveforms
 
         Args:
@@ -97,9 +462,63 @@ class ndi_app_spikesorter(ndi_app, ndi_app_appdoc):
 
         Returns:
             Tuple of (waveforms, waveformparams, spiketimes,
-            epochinfo, extraction_params_doc, waveform_docs)
+            epochinfo, extraction_params_doc, waveform_docs).
+            waveforms has shape (samples, channels, spikes) like MATLAB;
+            epochinfo has one dict per epoch with keys epoch_id,
+            start_index (0-based) and num_spikes.
         """
-        raise NotImplementedError("loadwaveforms requires spike extraction results in database.")
+        extraction_params_doc, waveform_docs = self._find_spikewaves(
+            ndi_timeseries_obj, extraction_name
+        )
+
+        maps = []
+        waveformparams: dict[str, Any] = {}
+        for doc in waveform_docs:
+            path = self._binary_path(doc, "spikewaves.vsw")
+            header = read_vsw_header(path)
+            if not waveformparams:
+                waveformparams = header
+            elif (header["numchannels"], header["num_samples"]) != (
+                waveformparams["numchannels"],
+                waveformparams["num_samples"],
+            ):
+                raise ValueError(
+                    f"Spike waveforms of document {doc.id} have a different shape "
+                    f"than those of the first epoch."
+                )
+            maps.append(memmap_vsw(path, header))
+
+        spiketimes, epochinfo = self._load_spiketimes(waveform_docs)
+        for m, info in zip(maps, epochinfo):
+            if m.shape[0] != info["num_spikes"]:
+                raise ValueError(
+                    f"Epoch '{info['epoch_id']}' has {m.shape[0]} waveforms but "
+                    f"{info['num_spikes']} spike times."
+                )
+
+        if len(maps) == 1:
+            waveforms = maps[0]
+        elif maps:
+            shape = (int(sum(m.shape[0] for m in maps)),) + maps[0].shape[1:]
+            waveforms = np.memmap(tempfile.TemporaryFile(), dtype="<f4", mode="w+", shape=shape)
+            offset = 0
+            for m in maps:
+                for s in range(0, m.shape[0], SPIKE_BLOCK_SIZE):
+                    block = m[s : s + SPIKE_BLOCK_SIZE]
+                    waveforms[offset : offset + block.shape[0]] = block
+                    offset += block.shape[0]
+            waveforms.flush()
+        else:
+            waveforms = np.zeros((0, 0, 0), dtype=np.float32)
+
+        return (
+            waveforms.transpose(2, 1, 0),
+            waveformparams,
+            spiketimes,
+            epochinfo,
+            extraction_params_doc,
+            waveform_docs,
+        )
 
     def spike_sort(
         self,
@@ -111,6 +530,13 @@ class ndi_app_spikesorter(ndi_app, ndi_app_appdoc):
         """
         Perform spike sorting on extracted spikes.
 
+        Waveforms of all epochs are projected onto their first
+        ``num_pca_features`` principal components (computed in
+        mini-batches), then clustered with k-means for every cluster
+        count between ``min_clusters`` and ``max_clusters``, keeping
+        the best of ``num_start`` restarts. The cluster count with the
+        lowest BIC is stored in a single spike_clusters document.
+
         MATLAB equivalent: ndi.app.spikesorter/spike_sort
 
         Args:
@@ -122,11 +548,76 @@ class ndi_app_spikesorter(ndi_app, ndi_app_appdoc):
         Returns:
             List of spike_clusters documents
         """
-        raise NotImplementedError(
-            "Full spike sorting requires sklearn.cluster. "
-            "This class provides the framework structure."
+        if self._session is None:
+            raise RuntimeError("No session: ndi_app_spikesorter requires a session to sort.")
+
+        sorting_doc = self._sorting_parameters_doc(sorting_parameters_name)
+        params = self.check_sorting_parameters(
+            dict(sorting_doc.document_properties.get("sorting_parameters", {}))
+        )
+        if params.get("graphical_mode"):
+            raise NotImplementedError("graphical_mode sorting is not available in Python.")
+
+        waveforms, waveformparams, _, epochinfo, extraction_doc, waveform_docs = self.loadwaveforms(
+            ndi_timeseries_obj, extraction_name
         )
 
+        existing = self._find_spike_clusters(ndi_timeseries_obj, sorting_doc, extraction_doc)
+        if existing:
+            if not redo:
+                return existing
+            self._session.database_rm(existing)
+
+        # (samples, channels, spikes) -> (spikes, channels * samples), still memory-mapped
+        spikes = waveforms.transpose(2, 1, 0)
+        num_spikes = spikes.shape[0]
+        X = spikes.reshape(num_spikes, -1)
+
+        if num_spikes > 0:
+            mean, components = pca_minibatch(X, int(params["num_pca_features"]))
+            features = _project(X, mean, components, SPIKE_BLOCK_SIZE)
+            clusterids = cluster_features(
+                features,
+                int(params["min_clusters"]),
+                int(params["max_clusters"]),
+                num_start=max(1, int(params["num_start"])),
+            )
+        else:
+            clusterids = np.zeros(0, dtype=np.int64)
+
+        clusterinfo = self._cluster_info(spikes, clusterids, epochinfo)
+
+        sr = float(waveformparams.get("samplingrate", 0) or 0)
+        sample_times = []
+        if sr > 0:
+            sample_times = (np.arange(waveformparams["S0"], waveformparams["S1"] + 1) / sr).tolist()
+
+        doc = self.struct2doc(
+            "spike_clusters",
+            {
+                "epoch_info": {
+                    "EpochStartSamples": [e["start_index"] + 1 for e in epochinfo],
+                    "EpochNames": [e["epoch_id"] for e in epochinfo],
+                },
+                "clusterinfo": clusterinfo,
+                "waveform_sample_times": sample_times,
+            },
+        )
+        doc.set_session_id(self._session.id())
+        doc.set_dependency_value("sorting_parameters_id", sorting_doc.id)
+        doc.set_dependency_value("element_id", ndi_timeseries_obj.id)
+        doc.set_dependency_value("extraction_parameters_id", extraction_doc.id)
+        if waveform_docs:
+            doc.set_dependency_value("spikewaves_doc_id", waveform_docs[0].id)
+
+        # Attach the cluster IDs so the file travels with the document
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / f"{doc.id}_spike_cluster.bin"
+            clusterids.astype("<u2").tofile(path)
+            doc.add_file("spike_cluster.bin", str(path), ingest=True, delete_original=True)
+            self._session.database_add(doc)
+        return [doc]
+
     def clusters2neurons(
         self,
         ndi_timeseries_obj: Any,
@@ -137,6 +628,11 @@ class ndi_app_spikesorter(ndi_app, ndi_app_appdoc):
         """
         Create ndi_neuron elements from cluster assignments.
 
+        One neuron is made for every cluster whose quality label is not
+        ``'Not usable'``. The neuron element documents and all of their
+        epoch documents are added in a single database_add call, and
+        the spike times of each epoch are stored with the epoch.
+
         MATLAB equivalent: ndi.app.spikesorter/clusters2neurons
 
         Args:
@@ -145,9 +641,220 @@ class ndi_app_spikesorter(ndi_app, ndi_app_appdoc):
             extraction_parameters_name: Name of extraction parameters
             redo: Re-create even if neurons exist
         """
-        raise NotImplementedError(
-            "Full neuron creation from clusters requires additional infrastructure."
+        if self._session is None:
+            raise RuntimeError("No session: ndi_app_spikesorter requires a session.")
+
+        from ..element_timeseries import TIMESERIES_FILE, attach_timeseries_binary
+        from ..neuron import ndi_neuron
+        from ..query import ndi_query
+
+        sorting_doc = self._sorting_parameters_doc(sorting_parameters_name)
+        extraction_doc, waveform_docs = self._find_spikewaves(
+            ndi_timeseries_obj, extraction_parameters_name
+        )
+        cluster_docs = self._find_spike_clusters(ndi_timeseries_obj, sorting_doc, extraction_doc)
+        if not cluster_docs:
+            raise ValueError(
+                f"No spike_clusters found for '{sorting_parameters_name}' / "
+                f"'{extraction_parameters_name}'; run spike_sort first."
+            )
+        cluster_doc = cluster_docs[0]
+
+        q = (
+            ndi_query("").isa("element")
+            & ndi_query("").depends_on("underlying_element_id", ndi_timeseries_obj.id)
+            & ndi_query("").depends_on("spike_clusters_id", cluster_doc.id)
+        )
+        existing = self._session.database_search(q)
+        if existing:
+            if not redo:
+                return
+            self._session.database_rm(existing)
+
+        clusterids = np.fromfile(self._binary_path(cluster_doc, "spike_cluster.bin"), dtype="<u2")
+        spiketimes, epochinfo = self._load_spiketimes(waveform_docs)
+        if clusterids.shape[0] != spiketimes.shape[0]:
+            raise ValueError(
+                f"spike_clusters document {cluster_doc.id} has {clusterids.shape[0]} "
+                f"assignments but {spiketimes.shape[0]} spike times were found."
+            )
+
+        et, _ = ndi_timeseries_obj.epochtable()
+        entries = {e.get("epoch_id", ""): e for e in et}
+
+        new_docs = []
+        data_to_store = []
+        clusterinfo = cluster_doc.document_properties["spike_clusters"].get("clusterinfo", [])
+        if isinstance(clusterinfo, dict):
+            clusterinfo = [clusterinfo]
+        for info in clusterinfo:
+            if info.get("qualitylabel", "") == "Not usable":
+                continue
+            number = int(info["number"])
+            neuron = ndi_neuron(
+                session=self._session,
+                name=f"{ndi_timeseries_obj.name}_{number}",
+                reference=ndi_timeseries_obj.reference,
+                underlying_element=ndi_timeseries_obj,
+                direct=False,
+                subject_id=ndi_timeseries_obj.subject_id,
+            )
+            element_doc = neuron.newdocument()
+            element_doc.set_dependency_value(
+                "spike_clusters_id", cluster_doc.id, error_if_not_found=False
+            )
+            new_docs.append(element_doc)
+
+            in_cluster = clusterids == number
+            for e in epochinfo:
+                entry = entries.get(e["epoch_id"])
+                if entry is None:
+                    continue
+                sl = slice(e["start_index"], e["start_index"] + e["num_spikes"])
+                times = spiketimes[sl][in_cluster[sl]]
+                epoch_doc = neuron.newepochdocument(
+                    e["epoch_id"], entry.get("epoch_clock", []), entry.get("t0_t1", [])
+                )
+                new_docs.append(epoch_doc)
+                data_to_store.append((epoch_doc, times, np.ones_like(times)))
+
+        if not new_docs:
+            return
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for epoch_doc, times, values in data_to_store:
+                path = Path(tmpdir) / f"{epoch_doc.id}_{TIMESERIES_FILE}"
+                attach_timeseries_binary(epoch_doc, path, [(times, values)])
+            self._session.database_add(new_docs)
+
+    # =========================================================================
+    # Helpers
+    # =========================================================================
+
+    def _binary_path(self, doc: ndi_document, filename: str) -> Path:
+        """Return the path of a binary file attached to a document."""
+        exists, path = self._session.database_existbinarydoc(doc, filename)
+        if not exists:
+            raise FileNotFoundError(f"Binary file '{filename}' not found for document {doc.id}")
+        return path
+
+    def _sorting_parameters_doc(self, sorting_parameters_name: str) -> ndi_document:
+        """Find sorting parameters by name; 'default' is created if absent."""
+        from ..query import ndi_query
+
+        q = ndi_query("").isa("sorting_parameters") & (
+            ndi_query("base.name") == sorting_parameters_name
         )
+        docs = self._session.database_search(q)
+        if docs:
+            return docs[0]
+        if sorting_parameters_name != "default":
+            raise ValueError(f"No sorting_parameters named '{sorting_parameters_name}'.")
+        doc = self.struct2doc("sorting_parameters", self.default_sorting_parameters())
+        doc.document_properties["base"]["name"] = "default"
+        doc.set_session_id(self._session.id())
+        self._session.database_add(doc)
+        return doc
+
+    def _find_spikewaves(
+        self, ndi_timeseries_obj: Any, extraction_name: str
+    ) -> tuple[ndi_document, list[ndi_document]]:
+        """Find extraction parameters and spikewaves docs in epoch-table order."""
+        if self._session is None:
+            raise RuntimeError("No session: ndi_app_spikesorter requires a session.")
+        from ..query import ndi_query
+
+        q = ndi_query("").isa("spike_extraction_parameters") & (
+            ndi_query("base.name") == extraction_name
+        )
+        param_docs = self._session.database_search(q)
+        if not param_docs:
+            raise ValueError(f"No spike_extraction_parameters named '{extraction_name}'.")
+        extraction_doc = param_docs[0]
+
+        q = (
+            ndi_query("").isa("spikewaves")
+            & ndi_query("").depends_on("element_id", ndi_timeseries_obj.id)
+            & ndi_query("").depends_on("extraction_parameters_id", extraction_doc.id)
+        )
+        waveform_docs = self._session.database_search(q)
+
+        et, _ = ndi_timeseries_obj.epochtable()
+        position = {e.get("epoch_id", ""): i for i, e in enumerate(et)}
+        waveform_docs.sort(
+            key=lambda d: (
+                position.get(_epochid(d), len(position)),
+                _epochid(d),
+            )
+        )
+        return extraction_doc, waveform_docs
+
+    def _find_spike_clusters(
+        self, ndi_timeseries_obj: Any, sorting_doc: ndi_document, extraction_doc: ndi_document
+    ) -> list[ndi_document]:
+        """Find spike_clusters docs for an element and parameter pair."""
+        from ..query import ndi_query
+
+        q = (
+            ndi_query("").isa("spike_clusters")
+            & ndi_query("").depends_on("element_id", ndi_timeseries_obj.id)
+            & ndi_query("").depends_on("sorting_parameters_id", sorting_doc.id)
+            & ndi_query("").depends_on("extraction_parameters_id", extraction_doc.id)
+        )
+        return self._session.database_search(q)
+
+    def _load_spiketimes(self, waveform_docs: list[ndi_document]) -> tuple[np.ndarray, list[dict]]:
+        """Concatenate the spike times of every epoch and index the epochs."""
+        times = []
+        epochinfo = []
+        start = 0
+        for doc in waveform_docs:
+            t = np.fromfile(self._binary_path(doc, "spiketimes.bin"), dtype="<f4")
+            times.append(t.astype(np.float64))
+            epochinfo.append(
+                {"epoch_id": _epochid(doc), "start_index": start, "num_spikes": t.size}
+            )
+            start += t.size
+        spiketimes = np.concatenate(times) if times else np.zeros(0)
+        return spiketimes, epochinfo
+
+    @staticmethod
+    def _cluster_info(
+        spikes: np.ndarray, clusterids: np.ndarray, epochinfo: list[dict]
+    ) -> list[dict[str, Any]]:
+        """Spike counts, mean waveforms and epoch span of each cluster."""
+        K = int(clusterids.max()) if clusterids.size else 0
+        num_spikes, num_channels, num_samples = spikes.shape
+        flat = spikes.reshape(num_spikes, -1)
+        sums = np.zeros((K, flat.shape[1]))
+        for s in range(0, num_spikes, SPIKE_BLOCK_SIZE):
+            ids = clusterids[s : s + SPIKE_BLOCK_SIZE] - 1
+            onehot = np.zeros((K, ids.size))
+            onehot[ids, np.arange(ids.size)] = 1.0
+            sums += onehot @ np.asarray(flat[s : s + SPIKE_BLOCK_SIZE], dtype=np.float64)
+        counts = np.bincount(clusterids, minlength=K + 1)[1:]
+
+        starts = np.array([e["start_index"] for e in epochinfo], dtype=np.int64)
+        epoch_of_spike = np.searchsorted(starts, np.arange(num_spikes), side="right") - 1
+
+        info = []
+        for k in range(K):
+            members = np.flatnonzero(clusterids == k + 1)
+            meanshape = sums[k] / max(counts[k], 1)
+            info.append(
+                {
+                    "number": k + 1,
+                    "qualitylabel": "Unselected",
+                    "number_of_spikes": int(counts[k]),
+                    "meanshape": meanshape.reshape(num_channels, num_samples).T.tolist(),
+                    "EpochStart": (
+                        epochinfo[epoch_of_spike[members[0]]]["epoch_id"] if members.size else ""
+                    ),
+                    "EpochStop": (
+                        epochinfo[epoch_of_spike[members[-1]]]["epoch_id"] if members.size else ""
+                    ),
+                }
+            )
+        return info
 
     def struct2doc(self, appdoc_type: str, appdoc_struct: dict, **kwargs) -> ndi_document:
         from ..document import ndi_document
@@ -189,3 +896,8 @@ class ndi_app_spikesorter(ndi_app, ndi_app_appdoc):
 
     def __repr__(self) -> str:
         return f"ndi_app_spikesorter(session={self._session is not None})"
+
+
+def _epochid(doc: Any) -> str:
+    """Return the epochid.epochid field of a document."""
+    return doc.document_properties.get("epochid", {}).get("epochid", "")
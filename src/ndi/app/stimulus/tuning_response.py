@@ -17,6 +17,9 @@ if TYPE_CHECKING:
     from ...document import ndi_document
     from ...session.session_base import ndi_session
 
+# longest stretch of response data read at once, in seconds
+_MAX_READ_SECONDS = 60.0
+
 
 class ndi_app_stimulus_tuning__response(ndi_app):
     """
@@ -45,6 +48,12 @@ class ndi_app_stimulus_tuning__response(ndi_app):
         """
         Compute responses to a stimulus set.
 
+        Every stimulus_presentation document of *ndi_element_stim* is
+        analyzed against *ndi_timeseries_obj*. Presentation documents,
+        control stimulus documents and existing responses are fetched
+        with one search each, and all new stimulus_response_scalar
+        documents are written with a single database_add call.
+
         MATLAB equivalent: ndi.app.stimulus.tuning_response/stimulus_responses
 
         Args:
@@ -55,11 +64,66 @@ class ndi_app_stimulus_tuning__response(ndi_app):
 
         Returns:
             List of stimulus_response_scalar documents
+
+        Raises:
+            RuntimeError: If no session is configured
         """
-        raise NotImplementedError(
-            "Full stimulus response computation requires signal processing. "
-            "This class provides the framework structure."
+        if self._session is None:
+            raise RuntimeError("No session configured")
+
+        from ...query import ndi_query
+
+        q_stim = ndi_query("").isa("stimulus_presentation") & ndi_query("").depends_on(
+            "stimulus_element_id", ndi_element_stim.id
         )
+        stim_docs = self._session.database_search(q_stim)
+        if not stim_docs:
+            return []
+        stim_ids = {d.id for d in stim_docs}
+
+        control_by_stim: dict[str, ndi_document] = {}
+        for cdoc in self._session.database_search(ndi_query("").isa("control_stimulus_ids")):
+            sid = cdoc.dependency_value("stimulus_presentation_id", error_if_not_found=False)
+            if sid in stim_ids:
+                control_by_stim.setdefault(sid, cdoc)
+
+        q_existing = ndi_query("").isa("stimulus_response_scalar") & ndi_query("").depends_on(
+            "element_id", ndi_timeseries_obj.id
+        )
+        existing = [
+            d
+            for d in self._session.database_search(q_existing)
+            if d.dependency_value("stimulus_presentation_id", error_if_not_found=False) in stim_ids
+        ]
+        if reset and existing:
+            self._session.database_rm(existing)
+            existing = []
+        done = {
+            d.dependency_value("stimulus_presentation_id", error_if_not_found=False)
+            for d in existing
+        }
+
+        parameters_doc = self._response_parameters_doc()
+
+        new_docs: list[ndi_document] = []
+        for stim_doc in stim_docs:
+            if stim_doc.id in done:
+                continue
+            new_docs.extend(
+                self.compute_stimulus_response_scalar(
+                    ndi_element_stim,
+                    ndi_timeseries_obj,
+                    stim_doc,
+                    control_by_stim.get(stim_doc.id),
+                    parameters_doc=parameters_doc,
+                    do_mean_only=do_mean_only,
+                    do_add=False,
+                )
+            )
+
+        if new_docs:
+            self._session.database_add(new_docs)
+        return new_docs
 
     def compute_stimulus_response_scalar(
         self,
@@ -67,9 +131,21 @@ class ndi_app_stimulus_tuning__response(ndi_app):
         ndi_timeseries_obj: Any,
         stim_doc: ndi_document,
         control_doc: ndi_document | None = None,
-    ) -> ndi_document | None:
+        parameters_doc: ndi_document | None = None,
+        do_mean_only: bool = False,
+        do_add: bool = True,
+    ) -> list[ndi_document]:
         """
-        Compute scalar response for a single stimulus presentation.
+        Compute scalar responses for all presentations in a stimulus document.
+
+        The onset and offset of every presentation are converted to the
+        response element's local time with one syncgraph call. The
+        response data is read for runs of neighbouring presentations
+        spanning at most a minute, and the mean and F1/F2 responses of
+        each run are computed together by
+        :func:`ndi.fun.stimulus.windowed_responses`. The control response
+        of a presentation is that of its control presentation, analyzed
+        at the presentation's own temporal frequency.
 
         MATLAB equivalent: ndi.app.stimulus.tuning_response/compute_stimulus_response_scalar
 
@@ -78,13 +154,167 @@ class ndi_app_stimulus_tuning__response(ndi_app):
             ndi_timeseries_obj: Response timeseries element
             stim_doc: Stimulus presentation document
             control_doc: Control stimulus document, or None
+            parameters_doc: stimulus_response_scalar_parameters_basic
+                document; the default parameters are used if None
+            do_mean_only: Only compute the mean response
+            do_add: Add the new documents to the database
 
         Returns:
-            stimulus_response_scalar document, or None
+            List of stimulus_response_scalar documents, one per response
+            type ('mean', and 'F1'/'F2' unless *do_mean_only*). Empty if
+            the presentations cannot be mapped onto the response element.
+
+        Raises:
+            RuntimeError: If no session is configured
         """
-        raise NotImplementedError(
-            "Stimulus response scalar computation requires signal processing."
+        if self._session is None:
+            raise RuntimeError("No session configured")
+
+        import numpy as np
+
+        from ...document import ndi_document
+        from ...fun.stimulus import (
+            presentation_stimulus_index,
+            stimulustemporalfrequency,
+            windowed_responses,
+        )
+        from ...time import ndi_time_clocktype, ndi_time_timereference
+
+        if parameters_doc is None:
+            parameters_doc = self._response_parameters_doc()
+        params = parameters_doc.document_properties.get(
+            "stimulus_response_scalar_parameters_basic", {}
+        )
+
+        pres = stim_doc.document_properties.get("stimulus_presentation", {})
+        order = np.asarray(pres.get("presentation_order", []), dtype=np.int64).ravel()
+        clocktype, onsets, offsets = self._presentation_times(stim_doc)
+        if order.size == 0 or onsets.size != order.size:
+            return []
+
+        stim_epochid = stim_doc.document_properties.get("epochid", {}).get("epochid", "")
+        timeref_in = ndi_time_timereference(
+            ndi_stim_obj, ndi_time_clocktype(clocktype), stim_epochid, 0
+        )
+        prestim = params.get("prestimulus_time") or 0
+        prestim = float(prestim) if np.isscalar(prestim) else 0.0
+        windows = np.concatenate([onsets - prestim, onsets, offsets])
+        t_out, timeref_out, _ = self._session.syncgraph.time_convert(
+            timeref_in, windows, ndi_timeseries_obj, ndi_time_clocktype.DEV_LOCAL_TIME
         )
+        if t_out is None:
+            return []
+        t_out = np.asarray(t_out, dtype=np.float64)
+        pre_on, on, off = np.split(t_out, 3)
+
+        isspike = bool(params.get("isspike")) or getattr(ndi_timeseries_obj, "type", "") in (
+            "spikes",
+            "neuron",
+        )
+
+        # temporal frequency of each stimulus, expanded to each presentation
+        stimuli = pres.get("stimuli", [])
+        if isinstance(stimuli, dict):
+            stimuli = [stimuli]
+        freq_response = float(params.get("freq_response") or 0)
+        stim_tf = np.full(len(stimuli), np.nan)
+        for i, stimulus in enumerate(stimuli):
+            if freq_response > 0:
+                stim_tf[i] = freq_response
+            else:
+                tf, _ = stimulustemporalfrequency(stimulus.get("parameters", {}))
+                stim_tf[i] = np.nan if tf is None else tf
+        stim_index = presentation_stimulus_index(order, stim_tf.size)
+        pres_tf = np.full(order.shape, np.nan)
+        pres_tf[stim_index >= 0] = stim_tf[stim_index[stim_index >= 0]]
+
+        # each presentation's control is the presentation named by
+        # control_stimulus_ids, analyzed at the stimulus's own frequency
+        control_index = np.full(order.shape, -1, dtype=np.int64)
+        if control_doc is not None:
+            cs = control_doc.document_properties.get("control_stimulus_ids", {})
+            cs = np.asarray(cs.get("control_stimulus_ids", []), dtype=np.float64).ravel()
+            if cs.size == order.size:
+                ok = np.isfinite(cs) & (cs >= 1) & (cs <= order.size)
+                control_index[ok] = cs[ok].astype(np.int64) - 1
+        has_control = control_index >= 0
+        window = np.concatenate([np.arange(order.size), control_index[has_control]])
+        window_tf = np.concatenate([pres_tf, pres_tf[has_control]])
+
+        harmonics = () if do_mean_only else (1, 2)
+        normalization = params.get("prestimulus_normalization") or 0
+        normalize = prestim > 0 and normalization in (1, 2, 3)
+        resp: dict[str, np.ndarray] = {"mean": np.full(window.size, np.nan)}
+        for h in harmonics:
+            resp[f"F{h}"] = np.full(window.size, complex(np.nan, np.nan))
+        base = np.full(order.size, np.nan)
+
+        # read the data a cluster of neighbouring presentations at a time
+        for members in _presentation_clusters(pre_on, off, _MAX_READ_SECONDS):
+            data, t, _ = ndi_timeseries_obj.readtimeseries(
+                timeref_out, float(pre_on[members].min()), float(off[members].max())
+            )
+            t = np.asarray(t, dtype=np.float64).ravel()
+            x = None if isspike else np.asarray(data, dtype=np.float64).reshape(t.size, -1)[:, 0]
+            sel = np.flatnonzero(np.isin(window, members))
+            w = window[sel]
+            r = windowed_responses(
+                t, x, on[w], off[w], window_tf[sel], harmonics=harmonics, isspike=isspike
+            )
+            for key, value in r.items():
+                resp[key][sel] = value
+            if normalize:
+                base[members] = windowed_responses(
+                    t, x, pre_on[members], on[members], isspike=isspike
+                )["mean"]
+
+        if normalize:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                mean = resp["mean"][: order.size]
+                if normalization == 1:
+                    mean = mean - base
+                elif normalization == 2:
+                    mean = (mean - base) / base
+                else:
+                    mean = mean / base
+            resp["mean"] = np.concatenate([mean, mean[control_index[has_control]]])
+
+        element_epochid = timeref_out.epoch if timeref_out is not None else ""
+        docs = []
+        for response_type in ["mean", *(f"F{h}" for h in harmonics)]:
+            r = np.asarray(resp[response_type], dtype=np.complex128)
+            cr = np.full(order.shape, complex(np.nan, np.nan))
+            cr[has_control] = r[order.size :]
+            r = r[: order.size]
+            doc = ndi_document(
+                "stimulus/stimulus_response_scalar",
+                **{
+                    "stimulus_response_scalar.response_type": response_type,
+                    "stimulus_response_scalar.responses": {
+                        "stimid": order.tolist(),
+                        "response_real": r.real.tolist(),
+                        "response_imaginary": r.imag.tolist(),
+                        "control_response_real": cr.real.tolist(),
+                        "control_response_imaginary": cr.imag.tolist(),
+                    },
+                    "stimulus_response.stimulator_epochid": stim_epochid,
+                    "stimulus_response.element_epochid": element_epochid,
+                },
+            )
+            doc.set_session_id(self._session.id())
+            doc.set_dependency_value("stimulus_response_scalar_parameters_id", parameters_doc.id)
+            for name, value in (
+                ("element_id", ndi_timeseries_obj.id),
+                ("stimulator_id", ndi_stim_obj.id),
+                ("stimulus_presentation_id", stim_doc.id),
+                ("stimulus_control_id", control_doc.id if control_doc is not None else ""),
+            ):
+                doc.set_dependency_value(name, value, error_if_not_found=False)
+            docs.append(doc)
+
+        if do_add and docs:
+            self._session.database_add(docs)
+        return docs
 
     def tuning_curve(
         self,
@@ -207,5 +437,78 @@ class ndi_app_stimulus_tuning__response(ndi_app):
             "1D tuning curve extraction requires multi-dimensional response analysis."
         )
 
+    def _response_parameters_doc(self) -> ndi_document:
+        """Find the default response parameters; they are created if absent."""
+        from ...document import ndi_document
+        from ...query import ndi_query
+
+        q = ndi_query("").isa("stimulus_response_scalar_parameters_basic") & (
+            ndi_query("base.name") == "default"
+        )
+        docs = self._session.database_search(q)
+        if docs:
+            return docs[0]
+        doc = ndi_document("stimulus/stimulus_response_scalar_parameters_basic")
+        doc.document_properties["base"]["name"] = "default"
+        doc.set_session_id(self._session.id())
+        self._session.database_add(doc)
+        return doc
+
+    def _presentation_times(self, stim_doc: ndi_document) -> tuple[str, Any, Any]:
+        """Return (clocktype, onsets, offsets) of every presentation as arrays.
+
+        Times stored inline in the document are used when present;
+        otherwise they are read from the document's presentation_time.bin.
+        """
+        import numpy as np
+
+        entries = stim_doc.document_properties.get("stimulus_presentation", {}).get(
+            "presentation_time", []
+        )
+        if isinstance(entries, dict):
+            entries = [entries]
+        if not entries or len(entries) == 1 and not entries[0].get("clocktype"):
+            exists, path = self._session.database_existbinarydoc(stim_doc, "presentation_time.bin")
+            if exists:
+                from ...database_fun import read_presentation_time_structure
+
+                _, entries = read_presentation_time_structure(str(path))
+        if not entries:
+            return "", np.zeros(0), np.zeros(0)
+        onsets = np.array([float(e.get("onset", np.nan)) for e in entries])
+        offsets = np.array([float(e.get("offset", np.nan)) for e in entries])
+        return str(entries[0].get("clocktype", "")), onsets, offsets
+
     def __repr__(self) -> str:
         return f"ndi_app_stimulus_tuning__response(session={self._session is not None})"
+
+
+def _presentation_clusters(starts: Any, stops: Any, max_duration: float) -> list[Any]:
+    """Group presentations into runs of neighbours spanning at most max_duration.
+
+    Presentations are taken in order of their start time; a presentation
+    longer than *max_duration* forms a run of its own. Presentations
+    with a non-finite start or stop are left out.
+
+    Returns:
+        List of integer index arrays, one per run.
+    """
+    import numpy as np
+
+    starts = np.asarray(starts, dtype=np.float64)
+    stops = np.asarray(stops, dtype=np.float64)
+    finite = np.flatnonzero(np.isfinite(starts) & np.isfinite(stops))
+    clusters = []
+    current: list[int] = []
+    c0 = c1 = 0.0
+    for i in finite[np.argsort(starts[finite], kind="stable")]:
+        if current and max(c1, stops[i]) - c0 > max_duration:
+            clusters.append(np.array(current))
+            current = []
+        if not current:
+            c0, c1 = starts[i], stops[i]
+        c1 = max(c1, stops[i])
+        current.append(int(i))
+    if current:
+        clusters.append(np.array(current))
+    return clusters
@@ -9,12 +9,12 @@ MATLAB equivalent: src/ndi/+ndi/+calc/+stimulus/tuningcurve.m
 
 from __future__ import annotations
 
-import math
 from typing import TYPE_CHECKING, Any
 
 import numpy as np
 
 from ...calculator import ndi_calculator
+from ...fun.stimulus import presentation_stimulus_index
 
 if TYPE_CHECKING:
     from ...document import ndi_document
@@ -201,69 +201,29 @@ class ndi_calc_stimulus_tuningcurve(ndi_calculator):
         Raises:
             RuntimeError: If stimulus presentation document cannot be found.
         """
-
         stim_pres_doc = self._get_stim_presentation_doc(stim_response_doc)
 
         stim_pres = stim_pres_doc.document_properties.get("stimulus_presentation", {})
         stimuli = stim_pres.get("stimuli", [])
-        presentation_order = stim_pres.get("presentation_order", [])
-
-        # Find stimuli that have the requested property
-        include = []
-        for i, stim in enumerate(stimuli):
-            params = stim.get("parameters", {})
-            if prop in params:
-                include.append(i)
+        stim_index = presentation_stimulus_index(
+            stim_pres.get("presentation_order", []), len(stimuli)
+        )
 
-        n = -1
-        v = float("-inf")
-        property_value: Any = ""
+        values = _response_values(stim_response_doc, stim_index.size)
+        mean, _, count = _group_responses(values[np.newaxis, :], stim_index, len(stimuli))
+        mean, count = mean[0], count[0]
 
-        responses = stim_response_doc.document_properties.get("stimulus_response_scalar", {}).get(
-            "responses", {}
+        # complex means are ranked by magnitude, real means by value
+        score = np.where(mean.imag != 0, np.abs(mean), mean.real)
+        include = np.array([prop in stim.get("parameters", {}) for stim in stimuli], dtype=bool) & (
+            count > 0
         )
-        response_real = responses.get("response_real", [])
-        response_imag = responses.get("response_imaginary", [])
-        control_real = responses.get("control_response_real", [])
-        control_imag = responses.get("control_response_imaginary", [])
-
-        for idx in include:
-            # Find all presentations of this stimulus
-            indexes = [
-                j
-                for j, po in enumerate(presentation_order)
-                if po == idx or po == idx + 1  # handle 0-based or 1-based
-            ]
-            # Use strict equality with actual presentation_order values
-            indexes = [j for j, po in enumerate(presentation_order) if po == idx]
-
-            r_values = []
-            for j in indexes:
-                if j < len(response_real):
-                    r = response_real[j]
-                    if j < len(response_imag):
-                        r = complex(r, response_imag[j])
-                    # Subtract control if available
-                    if j < len(control_real) and not _is_nan(control_real[j]):
-                        c = control_real[j]
-                        if j < len(control_imag):
-                            c = complex(c, control_imag[j])
-                        r = r - c
-                    r_values.append(r)
-
-            if r_values:
-                mn = np.nanmean(r_values)
-                if np.iscomplex(mn):
-                    mn = abs(mn)
-                else:
-                    mn = float(np.real(mn))
-
-                if mn > v:
-                    v = mn
-                    n = idx
-                    property_value = stimuli[idx].get("parameters", {}).get(prop, "")
-
-        return (n, v, property_value)
+        score = np.where(include & ~np.isnan(score), score, -np.inf)
+
+        if not np.any(score > -np.inf):
+            return (-1, float("-inf"), "")
+        n = int(np.argmax(score))
+        return (n, float(score[n]), stimuli[n].get("parameters", {}).get(prop, ""))
 
     def property_value_array(
         self,
@@ -287,17 +247,80 @@ class ndi_calc_stimulus_tuningcurve(ndi_calculator):
         stim_pres_doc = self._get_stim_presentation_doc(stim_response_doc)
 
         stim_pres = stim_pres_doc.document_properties.get("stimulus_presentation", {})
-        stimuli = stim_pres.get("stimuli", [])
+        return _unique_property_values(stim_pres.get("stimuli", []), prop)
+
+    def tuning_curves(
+        self,
+        stim_response_docs: list[ndi_document],
+        prop: str,
+    ) -> list[dict[str, Any]]:
+        """Compute tuning curves for many stimulus_response_scalar documents.
 
-        pva: list[Any] = []
-        for stim in stimuli:
-            params = stim.get("parameters", {})
-            if prop in params:
-                val = params[prop]
-                if not _value_in_list(val, pva):
-                    pva.append(val)
+        Python-specific: no MATLAB equivalent. The stimulus presentation
+        documents are fetched with one search, and the responses of all
+        documents that share a presentation document are grouped by
+        stimulus in a single ``np.bincount`` pass.
 
-        return pva
+        Responses are control-subtracted as in :meth:`best_value_empirical`,
+        and presentations with NaN responses are ignored.
+
+        Args:
+            stim_response_docs: stimulus_response_scalar documents.
+            prop: Stimulus property to use as the independent variable.
+
+        Returns:
+            List aligned with *stim_response_docs*. Each entry is a dict
+            with ``'independent_variable'`` (value of *prop* for each
+            stimulus that has it), ``'stimid'`` (0-based stimulus
+            indices), and numpy arrays ``'response_mean'`` (complex),
+            ``'response_stderr'`` and ``'count'``.
+
+        Raises:
+            RuntimeError: If a stimulus presentation document cannot be found.
+        """
+        from ...query import ndi_query
+
+        if not stim_response_docs:
+            return []
+        if self._session is None:
+            raise RuntimeError("ndi_session is required for stimulus lookup")
+
+        # rows of stim_response_docs for each presentation document
+        rows_by_pres: dict[str, list[int]] = {}
+        for i, d in enumerate(stim_response_docs):
+            rows_by_pres.setdefault(d.dependency_value("stimulus_presentation_id"), []).append(i)
+        q = None
+        for dep_id in rows_by_pres:
+            q_id = ndi_query("base.id") == dep_id
+            q = q_id if q is None else q | q_id
+        pres_docs = {d.id: d for d in self._session.database_search(q)}
+
+        results: list[dict[str, Any] | None] = [None] * len(stim_response_docs)
+        for dep_id, rows in rows_by_pres.items():
+            if dep_id not in pres_docs:
+                raise RuntimeError(f"Could not find stimulus presentation doc {dep_id}")
+            stim_pres = pres_docs[dep_id].document_properties.get("stimulus_presentation", {})
+            stimuli = stim_pres.get("stimuli", [])
+            stim_index = presentation_stimulus_index(
+                stim_pres.get("presentation_order", []), len(stimuli)
+            )
+
+            values = np.vstack(
+                [_response_values(stim_response_docs[i], stim_index.size) for i in rows]
+            )
+            mean, stderr, count = _group_responses(values, stim_index, len(stimuli))
+
+            has_prop = [k for k, stim in enumerate(stimuli) if prop in stim.get("parameters", {})]
+            independent = [stimuli[k]["parameters"][prop] for k in has_prop]
+            for j, i in enumerate(rows):
+                results[i] = {
+                    "independent_variable": independent,
+                    "stimid": has_prop,
+                    "response_mean": mean[j, has_prop],
+                    "response_stderr": stderr[j, has_prop],
+                    "count": count[j, has_prop],
+                }
+        return results
 
     def generate_mock_docs(
         self,
@@ -463,12 +486,80 @@ class ndi_calc_stimulus_tuningcurve(ndi_calculator):
         return f"ndi_calc_stimulus_tuningcurve(session={self._session is not None})"
 
 
-def _is_nan(value: Any) -> bool:
-    """Check if a value is NaN (handles non-float types)."""
-    try:
-        return math.isnan(float(value))
-    except (TypeError, ValueError):
-        return False
+def _response_values(stim_response_doc: ndi_document, num_presentations: int) -> np.ndarray:
+    """Return control-subtracted complex responses, NaN-padded to length."""
+    responses = stim_response_doc.document_properties.get("stimulus_response_scalar", {}).get(
+        "responses", {}
+    )
+
+    def column(name: str, fill: float) -> np.ndarray:
+        out = np.full(num_presentations, fill, dtype=np.float64)
+        vals = np.asarray(responses.get(name, []), dtype=np.float64).ravel()[:num_presentations]
+        out[: vals.size] = vals
+        return out
+
+    r = column("response_real", np.nan) + 1j * column("response_imaginary", 0.0)
+    c_real = column("control_response_real", np.nan)
+    c = np.where(np.isnan(c_real), 0.0, c_real) + 1j * column("control_response_imaginary", 0.0)
+    return r - c
+
+
+def _group_responses(
+    values: np.ndarray,
+    stim_index: np.ndarray,
+    num_stimuli: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Group (documents, presentations) responses by stimulus.
+
+    Returns ``(mean, stderr, count)``, each of shape (documents,
+    num_stimuli). NaN responses and presentations with a negative
+    stimulus index are ignored.
+    """
+    num_docs = values.shape[0]
+    size = num_docs * num_stimuli
+    valid = ~np.isnan(values) & (stim_index >= 0)[np.newaxis, :]
+    rows = np.broadcast_to(np.arange(num_docs)[:, np.newaxis], values.shape)
+    flat = (rows * num_stimuli + stim_index[np.newaxis, :])[valid]
+    v = values[valid]
+
+    count = np.bincount(flat, minlength=size).astype(np.float64)
+    total = np.bincount(flat, weights=v.real, minlength=size) + 1j * np.bincount(
+        flat, weights=v.imag, minlength=size
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = total / count
+        sq = np.bincount(flat, weights=np.abs(v - mean[flat]) ** 2, minlength=size)
+        stderr = np.sqrt(sq / (count - 1)) / np.sqrt(count)
+    mean[count == 0] = complex(np.nan, np.nan)
+    stderr[count < 2] = np.nan
+    shape = (num_docs, num_stimuli)
+    return mean.reshape(shape), stderr.reshape(shape), count.astype(np.int64).reshape(shape)
+
+
+def _unique_property_values(stimuli: list[dict], prop: str) -> list[Any]:
+    """Unique values of *prop* over stimuli, in first-seen order.
+
+    Values are compared with ``==`` as in :func:`_value_in_list`, so 1,
+    1.0 and True are one value. Hashable values are looked up in a set;
+    unhashable ones (lists, dicts) fall back to a scan of the values
+    seen so far.
+    """
+    pva: list[Any] = []
+    seen: set = set()
+    for stim in stimuli:
+        params = stim.get("parameters", {})
+        if prop not in params:
+            continue
+        val = params[prop]
+        try:
+            if val in seen:
+                continue
+            seen.add(val)
+        except TypeError:
+            if _value_in_list(val, pva):
+                continue
+        pva.append(val)
+    return pva
 
 
 def _value_in_list(val: Any, lst: list[Any]) -> bool:
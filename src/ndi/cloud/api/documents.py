@@ -429,9 +429,9 @@ def addDocumentAsFile(
 
     MATLAB equivalent: +cloud/+api/+documents/addDocumentAsFile.m
     """
-    import json
     from pathlib import Path
 
-    content = Path(file_path).read_text(encoding="utf-8")
-    doc_json = json.loads(content)
+    from ndi.util import json_codec
+
+    doc_json = json_codec.loads(Path(file_path).read_bytes())
     return addDocument(dataset_id, doc_json, client=client)
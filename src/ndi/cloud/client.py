@@ -11,7 +11,6 @@ MATLAB equivalent: ndi.cloud.api.url(), +implementation classes.
 from __future__ import annotations
 
 import functools
-import json
 import re
 from typing import Any
 from urllib.parse import quote as _url_quote
@@ -299,9 +298,9 @@ class CloudClient:
         if not resp.content:
             return None
         try:
-            from ndi.util import rehydrateJSONNanNull
+            from ndi.util import json_codec
 
-            return json.loads(rehydrateJSONNanNull(resp.text))
+            return json_codec.loads(resp.text, rehydrate_nan=True)
         except Exception:
             return resp.text
 
@@ -6,14 +6,13 @@ MATLAB equivalents: +ndi/+cloud/+download/*.m
 
 from __future__ import annotations
 
-import json
 import logging
 import warnings
 from collections.abc import Callable
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from ndi.util import rehydrateJSONNanNull
+from ndi.util import json_codec
 
 if TYPE_CHECKING:
     from .client import CloudClient
@@ -61,9 +60,7 @@ def _download_chunk_zip(
                 all_docs: list[dict[str, Any]] = []
                 for name in zf.namelist():
                     if name.endswith(".json"):
-                        raw_text = zf.read(name).decode("utf-8")
-                        raw_text = rehydrateJSONNanNull(raw_text)
-                        data = json.loads(raw_text)
+                        data = json_codec.loads(zf.read(name), rehydrate_nan=True)
                         docs = data if isinstance(data, list) else [data]
                         all_docs.extend(docs)
                 return all_docs
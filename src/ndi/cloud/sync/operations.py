@@ -9,11 +9,12 @@ MATLAB equivalents: +ndi/+cloud/+sync/*.m
 
 from __future__ import annotations
 
-import json
 import logging
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+from ndi.util import json_codec
+
 from ..exceptions import CloudSyncError
 from .index import SyncIndex
 from .mode import SyncMode, SyncOptions
@@ -43,7 +44,7 @@ def _save_downloaded_docs(
         ndi_id = doc.get("ndiId", doc.get("id", ""))
         if not ndi_id:
             continue
-        (doc_dir / f"{ndi_id}.json").write_text(json.dumps(doc, indent=2), encoding="utf-8")
+        json_codec.dump(doc, doc_dir / f"{ndi_id}.json", indent=2)
         saved.append(ndi_id)
     return saved
 
@@ -293,7 +294,7 @@ def mirrorToRemote(
                 for doc_id in report["uploaded"]:
                     doc_file = doc_dir / f"{doc_id}.json"
                     if doc_file.exists():
-                        doc_dicts.append(json.loads(doc_file.read_text(encoding="utf-8")))
+                        doc_dicts.append(json_codec.loads(doc_file.read_bytes()))
                 if doc_dicts:
                     uploadFilesForDatasetDocuments(
                         client.config.org_id,
@@ -9,12 +9,13 @@ MATLAB equivalents: +ndi/+cloud/+upload/*.m, uploadSingleFile.m
 
 from __future__ import annotations
 
-import json
 import tempfile
 import zipfile
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+from ndi.util import json_codec
+
 from .client import _auto_client
 
 if TYPE_CHECKING:
@@ -114,7 +115,7 @@ def zipForUpload(
         for i, doc in enumerate(documents):
             doc_id = doc.get("ndiId", doc.get("id", f"doc_{i}"))
             filename = f"{doc_id}.json"
-            zf.writestr(filename, json.dumps(doc, indent=2))
+            zf.writestr(filename, json_codec.dumpb(doc, indent=2))
             manifest.append(doc_id)
 
     return zip_path, manifest
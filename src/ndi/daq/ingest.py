@@ -0,0 +1,521 @@
+"""
+ndi.daq.ingest - Streaming ingestion of multi-function DAQ epochs.
+
+Python-specific: no MATLAB equivalent. Produces the same
+``daqreader_mfdaq_epochdata_ingested`` documents as MATLAB's
+``ndi.daq.reader.mfdaq/ingest_epochfiles``: a ``channel_list.bin`` channel
+table, one ``<prefix>_group<g>_seg.nbf_<s>`` file per channel group and
+segment compressed with ``ndicompress``, and an ``evmktx_group1_seg.nbf_1``
+file holding the epoch's events, markers and text.
+
+Each epoch is read through its reader one segment of one channel group at
+a time, so memory use is bounded by the largest group segment rather than
+by the length of the recording. :func:`ingest_epochs` runs several epochs
+in a process pool sized to a memory budget and reports the throughput.
+
+Readers built on ``ndi_daq_reader_mfdaq`` stream by default, through
+``ndi_daq_reader_mfdaq.ingest_epochfiles`` or :func:`ingest_epochs`;
+``ingest_epochs(..., stream=False)`` records only the epoch table.
+"""
+
+from __future__ import annotations
+
+import copy
+import functools
+import math
+import pickle
+import tempfile
+import time
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ..file.type.mfdaq_epoch_channel import ChannelInfo, ndi_file_type_mfdaq__epoch__channel
+from .mfdaq import standardize_channel_type
+
+# Default samples per segment file (document schema default)
+DEFAULT_SAMPLE_SEGMENT = 1_000_000
+
+# The document's file_list names groups 1 to 10 of each channel type
+MAX_GROUPS = 10
+
+# Channels per group before a new group is started
+ANALOG_CHANNELS_PER_GROUP = 400
+DIGITAL_CHANNELS_PER_GROUP = 512
+
+# Default memory budget shared by the workers of ingest_epochs (bytes)
+DEFAULT_MAX_MEMORY = 2 * 1024**3
+
+_KIND = {
+    "analog_in": "ephys",
+    "analog_out": "ephys",
+    "auxiliary_in": "ephys",
+    "auxiliary_out": "ephys",
+    "digital_in": "digital",
+    "digital_out": "digital",
+    "time": "time",
+    "event": "eventmarktext",
+    "marker": "eventmarktext",
+    "text": "eventmarktext",
+}
+
+_PREFIX = {
+    "analog_in": "ai",
+    "analog_out": "ao",
+    "auxiliary_in": "ax",
+    "auxiliary_out": "ax",
+    "digital_in": "di",
+    "digital_out": "do",
+    "time": "ti",
+}
+
+
+@dataclass
+class IngestReport:
+    """Throughput of an ingestion run.
+
+    Attributes:
+        epochs: Number of epochs ingested.
+        samples: Number of channel samples read.
+        bytes_read: Bytes of sample data read from the readers.
+        bytes_written: Bytes of compressed files written.
+        seconds: Wall-clock duration of the run.
+        workers: Number of epochs ingested concurrently.
+    """
+
+    epochs: int = 0
+    samples: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    seconds: float = 0.0
+    workers: int = 1
+
+    @property
+    def megabytes_per_second(self) -> float:
+        """Sample data read per second of wall-clock time, in MB/s."""
+        return self.bytes_read / 1e6 / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def compression_ratio(self) -> float:
+        """Compressed size as a fraction of the sample data read."""
+        return self.bytes_written / self.bytes_read if self.bytes_read else 0.0
+
+    def add(self, result: dict[str, Any]) -> None:
+        """Accumulate the statistics of one :func:`ingest_epoch` result."""
+        self.epochs += 1
+        self.samples += result["samples"]
+        self.bytes_read += result["bytes_read"]
+        self.bytes_written += result["bytes_written"]
+
+    def __str__(self) -> str:
+        return (
+            f"ingested {self.epochs} epoch(s), {self.samples} samples "
+            f"({self.bytes_read / 1e6:.1f} MB) in {self.seconds:.2f} s with "
+            f"{self.workers} worker(s): {self.megabytes_per_second:.1f} MB/s, "
+            f"compressed to {self.compression_ratio:.1%}"
+        )
+
+
+def segment_parameters(parameters: dict[str, Any] | None = None) -> dict[str, int]:
+    """Return the segment parameters of an ingested document.
+
+    Args:
+        parameters: Overrides of ``sample_analog_segment`` and
+            ``sample_digital_segment``.
+
+    Returns:
+        Dict with both keys, suitable for
+        ``daqreader_mfdaq_epochdata_ingested.parameters``.
+    """
+    params = {
+        "sample_analog_segment": DEFAULT_SAMPLE_SEGMENT,
+        "sample_digital_segment": DEFAULT_SAMPLE_SEGMENT,
+    }
+    params.update(parameters or {})
+    return {key: int(value) for key, value in params.items()}
+
+
+def _field(channel: Any, name: str, default: Any = None) -> Any:
+    if isinstance(channel, dict):
+        return channel.get(name, default)
+    return getattr(channel, name, default)
+
+
+def assign_channel_groups(
+    channels: Iterable[Any],
+    analog_per_group: int = ANALOG_CHANNELS_PER_GROUP,
+    digital_per_group: int = DIGITAL_CHANNELS_PER_GROUP,
+) -> list[ChannelInfo]:
+    """Assign the channels of an epoch to compression groups.
+
+    Channels of each type are numbered into groups in order. A group is
+    closed when it is full or when the sample rate changes, so every group
+    can be stored as one samples-by-channels array. Events, markers and
+    text all go to group 1.
+
+    Args:
+        channels: Channels as returned by ``getchannelsepoch`` (objects or
+            dicts with ``name``, ``type``, ``number``, ...).
+        analog_per_group: Channels per analog and time group.
+        digital_per_group: Channels per digital group.
+
+    Returns:
+        List of ``ChannelInfo`` in the input order with ``group`` and
+        ``dataclass`` set.
+
+    Raises:
+        ValueError: If a channel type cannot be ingested or needs more than
+            :data:`MAX_GROUPS` groups.
+    """
+    channels = list(channels)
+    counts: dict[str, int] = {}
+    for ch in channels:
+        ct = standardize_channel_type(_field(ch, "type", ""))
+        counts[ct] = counts.get(ct, 0) + 1
+
+    state: dict[str, list] = {}  # type -> [group, count in group, sample rate]
+    out = []
+    for ch in channels:
+        ct = standardize_channel_type(_field(ch, "type", ""))
+        kind = _KIND.get(ct)
+        if kind is None:
+            raise ValueError(f"Cannot ingest channels of type {ct!r}")
+        sr = _field(ch, "sample_rate")
+        if kind == "eventmarktext":
+            group = 1
+        else:
+            limit = digital_per_group if kind == "digital" else analog_per_group
+            # Grow the groups rather than exceed the document's file_list
+            limit = max(limit, math.ceil(counts[ct] / MAX_GROUPS))
+            group, count, rate = state.get(ct, [1, 0, sr])
+            if count == limit or (count and sr != rate):
+                group, count = group + 1, 0
+            if group > MAX_GROUPS:
+                raise ValueError(
+                    f"Channels of type {ct!r} need more than {MAX_GROUPS} groups; "
+                    "they have too many distinct sample rates"
+                )
+            state[ct] = [group, count + 1, sr]
+        out.append(
+            ChannelInfo(
+                name=_field(ch, "name", "") or "",
+                type=ct,
+                time_channel=_field(ch, "time_channel") or 1,
+                sample_rate=float(sr) if sr is not None else 0.0,
+                offset=float(_field(ch, "offset", 0.0) or 0.0),
+                scale=float(_field(ch, "scale", 1.0) or 1.0),
+                number=int(_field(ch, "number", 0) or 0),
+                group=group,
+                dataclass=kind,
+            )
+        )
+    return out
+
+
+def _epoch_channels(reader: Any, epochfiles: list[str]) -> list[ChannelInfo]:
+    """Return the grouped channels of an epoch with rates and scaling filled in."""
+    channels = assign_channel_groups(reader.getchannelsepoch(epochfiles))
+    missing_rate = False
+    for ct in dict.fromkeys(ch.type for ch in channels):
+        typed = [ch for ch in channels if ch.type == ct]
+        numbers = [ch.number for ch in typed]
+        if _KIND[ct] != "eventmarktext" and any(not ch.sample_rate for ch in typed):
+            missing_rate = True
+            rates = np.atleast_1d(reader.samplerate(epochfiles, [ct] * len(numbers), numbers))
+            for ch, sr in zip(typed, rates):
+                ch.sample_rate = ch.sample_rate or float(sr)
+        try:
+            _, poly, _ = reader.underlying_datatype(epochfiles, ct, numbers)
+        except ValueError:
+            continue
+        for ch, (offset, scale) in zip(typed, np.atleast_2d(poly)):
+            ch.offset, ch.scale = float(offset), float(scale)
+    # Groups must not mix the sample rates filled in above
+    return assign_channel_groups(channels) if missing_rate else channels
+
+
+def _groups(channels: list[ChannelInfo]) -> dict[tuple[str, int], list[ChannelInfo]]:
+    groups: dict[tuple[str, int], list[ChannelInfo]] = {}
+    for ch in channels:
+        if ch.dataclass != "eventmarktext":
+            groups.setdefault((ch.type, ch.group), []).append(ch)
+    return groups
+
+
+def _segment_length(kind: str, parameters: dict[str, int]) -> int:
+    key = "sample_digital_segment" if kind == "digital" else "sample_analog_segment"
+    return parameters[key]
+
+
+def peak_memory(reader: Any, epochfiles: list[str], parameters: dict | None = None) -> int:
+    """Estimate the peak memory of ingesting one epoch, in bytes.
+
+    The estimate is the largest segment of one channel group held twice
+    (as read and as converted for compression) in double precision.
+    """
+    parameters = segment_parameters(parameters)
+    groups = _groups(assign_channel_groups(reader.getchannelsepoch(epochfiles)))
+    return max(
+        (
+            2 * 8 * len(chans) * _segment_length(_KIND[ct], parameters)
+            for (ct, _), chans in groups.items()
+        ),
+        default=0,
+    )
+
+
+def _compressed_file(base: Path, written: Any = None) -> str:
+    """Return the file ndicompress wrote for ``base``.
+
+    ``written`` is the return value of the ``compress_*`` call; it is used
+    when it names an existing file.
+    """
+    if isinstance(written, (str, Path)) and Path(written).is_file():
+        return str(written)
+    for suffix in (".nbf.tgz", ".tgz", ".nbf", ""):
+        candidate = Path(str(base) + suffix)
+        if candidate.is_file():
+            return str(candidate)
+    raise FileNotFoundError(f"ndicompress did not write a file for {base}")
+
+
+def ingest_epoch(
+    reader: Any,
+    epochfiles: list[str],
+    epoch_id: str,
+    directory: str | Path,
+    parameters: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Read one epoch through a reader and write its compressed files.
+
+    Every channel group is read ``sample_*_segment`` samples at a time with
+    ``readchannels_epochsamples``, converted to its underlying values, and
+    written with ``ndicompress.compress_ephys``, ``compress_digital`` or
+    ``compress_time``. Events, markers and text are read with
+    ``readevents_epochsamples_native`` and written with
+    ``ndicompress.compress_eventmarktext``.
+
+    Args:
+        reader: An ``ndi_daq_reader_mfdaq``.
+        epochfiles: The epoch's files.
+        epoch_id: The epoch's ID.
+        directory: Directory to write the files into.
+        parameters: Segment parameters, see :func:`segment_parameters`.
+
+    Returns:
+        Dict with ``epoch_id``, ``epochtable``, ``parameters``, ``files``
+        (document file name -> path), ``samples``, ``bytes_read`` and
+        ``bytes_written``; pass it to :func:`ingested_document`.
+    """
+    import ndicompress
+
+    parameters = segment_parameters(parameters)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    epochtable = reader._ingested_epochtable(epochfiles)
+    t0, t1 = reader.t0_t1(epochfiles)[0]
+    channels = _epoch_channels(reader, epochfiles)
+
+    files: dict[str, str] = {}
+    mec = ndi_file_type_mfdaq__epoch__channel(channels)
+    b, msg = mec.writeToFile(str(directory / "channel_list.bin"))
+    if not b:
+        raise OSError(f"Could not write channel_list.bin: {msg}")
+    files["channel_list.bin"] = str(directory / "channel_list.bin")
+
+    samples = bytes_read = 0
+    n_samples: dict[tuple[str, float], int] = {}
+    for (ct, group), chans in _groups(channels).items():
+        kind = _KIND[ct]
+        numbers = [ch.number for ch in chans]
+        key = (ct, chans[0].sample_rate)
+        if key not in n_samples:
+            if not (np.isfinite(t0) and np.isfinite(t1)):
+                raise ValueError(f"Cannot ingest epoch {epoch_id}: its t0_t1 is not finite")
+            last = reader.epochtimes2samples(ct, numbers[0], epochfiles, np.array([t1]))
+            n_samples[key] = int(np.asarray(last).ravel()[0]) + 1
+        offset = np.array([ch.offset for ch in chans])
+        scale = np.array([ch.scale for ch in chans])
+        dtype = None
+        if kind == "digital":
+            dtype = reader.underlying_datatype(epochfiles, ct, numbers)[0]
+        compress = getattr(ndicompress, f"compress_{kind}")
+
+        seg_len = _segment_length(kind, parameters)
+        for seg, s0 in enumerate(range(0, n_samples[key], seg_len), start=1):
+            s1 = min(s0 + seg_len, n_samples[key]) - 1
+            # Readers take 1-based sample numbers
+            data = np.asarray(
+                reader.readchannels_epochsamples(
+                    [ct] * len(numbers), numbers, epochfiles, s0 + 1, s1 + 1
+                ),
+                dtype=float,
+            )
+            if data.ndim == 1:
+                data = data[:, None]
+            samples += data.size
+            bytes_read += data.nbytes
+            # The ingested reader applies (underlying - offset) * scale
+            data = data / scale + offset
+            if dtype is not None:
+                data = data.astype(dtype)
+            base = directory / f"{_PREFIX[ct]}_group{group}_seg_{seg}"
+            written = compress(data, str(base))
+            files[f"{_PREFIX[ct]}_group{group}_seg.nbf_{seg}"] = _compressed_file(base, written)
+            del data
+
+    events = [ch for ch in channels if ch.dataclass == "eventmarktext"]
+    if events:
+        types = [ch.type for ch in events]
+        numbers = [ch.number for ch in events]
+        T, D = reader.readevents_epochsamples_native(types, numbers, epochfiles, t0, t1)
+        if len(numbers) == 1 and not isinstance(T, list):
+            T, D = [T], [D]
+        if len(T):
+            base = directory / "evmktx_group1_seg_1"
+            written = ndicompress.compress_eventmarktext(types, numbers, T, D, str(base))
+            files["evmktx_group1_seg.nbf_1"] = _compressed_file(base, written)
+            samples += sum(np.size(t) for t in T)
+            bytes_read += sum(np.asarray(t).nbytes for t in T)
+
+    return {
+        "epoch_id": epoch_id,
+        "epochtable": epochtable,
+        "parameters": parameters,
+        "files": files,
+        "samples": samples,
+        "bytes_read": bytes_read,
+        "bytes_written": sum(Path(p).stat().st_size for p in files.values()),
+    }
+
+
+def ingested_document(reader: Any, result: dict[str, Any]) -> Any:
+    """Build the ``daqreader_mfdaq_epochdata_ingested`` document of an epoch.
+
+    The compressed files are attached with ``ingest=True`` and
+    ``delete_original=True``, so adding the document to a session moves
+    them into the session's database.
+
+    Args:
+        reader: The reader that produced ``result``.
+        result: The return value of :func:`ingest_epoch`.
+
+    Returns:
+        The new ``ndi_document`` (not added to any database).
+    """
+    from ..document import ndi_document
+
+    doc = ndi_document(
+        "ingestion/daqreader_mfdaq_epochdata_ingested",
+        daqreader_epochdata_ingested={"epochtable": result["epochtable"]},
+        daqreader_mfdaq_epochdata_ingested={"parameters": result["parameters"]},
+        epochid={"epochid": result["epoch_id"]},
+    )
+    doc.set_dependency_value("daqreader_id", reader.id)
+    for name, path in result["files"].items():
+        doc.add_file(name, path, ingest=True, delete_original=True)
+    return doc
+
+
+def _streams(reader: Any) -> bool:
+    """True if the reader ingests through :func:`ingest_epoch`."""
+    from .mfdaq import ndi_daq_reader_mfdaq
+
+    return (
+        isinstance(reader, ndi_daq_reader_mfdaq)
+        and type(reader).ingest_epochfiles is ndi_daq_reader_mfdaq.ingest_epochfiles
+    )
+
+
+def ingest_epochs(
+    reader: Any,
+    epochs: Iterable[tuple[list[str], str]],
+    directory: str | Path | None = None,
+    max_workers: int = 1,
+    max_memory: int = DEFAULT_MAX_MEMORY,
+    parameters: dict[str, Any] | None = None,
+    stream: bool = True,
+) -> tuple[list[Any], IngestReport]:
+    """Ingest several epochs of one reader, optionally in parallel.
+
+    Epochs of multi-function DAQ readers are streamed through
+    :func:`ingest_epoch`. With ``max_workers > 1`` they run in a process
+    pool (a thread pool if the reader cannot be pickled) whose size is
+    reduced until the workers' combined :func:`peak_memory` fits in
+    ``max_memory``. Readers that override ``ingest_epochfiles`` are
+    ingested serially with their own method. ``stream=False`` gives
+    multi-function DAQ readers the epochtable-only document of
+    ``ndi_daq_reader.ingest_epochfiles`` instead.
+
+    Args:
+        reader: The DAQ reader.
+        epochs: ``(epochfiles, epoch_id)`` pairs.
+        directory: Directory for the compressed files; a new temporary
+            directory by default.
+        max_workers: Maximum number of epochs ingested concurrently.
+        max_memory: Memory budget of the concurrent workers, in bytes.
+        parameters: Segment parameters, see :func:`segment_parameters`.
+        stream: Write the sample data to compressed segment files;
+            False records only the epoch table.
+
+    Returns:
+        Tuple of (documents in epoch order, :class:`IngestReport`).
+    """
+    start = time.perf_counter()
+    epochs = list(epochs)
+    report = IngestReport()
+
+    if not (stream and _streams(reader)):
+        ingest_one = reader.ingest_epochfiles
+        if _streams(reader):
+            from .reader_base import ndi_daq_reader
+
+            ingest_one = functools.partial(ndi_daq_reader.ingest_epochfiles, reader)
+        docs = []
+        for epochfiles, epoch_id in epochs:
+            d = ingest_one(epochfiles, epoch_id)
+            docs.extend(d if isinstance(d, list) else [d])
+        report.epochs = len(epochs)
+        report.seconds = time.perf_counter() - start
+        return docs, report
+
+    parameters = segment_parameters(parameters)
+    directory = Path(directory or tempfile.mkdtemp(prefix="ndi_ingest_"))
+    jobs = [
+        (epochfiles, epoch_id, directory / f"epoch{i + 1}", parameters)
+        for i, (epochfiles, epoch_id) in enumerate(epochs)
+    ]
+
+    workers = max(1, min(max_workers, len(jobs)))
+    if workers > 1:
+        peak = max(peak_memory(reader, job[0], parameters) for job in jobs)
+        workers = max(1, min(workers, max_memory // max(peak, 1)))
+
+    if workers == 1:
+        results = [ingest_epoch(reader, *job) for job in jobs]
+    else:
+        # Workers read the raw files only; leave the session behind
+        worker_reader = copy.copy(reader)
+        worker_reader._session = None
+        try:
+            pickle.dumps(worker_reader)
+            executor = ProcessPoolExecutor(max_workers=workers)
+        except Exception:
+            worker_reader = reader
+            executor = ThreadPoolExecutor(max_workers=workers)
+        with executor:
+            futures = [executor.submit(ingest_epoch, worker_reader, *job) for job in jobs]
+            results = [f.result() for f in futures]
+
+    docs = []
+    for result in results:
+        docs.append(ingested_document(reader, result))
+        report.add(result)
+    report.workers = workers
+    report.seconds = time.perf_counter() - start
+    return docs, report
@@ -7,7 +7,13 @@ multi-function data acquisition systems that sample various data types.
 
 from __future__ import annotations
 
+import contextlib
+import hashlib
+import math
+import os
+import threading
 from abc import abstractmethod
+from collections.abc import Callable
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any
@@ -16,7 +22,13 @@ import numpy as np
 
 from ..time import DEV_LOCAL_TIME, ndi_time_clocktype
 from .daqsystemstring import ndi_daq_daqsystemstring
-from .reader_base import ndi_daq_reader
+from .reader_base import _epochfiles_stamp, _session_ndi_file, ndi_daq_reader
+
+# Samples read per block when deriving analog events (aep/aen/aimp/aimn)
+ANALOG_EVENT_BLOCK = 1_000_000
+
+# Derived analog events cached in a session's .ndi directory
+ANALOG_EVENT_CACHE_DIR = "analog_event_cache"
 
 
 class ChannelType(Enum):
@@ -126,6 +138,123 @@ def standardize_channel_types(channel_types: list[str]) -> list[str]:
     return [standardize_channel_type(ct) for ct in channel_types]
 
 
+def _native_threshold(dtype: np.dtype, value: float) -> Any:
+    """Threshold to compare samples of *dtype* against without converting them.
+
+    An integer sample ``x`` satisfies ``x >= value`` exactly when
+    ``x >= ceil(value)``, so integer blocks are compared in their own dtype.
+    """
+    if np.issubdtype(dtype, np.integer) and math.isfinite(value):
+        bound = math.ceil(value)
+        info = np.iinfo(dtype)
+        if info.min <= bound <= info.max:
+            return dtype.type(bound)
+    return value
+
+
+def threshold_crossings(
+    read_block: Callable[[int, int], np.ndarray],
+    s0: int,
+    s1: int,
+    threshold: float,
+    hysteresis: float = 0.0,
+    block_size: int = ANALOG_EVENT_BLOCK,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Find threshold crossings of a channel read in fixed-size blocks.
+
+    Python-specific: no MATLAB equivalent.
+
+    The signal goes high when it reaches ``threshold`` and low again when
+    it falls below ``threshold - hysteresis``; samples in between keep the
+    previous level, which is carried across block boundaries. With no
+    hysteresis this marks the same samples as comparing each pair of
+    consecutive samples of the whole trace. Blocks are compared in the
+    dtype the reader returns, so integer data is never converted to float.
+
+    Args:
+        read_block: Callable ``(a, b)`` returning the samples ``a`` to
+            ``b`` (inclusive) of the channel
+        s0: First sample to examine
+        s1: Last sample to examine
+        threshold: Level of the upward crossings
+        hysteresis: Distance below ``threshold`` of the downward crossings
+        block_size: Number of samples read at a time
+
+    Returns:
+        Tuple of (rising, falling) sample numbers, the first sample at
+        the new level of each upward and downward crossing
+    """
+    rising: list[np.ndarray] = []
+    falling: list[np.ndarray] = []
+    state: bool | None = None
+    for a in range(s0, s1 + 1, block_size):
+        x = np.asarray(read_block(a, min(a + block_size - 1, s1))).ravel()
+        if x.size == 0:
+            continue
+        high = x >= _native_threshold(x.dtype, threshold)
+        low = x < _native_threshold(x.dtype, threshold - hysteresis)
+        if state is None:
+            state = bool(high[0])
+        # each sample takes the level of the last sample outside the dead band
+        decided = np.where(high | low, np.arange(x.size), -1)
+        np.maximum.accumulate(decided, out=decided)
+        level = np.where(decided >= 0, high[decided], state)
+        previous = np.concatenate(([state], level[:-1]))
+        change = np.flatnonzero(level != previous)
+        rising.append(a + change[level[change]])
+        falling.append(a + change[~level[change]])
+        state = bool(level[-1])
+    empty = np.array([], dtype=int)
+    return (
+        np.concatenate(rising) if rising else empty,
+        np.concatenate(falling) if falling else empty,
+    )
+
+
+def _sample_times(
+    read_block: Callable[[int, int], np.ndarray],
+    samples: np.ndarray,
+    s0: int,
+    s1: int,
+    block_size: int,
+) -> np.ndarray:
+    """Time-channel values at *samples*, reading only the blocks that hold them."""
+    times = np.full(len(samples), np.nan)
+    blocks = (samples - s0) // block_size
+    for block in np.unique(blocks):
+        a = s0 + int(block) * block_size
+        t = np.asarray(read_block(a, min(a + block_size - 1, s1))).ravel()
+        here = np.flatnonzero(blocks == block)
+        offsets = samples[here] - a
+        valid = offsets < t.size
+        times[here[valid]] = t[offsets[valid]]
+    return times
+
+
+def _load_analog_events(path: str) -> tuple[np.ndarray, np.ndarray] | None:
+    """Read cached analog events; a missing or unreadable entry is a miss."""
+    try:
+        with np.load(path) as saved:
+            return saved["timestamps"], saved["data"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _save_analog_events(path: str, timestamps: np.ndarray, data: np.ndarray) -> None:
+    """Write analog events to the cache atomically."""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            np.savez(f, timestamps=timestamps, data=data)
+        os.replace(tmp_path, path)
+    except OSError:
+        # the cache is only an accelerator; failing to save it is harmless
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+
+
 class ndi_daq_reader_mfdaq(ndi_daq_reader):
     """
     Multi-function DAQ reader for various data types.
@@ -172,6 +301,12 @@ class ndi_daq_reader_mfdaq(ndi_daq_reader):
     ]
     CHANNEL_ABBREVS = ["ai", "ao", "ax", "di", "do", "e", "mk", "tx", "t"]
 
+    # Analog events (aep/aen/aimp/aimn): samples per block, detector
+    # hysteresis in channel units, and whether to persist the results
+    analog_event_block: int = ANALOG_EVENT_BLOCK
+    analog_event_hysteresis: float = 0.0
+    analog_event_cache: bool = True
+
     def __init__(
         self,
         identifier: str | None = None,
@@ -400,7 +535,46 @@ class ndi_daq_reader_mfdaq(ndi_daq_reader):
         t1: float,
     ) -> tuple[list[np.ndarray] | np.ndarray, list[np.ndarray] | np.ndarray]:
         """Read events derived from analog channels via threshold crossing."""
+
+        def sample_range(ch: int) -> tuple[int, int]:
+            sd = self.epochtimes2samples(["ai"], [ch], epochfiles, np.array([t0, t1]))
+            return int(sd[0]), int(sd[1])
+
+        def read(ct: str, ch: int, s0: int, s1: int) -> np.ndarray:
+            return self.readchannels_epochsamples(ct, [ch], epochfiles, s0, s1)
+
+        return self._threshold_events(
+            channeltype,
+            channel,
+            sample_range,
+            read,
+            _epochfiles_stamp(epochfiles),
+            self._session,
+        )
+
+    def _threshold_events(
+        self,
+        channeltype: list[str],
+        channel: list[int],
+        sample_range: Callable[[int], tuple[int, int]],
+        read: Callable[[str, int, int, int], np.ndarray],
+        epoch_stamp: str | None,
+        session: Any,
+    ) -> tuple[list[np.ndarray] | np.ndarray, list[np.ndarray] | np.ndarray]:
+        """
+        Derive analog events of each channel, streaming its samples in blocks.
+
+        Args:
+            channeltype: Analog event type of each channel (e.g. ``'aep_t2.5'``)
+            channel: Channel numbers
+            sample_range: Callable returning the (s0, s1) samples of a channel
+            read: Callable ``(channeltype, channel, s0, s1)`` returning samples
+            epoch_stamp: Key of the epoch's data, or None to skip the cache
+            session: Session whose .ndi directory holds the event cache
+        """
         _, base_types, thresholds = ndi_daq_reader_mfdaq.is_analog_event_type(channeltype)
+        cache_dir = self._analog_event_cache_dir(session) if epoch_stamp is not None else None
+        block = int(self.analog_event_block)
 
         timestamps = []
         data = []
@@ -408,47 +582,49 @@ class ndi_daq_reader_mfdaq(ndi_daq_reader):
         for i, ch in enumerate(channel):
             bt = base_types[i]
             thresh = thresholds[i]
+            s0, s1 = sample_range(ch)
 
-            # Get sample range for time window from analog input
-            sd = self.epochtimes2samples(["ai"], [ch], epochfiles, np.array([t0, t1]))
-            s0, s1 = int(sd[0]), int(sd[1])
-
-            # Read analog and time data
-            ai_data = self.readchannels_epochsamples("ai", [ch], epochfiles, s0, s1)
-            time_data = self.readchannels_epochsamples("time", [ch], epochfiles, s0, s1)
-
-            ai_data = ai_data.flatten()
-            time_data = time_data.flatten()
-
-            below = ai_data[:-1] < thresh
-            above = ai_data[1:] >= thresh
-
+            cache_path = None
+            if cache_dir is not None:
+                key = (
+                    f"{self.id}\0{epoch_stamp}\0{ch}\0{bt}\0{thresh!r}\0"
+                    f"{float(self.analog_event_hysteresis)!r}\0{s0}\0{s1}"
+                )
+                digest = hashlib.md5(key.encode()).hexdigest()
+                cache_path = os.path.join(cache_dir, f"{digest}.npz")
+                cached = _load_analog_events(cache_path)
+                if cached is not None:
+                    timestamps.append(cached[0])
+                    data.append(cached[1])
+                    continue
+
+            rising, falling = threshold_crossings(
+                lambda a, b, ch=ch: read("ai", ch, a, b),
+                s0,
+                s1,
+                thresh,
+                self.analog_event_hysteresis,
+                block,
+            )
+            empty = np.array([], dtype=int)
             if bt in ("aep", "aimp"):
                 # Below-to-above threshold crossings
-                on_samples = 1 + np.where(below & above)[0]
-                off_samples = (
-                    1 + np.where(~below & ~above)[0] if bt == "aimp" else np.array([], dtype=int)
-                )
+                on_samples, off_samples = rising, falling if bt == "aimp" else empty
                 on_sign, off_sign = 1, -1
             else:  # aen, aimn
                 # Above-to-below threshold crossings
-                on_samples = 1 + np.where(~below & ~above)[0]
-                off_samples = (
-                    1 + np.where(below & above)[0] if bt == "aimn" else np.array([], dtype=int)
-                )
+                on_samples, off_samples = falling, rising if bt == "aimn" else empty
                 on_sign, off_sign = -1, 1
 
-            ts = np.concatenate(
-                [
-                    time_data[on_samples],
-                    time_data[off_samples] if len(off_samples) else np.array([]),
-                ]
+            ts = _sample_times(
+                lambda a, b, ch=ch: read("time", ch, a, b),
+                np.concatenate([on_samples, off_samples]),
+                s0,
+                s1,
+                block,
             )
             d = np.concatenate(
-                [
-                    on_sign * np.ones(len(on_samples)),
-                    off_sign * np.ones(len(off_samples)) if len(off_samples) else np.array([]),
-                ]
+                [on_sign * np.ones(len(on_samples)), off_sign * np.ones(len(off_samples))]
             )
 
             if len(off_samples) > 0:
@@ -456,6 +632,8 @@ class ndi_daq_reader_mfdaq(ndi_daq_reader):
                 ts = ts[order]
                 d = d[order]
 
+            if cache_path is not None:
+                _save_analog_events(cache_path, ts, d)
             timestamps.append(ts)
             data.append(d)
 
@@ -463,6 +641,12 @@ class ndi_daq_reader_mfdaq(ndi_daq_reader):
             return timestamps[0], data[0]
         return timestamps, data
 
+    def _analog_event_cache_dir(self, session: Any) -> str | None:
+        """Directory of the persisted analog events, if caching is possible."""
+        if not self.analog_event_cache:
+            return None
+        return _session_ndi_file(session, ANALOG_EVENT_CACHE_DIR)
+
     def readevents_epochsamples_native(
         self,
         channeltype: list[str],
@@ -689,6 +873,38 @@ class ndi_daq_reader_mfdaq(ndi_daq_reader):
     # Ingested data methods - for reading from database-stored epochs
     # =========================================================================
 
+    def ingest_epochfiles(
+        self,
+        epochfiles: list[str],
+        epoch_id: str,
+    ) -> Any:
+        """
+        Create a document holding the compressed data of an epoch.
+
+        Streams every channel through ``readchannels_epochsamples`` one
+        segment at a time and compresses it with ``ndicompress`` (see
+        :func:`ndi.daq.ingest.ingest_epoch`). The files are written to a
+        temporary directory and moved into the database when the document
+        is added to a session.
+
+        Args:
+            epochfiles: List of file paths for the epoch
+            epoch_id: Unique identifier for this epoch
+
+        Returns:
+            ``daqreader_mfdaq_epochdata_ingested`` document with the
+            channel list and compressed segment files attached
+
+        Note:
+            The returned document is not added to any database.
+        """
+        import tempfile
+
+        from .ingest import ingest_epoch, ingested_document
+
+        directory = tempfile.mkdtemp(prefix="ndi_ingest_")
+        return ingested_document(self, ingest_epoch(self, epochfiles, epoch_id, directory))
+
     def getchannelsepoch_ingested(
         self,
         epochfiles: list[str],
@@ -1052,70 +1268,23 @@ class ndi_daq_reader_mfdaq(ndi_daq_reader):
         session: Any,
     ) -> tuple[list[np.ndarray] | np.ndarray, list[np.ndarray] | np.ndarray]:
         """Read events derived from analog channels via threshold crossing (ingested)."""
-        _, base_types, thresholds = ndi_daq_reader_mfdaq.is_analog_event_type(channeltype)
-
-        timestamps = []
-        data = []
-
-        for i, ch in enumerate(channel):
-            bt = base_types[i]
-            thresh = thresholds[i]
 
+        def sample_range(ch: int) -> tuple[int, int]:
             sd = self.epochtimes2samples_ingested(
                 ["ai"], [ch], epochfiles, np.array([t0, t1]), session
             )
-            s0, s1 = int(sd[0]), int(sd[1])
-
-            ai_data = self.readchannels_epochsamples_ingested(
-                ["ai"], [ch], epochfiles, s0, s1, session
-            )
-            time_data = self.readchannels_epochsamples_ingested(
-                ["time"], [ch], epochfiles, s0, s1, session
-            )
-
-            ai_data = ai_data.flatten()
-            time_data = time_data.flatten()
-
-            below = ai_data[:-1] < thresh
-            above = ai_data[1:] >= thresh
-
-            if bt in ("aep", "aimp"):
-                on_samples = 1 + np.where(below & above)[0]
-                off_samples = (
-                    1 + np.where(~below & ~above)[0] if bt == "aimp" else np.array([], dtype=int)
-                )
-                on_sign, off_sign = 1, -1
-            else:  # aen, aimn
-                on_samples = 1 + np.where(~below & ~above)[0]
-                off_samples = (
-                    1 + np.where(below & above)[0] if bt == "aimn" else np.array([], dtype=int)
-                )
-                on_sign, off_sign = -1, 1
-
-            ts = np.concatenate(
-                [
-                    time_data[on_samples],
-                    time_data[off_samples] if len(off_samples) else np.array([]),
-                ]
-            )
-            d = np.concatenate(
-                [
-                    on_sign * np.ones(len(on_samples)),
-                    off_sign * np.ones(len(off_samples)) if len(off_samples) else np.array([]),
-                ]
-            )
+            return int(sd[0]), int(sd[1])
 
-            if len(off_samples) > 0:
-                order = np.argsort(ts)
-                ts = ts[order]
-                d = d[order]
+        def read(ct: str, ch: int, s0: int, s1: int) -> np.ndarray:
+            return self.readchannels_epochsamples_ingested([ct], [ch], epochfiles, s0, s1, session)
 
-            timestamps.append(ts)
-            data.append(d)
-
-        if len(channel) == 1:
-            return timestamps[0], data[0]
-        return timestamps, data
+        epoch_stamp = None
+        if self._analog_event_cache_dir(session) is not None:
+            # ingested data only changes with the document that holds it
+            epoch_stamp = self.getingesteddocument(epochfiles, session).id
+        return self._threshold_events(
+            channeltype, channel, sample_range, read, epoch_stamp, session
+        )
 
     def samplerate_ingested(
         self,
@@ -28,6 +28,7 @@ class ndi_daq_reader_mfdaq_blackrock(ndi_daq_reader_mfdaq):
     def __init__(self, identifier=None, session=None, document=None):
         super().__init__(identifier=identifier, session=session, document=document)
         self._ndi_daqreader_class = self.NDI_DAQREADER_CLASS
+        self._si_adapter = None
 
     def _get_si_reader(self):
         try:
@@ -37,12 +38,18 @@ class ndi_daq_reader_mfdaq_blackrock(ndi_daq_reader_mfdaq):
         except ImportError:
             return None
 
+    def _adapter(self, SI):
+        # One adapter per reader; its extractors live in the shared pool
+        if self._si_adapter is None:
+            self._si_adapter = SI()
+        return self._si_adapter
+
     def getchannelsepoch(self, epochfiles: list[str]) -> list[ChannelInfo]:
         SI = self._get_si_reader()
         if SI is None:
             return []
         try:
-            return SI().getchannelsepoch(epochfiles)
+            return self._adapter(SI).getchannelsepoch(epochfiles)
         except Exception as exc:
             logger.warning("ndi_daq_reader_mfdaq_blackrock.getchannelsepoch failed: %s", exc)
             return []
@@ -51,13 +58,21 @@ class ndi_daq_reader_mfdaq_blackrock(ndi_daq_reader_mfdaq):
         SI = self._get_si_reader()
         if SI is None:
             raise ImportError("spikeinterface required for reading Blackrock data")
-        return SI().readchannels_epochsamples(channeltype, channel, epochfiles, s0, s1)
+        return self._adapter(SI).readchannels_epochsamples(channeltype, channel, epochfiles, s0, s1)
 
     def samplerate(self, epochfiles, channeltype, channel):
         SI = self._get_si_reader()
         if SI is None:
             raise ImportError("spikeinterface required for reading Blackrock data")
-        return SI().samplerate(epochfiles, channeltype, channel)
+        return self._adapter(SI).samplerate(epochfiles, channeltype, channel)
+
+    def readevents_epochsamples_native(self, channeltype, channel, epochfiles, t0, t1):
+        SI = self._get_si_reader()
+        if SI is None:
+            raise ImportError("spikeinterface required for reading Blackrock data")
+        return self._adapter(SI).readevents_epochsamples_native(
+            channeltype, channel, epochfiles, t0, t1
+        )
 
     def __repr__(self):
         return f"ndi_daq_reader_mfdaq_blackrock(id={self.id[:8]}...)"
@@ -39,6 +39,8 @@ class ndi_daq_reader_mfdaq_intan(ndi_daq_reader_mfdaq):
 
     NDI_DAQREADER_CLASS = "ndi.daq.reader.mfdaq.intan"
     FILE_EXTENSIONS = [".rhd", ".rhs"]
+    # t0_t1 opens each epoch's own .rhd file; headers are cached per path
+    threadsafe_t0_t1 = True
 
     def __init__(
         self,
@@ -33,6 +33,8 @@ class ndi_daq_reader_mfdaq_ndr(ndi_daq_reader_mfdaq):
     """
 
     NDI_DAQREADER_CLASS = "ndi.daq.reader.mfdaq.ndr"
+    # t0_t1 makes a new NDR reader, which opens the epoch's files itself
+    threadsafe_t0_t1 = True
 
     def __init__(
         self,
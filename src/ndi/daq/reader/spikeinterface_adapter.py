@@ -14,6 +14,11 @@ Supported formats (via spikeinterface):
 
 from __future__ import annotations
 
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
@@ -34,12 +39,17 @@ except ImportError:
     se = None
 
 
-def _get_extractor_for_file(filepath: str) -> Any | None:
+# Default number of extractors kept open by the shared pool
+DEFAULT_POOL_SIZE = 16
+
+
+def _get_extractor_for_file(filepath: str, stream_id: str | None = None) -> Any | None:
     """
     Get the appropriate spikeinterface extractor for a file.
 
     Args:
         filepath: Path to the data file
+        stream_id: Stream ID for multi-stream formats (format default if None)
 
     Returns:
         SpikeInterface recording extractor or None
@@ -53,14 +63,16 @@ def _get_extractor_for_file(filepath: str) -> Any | None:
     try:
         # Intan RHD
         if suffix == ".rhd":
-            return se.read_intan(filepath, stream_id="0")
+            return se.read_intan(filepath, stream_id=stream_id or "0")
 
         # Intan RHS
         if suffix == ".rhs":
-            return se.read_intan(filepath, stream_id="0")
+            return se.read_intan(filepath, stream_id=stream_id or "0")
 
         # Blackrock
         if suffix in (".ns1", ".ns2", ".ns3", ".ns4", ".ns5", ".ns6"):
+            if stream_id is not None:
+                return se.read_blackrock(filepath, stream_id=stream_id)
             return se.read_blackrock(filepath)
 
         # Open Ephys binary
@@ -83,6 +95,278 @@ def _get_extractor_for_file(filepath: str) -> Any | None:
         return None
 
 
+def _close_extractor(recording: Any) -> None:
+    """Release the file handles held by a recording extractor, if it can."""
+    if recording is None:
+        return
+    # neo-based extractors keep the open files on their rawio reader
+    for obj in (getattr(recording, "neo_reader", None), recording):
+        close = getattr(obj, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
+
+
+class ExtractorPool:
+    """
+    Process-wide, size-bounded pool of open recording extractors.
+
+    Python-specific: no MATLAB equivalent. Opening an extractor parses the
+    file header, which can take seconds for NSx headers or SpikeGadgets
+    .rec XML, so extractors are kept open and shared by every
+    SpikeInterface-based reader. Entries are keyed by (file path,
+    modification time, stream ID): a rewritten file is opened afresh.
+    Files that no extractor can read are remembered separately, by the
+    same key, so they neither take pool slots nor are parsed again until
+    they change.
+
+    The least recently used extractor is evicted when the pool is full.
+    Readers hold an extractor for the duration of a read with
+    :meth:`use` (or :meth:`acquire` and :meth:`release`); an extractor
+    evicted while held is closed only when its last holder releases it.
+
+    Args:
+        max_size: Maximum number of extractors kept open.
+        opener: Callable ``(filepath, stream_id) -> extractor or None``;
+            ``_get_extractor_for_file`` by default.
+
+    Example:
+        >>> pool = extractor_pool()
+        >>> with pool.use('recording.ns5') as recording:
+        ...     traces = recording.get_traces(end_frame=1000)
+        >>> pool.stats()['hits']
+        0
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_POOL_SIZE,
+        opener: Callable[[str, str | None], Any] | None = None,
+    ):
+        self.max_size = max_size
+        self._opener = opener
+        self._entries: OrderedDict[tuple, Any] = OrderedDict()
+        # keys of files no extractor could read
+        self._unreadable: set[tuple] = set()
+        # key -> values derived from the extractor, dropped with it
+        self._memos: dict[tuple, dict[Any, Any]] = {}
+        # id(extractor) -> number of readers holding it
+        self._holds: dict[int, int] = {}
+        # id(extractor) -> extractor evicted while held, closed on release
+        self._retired: dict[int, Any] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(filepath: str, stream_id: str | None = None) -> tuple | None:
+        """Return the pool key of a file, or None if it does not exist."""
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return None
+        return (os.path.realpath(filepath), st.st_mtime_ns, stream_id)
+
+    def _open(self, filepath: str, stream_id: str | None) -> Any | None:
+        return (self._opener or _get_extractor_for_file)(filepath, stream_id)
+
+    def get(self, filepath: str, stream_id: str | None = None) -> Any | None:
+        """
+        Return the open extractor of a file, opening it if needed.
+
+        The extractor is not held: it may be closed as soon as it is
+        evicted. Use :meth:`use` to read from it.
+
+        Args:
+            filepath: Path to the data file
+            stream_id: Stream ID for multi-stream formats
+
+        Returns:
+            SpikeInterface recording extractor or None
+        """
+        return self._get(filepath, stream_id, hold=False)
+
+    def acquire(self, filepath: str, stream_id: str | None = None) -> Any | None:
+        """
+        Return the open extractor of a file and hold it until :meth:`release`.
+
+        Args:
+            filepath: Path to the data file
+            stream_id: Stream ID for multi-stream formats
+
+        Returns:
+            SpikeInterface recording extractor, or None (nothing to release)
+            if no extractor can read the file
+        """
+        return self._get(filepath, stream_id, hold=True)
+
+    def release(self, recording: Any) -> None:
+        """Release an extractor returned by :meth:`acquire`."""
+        if recording is None:
+            return
+        with self._lock:
+            ident = id(recording)
+            count = self._holds.get(ident, 0) - 1
+            if count > 0:
+                self._holds[ident] = count
+                return
+            self._holds.pop(ident, None)
+            retired = self._retired.pop(ident, None)
+        if retired is not None:
+            _close_extractor(retired)
+
+    @contextmanager
+    def use(self, filepath: str, stream_id: str | None = None) -> Iterator[Any | None]:
+        """
+        Hold the open extractor of a file for the duration of a ``with`` block.
+
+        Args:
+            filepath: Path to the data file
+            stream_id: Stream ID for multi-stream formats
+
+        Yields:
+            SpikeInterface recording extractor or None
+        """
+        recording = self.acquire(filepath, stream_id)
+        try:
+            yield recording
+        finally:
+            self.release(recording)
+
+    def _hold(self, recording: Any) -> None:
+        if recording is not None:
+            self._holds[id(recording)] = self._holds.get(id(recording), 0) + 1
+
+    def _get(self, filepath: str, stream_id: str | None, hold: bool) -> Any | None:
+        key = self.key(filepath, stream_id)
+        if key is None:
+            return None
+        with self._lock:
+            if key in self._unreadable:
+                self.hits += 1
+                return None
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                recording = self._entries[key]
+                if hold:
+                    self._hold(recording)
+                return recording
+            self.misses += 1
+
+        # Parse the header outside the lock so other files can be served
+        recording = self._open(filepath, stream_id)
+
+        with self._lock:
+            if key in self._entries:
+                # Opened concurrently by another thread
+                if self._entries[key] is not recording:
+                    _close_extractor(recording)
+                recording = self._entries[key]
+                if hold:
+                    self._hold(recording)
+                return recording
+            same_file = [k for k in self._entries if k[0] == key[0] and k[2] == key[2]]
+            for old in same_file:
+                self._evict(old)  # an older version of the same file
+            self._unreadable = {
+                k for k in self._unreadable if not (k[0] == key[0] and k[2] == key[2])
+            }
+            if recording is None:
+                self._unreadable.add(key)
+                return None
+            self._entries[key] = recording
+            if hold:
+                self._hold(recording)
+            while len(self._entries) > max(self.max_size, 0):
+                self._evict(next(iter(self._entries)))
+        return recording
+
+    def memo(
+        self,
+        filepath: str,
+        stream_id: str | None,
+        name: Any,
+        compute: Callable[[], Any],
+    ) -> Any:
+        """
+        Return a value derived from a file's extractor, computing it once.
+
+        The value is kept for as long as the file's extractor stays in the
+        pool and is discarded when the extractor is evicted or the file
+        changes.
+
+        Args:
+            filepath: Path to the data file
+            stream_id: Stream ID for multi-stream formats
+            name: Hashable name of the value
+            compute: Callable returning the value
+
+        Returns:
+            The cached or newly computed value
+        """
+        key = self.key(filepath, stream_id)
+        with self._lock:
+            memo = self._memos.get(key, {})
+            if name in memo:
+                return memo[name]
+        value = compute()
+        with self._lock:
+            if key in self._entries:
+                self._memos.setdefault(key, {})[name] = value
+        return value
+
+    def _evict(self, key: tuple) -> None:
+        self._memos.pop(key, None)
+        self._retire(self._entries.pop(key))
+        self.evictions += 1
+
+    def _retire(self, recording: Any) -> None:
+        """Close an extractor removed from the pool, or defer it while held."""
+        if self._holds.get(id(recording)):
+            self._retired[id(recording)] = recording
+        else:
+            _close_extractor(recording)
+
+    def clear(self) -> None:
+        """Empty the pool, closing every extractor that no reader holds."""
+        with self._lock:
+            self._memos.clear()
+            self._unreadable.clear()
+            while self._entries:
+                self._retire(self._entries.popitem(last=False)[1])
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss/eviction counters, the pool size and unreadable files."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "unreadable": len(self._unreadable),
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_EXTRACTOR_POOL = ExtractorPool()
+
+
+def extractor_pool() -> ExtractorPool:
+    """
+    Return the extractor pool shared by all SpikeInterface-based readers.
+
+    Python-specific: no MATLAB equivalent.
+    """
+    return _EXTRACTOR_POOL
+
+
 class ndi_daq_reader_SpikeInterfaceReader(ndi_daq_reader_mfdaq):
     """
     DAQ reader using spikeinterface for data access.
@@ -131,26 +415,79 @@ class ndi_daq_reader_SpikeInterfaceReader(ndi_daq_reader_mfdaq):
 
         super().__init__(identifier, session, document)
         self._stream_id = stream_id
-        self._recording_cache: dict[str, Any] = {}
 
-    def _get_recording(self, epochfiles: list[str]) -> Any | None:
-        """Get or create recording extractor for epoch files."""
-        if not epochfiles:
-            return None
+    @contextmanager
+    def _recording(self, epochfiles: list[str]) -> Iterator[Any | None]:
+        """Hold the recording extractor of an epoch from the shared pool."""
+        with self._recording_file(epochfiles) as (_, recording):
+            yield recording
 
-        # Use first file as cache key
-        cache_key = epochfiles[0]
-        if cache_key in self._recording_cache:
-            return self._recording_cache[cache_key]
+    @contextmanager
+    def _recording_file(self, epochfiles: list[str]) -> Iterator[tuple[str | None, Any | None]]:
+        """Hold the first epoch file an extractor can read, and its extractor.
 
+        The extractor is held for the duration of the ``with`` block, so the
+        pool does not close it if it is evicted during the read.
+        """
+        pool = extractor_pool()
         # Try each file until one works
         for filepath in epochfiles:
-            recording = _get_extractor_for_file(filepath)
+            recording = pool.acquire(filepath, self._stream_id)
             if recording is not None:
-                self._recording_cache[cache_key] = recording
-                return recording
+                try:
+                    yield filepath, recording
+                finally:
+                    pool.release(recording)
+                return
+
+        yield None, None
+
+    @staticmethod
+    def _event_channels(recording: Any) -> list[str]:
+        """Names of the event channels of the recording's neo reader."""
+        rawio = getattr(recording, "neo_reader", None)
+        if rawio is None:
+            return []
+        try:
+            return [str(ev["name"]) for ev in rawio.header["event_channels"]]
+        except Exception:
+            return []
 
-        return None
+    @staticmethod
+    def _decode_events(recording: Any, index: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Read every event of one neo event channel.
+
+        Only the event stream is read (e.g. NEV digital/serial ports, Open
+        Ephys TTL events); no continuous samples are touched.
+
+        Returns:
+            Tuple of (times in seconds from the recording start, data);
+            data are the numeric event labels, the labels as strings if
+            they are not numeric, or ones if the events carry no labels
+        """
+        rawio = recording.neo_reader
+        timestamps, _, labels = rawio.get_event_timestamps(
+            block_index=0, seg_index=0, event_channel_index=index, t_start=None, t_stop=None
+        )
+        times = np.asarray(
+            rawio.rescale_event_timestamp(timestamps, dtype="float64", event_channel_index=index),
+            dtype=float,
+        )
+        try:
+            times = times - float(recording.get_start_time(segment_index=0))
+        except Exception:
+            pass  # older spikeinterface: recordings start at 0
+
+        labels = np.asarray(labels if labels is not None else [])
+        if labels.size == 0 or all(str(x) == "" for x in labels):
+            data = np.ones(len(times))
+        else:
+            try:
+                data = labels.astype(float)
+            except (TypeError, ValueError):
+                data = labels.astype(str)
+        return times, data
 
     def epochclock(
         self,
@@ -172,18 +509,18 @@ class ndi_daq_reader_SpikeInterfaceReader(ndi_daq_reader_mfdaq):
         Returns:
             List with single (t0, t1) tuple
         """
-        recording = self._get_recording(epochfiles)
-        if recording is None:
-            return [(np.nan, np.nan)]
+        with self._recording(epochfiles) as recording:
+            if recording is None:
+                return [(np.nan, np.nan)]
 
-        try:
-            num_samples = recording.get_num_samples()
-            sr = recording.get_sampling_frequency()
-            t0 = 0.0
-            t1 = (num_samples - 1) / sr
-            return [(t0, t1)]
-        except Exception:
-            return [(np.nan, np.nan)]
+            try:
+                num_samples = recording.get_num_samples()
+                sr = recording.get_sampling_frequency()
+                t0 = 0.0
+                t1 = (num_samples - 1) / sr
+                return [(t0, t1)]
+            except Exception:
+                return [(np.nan, np.nan)]
 
     def getchannelsepoch(
         self,
@@ -198,56 +535,68 @@ class ndi_daq_reader_SpikeInterfaceReader(ndi_daq_reader_mfdaq):
         Returns:
             List of ChannelInfo objects
         """
-        recording = self._get_recording(epochfiles)
-        if recording is None:
-            return []
+        with self._recording(epochfiles) as recording:
+            if recording is None:
+                return []
 
-        channels = []
-        try:
-            channel_ids = recording.get_channel_ids()
-            sr = recording.get_sampling_frequency()
+            channels = []
+            try:
+                channel_ids = recording.get_channel_ids()
+                sr = recording.get_sampling_frequency()
 
-            for i, ch_id in enumerate(channel_ids):
-                # Determine channel type from properties if available
-                ch_type = "analog_in"  # Default
+                for i, ch_id in enumerate(channel_ids):
+                    # Determine channel type from properties if available
+                    ch_type = "analog_in"  # Default
 
-                # Try to get gain/offset for scaling
-                gain = 1.0
-                offset = 0.0
-                if recording.has_channel_property(ch_id, "gain_to_uV"):
-                    gain = recording.get_channel_property(ch_id, "gain_to_uV")
-                if recording.has_channel_property(ch_id, "offset_to_uV"):
-                    offset = recording.get_channel_property(ch_id, "offset_to_uV")
+                    # Try to get gain/offset for scaling
+                    gain = 1.0
+                    offset = 0.0
+                    if recording.has_channel_property(ch_id, "gain_to_uV"):
+                        gain = recording.get_channel_property(ch_id, "gain_to_uV")
+                    if recording.has_channel_property(ch_id, "offset_to_uV"):
+                        offset = recording.get_channel_property(ch_id, "offset_to_uV")
+
+                    channels.append(
+                        ChannelInfo(
+                            name=f"ai{i + 1}",
+                            type=ch_type,
+                            time_channel=1,  # Time channel index
+                            number=i + 1,
+                            sample_rate=sr,
+                            offset=offset,
+                            scale=gain,
+                            group=1,
+                        )
+                    )
 
+                # Add time channel
                 channels.append(
                     ChannelInfo(
-                        name=f"ai{i + 1}",
-                        type=ch_type,
-                        time_channel=1,  # Time channel index
-                        number=i + 1,
+                        name="t1",
+                        type="time",
+                        time_channel=None,
+                        number=1,
                         sample_rate=sr,
-                        offset=offset,
-                        scale=gain,
                         group=1,
                     )
                 )
 
-            # Add time channel
-            channels.append(
-                ChannelInfo(
-                    name="t1",
-                    type="time",
-                    time_channel=None,
-                    number=1,
-                    sample_rate=sr,
-                    group=1,
-                )
-            )
+                # Native event channels (NEV ports, Open Ephys TTL, ...)
+                for i, _name in enumerate(self._event_channels(recording)):
+                    channels.append(
+                        ChannelInfo(
+                            name=f"e{i + 1}",
+                            type="event",
+                            time_channel=None,
+                            number=i + 1,
+                            group=1,
+                        )
+                    )
 
-        except Exception:
-            pass
+            except Exception:
+                pass
 
-        return channels
+            return channels
 
     def readchannels_epochsamples(
         self,
@@ -270,52 +619,52 @@ class ndi_daq_reader_SpikeInterfaceReader(ndi_daq_reader_mfdaq):
         Returns:
             Array with shape (num_samples, num_channels)
         """
-        recording = self._get_recording(epochfiles)
-        if recording is None:
+        with self._recording(epochfiles) as recording:
+            if recording is None:
+                if isinstance(channel, int):
+                    channel = [channel]
+                return np.full((s1 - s0 + 1, len(channel)), np.nan)
+
+            # Normalize inputs
             if isinstance(channel, int):
                 channel = [channel]
-            return np.full((s1 - s0 + 1, len(channel)), np.nan)
-
-        # Normalize inputs
-        if isinstance(channel, int):
-            channel = [channel]
-        if isinstance(channeltype, str):
-            channeltype = [channeltype] * len(channel)
-
-        channeltype = [standardize_channel_type(ct) for ct in channeltype]
-
-        # Convert to 0-indexed
-        start_sample = s0 - 1
-        end_sample = s1  # spikeinterface end is exclusive
-
-        try:
-            # Handle time channel specially
-            if all(ct == "time" for ct in channeltype):
-                sr = recording.get_sampling_frequency()
-                t0_t1 = self.t0_t1(epochfiles)
-                t0 = t0_t1[0][0]
-                samples = np.arange(start_sample, end_sample)
-                return (t0 + samples / sr).reshape(-1, 1)
-
-            # Read analog data
-            channel_ids = recording.get_channel_ids()
-            # Convert 1-indexed channel numbers to channel IDs
-            ch_indices = [ch - 1 for ch in channel]
-            selected_ids = [channel_ids[i] for i in ch_indices if i < len(channel_ids)]
-
-            if not selected_ids:
-                return np.full((end_sample - start_sample, len(channel)), np.nan)
-
-            traces = recording.get_traces(
-                channel_ids=selected_ids,
-                start_frame=start_sample,
-                end_frame=end_sample,
-            )
+            if isinstance(channeltype, str):
+                channeltype = [channeltype] * len(channel)
+
+            channeltype = [standardize_channel_type(ct) for ct in channeltype]
+
+            # Convert to 0-indexed
+            start_sample = s0 - 1
+            end_sample = s1  # spikeinterface end is exclusive
+
+            try:
+                # Handle time channel specially
+                if all(ct == "time" for ct in channeltype):
+                    sr = recording.get_sampling_frequency()
+                    t0_t1 = self.t0_t1(epochfiles)
+                    t0 = t0_t1[0][0]
+                    samples = np.arange(start_sample, end_sample)
+                    return (t0 + samples / sr).reshape(-1, 1)
+
+                # Read analog data
+                channel_ids = recording.get_channel_ids()
+                # Convert 1-indexed channel numbers to channel IDs
+                ch_indices = [ch - 1 for ch in channel]
+                selected_ids = [channel_ids[i] for i in ch_indices if i < len(channel_ids)]
+
+                if not selected_ids:
+                    return np.full((end_sample - start_sample, len(channel)), np.nan)
+
+                traces = recording.get_traces(
+                    channel_ids=selected_ids,
+                    start_frame=start_sample,
+                    end_frame=end_sample,
+                )
 
-            return traces
+                return traces
 
-        except Exception:
-            return np.full((s1 - s0 + 1, len(channel)), np.nan)
+            except Exception:
+                return np.full((s1 - s0 + 1, len(channel)), np.nan)
 
     def samplerate(
         self,
@@ -334,20 +683,20 @@ class ndi_daq_reader_SpikeInterfaceReader(ndi_daq_reader_mfdaq):
         Returns:
             Array of sample rates
         """
-        recording = self._get_recording(epochfiles)
-        if recording is None:
+        with self._recording(epochfiles) as recording:
+            if recording is None:
+                if isinstance(channel, int):
+                    channel = [channel]
+                return np.full(len(channel), np.nan)
+
             if isinstance(channel, int):
                 channel = [channel]
-            return np.full(len(channel), np.nan)
 
-        if isinstance(channel, int):
-            channel = [channel]
-
-        try:
-            sr = recording.get_sampling_frequency()
-            return np.full(len(channel), sr)
-        except Exception:
-            return np.full(len(channel), np.nan)
+            try:
+                sr = recording.get_sampling_frequency()
+                return np.full(len(channel), sr)
+            except Exception:
+                return np.full(len(channel), np.nan)
 
     def readevents_epochsamples_native(
         self,
@@ -360,8 +709,11 @@ class ndi_daq_reader_SpikeInterfaceReader(ndi_daq_reader_mfdaq):
         """
         Read native event data.
 
-        Currently returns empty arrays. Override in format-specific
-        subclasses to read events from the native file format.
+        Event channel ``n`` is the ``n``-th event channel of the recording's
+        neo reader (see ``getchannelsepoch``). The decoded events of each
+        channel are cached with the file's extractor in the shared pool, so
+        repeated reads of an epoch, for example by sync rules and stimulus
+        decoders, do not decode the event stream again.
 
         Args:
             channeltype: Channel types
@@ -371,10 +723,35 @@ class ndi_daq_reader_SpikeInterfaceReader(ndi_daq_reader_mfdaq):
             t1: End time
 
         Returns:
-            Tuple of empty (timestamps, data) lists
+            Tuple of (timestamps, data) lists, one array per channel; empty
+            arrays for channels the file does not have
         """
-        # Event reading not yet implemented
-        return [np.array([]) for _ in channel], [np.array([]) for _ in channel]
+        if isinstance(channel, int):
+            channel = [channel]
+        if isinstance(channeltype, str):
+            channeltype = [channeltype] * len(channel)
+
+        with self._recording_file(epochfiles) as (filepath, recording):
+            n_events = len(self._event_channels(recording)) if recording is not None else 0
+
+            timestamps, data = [], []
+            for ct, ch in zip(channeltype, channel):
+                if standardize_channel_type(ct) not in ("event", "marker", "text") or not (
+                    1 <= ch <= n_events
+                ):
+                    timestamps.append(np.array([]))
+                    data.append(np.array([]))
+                    continue
+                times, values = extractor_pool().memo(
+                    filepath,
+                    self._stream_id,
+                    ("events", ch),
+                    lambda ch=ch: self._decode_events(recording, ch - 1),
+                )
+                included = (times >= t0) & (times <= t1)
+                timestamps.append(times[included])
+                data.append(values[included])
+            return timestamps, data
 
     def underlying_datatype(
         self,
@@ -393,51 +770,51 @@ class ndi_daq_reader_SpikeInterfaceReader(ndi_daq_reader_mfdaq):
         Returns:
             Tuple of (datatype, polynomial, datasize)
         """
-        recording = self._get_recording(epochfiles)
-        if isinstance(channel, int):
-            channel = [channel]
-
-        if recording is None:
-            return super().underlying_datatype(epochfiles, channeltype, channel)
+        with self._recording(epochfiles) as recording:
+            if isinstance(channel, int):
+                channel = [channel]
 
-        try:
-            dtype = recording.get_dtype()
-            dtype_str = str(dtype)
-
-            if "int16" in dtype_str:
-                datatype = "int16"
-                datasize = 16
-            elif "float32" in dtype_str or "float" in dtype_str:
-                datatype = "float32"
-                datasize = 32
-            elif "float64" in dtype_str:
-                datatype = "float64"
-                datasize = 64
-            else:
-                datatype = "int16"
-                datasize = 16
-
-            # Get gain/offset for each channel
-            poly = np.zeros((len(channel), 2))
-            channel_ids = recording.get_channel_ids()
-
-            for i, ch in enumerate(channel):
-                ch_idx = ch - 1
-                if ch_idx < len(channel_ids):
-                    ch_id = channel_ids[ch_idx]
-                    if recording.has_channel_property(ch_id, "offset_to_uV"):
-                        poly[i, 0] = recording.get_channel_property(ch_id, "offset_to_uV")
-                    if recording.has_channel_property(ch_id, "gain_to_uV"):
-                        poly[i, 1] = recording.get_channel_property(ch_id, "gain_to_uV")
+            if recording is None:
+                return super().underlying_datatype(epochfiles, channeltype, channel)
+
+            try:
+                dtype = recording.get_dtype()
+                dtype_str = str(dtype)
+
+                if "int16" in dtype_str:
+                    datatype = "int16"
+                    datasize = 16
+                elif "float32" in dtype_str or "float" in dtype_str:
+                    datatype = "float32"
+                    datasize = 32
+                elif "float64" in dtype_str:
+                    datatype = "float64"
+                    datasize = 64
+                else:
+                    datatype = "int16"
+                    datasize = 16
+
+                # Get gain/offset for each channel
+                poly = np.zeros((len(channel), 2))
+                channel_ids = recording.get_channel_ids()
+
+                for i, ch in enumerate(channel):
+                    ch_idx = ch - 1
+                    if ch_idx < len(channel_ids):
+                        ch_id = channel_ids[ch_idx]
+                        if recording.has_channel_property(ch_id, "offset_to_uV"):
+                            poly[i, 0] = recording.get_channel_property(ch_id, "offset_to_uV")
+                        if recording.has_channel_property(ch_id, "gain_to_uV"):
+                            poly[i, 1] = recording.get_channel_property(ch_id, "gain_to_uV")
+                        else:
+                            poly[i, 1] = 1.0
                     else:
                         poly[i, 1] = 1.0
-                else:
-                    poly[i, 1] = 1.0
 
-            return datatype, poly, datasize
+                return datatype, poly, datasize
 
-        except Exception:
-            return super().underlying_datatype(epochfiles, channeltype, channel)
+            except Exception:
+                return super().underlying_datatype(epochfiles, channeltype, channel)
 
     def newdocument(self) -> Any:
         """Create document for this reader."""
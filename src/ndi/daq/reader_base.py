@@ -7,7 +7,13 @@ the interface for reading data from data acquisition systems.
 
 from __future__ import annotations
 
+import contextlib
+import hashlib
+import json
+import os
+import threading
 from abc import ABC
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import numpy as np
@@ -16,6 +22,9 @@ from ..ido import ndi_ido
 from ..time import NO_TIME, ndi_time_clocktype
 from ..util.classname import ndi_matlab_classname
 
+# Header-metadata cache kept in a session's .ndi directory
+HEADER_CACHE_FILE = "daqreader_header_cache.json"
+
 
 class ndi_daq_reader(ndi_ido, ABC):
     """
@@ -37,6 +46,10 @@ class ndi_daq_reader(ndi_ido, ABC):
         ...     # ... implement other abstract methods
     """
 
+    # Python-specific: readers whose t0_t1 may run in several threads at
+    # once set this, and t0_t1_many then reads epoch headers concurrently
+    threadsafe_t0_t1: bool = False
+
     def __init__(
         self,
         identifier: str | None = None,
@@ -53,6 +66,8 @@ class ndi_daq_reader(ndi_ido, ABC):
         """
         super().__init__(identifier)
         self._session = session
+        # header-metadata stamp -> t0_t1 rows, see t0_t1_many
+        self._t0_t1_memo: dict[str, list[list[float]]] = {}
 
         # Load from document if provided
         if document is not None:
@@ -97,6 +112,65 @@ class ndi_daq_reader(ndi_ido, ABC):
         """
         return [(np.nan, np.nan)]
 
+    def t0_t1_many(
+        self,
+        epochfiles_list: list[list[str]],
+        cache_path: str | None = None,
+        max_workers: int | None = None,
+    ) -> list[list[tuple[float, float]]]:
+        """
+        Return the start and end times of many epochs.
+
+        Python-specific: no MATLAB equivalent.
+
+        Results are cached in memory and, when ``cache_path`` is given,
+        in a JSON header-metadata cache keyed by this reader's ID and the
+        path, size and modification time of every epoch file, so epochs
+        whose files are unchanged are answered without opening them.
+        The remaining epochs are read one after another, or concurrently
+        if the reader sets ``threadsafe_t0_t1``.
+
+        Args:
+            epochfiles_list: File lists, one per epoch
+            cache_path: Optional header-metadata cache file
+            max_workers: Thread-pool size for the header reads of a
+                reader with ``threadsafe_t0_t1`` (default: the
+                ThreadPoolExecutor default)
+
+        Returns:
+            List of ``t0_t1`` results, one per epoch
+        """
+        stamps = [_epochfiles_stamp(files) for files in epochfiles_list]
+        memo = self._t0_t1_memo
+        if cache_path is not None and any(st is not None and st not in memo for st in stamps):
+            memo.update(_load_header_cache(cache_path).get(self.id, {}))
+
+        results: list[Any] = [None] * len(epochfiles_list)
+        missing = []
+        for i, stamp in enumerate(stamps):
+            if stamp is not None and stamp in memo:
+                results[i] = [tuple(row) for row in memo[stamp]]
+            else:
+                missing.append(i)
+        if not missing:
+            return results
+
+        if len(missing) == 1 or not self.threadsafe_t0_t1:
+            computed = [self.t0_t1(epochfiles_list[i]) for i in missing]
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                computed = list(pool.map(self.t0_t1, [epochfiles_list[i] for i in missing]))
+
+        new_entries = {}
+        for i, value in zip(missing, computed):
+            results[i] = value
+            if stamps[i] is not None:
+                new_entries[stamps[i]] = [[float(t0), float(t1)] for t0, t1 in value]
+        memo.update(new_entries)
+        if cache_path is not None and new_entries:
+            _save_header_cache(cache_path, self.id, new_entries)
+        return results
+
     # =========================================================================
     # Ingested data methods - for reading from database-stored epochs
     # =========================================================================
@@ -160,7 +234,7 @@ class ndi_daq_reader(ndi_ido, ABC):
         epochclock_map = {}
 
         for doc in d_ingested:
-            props = doc.document_properties
+            props = doc.read_properties()
             epochid = props["epochid"]["epochid"]
             et = props["daqreader_epochdata_ingested"]["epochtable"]
 
@@ -295,6 +369,17 @@ class ndi_daq_reader(ndi_ido, ABC):
         """
         from ..document import ndi_document
 
+        doc = ndi_document(
+            "ingestion/daqreader_epochdata_ingested",
+            daqreader_epochdata_ingested={"epochtable": self._ingested_epochtable(epochfiles)},
+            epochid={"epochid": epoch_id},
+        )
+        doc.set_dependency_value("daqreader_id", self.id)
+
+        return doc
+
+    def _ingested_epochtable(self, epochfiles: list[str]) -> dict[str, Any]:
+        """Return the epochclock/t0_t1 table stored in ingested documents."""
         # Get epoch clock and t0_t1
         ec = self.epochclock(epochfiles)
         ec_strings = [c.value if isinstance(c, ndi_time_clocktype) else str(c) for c in ec]
@@ -315,20 +400,11 @@ class ndi_daq_reader(ndi_ido, ABC):
                     None if (isinstance(pair, float) and math.isnan(pair)) else pair
                 )
 
-        epochtable = {
+        return {
             "epochclock": ec_strings,
             "t0_t1": sanitized_t0t1,
         }
 
-        doc = ndi_document(
-            "ingestion/daqreader_epochdata_ingested",
-            daqreader_epochdata_ingested={"epochtable": epochtable},
-            epochid={"epochid": epoch_id},
-        )
-        doc.set_dependency_value("daqreader_id", self.id)
-
-        return doc
-
     def newdocument(self) -> Any:
         """
         Create a new document for this ndi_daq_reader.
@@ -369,3 +445,55 @@ class ndi_daq_reader(ndi_ido, ABC):
     def __hash__(self) -> int:
         """Hash by ID."""
         return hash(self.id)
+
+
+def _session_ndi_file(session: Any, filename: str) -> str | None:
+    """Path of *filename* in a session's .ndi directory, if there is one."""
+    if session is None or not hasattr(session, "getpath"):
+        return None
+    try:
+        ndi_dir = os.path.join(str(session.getpath()), ".ndi")
+    except Exception:
+        return None
+    return os.path.join(ndi_dir, filename) if os.path.isdir(ndi_dir) else None
+
+
+def _epochfiles_stamp(epochfiles: list[str]) -> str | None:
+    """Cache key for an epoch's files, or None if they cannot all be stat'ed."""
+    if not epochfiles or epochfiles[0].startswith("epochid://"):
+        return None
+    h = hashlib.md5()
+    for f in epochfiles:
+        try:
+            st = os.stat(f)
+        except OSError:
+            return None
+        h.update(f"{f}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()
+
+
+def _load_header_cache(path: str) -> dict[str, dict[str, Any]]:
+    """Read the header-metadata cache; a missing or unreadable cache is empty."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(saved, dict) or saved.get("version") != 1:
+        return {}
+    return saved.get("readers", {})
+
+
+def _save_header_cache(path: str, reader_id: str, entries: dict[str, Any]) -> None:
+    """Merge entries for one reader into the header-metadata cache and replace it atomically."""
+    readers = _load_header_cache(path)
+    readers.setdefault(reader_id, {}).update(entries)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "readers": readers}, f)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError):
+        # the cache is only an accelerator; failing to save it is harmless
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
@@ -7,17 +7,29 @@ data reading, and metadata reading for a complete data acquisition system.
 
 from __future__ import annotations
 
+import contextlib
+import copy
+import hashlib
+import json
 import logging
+import os
+import threading
 from typing import Any
 
 import numpy as np
 
 from ..ido import ndi_ido
 from ..time import NO_TIME, ndi_time_clocktype
-from .reader_base import ndi_daq_reader
+from .reader_base import _session_ndi_file, ndi_daq_reader
 
 logger = logging.getLogger(__name__)
 
+# Session cache type under which DAQ system epoch tables are shared
+EPOCHTABLE_CACHE_TYPE = "daqsystem_epochtable"
+# Session cache type and .ndi file for DAQ system probe inventories
+PROBE_INVENTORY_CACHE_TYPE = "daqsystem_probe_inventory"
+PROBE_INVENTORY_FILE = "probe_inventory.json"
+
 
 def _serialize_clocktype(ct: Any) -> dict[str, str]:
     """Convert a ClockType enum (or dict) to a MATLAB-compatible dict."""
@@ -87,6 +99,38 @@ def _serialize_epochnode(node: dict[str, Any]) -> None:
         node["epochprobemap"] = _serialize_single_epochprobemap(epm)
 
 
+def _load_probe_inventory(path: str) -> dict[str, dict[str, Any]]:
+    """Read the probe inventory file; a missing or unreadable file is empty."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(saved, dict) or saved.get("version") != 1:
+        return {}
+    return saved.get("daqsystems", {})
+
+
+def _save_probe_inventory(path: str, daqsystem_id: str, entry: dict[str, Any] | None) -> None:
+    """Atomically replace (or, with ``entry=None``, drop) one DAQ system's inventory."""
+    daqsystems = _load_probe_inventory(path)
+    if entry is None:
+        if daqsystem_id not in daqsystems:
+            return
+        del daqsystems[daqsystem_id]
+    else:
+        daqsystems[daqsystem_id] = entry
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "daqsystems": daqsystems}, f)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError):
+        # the inventory is only an accelerator; failing to save it is harmless
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+
+
 class ndi_daq_system(ndi_ido):
     """
     Complete data acquisition system.
@@ -143,6 +187,8 @@ class ndi_daq_system(ndi_ido):
             document: Optional document to load from
         """
         super().__init__(identifier)
+        # Throughput of the last ingest(), see ndi.daq.ingest.IngestReport
+        self.ingest_report = None
 
         # Handle loading from document
         if session is not None and document is not None:
@@ -370,6 +416,14 @@ class ndi_daq_system(ndi_ido):
         """
         return [(np.nan, np.nan)]
 
+    def _t0_t1_many(
+        self,
+        epoch_numbers: list[int],
+        epochfiles_list: list[list[str]],
+    ) -> list[list[tuple[float, float]]]:
+        """Return ``t0_t1`` for several epochs; subclasses may batch the reads."""
+        return [self.t0_t1(n) for n in epoch_numbers]
+
     def epochid(
         self,
         epoch_number: int,
@@ -391,6 +445,12 @@ class ndi_daq_system(ndi_ido):
         """
         Build the epoch table for this DAQ system.
 
+        The table is shared through the session cache, so every consumer
+        (probes, ``getprobes``, syncrules) reuses one computed table per
+        DAQ system. A cached table is reused while
+        ``epochtable_fingerprint`` is unchanged; ``ingest`` and
+        ``deleteepoch`` drop it explicitly.
+
         Returns:
             List of epoch entries with fields:
             - epoch_number: The epoch number
@@ -400,6 +460,94 @@ class ndi_daq_system(ndi_ido):
             - t0_t1: List of (t0, t1) tuples
             - underlying_epochs: Underlying file information
         """
+        if self._filenavigator is None:
+            return []
+        if self._session_cache() is None:
+            return self._buildepochtable()
+        return self._cached_epochtable(self.epochtable_fingerprint())
+
+    def _cached_epochtable(self, fingerprint: str) -> list[dict[str, Any]]:
+        """Return the shared epoch table for *fingerprint*, building it if needed."""
+        cache = self._session_cache()
+        entry = cache.lookup(self.id, EPOCHTABLE_CACHE_TYPE)
+        if entry is not None and entry.data[0] == fingerprint:
+            et = entry.data[1]
+        else:
+            et = self._buildepochtable()
+            if entry is not None:
+                # the table changed underneath its consumers
+                self.clearepochtablecache()
+                cache.remove(self.id, EPOCHTABLE_CACHE_TYPE)
+            cache.add(self.id, EPOCHTABLE_CACHE_TYPE, (fingerprint, et))
+        # copy the entries, including nested lists, so callers cannot modify the shared table
+        return copy.deepcopy(et)
+
+    def epochtable_fingerprint(self) -> str:
+        """
+        Fingerprint of everything the epoch table is built from.
+
+        Python-specific: no MATLAB equivalent.
+
+        Combines the navigator's file-state fingerprint with the IDs of
+        the documents recording ingested epochs for this system.
+
+        Returns:
+            MD5 hex digest
+        """
+        h = hashlib.md5()
+        if self._filenavigator is not None:
+            h.update(self._filenavigator.filestate_fingerprint().encode())
+        for doc_id in self._ingested_document_ids():
+            h.update(doc_id.encode() + b"\n")
+        return h.hexdigest()
+
+    def clearepochtablecache(self) -> ndi_daq_system:
+        """
+        Drop this system's cached epoch table and probe inventory.
+
+        Python-specific: no MATLAB equivalent.
+
+        Returns:
+            self for chaining
+        """
+        session = self.session
+        if session is not None and hasattr(session, "epochtable_clearcache"):
+            session.epochtable_clearcache(self.id)
+        inventory_path = self._session_ndi_file(PROBE_INVENTORY_FILE)
+        if inventory_path is not None:
+            _save_probe_inventory(inventory_path, self.id, None)
+        return self
+
+    def _session_cache(self) -> Any | None:
+        """Return the session's ndi_cache, if the session has one."""
+        from ..cache import ndi_cache
+
+        cache = getattr(self.session, "cache", None)
+        return cache if isinstance(cache, ndi_cache) else None
+
+    def _ingested_document_ids(self) -> list[str]:
+        """Sorted IDs of the documents describing this system's ingested epochs."""
+        session = self.session
+        if session is None:
+            return []
+        from ..query import ndi_query
+
+        q = None
+        if self._filenavigator is not None:
+            q = ndi_query("").isa("epochfiles_ingested") & ndi_query("").depends_on(
+                "filenavigator_id", self._filenavigator.id
+            )
+        if self._daqreader is not None:
+            q_reader = ndi_query("").isa("daqreader_epochdata_ingested") & ndi_query("").depends_on(
+                "daqreader_id", self._daqreader.id
+            )
+            q = q_reader if q is None else q | q_reader
+        if q is None:
+            return []
+        return sorted(doc.id for doc in session.database_search(q))
+
+    def _buildepochtable(self) -> list[dict[str, Any]]:
+        """Compute the epoch table from the navigator and the reader."""
         if self._filenavigator is None:
             return []
 
@@ -414,6 +562,18 @@ class ndi_daq_system(ndi_ido):
             t0t1_map = maps.get("t0t1", {})
             clock_map = maps.get("epochclock", {})
 
+        # Read the start/end times of all epochs that are not ingested at once
+        pending = [
+            (i, entry.get("epoch_number", i + 1))
+            for i, entry in enumerate(nav_et)
+            if entry.get("epoch_id") not in t0t1_map
+        ]
+        pending_t0_t1 = self._t0_t1_many(
+            [n for _, n in pending],
+            [(nav_et[i].get("underlying_epochs") or {}).get("underlying", []) for i, _ in pending],
+        )
+        t0t1_by_index = {i: value for (i, _), value in zip(pending, pending_t0_t1)}
+
         et = []
         for i, entry in enumerate(nav_et):
             epoch_number = entry.get("epoch_number", i + 1)
@@ -433,7 +593,7 @@ class ndi_daq_system(ndi_ido):
             if epoch_id in t0t1_map:
                 t0_t1 = t0t1_map[epoch_id]
             else:
-                t0_t1 = self.t0_t1(epoch_number)
+                t0_t1 = t0t1_by_index[i]
 
             et.append(
                 {
@@ -472,10 +632,16 @@ class ndi_daq_system(ndi_ido):
             nodes.append(node)
         return nodes
 
-    def getprobes(self) -> list[dict[str, Any]]:
+    def getprobes(self, subject_ids: dict[str, str] | None = None) -> list[dict[str, Any]]:
         """
         Return all probes associated with this DAQ system.
 
+        Args:
+            subject_ids: Optional memo of subjectstring -> subject document
+                ID, shared across calls (e.g. across the DAQ systems of a
+                session) so each subject is looked up only once.
+                Python-specific.
+
         Returns:
             List of probe dicts with:
             - name: ndi_probe name
@@ -483,10 +649,67 @@ class ndi_daq_system(ndi_ido):
             - type: ndi_probe type
             - subject_id: ndi_subject document ID
         """
-        from ..subject import ndi_subject
+        if subject_ids is None:
+            subject_ids = {}
 
-        et = self.epochtable()
         probes = []
+        for item in self.probe_inventory():
+            probes.append(
+                {
+                    "name": item["name"],
+                    "reference": item["reference"],
+                    "type": item["type"],
+                    "subject_id": self._subject_id_for(item["subjectstring"], subject_ids),
+                }
+            )
+        return probes
+
+    def probe_inventory(self) -> list[dict[str, Any]]:
+        """
+        Return the distinct probes named in this system's epoch probe maps.
+
+        Python-specific: no MATLAB equivalent.
+
+        The inventory is derived from the epoch table once per
+        ``epochtable_fingerprint`` and kept both in the session cache
+        and in ``<session>/.ndi/probe_inventory.json``, so an unchanged
+        session does not rebuild its epoch table to list its probes.
+
+        Returns:
+            List of dicts with name, reference, type and subjectstring,
+            in order of first appearance
+        """
+        if self._filenavigator is None:
+            return []
+        cache = self._session_cache()
+        if cache is None:
+            return self._buildprobeinventory(self.epochtable())
+
+        fingerprint = self.epochtable_fingerprint()
+        entry = cache.lookup(self.id, PROBE_INVENTORY_CACHE_TYPE)
+        if entry is not None and entry.data[0] == fingerprint:
+            return [dict(p) for p in entry.data[1]]
+
+        inventory_path = self._session_ndi_file(PROBE_INVENTORY_FILE)
+        inventory = None
+        if inventory_path is not None:
+            saved = _load_probe_inventory(inventory_path).get(self.id, {})
+            if saved.get("fingerprint") == fingerprint:
+                inventory = saved.get("probes")
+        if inventory is None:
+            inventory = self._buildprobeinventory(self._cached_epochtable(fingerprint))
+            if inventory_path is not None:
+                _save_probe_inventory(
+                    inventory_path, self.id, {"fingerprint": fingerprint, "probes": inventory}
+                )
+
+        cache.remove(self.id, PROBE_INVENTORY_CACHE_TYPE)
+        cache.add(self.id, PROBE_INVENTORY_CACHE_TYPE, (fingerprint, inventory))
+        return [dict(p) for p in inventory]
+
+    def _buildprobeinventory(self, et: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Collect the distinct probes of this device from an epoch table."""
+        inventory = []
         seen = set()
 
         for entry in et:
@@ -497,35 +720,46 @@ class ndi_daq_system(ndi_ido):
             # Handle both list and object epochprobemap
             items = epc if isinstance(epc, list) else [epc]
             for item in items:
-                if hasattr(item, "devicestring"):
-                    # Check if this probe belongs to us
-                    device_name = self._parse_devicename(item.devicestring)
-                    if device_name.lower() == self._name.lower():
-                        key = (item.name, item.reference, item.type)
-                        if key not in seen:
-                            seen.add(key)
-                            # Look up the subject document ID from the
-                            # subjectstring (e.g. "anteater27@nosuchlab.org").
-                            # MATLAB does the same lookup and stores the
-                            # document ID, not the local_identifier string.
-                            subjectstring = getattr(item, "subjectstring", "")
-                            sid = ""
-                            if subjectstring and self.session is not None:
-                                _, doc_id = ndi_subject.does_subjectstring_match_session_document(
-                                    self.session, subjectstring
-                                )
-                                if doc_id is not None:
-                                    sid = doc_id
-                            probes.append(
-                                {
-                                    "name": item.name,
-                                    "reference": item.reference,
-                                    "type": item.type,
-                                    "subject_id": sid,
-                                }
-                            )
+                if not hasattr(item, "devicestring"):
+                    continue
+                # Check if this probe belongs to us
+                device_name = self._parse_devicename(item.devicestring)
+                if device_name.lower() != self._name.lower():
+                    continue
+                key = (item.name, item.reference, item.type)
+                if key in seen:
+                    continue
+                seen.add(key)
+                inventory.append(
+                    {
+                        "name": item.name,
+                        "reference": item.reference,
+                        "type": item.type,
+                        "subjectstring": getattr(item, "subjectstring", "") or "",
+                    }
+                )
 
-        return probes
+        return inventory
+
+    def _subject_id_for(self, subjectstring: str, subject_ids: dict[str, str]) -> str:
+        """Resolve a subjectstring to a subject document ID, memoized in *subject_ids*."""
+        if not subjectstring or self.session is None:
+            return ""
+        if subjectstring not in subject_ids:
+            from ..subject import ndi_subject
+
+            # Look up the subject document ID from the subjectstring
+            # (e.g. "anteater27@nosuchlab.org"). MATLAB does the same
+            # lookup and stores the document ID, not the local_identifier.
+            _, doc_id = ndi_subject.does_subjectstring_match_session_document(
+                self.session, subjectstring
+            )
+            subject_ids[subjectstring] = doc_id or ""
+        return subject_ids[subjectstring]
+
+    def _session_ndi_file(self, filename: str) -> str | None:
+        """Path of *filename* in the session's .ndi directory, if there is one."""
+        return _session_ndi_file(self.session, filename)
 
     def _parse_devicename(self, devicestring: str) -> str:
         """Parse device name from a device string."""
@@ -592,43 +826,73 @@ class ndi_daq_system(ndi_ido):
 
         return reader.readmetadata(epochfiles)
 
-    def ingest(self) -> tuple[bool, list[Any]]:
+    def ingest(
+        self,
+        max_workers: int = 1,
+        max_memory: int | None = None,
+        stream: bool = True,
+        add: bool = True,
+    ) -> tuple[bool, list[Any]]:
         """
         Ingest data from this DAQ system into the database.
 
+        Args:
+            max_workers: Python-specific. Maximum number of epochs the DAQ
+                reader ingests concurrently (see
+                :func:`ndi.daq.ingest.ingest_epochs`).
+            max_memory: Python-specific. Memory budget of the concurrent
+                workers in bytes; ``None`` uses
+                ``ndi.daq.ingest.DEFAULT_MAX_MEMORY``.
+            stream: Python-specific. Stream the sample data of
+                multi-function DAQ readers into compressed segment files
+                (see :func:`ndi.daq.ingest.ingest_epoch`); False records
+                only the epoch table.
+            add: Python-specific. Add the documents to the session
+                database; ``ndi_session.ingest`` passes False and adds
+                the documents of all DAQ systems at once.
+
         Returns:
             Tuple of (success, documents):
             - success: True if successful
             - documents: List of created documents
+
+        The throughput of the reader's ingestion is kept in
+        ``ingest_report`` and logged.
         """
+        from .ingest import DEFAULT_MAX_MEMORY, ingest_epochs
+
         et = self.epochtable()
         docs = []
-        filenavigator_ingested = False
 
+        pending = []
         for entry in et:
             underlying = entry.get("underlying_epochs", {})
             epochfiles = underlying.get("underlying", [])
 
             # Check if already ingested
-            if self._is_ingested(epochfiles):
-                continue
-
-            # Ingest file navigator first
-            if not filenavigator_ingested and self._filenavigator is not None:
-                nav_docs = self._filenavigator.ingest()
-                docs.extend(nav_docs)
-                filenavigator_ingested = True
-
-            # Ingest DAQ reader data
-            if self._daqreader is not None:
-                reader_docs = self._daqreader.ingest_epochfiles(epochfiles, entry["epoch_id"])
-                if not isinstance(reader_docs, list):
-                    reader_docs = [reader_docs]
-                docs.extend(reader_docs)
+            if not self._is_ingested(epochfiles):
+                pending.append((epochfiles, entry["epoch_id"]))
+
+        # Ingest file navigator first
+        if pending and self._filenavigator is not None:
+            docs.extend(self._filenavigator.ingest())
+
+        # Ingest DAQ reader data
+        if pending and self._daqreader is not None:
+            reader_docs, self.ingest_report = ingest_epochs(
+                self._daqreader,
+                pending,
+                max_workers=max_workers,
+                max_memory=DEFAULT_MAX_MEMORY if max_memory is None else max_memory,
+                stream=stream,
+            )
+            docs.extend(reader_docs)
+            logger.info("%s: %s", self.name, self.ingest_report)
 
-            # Ingest metadata
+        # Ingest metadata
+        for epochfiles, epoch_id in pending:
             for mreader in self._daqmetadatareaders:
-                m_docs = mreader.ingest_epochfiles(epochfiles, entry["epoch_id"])
+                m_docs = mreader.ingest_epochfiles(epochfiles, epoch_id)
                 if not isinstance(m_docs, list):
                     m_docs = [m_docs]
                 docs.extend(m_docs)
@@ -638,7 +902,9 @@ class ndi_daq_system(ndi_ido):
             session_id = self.session.id()
             for doc in docs:
                 doc.set_session_id(session_id)
-            self.session.database_add(docs)
+            if add:
+                self.session.database_add(docs)
+        self.clearepochtablecache()
 
         return True, docs
 
@@ -715,8 +981,6 @@ class ndi_daq_system(ndi_ido):
 
         # Delete files from disk if requested
         if delete_from_disk and epochfiles:
-            import os
-
             for filepath in epochfiles:
                 if not filepath.startswith("epochid://") and os.path.exists(filepath):
                     try:
@@ -724,6 +988,7 @@ class ndi_daq_system(ndi_ido):
                     except OSError:
                         pass  # Best effort deletion
 
+        self.clearepochtablecache()
         return True, f"ndi_epoch_epoch {epoch_number} deleted"
 
     def verifyepochprobemap(
@@ -15,6 +15,7 @@ import numpy as np
 
 from ..time import DEV_LOCAL_TIME, ndi_time_clocktype
 from .mfdaq import ndi_daq_reader_mfdaq, standardize_channel_type
+from .reader_base import HEADER_CACHE_FILE
 from .system import ndi_daq_system
 
 
@@ -84,6 +85,18 @@ class ndi_daq_system_mfdaq(ndi_daq_system):
             return self._daqreader.t0_t1(epochfiles)
         return [(np.nan, np.nan)]
 
+    def _t0_t1_many(
+        self,
+        epoch_numbers: list[int],
+        epochfiles_list: list[list[str]],
+    ) -> list[list[tuple[float, float]]]:
+        """Batch ``t0_t1`` through the reader's header-metadata cache."""
+        if self._daqreader is None or self._filenavigator is None:
+            return super()._t0_t1_many(epoch_numbers, epochfiles_list)
+        return self._daqreader.t0_t1_many(
+            epochfiles_list, cache_path=self._session_ndi_file(HEADER_CACHE_FILE)
+        )
+
     def getchannelsepoch(self, epoch_number: int) -> list[Any]:
         """
         Get available channels for an epoch.
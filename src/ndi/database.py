@@ -19,10 +19,52 @@ Example:
     doc = db.read(doc_id)
 """
 
+from collections.abc import Iterable, Iterator
+from contextlib import closing, contextmanager
 from pathlib import Path
+from typing import Any
 
-from .document import ndi_document
+from .document import ndi_document, ndi_document_view
 from .query import ndi_query
+from .util import json_codec
+
+# SQLite limits the number of bound parameters per statement
+_MAX_PARAMS = 500
+
+# Documents handed to DID-python per add_docs call by bulk_add
+_BULK_CHUNK = 1000
+
+# Documents read per database call by iter_documents
+DEFAULT_PAGE_SIZE = 1000
+
+
+def project_properties(properties: dict, fields: Iterable[str]) -> dict[str, Any]:
+    """Pick dotted-path fields out of a document_properties dict.
+
+    Python-specific: no MATLAB equivalent.
+
+    Args:
+        properties: A document_properties dict.
+        fields: Dotted field paths such as ``'element.name'``.
+
+    Returns:
+        Dict mapping each field path to its value, or None where the
+        path does not exist.
+    """
+    row: dict[str, Any] = {}
+    for field in fields:
+        value: Any = properties
+        for key in field.split("."):
+            value = value.get(key) if isinstance(value, dict) else None
+            if value is None:
+                break
+        row[field] = value
+    return row
+
+
+def _json_path(field: str) -> str:
+    """Convert a dotted field path to an SQLite JSON path."""
+    return "$" + "".join(f'."{key}"' for key in field.split("."))
 
 
 class SQLiteDriver:
@@ -48,6 +90,8 @@ class SQLiteDriver:
         self._db_path = db_path
         self._branch_id = branch_id
         self._DIDDocument = DIDDocument
+        # Incremented on every write made through this driver
+        self.change_counter = 0
 
         # Initialize SQLiteDB
         self._db = SQLiteDB(str(db_path))
@@ -57,6 +101,33 @@ class SQLiteDriver:
         if branch_id not in existing_branches:
             self._db.add_branch(branch_id, "")  # Empty string for root branch
 
+        from .database_fileindex import ndi_database_fileindex
+
+        self.file_index = ndi_database_fileindex(
+            db_path.parent / "file_index.sqlite", self.file_stamp, self._file_index_source
+        )
+
+    def file_stamp(self) -> list:
+        """Return the size and modification time of the SQLite files."""
+        stamp: list = []
+        for suffix in ("", "-wal"):
+            try:
+                st = Path(f"{self._db_path}{suffix}").stat()
+                stamp.append([st.st_mtime_ns, st.st_size])
+            except OSError:
+                stamp.append(None)
+        return stamp
+
+    def _file_index_source(self):
+        for row in self.project(None, ["base.id", "base.session_id", "files.file_info"]):
+            if row["files.file_info"]:
+                yield row["base.id"], row["base.session_id"], row["files.file_info"]
+
+    def _written(self, before: list, removed=(), added=()) -> None:
+        """Account for a write: bump the change counter, update the file index."""
+        self.change_counter += 1
+        self.file_index.apply(before, self.file_stamp(), removed, added)
+
     def add(self, document: dict) -> None:
         """Add a document to the database."""
         doc_id = document.get("base", {}).get("id", "")
@@ -69,33 +140,85 @@ class SQLiteDriver:
             raise FileExistsError(f"ndi_document {doc_id} already exists")
 
         # Create DID ndi_document and add (DID-python now populates doc_data)
+        before = self.file_stamp()
         did_doc = self._DIDDocument(document)
         self._db.add_docs([did_doc], self._branch_id)
+        self._written(before, added=[document])
 
     def bulk_add(self, documents: list[dict]) -> tuple[int, int]:
         """Add many documents at once, bypassing per-doc duplicate checks.
 
-        Duplicates (by ``base.id``) are silently skipped.
+        Duplicates (by ``base.id``) are silently skipped. The documents
+        are handed to DID-python in chunks rather than one at a time.
 
         Returns:
             ``(added, skipped)`` counts.
         """
         existing_ids = set(self._db.get_doc_ids(self._branch_id))
 
-        added = 0
         skipped = 0
+        pending = []
         for doc in documents:
             doc_id = doc.get("base", {}).get("id", "")
             if not doc_id or doc_id in existing_ids:
                 skipped += 1
                 continue
-
-            did_doc = self._DIDDocument(doc)
-            self._db.add_docs([did_doc], self._branch_id)
             existing_ids.add(doc_id)
-            added += 1
+            pending.append(doc)
+
+        before = self.file_stamp()
+        added_docs: list[dict] = []
+        try:
+            for i in range(0, len(pending), _BULK_CHUNK):
+                chunk = pending[i : i + _BULK_CHUNK]
+                self._db.add_docs([self._DIDDocument(d) for d in chunk], self._branch_id)
+                added_docs.extend(chunk)
+        finally:
+            if added_docs:
+                self._written(before, added=added_docs)
+        return len(added_docs), skipped
+
+    def doc_ids(self) -> set[str]:
+        """Return the IDs of all documents on the branch."""
+        return set(self._db.get_doc_ids(self._branch_id))
+
+    def add_batch(self, documents: list[dict]) -> None:
+        """Add documents in a single DID-python call.
 
-        return added, skipped
+        If the call fails, part of the batch may have reached the
+        database; :meth:`remove_batch` takes it out again.
+
+        Raises:
+            FileExistsError: If any of the IDs is already present; nothing
+                is written.
+        """
+        ids = [doc.get("base", {}).get("id", "") for doc in documents]
+        if not all(ids):
+            raise ValueError("ndi_document must have a base.id")
+        clash = self.doc_ids().intersection(ids)
+        if clash:
+            raise FileExistsError(f"ndi_document {sorted(clash)[0]} already exists")
+
+        before = self.file_stamp()
+        try:
+            self._db.add_docs([self._DIDDocument(d) for d in documents], self._branch_id)
+        except BaseException:
+            self._written(before)
+            raise
+        self._written(before, added=documents)
+
+    def remove_batch(self, doc_ids: Iterable[str]) -> list[str]:
+        """Remove those of *doc_ids* that are present, in one DID-python call.
+
+        Returns:
+            The IDs that were removed.
+        """
+        present = sorted(self.doc_ids().intersection(doc_ids))
+        if present:
+            before = self.file_stamp()
+            self._db.remove_docs(present, self._branch_id)
+            self._written(before, removed=present)
+        return present
 
     def update(self, document: dict) -> None:
         """Update an existing document."""
@@ -107,9 +230,11 @@ class SQLiteDriver:
             raise FileNotFoundError(f"ndi_document {doc_id} not found")
 
         # Remove old and add new (DID handles doc_data cleanup and repopulation)
+        before = self.file_stamp()
         self._db.remove_docs([doc_id], self._branch_id)
         did_doc = self._DIDDocument(document)
         self._db.add_docs([did_doc], self._branch_id)
+        self._written(before, removed=[doc_id], added=[document])
 
     def delete_by_id(self, doc_id: str) -> bool:
         """Delete a document by ID."""
@@ -117,7 +242,9 @@ class SQLiteDriver:
         if doc_id not in existing_ids:
             return False
 
+        before = self.file_stamp()
         self._db.remove_docs([doc_id], self._branch_id)
+        self._written(before, removed=[doc_id])
         return True
 
     def find_by_id(self, doc_id: str) -> dict | None:
@@ -130,6 +257,20 @@ class SQLiteDriver:
         except Exception:
             return None
 
+    def find_by_ids(self, doc_ids: list[str]) -> dict[str, dict]:
+        """Find several documents by ID; missing IDs are absent from the result."""
+        if not doc_ids:
+            return {}
+        docs = self._db.get_docs(list(doc_ids), self._branch_id, OnMissing="ignore")
+        if not isinstance(docs, list):
+            docs = [docs]
+        found = {}
+        for d in docs:
+            if d is not None:
+                props = d.document_properties
+                found[props.get("base", {}).get("id", "")] = props
+        return found
+
     def find(self, query=None) -> list[dict]:
         """Find all documents matching query.
 
@@ -148,6 +289,88 @@ class SQLiteDriver:
 
         return [d.document_properties for d in docs if d is not None]
 
+    def project(self, query, fields: list[str]) -> list[dict[str, Any]]:
+        """Return selected fields of all documents matching query.
+
+        Matching uses DID-python's search like :meth:`find`, but the
+        requested fields are extracted inside SQLite with ``json_extract``
+        so that whole documents are never materialized. If the database
+        layout is not the one expected, projection falls back to reading
+        the documents through DID-python.
+
+        Values are returned as stored, so a document written by MATLAB may
+        hold a single struct where Python writes a list.
+        """
+        if query is not None:
+            doc_ids = list(self._db.search(query, self._branch_id))
+        else:
+            doc_ids = list(self._db.get_doc_ids(self._branch_id))
+        if not doc_ids:
+            return []
+
+        rows = self._project_sql(doc_ids, fields)
+        if rows is None:
+            docs = self._db.get_docs(doc_ids, self._branch_id, OnMissing="ignore")
+            rows = [
+                project_properties(d.document_properties, fields) for d in docs if d is not None
+            ]
+        return rows
+
+    def _project_sql(self, doc_ids: list[str], fields: list[str]) -> list[dict[str, Any]] | None:
+        """Extract fields with SQL; return None if the fast path cannot be trusted."""
+        import sqlite3
+
+        paths = [_json_path(f) for f in fields]
+        columns = "".join(
+            ", json_extract(d.json_code, ?), json_type(d.json_code, ?)" for _ in paths
+        )
+        try:
+            conn = sqlite3.connect(f"{self._db_path.resolve().as_uri()}?mode=ro", uri=True)
+        except (sqlite3.Error, OSError):
+            return None
+
+        found: dict[str, dict[str, Any]] = {}
+        try:
+            with closing(conn):
+                doc_columns = {r[1] for r in conn.execute("PRAGMA table_info(docs)")}
+                if not {"doc_id", "json_code"} <= doc_columns:
+                    return None
+                branch_columns = {r[1] for r in conn.execute("PRAGMA table_info(branch_docs)")}
+                join, join_params = "", []
+                if "doc_idx" in doc_columns and {"branch_id", "doc_idx"} <= branch_columns:
+                    join = " JOIN branch_docs b ON b.doc_idx = d.doc_idx AND b.branch_id = ?"
+                    join_params = [self._branch_id]
+
+                path_params = [p for path in paths for p in (path, path)]
+                chunk_size = max(1, _MAX_PARAMS - len(path_params) - 2)
+                for start in range(0, len(doc_ids), chunk_size):
+                    chunk = doc_ids[start : start + chunk_size]
+                    marks = ",".join("?" * len(chunk))
+                    cursor = conn.execute(
+                        f"SELECT d.doc_id, json_extract(d.json_code, '$.base.id'){columns} "
+                        f"FROM docs d{join} WHERE d.doc_id IN ({marks})",
+                        (*path_params, *join_params, *chunk),
+                    )
+                    for doc_id, base_id, *values in cursor:
+                        # Several stored versions of one document, or a json_code
+                        # that is not the document itself: let DID-python decide
+                        if doc_id in found or base_id != doc_id:
+                            return None
+                        row = {}
+                        for field, value, kind in zip(fields, values[::2], values[1::2]):
+                            if kind in ("object", "array"):
+                                value = json_codec.loads(value)
+                            elif kind in ("true", "false"):
+                                value = kind == "true"
+                            row[field] = value
+                        found[doc_id] = row
+        except (sqlite3.Error, ValueError):
+            return None
+
+        if len(found) != len(set(doc_ids)):
+            return None
+        return [found[doc_id] for doc_id in doc_ids]
+
 
 class ndi_database:
     """NDI database interface.
@@ -193,11 +416,35 @@ class ndi_database:
         self._binary_dir = self.session_path / db_name / "files"
         self._binary_dir.mkdir(parents=True, exist_ok=True)
 
+        # Open unit of work, see transaction()
+        self._transaction: ndi_database_transaction | None = None
+
     @property
     def database_path(self) -> Path:
         """Path to the SQLite database file."""
         return self.session_path / self._db_name / "did-sqlite.sqlite"
 
+    @property
+    def change_counter(self) -> int:
+        """Number of writes made through this database object.
+
+        Python-specific: no MATLAB equivalent.
+        """
+        return self._driver.change_counter
+
+    def change_token(self) -> tuple:
+        """Return a value that changes whenever the database contents change.
+
+        Python-specific: no MATLAB equivalent. Combines
+        :attr:`change_counter` with the size and modification time of the
+        SQLite files, so writes made by other processes are noticed too.
+        Suitable as a key for caches of results derived from the database.
+        """
+        return (
+            self.change_counter,
+            *(tuple(st) if st else None for st in self._driver.file_stamp()),
+        )
+
     @property
     def binary_path(self) -> Path:
         """Path where binary files are stored."""
@@ -221,6 +468,9 @@ class ndi_database:
             doc = ndi_document({'base': {'id': '...', ...}})
             db.add(doc)
         """
+        if self._transaction is not None:
+            self._transaction.add(document)
+            return document
         try:
             self._driver.add(document.document_properties)
         except FileExistsError as exc:
@@ -268,6 +518,7 @@ class ndi_database:
             db.remove(doc)
             db.remove('abc123')
         """
+        self._check_no_transaction("remove")
         doc_id = document.id if isinstance(document, ndi_document) else document
         return self._driver.delete_by_id(doc_id)
 
@@ -288,6 +539,7 @@ class ndi_database:
             doc = doc.setproperties(**{'base.name': 'new_name'})
             db.update(doc)
         """
+        self._check_no_transaction("update")
         try:
             self._driver.update(document.document_properties)
         except FileNotFoundError as exc:
@@ -310,6 +562,7 @@ class ndi_database:
         Example:
             db.add_or_replace(doc)
         """
+        self._check_no_transaction("add_or_replace")
         existing = self._driver.find_by_id(document.id)
         if existing:
             self._driver.update(document.document_properties)
@@ -331,7 +584,9 @@ class ndi_database:
                       documents that are instances of that class.
 
         Returns:
-            List of matching Documents.
+            List of matching Documents. They are :class:`ndi_document_view`
+            objects, which copy the stored properties only when first
+            modified.
 
         Example:
             # Find all documents
@@ -358,8 +613,39 @@ class ndi_database:
         # Execute search
         results = self._driver.find(combined)
 
-        # Convert results to ndi.ndi_document
-        return [ndi_document(r) for r in results]
+        # Wrap results without copying them
+        return [ndi_document_view(r) for r in results]
+
+    def project(
+        self,
+        query: ndi_query | None = None,
+        fields: Iterable[str] = ("base.id",),
+        isa_class: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return selected fields of the documents matching a query.
+
+        Python-specific: no MATLAB equivalent. Much faster than
+        :meth:`search` when only a few fields are needed, because the
+        fields are extracted inside SQLite and no ndi_document objects
+        are built.
+
+        Args:
+            query: The ndi_query to match. If None, all documents match.
+            fields: Dotted field paths to return, e.g. ``'element.name'``.
+            isa_class: Optional class filter, as in :meth:`search`.
+
+        Returns:
+            One dict per matching document mapping each field path to its
+            value (None where the document lacks the field).
+
+        Example:
+            rows = db.project(isa_class='element', fields=['base.id', 'element.name'])
+        """
+        combined = query
+        if isa_class:
+            isa_query = ndi_query("").isa(isa_class)
+            combined = (combined & isa_query) if combined else isa_query
+        return self._driver.project(combined, list(fields))
 
     def find_by_id(self, doc_id: str) -> ndi_document | None:
         """Find a document by its ID.
@@ -383,6 +669,33 @@ class ndi_database:
         all_docs = self._driver.find(None)
         return [doc.get("base", {}).get("id", "") for doc in all_docs]
 
+    def iter_documents(
+        self, doc_ids: Iterable[str] | None = None, page_size: int = DEFAULT_PAGE_SIZE
+    ) -> Iterator[ndi_document]:
+        """Yield documents, reading them from the database a page at a time.
+
+        Python-specific: no MATLAB equivalent. Unlike :meth:`search`, at
+        most ``page_size`` documents are held in memory at once.
+
+        Args:
+            doc_ids: IDs of the documents to read (default: all). Missing
+                IDs are skipped.
+            page_size: Number of documents read per database call.
+
+        Yields:
+            The documents (as :class:`ndi_document_view`), in the order of
+            ``doc_ids``.
+        """
+        if doc_ids is None:
+            doc_ids = [row["base.id"] for row in self._driver.project(None, ["base.id"])]
+        doc_ids = list(doc_ids)
+        for i in range(0, len(doc_ids), page_size):
+            page = doc_ids[i : i + page_size]
+            found = self._driver.find_by_ids(page)
+            for doc_id in page:
+                if doc_id in found:
+                    yield ndi_document_view(found[doc_id])
+
     def numdocs(self) -> int:
         """Get the number of documents in the database.
 
@@ -412,7 +725,7 @@ class ndi_database:
             for doc in all_docs
             if any(
                 dep.get("value") == doc_id
-                for dep in doc.document_properties.get("depends_on", [])
+                for dep in doc.read_properties().get("depends_on", [])
                 if isinstance(dep, dict)
             )
         ]
@@ -458,6 +771,24 @@ class ndi_database:
             added.append(self.add(doc))
         return added
 
+    def bulk_add(self, documents: list[ndi_document]) -> tuple[int, int]:
+        """Add many documents, skipping those whose ID is already present.
+
+        Python-specific: no MATLAB equivalent. The existing IDs are read
+        once and the documents are written in large batches, instead of
+        the duplicate scan and write that :meth:`add` does per document.
+        Because present IDs are skipped, an interrupted bulk add can be
+        repeated.
+
+        Args:
+            documents: Documents to add.
+
+        Returns:
+            ``(added, skipped)`` counts.
+        """
+        self._check_no_transaction("bulk_add")
+        return self._driver.bulk_add([doc.document_properties for doc in documents])
+
     def remove_many(
         self, query: ndi_query | None = None, documents: list[ndi_document] | None = None
     ) -> int:
@@ -490,6 +821,98 @@ class ndi_database:
                 count += 1
         return count
 
+    # === File Index ===
+
+    def file_locations(
+        self,
+        uids: Iterable[str] | None = None,
+        doc_ids: Iterable[str] | None = None,
+        session_id: str | None = None,
+        ingest: bool | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return file location records from the file index.
+
+        Python-specific: no MATLAB equivalent. Each record describes one
+        ``files.file_info[].locations[]`` entry of a document, with keys
+        ``uid``, ``doc_id``, ``session_id``, ``name``, ``location``,
+        ``location_type``, ``ingest`` and ``delete_original``. The index
+        is maintained on add/update/remove and rebuilt automatically if
+        the database was changed by another program.
+
+        Args:
+            uids: Only records of these file UIDs.
+            doc_ids: Only records of these documents.
+            session_id: Only records of documents of this session.
+            ingest: Only records whose ingest flag has this value.
+
+        Returns:
+            List of location records.
+        """
+        return self._driver.file_index.rows(
+            uids=uids, doc_ids=doc_ids, session_id=session_id, ingest=ingest
+        )
+
+    def find_by_file_uids(
+        self, uids: Iterable[str], session_id: str | None = None
+    ) -> dict[str, tuple[ndi_document, str]]:
+        """Find the documents that hold files with the given UIDs.
+
+        Python-specific: no MATLAB equivalent. Bulk form of
+        :meth:`find_by_file_uid`; the documents are read in one call.
+
+        Args:
+            uids: File UIDs to look up.
+            session_id: If given, only documents of this session match.
+
+        Returns:
+            Dict mapping each UID that was found to ``(document, file_name)``.
+        """
+        records: dict[str, dict[str, Any]] = {}
+        for record in self.file_locations(uids=uids, session_id=session_id):
+            records.setdefault(record["uid"], record)
+        docs = self._driver.find_by_ids(list({r["doc_id"] for r in records.values()}))
+        return {
+            uid: (ndi_document(docs[r["doc_id"]]), r["name"])
+            for uid, r in records.items()
+            if r["doc_id"] in docs
+        }
+
+    def find_by_file_uid(
+        self, uid: str, session_id: str | None = None
+    ) -> tuple[ndi_document | None, str]:
+        """Find the document that holds a file with the given UID.
+
+        Python-specific: no MATLAB equivalent. Uses the file index
+        instead of scanning every document.
+
+        Args:
+            uid: File UID to look up.
+            session_id: If given, only documents of this session match.
+
+        Returns:
+            Tuple ``(document, file_name)``, or ``(None, '')`` if no
+            document holds the UID.
+        """
+        return self.find_by_file_uids([uid], session_id=session_id).get(uid, (None, ""))
+
+    def docs_with_files(
+        self, session_id: str | None = None, ingest: bool | None = None
+    ) -> list[str]:
+        """Return the IDs of documents that record at least one file location.
+
+        Python-specific: no MATLAB equivalent.
+
+        Args:
+            session_id: Only documents of this session.
+            ingest: If given, only documents with a location whose ingest
+                flag has this value.
+
+        Returns:
+            Document IDs in index order, without duplicates.
+        """
+        records = self.file_locations(session_id=session_id, ingest=ingest)
+        return list(dict.fromkeys(r["doc_id"] for r in records))
+
     # === File Management ===
 
     def get_binary_path(self, document: ndi_document, file_name: str) -> Path:
@@ -504,10 +927,177 @@ class ndi_database:
         """
         return self._binary_dir / f"{document.id}_{file_name}"
 
+    def copy_binary_file(self, source: str | Path, dest: str | Path) -> None:
+        """Copy a file into the database's binary directory.
+
+        Python-specific: no MATLAB equivalent. Inside :meth:`transaction`
+        the copy is staged and made when the transaction commits.
+
+        Args:
+            source: The file to copy.
+            dest: Its path in the binary directory (see
+                :meth:`get_binary_path`).
+        """
+        if self._transaction is not None:
+            self._transaction.add_file(source, dest)
+            return
+        import shutil
+
+        Path(dest).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(str(source), str(dest))
+
+    # === Transactions ===
+
+    @property
+    def in_transaction(self) -> bool:
+        """True while a :meth:`transaction` block is open.
+
+        Python-specific: no MATLAB equivalent.
+        """
+        return self._transaction is not None
+
+    @contextmanager
+    def transaction(self) -> Iterator["ndi_database_transaction"]:
+        """Group document additions and binary file copies into one unit of work.
+
+        Python-specific: no MATLAB equivalent. Inside the block,
+        :meth:`add` and :meth:`copy_binary_file` are staged. When the
+        block exits normally the files are copied and then all documents
+        are written in a single DID-python call. If the block raises,
+        nothing is written.
+
+        The unit of work is not atomic. DID-python owns the SQLite
+        connection, so the commit is not one SQLite transaction. If the
+        copy or the write fails, :meth:`ndi_database_transaction.commit`
+        removes the documents of the batch that reached the database and
+        deletes the files it copied. A process that dies during the
+        commit can leave part of the batch behind.
+
+        Staged documents are not visible to :meth:`search` or
+        :meth:`read` until the transaction commits, so keep the block
+        around the final writes of a batch, not around code that
+        searches for what it has just added. Only additions can be
+        staged: :meth:`update`, :meth:`remove`, :meth:`add_or_replace` and
+        :meth:`bulk_add` raise RuntimeError inside a transaction. A nested
+        ``transaction()`` joins the outer one.
+
+        Yields:
+            The open ndi_database_transaction.
+
+        Example:
+            with db.transaction():
+                for doc in docs:
+                    db.add(doc)
+        """
+        if self._transaction is not None:
+            yield self._transaction
+            return
+        tx = ndi_database_transaction(self)
+        self._transaction = tx
+        try:
+            yield tx
+        except BaseException:
+            self._transaction = None
+            tx.rollback()
+            raise
+        self._transaction = None
+        tx.commit()
+
+    def _check_no_transaction(self, operation: str) -> None:
+        if self._transaction is not None:
+            raise RuntimeError(
+                f"ndi_database.{operation}() cannot be used inside a transaction; "
+                f"only additions are staged"
+            )
+
     def __repr__(self) -> str:
         return f"ndi_database('{self.session_path}')"
 
 
+class ndi_database_transaction:
+    """Documents and binary files staged by :meth:`ndi_database.transaction`.
+
+    Python-specific: no MATLAB equivalent.
+
+    Args:
+        database: The database the transaction belongs to.
+    """
+
+    def __init__(self, database: ndi_database):
+        self._database = database
+        self.documents: list[ndi_document] = []
+        self.files: list[tuple[Path, Path]] = []
+        self._ids: set[str] | None = None
+
+    def add(self, document: ndi_document) -> None:
+        """Stage a document addition.
+
+        Raises:
+            ValueError: If the ID is already in the database or staged.
+        """
+        if self._ids is None:
+            self._ids = self._database._driver.doc_ids()
+        doc_id = document.id
+        if not doc_id:
+            raise ValueError("ndi_document must have a base.id")
+        if doc_id in self._ids:
+            raise ValueError(
+                f"ndi_document with ID {doc_id} already exists. "
+                f"Use update() or add_or_replace()."
+            )
+        self._ids.add(doc_id)
+        self.documents.append(document)
+
+    def add_file(self, source: str | Path, dest: str | Path) -> None:
+        """Stage a copy of *source* to *dest*."""
+        self.files.append((Path(source), Path(dest)))
+
+    def rollback(self) -> None:
+        """Discard everything staged."""
+        self.documents.clear()
+        self.files.clear()
+        self._ids = None
+
+    def commit(self) -> None:
+        """Copy the staged files, then write the staged documents.
+
+        If the write fails, the staged documents that reached the
+        database are removed again and the copied files deleted.
+
+        Raises:
+            OSError: If a file could not be copied; nothing is written.
+            ValueError: If a document ID was added to the database by
+                someone else in the meantime; nothing is written.
+        """
+        from .file.transfer import transfer_files
+
+        documents, files = list(self.documents), list(self.files)
+        self.rollback()
+        if not documents and not files:
+            return
+
+        driver = self._database._driver
+        created = [dest for _, dest in files if not dest.exists()]
+        try:
+            report = transfer_files(files, link=False)
+            if report.failed:
+                dest, error = report.failed[0]
+                raise OSError(f"Could not copy binary file to {dest}: {error}")
+            if documents:
+                try:
+                    driver.add_batch([doc.document_properties for doc in documents])
+                except FileExistsError as exc:
+                    raise ValueError(f"{exc}. Use update() or add_or_replace().") from exc
+                except BaseException:
+                    # None of these IDs were present before add_batch
+                    driver.remove_batch([doc.id for doc in documents])
+                    raise
+        except BaseException:
+            for dest in created:
+                dest.unlink(missing_ok=True)
+            raise
+
+
 # Convenience function
 def open_database(session_path: str | Path, **kwargs) -> ndi_database:
     """Open or create an NDI database.
@@ -0,0 +1,287 @@
+"""
+ndi.database_fileindex - Index of the file locations recorded in documents.
+
+Python-specific: no MATLAB equivalent.
+
+Every ``files.file_info[].locations[]`` entry of the documents in an NDI
+database is mirrored as one row of a small SQLite table, so that a file
+UID can be resolved to its document without scanning every document.
+
+The index lives next to the DID-python database file and records the
+size and modification time of that file after each update. Whenever the
+database has been written by something that did not update the index
+(another program, NDI-MATLAB, an older NDI-python), the recorded stamp no
+longer matches and the index is rebuilt on its next use, so lookups are
+never answered from stale rows.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+# SQLite limits the number of bound parameters per statement
+_MAX_PARAMS = 500
+
+COLUMNS = (
+    "uid",
+    "doc_id",
+    "session_id",
+    "name",
+    "location",
+    "location_type",
+    "ingest",
+    "delete_original",
+)
+
+
+def _as_list(value: Any) -> list:
+    """Normalize a MATLAB-style single struct to a list."""
+    if isinstance(value, dict):
+        return [value]
+    return value if isinstance(value, list) else []
+
+
+def _flag(value: Any) -> int:
+    if isinstance(value, str):
+        return int(value.strip().lower() in ("1", "true"))
+    return int(bool(value))
+
+
+def file_rows(doc_id: str, session_id: str | None, file_info: Any) -> list[tuple]:
+    """Return the index rows of one document's ``files.file_info``.
+
+    Args:
+        doc_id: The document ID.
+        session_id: The document's ``base.session_id``.
+        file_info: The ``files.file_info`` value (list or single dict).
+
+    Returns:
+        One tuple per file location that has a UID, ordered as
+        :data:`COLUMNS`.
+    """
+    rows = []
+    for fi in _as_list(file_info):
+        if not isinstance(fi, dict):
+            continue
+        name = fi.get("name", "") or ""
+        for loc in _as_list(fi.get("locations")):
+            if not isinstance(loc, dict) or not loc.get("uid"):
+                continue
+            rows.append(
+                (
+                    str(loc["uid"]),
+                    doc_id,
+                    session_id or "",
+                    name,
+                    str(loc.get("location", "") or ""),
+                    str(loc.get("location_type", "") or ""),
+                    _flag(loc.get("ingest", False)),
+                    _flag(loc.get("delete_original", False)),
+                )
+            )
+    return rows
+
+
+class ndi_database_fileindex:
+    """SQLite table mapping file UIDs to documents and file locations.
+
+    Args:
+        path: Location of the index file. If it cannot be opened, the
+            index is kept in memory instead.
+        stamp: Callable returning the current stamp of the indexed
+            database (any JSON-serializable value).
+        source: Callable yielding ``(doc_id, session_id, file_info)`` for
+            every document of the database; used to rebuild the index.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        stamp: Callable[[], Any],
+        source: Callable[[], Iterable[tuple[str, str | None, Any]]],
+    ):
+        self.path = Path(path)
+        self._stamp = stamp
+        self._source = source
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.RLock()
+
+    @property
+    def is_open(self) -> bool:
+        """True once the index has been used in this process."""
+        return self._conn is not None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+        schema = (
+            "CREATE TABLE IF NOT EXISTS file_index ("
+            "uid TEXT NOT NULL, doc_id TEXT NOT NULL, session_id TEXT, name TEXT, "
+            "location TEXT, location_type TEXT, ingest INTEGER, delete_original INTEGER)",
+            "CREATE INDEX IF NOT EXISTS file_index_uid ON file_index (uid)",
+            "CREATE INDEX IF NOT EXISTS file_index_doc ON file_index (doc_id)",
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+        )
+        try:
+            conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in schema:
+                conn.execute(statement)
+            conn.commit()
+        except (sqlite3.Error, OSError):
+            # Read-only session directory: keep the index for this process only
+            conn = sqlite3.connect(":memory:", check_same_thread=False)
+            for statement in schema:
+                conn.execute(statement)
+        self._conn = conn
+        return conn
+
+    def _stored_stamp(self, conn: sqlite3.Connection) -> Any:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'stamp'").fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def _set_stamp(self, conn: sqlite3.Connection, stamp: Any) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('stamp', ?)", (json.dumps(stamp),)
+        )
+
+    def _current(self) -> sqlite3.Connection:
+        """Return the connection, rebuilding the index first if it is stale."""
+        conn = self._connect()
+        stamp = json.loads(json.dumps(self._stamp()))
+        if self._stored_stamp(conn) != stamp:
+            rows = [r for doc in self._source() for r in file_rows(*doc)]
+            with conn:
+                conn.execute("DELETE FROM file_index")
+                conn.executemany(
+                    f"INSERT INTO file_index VALUES ({','.join('?' * len(COLUMNS))})", rows
+                )
+                self._set_stamp(conn, stamp)
+        return conn
+
+    def rebuild(self) -> None:
+        """Rebuild the index from the database on its next use."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM meta WHERE key = 'stamp'")
+
+    def apply(
+        self,
+        before: Any,
+        after: Any,
+        removed: Iterable[str] = (),
+        added: Iterable[dict] = (),
+    ) -> None:
+        """Record a write made to the database.
+
+        Does nothing unless the index is open; an index that was not
+        maintained is rebuilt on its next use.
+
+        Args:
+            before: Database stamp taken just before the write.
+            after: Database stamp taken just after the write.
+            removed: IDs of documents removed or replaced by the write.
+            added: document_properties of documents added by the write.
+        """
+        if self._conn is None:
+            return
+        with self._lock:
+            conn = self._conn
+            try:
+                with conn:
+                    if self._stored_stamp(conn) != json.loads(json.dumps(before)):
+                        # Changed behind our back: leave it to be rebuilt
+                        conn.execute("DELETE FROM meta WHERE key = 'stamp'")
+                        return
+                    removed = list(removed)
+                    for i in range(0, len(removed), _MAX_PARAMS):
+                        chunk = removed[i : i + _MAX_PARAMS]
+                        conn.execute(
+                            f"DELETE FROM file_index WHERE doc_id IN ({','.join('?' * len(chunk))})",
+                            chunk,
+                        )
+                    rows = []
+                    for props in added:
+                        base = props.get("base", {})
+                        files = props.get("files", {})
+                        if isinstance(files, dict):
+                            rows.extend(
+                                file_rows(
+                                    base.get("id", ""),
+                                    base.get("session_id"),
+                                    files.get("file_info"),
+                                )
+                            )
+                    conn.executemany(
+                        f"INSERT INTO file_index VALUES ({','.join('?' * len(COLUMNS))})", rows
+                    )
+                    self._set_stamp(conn, after)
+            except sqlite3.Error:
+                pass  # The stamp is unchanged, so the next use rebuilds
+
+    def rows(
+        self,
+        uids: Iterable[str] | None = None,
+        doc_ids: Iterable[str] | None = None,
+        session_id: str | None = None,
+        ingest: bool | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return index rows, optionally filtered.
+
+        Args:
+            uids: Only rows of these file UIDs.
+            doc_ids: Only rows of these documents (combined with ``uids``
+                if both are given).
+            session_id: Only rows of documents of this session.
+            ingest: Only rows whose ingest flag has this value.
+
+        Returns:
+            List of dicts with the keys of :data:`COLUMNS`.
+        """
+        where, params = [], []
+        if session_id is not None:
+            where.append("session_id = ?")
+            params.append(session_id)
+        if ingest is not None:
+            where.append("ingest = ?")
+            params.append(int(ingest))
+
+        with self._lock:
+            conn = self._current()
+            if uids is None and doc_ids is None:
+                return self._select(conn, where, params)
+            column, values = ("uid", uids) if uids is not None else ("doc_id", doc_ids)
+            values = list(dict.fromkeys(values))
+            found = []
+            for i in range(0, len(values), _MAX_PARAMS):
+                chunk = values[i : i + _MAX_PARAMS]
+                clause = f"{column} IN ({','.join('?' * len(chunk))})"
+                found.extend(self._select(conn, [*where, clause], [*params, *chunk]))
+        if uids is not None and doc_ids is not None:
+            wanted = set(doc_ids)
+            found = [row for row in found if row["doc_id"] in wanted]
+        return found
+
+    @staticmethod
+    def _select(conn: sqlite3.Connection, where: list[str], params: list) -> list[dict[str, Any]]:
+        sql = f"SELECT {', '.join(COLUMNS)} FROM file_index"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        rows = conn.execute(sql + " ORDER BY rowid", params).fetchall()
+        return [
+            {**dict(zip(COLUMNS, r)), "ingest": bool(r[6]), "delete_original": bool(r[7])}
+            for r in rows
+        ]
+
+    def close(self) -> None:
+        """Close the index connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
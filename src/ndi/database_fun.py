@@ -425,7 +425,17 @@ def copy_session_to_dataset(
             stacklevel=2,
         )
 
-    # Add documents to the dataset
+    # Add documents to the dataset: in bulk when it has an NDI database,
+    # which skips documents already copied by an interrupted earlier call
+    from .database import ndi_database
+
+    database = getattr(getattr(ndi_dataset_obj, "_session", None), "_database", None)
+    if isinstance(database, ndi_database):
+        try:
+            database.bulk_add(all_docs)
+            return True, ""
+        except Exception:
+            pass
     for doc in all_docs:
         try:
             ndi_dataset_obj.database_add(doc)
@@ -641,9 +651,69 @@ def read_presentation_time_structure(
 # =========================================================================
 
 
+# Documents read per page and concurrent writers used by the exporters
+EXPORT_PAGE_SIZE = 1000
+EXPORT_WORKERS = 8
+
+
+def _iter_base_documents(session: Any, page_size: int) -> Any:
+    """Yield all documents of a session, paging through its database if possible."""
+    from .database import ndi_database
+    from .query import ndi_query
+
+    database = getattr(session, "_database", None)
+    if isinstance(database, ndi_database) and hasattr(session, "database_project"):
+        rows = session.database_project(ndi_query("").isa("base"), ["base.id"])
+        yield from database.iter_documents([r["base.id"] for r in rows], page_size)
+    else:
+        yield from session.database_search(ndi_query("").isa("base"))
+
+
+def _pages(items: Any, size: int) -> Any:
+    """Split an iterable into lists of at most *size* items."""
+    import itertools
+
+    it = iter(items)
+    while page := list(itertools.islice(it, size)):
+        yield page
+
+
+def _copy_binary(fobj: Any, dest: Any) -> None:
+    """Write an open binary document file to the path *dest* without loading it whole.
+
+    Files opened from disk are copied with ``shutil.copyfile``, which uses
+    ``os.sendfile`` where available; other streams are copied in chunks.
+    """
+    import io
+    import os
+    import shutil
+
+    name = getattr(fobj, "name", None)
+    if isinstance(name, str) and os.path.isfile(name):
+        shutil.copyfile(name, dest)
+        return
+    with open(dest, "wb") as out:
+        if isinstance(fobj, io.IOBase):
+            shutil.copyfileobj(fobj, out)
+        else:
+            out.write(fobj.read())
+
+
+def _binary_names(props: dict) -> list[str]:
+    files_info = props.get("files", {})
+    if not isinstance(files_info, dict):
+        return []
+    return [name for name in files_info.get("file_list", []) if name]
+
+
 def database2json(
     session: Any,
     output_path: str,
+    indent: int | None = 2,
+    output_format: str = "dir",
+    include_files: bool = False,
+    page_size: int = EXPORT_PAGE_SIZE,
+    max_workers: int = EXPORT_WORKERS,
 ) -> int:
     """Export all session documents to JSON files in a directory.
 
@@ -651,33 +721,128 @@ def database2json(
 
     Each document is written as ``{doc_id}.json``.
 
+    Python-specific options: documents are read from the database a page
+    at a time and written by a thread pool. ``output_format='jsonl'``
+    writes one compact document per line to the single file
+    ``output_path``; ``output_format='tar'`` writes the ``{doc_id}.json``
+    members to the tar file ``output_path`` (gzip-compressed if it ends
+    in ``.gz`` or ``.tgz``). With ``include_files``, binary files are
+    exported as ``{doc_id}/{file_name}`` next to the JSON files (or tar
+    members), copied without being loaded into memory.
+
     Args:
         session: An NDI session instance.
-        output_path: Directory path to write JSON files.
+        output_path: Directory path to write JSON files (or the output
+            file for the ``'jsonl'`` and ``'tar'`` formats).
+        indent: JSON indentation; None writes compact JSON.
+        output_format: ``'dir'``, ``'jsonl'`` or ``'tar'``.
+        include_files: Also export the documents' binary files.
+        page_size: Documents read per database call.
+        max_workers: Number of concurrent writers.
 
     Returns:
         Number of documents exported.
+
+    Raises:
+        ValueError: If ``output_format`` is unknown, or binary files are
+            requested with the ``'jsonl'`` format.
     """
-    import json
+    import os
+    import tarfile
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from io import BytesIO
     from pathlib import Path
 
-    from .query import ndi_query
+    from .util import json_codec
 
-    out = Path(output_path)
-    out.mkdir(parents=True, exist_ok=True)
+    if output_format not in ("dir", "jsonl", "tar"):
+        raise ValueError(f"Unknown output_format {output_format!r}; use 'dir', 'jsonl' or 'tar'.")
+    if output_format == "jsonl":
+        if include_files:
+            raise ValueError("Binary files cannot be exported to a JSON-lines file.")
+        indent = None
 
-    docs = session.database_search(ndi_query("").isa("base"))
+    out = Path(output_path)
+    if output_format == "dir":
+        out.mkdir(parents=True, exist_ok=True)
+    else:
+        out.parent.mkdir(parents=True, exist_ok=True)
 
-    count = 0
-    for doc in docs:
+    def encode(item: tuple[int, Any]) -> tuple[Any, dict, str, bytes] | None:
+        number, doc = item
         props = doc.document_properties if hasattr(doc, "document_properties") else doc
         if not isinstance(props, dict):
-            continue
-        doc_id = props.get("base", {}).get("id", f"doc_{count}")
-        filepath = out / f"{doc_id}.json"
-        with open(filepath, "w") as f:
-            json.dump(props, f, indent=2, default=str)
-        count += 1
+            return None
+        doc_id = props.get("base", {}).get("id", f"doc_{number}")
+        return doc, props, doc_id, json_codec.dumpb(props, indent=indent, default=str)
+
+    def write(encoded: tuple[Any, dict, str, bytes]) -> None:
+        doc, props, doc_id, data = encoded
+        (out / f"{doc_id}.json").write_bytes(data)
+        if include_files:
+            for fname in _binary_names(props):
+                try:
+                    fobj = session.database_openbinarydoc(doc, fname)
+                    try:
+                        (out / doc_id).mkdir(exist_ok=True)
+                        _copy_binary(fobj, out / doc_id / fname)
+                    finally:
+                        if hasattr(fobj, "close"):
+                            fobj.close()
+                except Exception:
+                    pass
+
+    def add_member(archive: tarfile.TarFile, name: str, fobj: Any, size: int) -> None:
+        info = tarfile.TarInfo(name)
+        info.size = size
+        info.mtime = int(time.time())
+        archive.addfile(info, fobj)
+
+    def add_binary(archive: tarfile.TarFile, doc: Any, doc_id: str, fname: str) -> None:
+        try:
+            fobj = session.database_openbinarydoc(doc, fname)
+        except Exception:
+            return
+        try:
+            try:
+                size = os.fstat(fobj.fileno()).st_size
+            except (AttributeError, OSError, ValueError):
+                data = fobj.read()
+                fobj, size = BytesIO(data), len(data)
+            add_member(archive, f"{doc_id}/{fname}", fobj, size)
+        finally:
+            if hasattr(fobj, "close"):
+                fobj.close()
+
+    count = 0
+    numbered = enumerate(_iter_base_documents(session, page_size))
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        if output_format == "dir":
+            for page in _pages(numbered, page_size):
+                encoded = [e for e in pool.map(encode, page) if e is not None]
+                list(pool.map(write, encoded))
+                count += len(encoded)
+        elif output_format == "jsonl":
+            with open(out, "wb") as f:
+                for page in _pages(numbered, page_size):
+                    for e in pool.map(encode, page):
+                        if e is not None:
+                            f.write(e[3] + b"\n")
+                            count += 1
+        else:
+            mode = "w:gz" if out.name.endswith((".gz", ".tgz")) else "w"
+            with tarfile.open(out, mode) as archive:
+                for page in _pages(numbered, page_size):
+                    for e in pool.map(encode, page):
+                        if e is None:
+                            continue
+                        doc, props, doc_id, data = e
+                        add_member(archive, f"{doc_id}.json", BytesIO(data), len(data))
+                        if include_files:
+                            for fname in _binary_names(props):
+                                add_binary(archive, doc, doc_id, fname)
+                        count += 1
 
     return count
 
@@ -702,21 +867,20 @@ def copydocfile2temp(
         Tuple of ``(temp_path, temp_path_without_extension)``.
         The caller should delete the temp file when finished.
     """
+    import os
     import tempfile
 
     f = session.database_openbinarydoc(doc, filename)
-    data = f.read()
-    if hasattr(f, "close"):
-        f.close()
 
     # Create temp file
     fd, base_path = tempfile.mkstemp(suffix=extension)
-    import os
-
     os.close(fd)
 
-    with open(base_path, "wb") as out:
-        out.write(data)
+    try:
+        _copy_binary(f, base_path)
+    finally:
+        if hasattr(f, "close"):
+            f.close()
 
     # Compute path without extension
     if extension:
@@ -730,23 +894,31 @@ def copydocfile2temp(
 def extract_doc_files(
     session: Any,
     target_path: str | None = None,
+    indent: int | None = 2,
+    max_workers: int = EXPORT_WORKERS,
 ) -> tuple[list[Any], str]:
     """Extract all documents and their binary files to a directory.
 
     MATLAB equivalent: ndi.database.fun.extract_doc_files
 
+    Python-specific: the documents are written by a thread pool and
+    binary files are copied without being loaded into memory.
+
     Args:
         session: An NDI session or dataset.
         target_path: Directory to write files. If None, creates a temp dir.
+        indent: JSON indentation; None writes compact JSON.
+        max_workers: Number of concurrent writers.
 
     Returns:
         Tuple of ``(documents, target_path)``.
     """
-    import json
     import tempfile
+    from concurrent.futures import ThreadPoolExecutor
     from pathlib import Path
 
     from .query import ndi_query
+    from .util import json_codec
 
     if target_path is None:
         target_path = tempfile.mkdtemp(prefix="ndi_extract_")
@@ -756,37 +928,34 @@ def extract_doc_files(
 
     docs = session.database_search(ndi_query("").isa("base"))
 
-    for doc in docs:
+    def extract(doc: Any) -> None:
         props = doc.document_properties if hasattr(doc, "document_properties") else doc
         if not isinstance(props, dict):
-            continue
+            return
 
         doc_id = props.get("base", {}).get("id", "")
         if not doc_id:
-            continue
+            return
 
         # Write JSON
         doc_dir = out / doc_id
         doc_dir.mkdir(parents=True, exist_ok=True)
 
-        with open(doc_dir / "document.json", "w") as f:
-            json.dump(props, f, indent=2, default=str)
+        json_codec.dump(props, doc_dir / "document.json", indent=indent, default=str)
 
         # Copy binary files
-        files_info = props.get("files", {})
-        if isinstance(files_info, dict):
-            file_list = files_info.get("file_list", [])
-            for fname in file_list:
-                if not fname:
-                    continue
+        for fname in _binary_names(props):
+            try:
+                fobj = session.database_openbinarydoc(doc, fname)
                 try:
-                    fobj = session.database_openbinarydoc(doc, fname)
-                    data = fobj.read()
+                    _copy_binary(fobj, doc_dir / fname)
+                finally:
                     if hasattr(fobj, "close"):
                         fobj.close()
-                    with open(doc_dir / fname, "wb") as bf:
-                        bf.write(data)
-                except Exception:
-                    pass
+            except Exception:
+                pass
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        list(pool.map(extract, docs))
 
     return docs, target_path
@@ -124,14 +124,28 @@ class ndi_dataset:
 
         return self
 
-    def add_ingested_session(self, session: Any) -> ndi_dataset:
+    def add_ingested_session(
+        self,
+        session: Any,
+        link: bool = True,
+        max_workers: int | None = None,
+    ) -> ndi_dataset:
         """
         Ingest a session into this dataset by copying documents.
 
         MATLAB equivalent: ``ndi.dataset/add_ingested_session``
 
+        Python-specific: the documents are added in bulk and the binary
+        files are cloned or hardlinked where the filesystem allows it and
+        copied in parallel otherwise (see ``ndi.file.transfer``).
+        Documents and files already present are skipped, so an interrupted
+        ingestion can be resumed by calling this method again.
+
         Args:
             session: ndi_session object to ingest
+            link: Allow hardlinking binary files on the same filesystem
+            max_workers: Number of concurrent file copies
+                (default: ``ndi.file.transfer.DEFAULT_COPY_WORKERS``)
 
         Returns:
             self for chaining
@@ -140,6 +154,8 @@ class ndi_dataset:
             ValueError: If the session is already part of this dataset
             ValueError: If the session is not fully ingested
         """
+        from ..file.transfer import DEFAULT_COPY_WORKERS, transfer_files
+
         if not self._session_array:
             self.build_session_info()
 
@@ -158,21 +174,40 @@ class ndi_dataset:
             )
 
         # Copy all documents from source session into the dataset's database.
-        # We add directly via _database.add() because session.database_add()
+        # We add directly to the database because session.database_add()
         # enforces session_id == self._session.id(), but ingested docs retain
         # their *original* session_id so we can tell which session they came from.
         # Binary files are also copied from the source session.
         all_docs = session.database_search(ndi_query("").isa("base"))
         ingestion_failures: list[tuple[str, str]] = []
+        try:
+            self._session._database.bulk_add(all_docs)
+        except Exception:
+            # Add one at a time to find out which documents fail
+            for doc in all_docs:
+                try:
+                    self._session._database.bulk_add([doc])
+                except Exception as exc:
+                    doc_id = ndi_dataset_dir._get_doc_id(doc)
+                    ingestion_failures.append((doc_id, str(exc)))
+
+        owners: dict[str, str] = {}
+        pairs = []
         for doc in all_docs:
-            try:
-                self._session._database.add(doc)
-                self._copy_binary_files(session, doc)
-            except FileExistsError:
-                pass  # Re-ingestion duplicates are expected
-            except Exception as exc:
-                doc_id = ndi_dataset_dir._get_doc_id(doc)
-                ingestion_failures.append((doc_id, str(exc)))
+            for src_path, dest_path in self._binary_file_pairs(session, doc):
+                owners[str(dest_path)] = ndi_dataset_dir._get_doc_id(doc)
+                pairs.append((src_path, dest_path))
+        report = transfer_files(pairs, link=link, max_workers=max_workers or DEFAULT_COPY_WORKERS)
+        logger.info(
+            "Ingested session %s: %d files reflinked, %d hardlinked, %d copied, %d present",
+            session.id(),
+            report.reflinked,
+            report.hardlinked,
+            report.copied,
+            report.skipped,
+        )
+        ingestion_failures.extend((owners[dest], err) for dest, err in report.failed)
+
         if ingestion_failures:
             failure_details = "\n".join(
                 f"  - {doc_id}: {err}" for doc_id, err in ingestion_failures[:20]
@@ -410,6 +445,75 @@ class ndi_dataset:
 
         return results
 
+    def _linked_sessions(self) -> list[Any]:
+        """Return the opened linked session objects."""
+        self._open_linked_sessions()
+        sessions = []
+        for i, si in enumerate(self._session_info):
+            if si.get("is_linked", False):
+                sa = self._session_array[i] if i < len(self._session_array) else None
+                if sa and sa.get("session") is not None:
+                    sessions.append(sa["session"])
+        return sessions
+
+    def database_project(self, query: ndi_query, fields: list[str]) -> list[dict[str, Any]]:
+        """Return selected fields of matching documents in the dataset.
+
+        Python-specific: no MATLAB equivalent. Covers the same documents
+        as :meth:`database_search` (the dataset database and all linked
+        sessions) but returns one dict of field values per document.
+        """
+        if self._session._database is None:
+            results: list[dict[str, Any]] = []
+        else:
+            results = list(self._session._database.project(query, fields))
+
+        for session in self._linked_sessions():
+            try:
+                results.extend(session.database_project(query, fields))
+            except Exception:
+                pass
+
+        return results
+
+    def database_find_by_file_uids(self, uids: list[str]) -> dict[str, tuple[ndi_document, str]]:
+        """Find the documents in the dataset that hold files with the given UIDs.
+
+        Python-specific: no MATLAB equivalent. Looks in the dataset
+        database first, then in the linked sessions.
+        """
+        pending = list(dict.fromkeys(uids))
+        found: dict[str, tuple[ndi_document, str]] = {}
+        if self._session._database is not None:
+            found.update(self._session._database.find_by_file_uids(pending))
+        for session in self._linked_sessions():
+            pending = [uid for uid in pending if uid not in found]
+            if not pending:
+                break
+            try:
+                found.update(session.database_find_by_file_uids(pending))
+            except Exception:
+                pass
+        return found
+
+    def database_find_by_file_uid(self, uid: str) -> tuple[ndi_document | None, str]:
+        """Find the document in the dataset that holds a file with the given UID.
+
+        Python-specific: no MATLAB equivalent.
+        """
+        return self.database_find_by_file_uids([uid]).get(uid, (None, ""))
+
+    def database_change_token(self) -> Any:
+        """Return a value that changes whenever any dataset database changes.
+
+        Python-specific: no MATLAB equivalent. Combines the change tokens
+        of the dataset database and of every linked session.
+        """
+        tokens = [self._session.database_change_token()]
+        for session in self._linked_sessions():
+            tokens.append((session.id(), session.database_change_token()))
+        return tuple(tokens)
+
     def database_openbinarydoc(
         self,
         doc_or_id: Any,
@@ -527,7 +631,7 @@ class ndi_dataset:
 
         self._session_info = []
         for doc in info_docs:
-            props = doc.document_properties.get("session_in_a_dataset", {})
+            props = doc.read_properties().get("session_in_a_dataset", {})
             info = dict(props)
             info["session_doc_in_dataset_id"] = doc.id
             self._session_info.append(info)
@@ -692,36 +796,33 @@ class ndi_dataset:
 
         return None
 
-    def _copy_binary_files(self, source_session: Any, doc: ndi_document) -> None:
-        """Copy binary file attachments from a source session to this dataset."""
-        import shutil
-
+    def _binary_file_pairs(self, source_session: Any, doc: ndi_document) -> list[tuple[Path, Path]]:
+        """(source, destination) paths of a document's binary files in this dataset."""
         if self._session._database is None:
-            return
+            return []
         props = doc.document_properties
         files = props.get("files", {})
         if not isinstance(files, dict):
-            return
+            return []
+        pairs = []
         for fi in files.get("file_info", []):
             name = fi.get("name", "")
             if not name:
                 continue
+            dest_path = self._session._database.get_binary_path(doc, name)
             if hasattr(source_session, "_database") and source_session._database is not None:
                 src_path = source_session._database.get_binary_path(doc, name)
                 if src_path.exists():
-                    dest_path = self._session._database.get_binary_path(doc, name)
-                    dest_path.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(str(src_path), str(dest_path))
+                    pairs.append((src_path, dest_path))
                     continue
             for loc in fi.get("locations", []):
                 source = loc.get("location", "")
                 if source:
                     src_path = Path(source)
                     if src_path.exists():
-                        dest_path = self._session._database.get_binary_path(doc, name)
-                        dest_path.parent.mkdir(parents=True, exist_ok=True)
-                        shutil.copy2(str(src_path), str(dest_path))
+                        pairs.append((src_path, dest_path))
                         break
+        return pairs
 
     def _open_linked_sessions(self) -> None:
         """Ensure all linked sessions are open and cached.
@@ -939,7 +1040,7 @@ class ndi_dataset_dir(ndi_dataset):
         tracked_docs = self._session.database_search(q_tracked)
         tracked_ids: set[str] = set()
         for doc in tracked_docs:
-            props = doc.document_properties.get("session_in_a_dataset", {})
+            props = doc.read_properties().get("session_in_a_dataset", {})
             sid = props.get("session_id", "")
             if sid:
                 tracked_ids.add(sid)
@@ -951,7 +1052,7 @@ class ndi_dataset_dir(ndi_dataset):
         ds_session_id = self._session.id()
 
         for sdoc in session_docs:
-            props = sdoc.document_properties
+            props = sdoc.read_properties()
             sid = props.get("base", {}).get("session_id", "")
             if not sid or sid == ds_session_id or sid in tracked_ids:
                 continue
@@ -11,18 +11,17 @@ Important Rules for Creating Documents:
 3. When specifying document_type, use the name without '.json' extension.
 """
 
-import json
+import importlib.util
 from copy import deepcopy
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional, Union
+from typing import TYPE_CHECKING, Any, Optional, Union
 
-try:
+if TYPE_CHECKING:
     import pandas as pd
 
-    HAS_PANDAS = True
-except ImportError:
-    HAS_PANDAS = False
+# pandas is only needed by to_table, which imports it on first use
+HAS_PANDAS = importlib.util.find_spec("pandas") is not None
 
 try:
     from did.document import Document as DIDDocument
@@ -31,6 +30,44 @@ except ImportError:
 
 from .common import ndi_common_PathConstants, timestamp
 from .ido import ndi_ido
+from .util import json_codec
+
+
+def _as_list(value: Any) -> list:
+    """Return a depends_on / file_info value as a list (MATLAB may store a bare dict)."""
+    if isinstance(value, dict):
+        return [value]
+    return value if isinstance(value, list) else []
+
+
+def _normalize(props: dict) -> None:
+    """Turn single-dict depends_on, file_info and superclasses into lists, in place."""
+    dep = props.get("depends_on")
+    if isinstance(dep, dict):
+        props["depends_on"] = [dep]
+
+    files = props.get("files")
+    if isinstance(files, dict):
+        fi = files.get("file_info")
+        if isinstance(fi, dict):
+            files["file_info"] = [fi]
+
+    dc = props.get("document_class")
+    if isinstance(dc, dict):
+        sc = dc.get("superclasses")
+        if isinstance(sc, dict):
+            dc["superclasses"] = [sc]
+
+
+def _is_normalized(props: dict) -> bool:
+    """Return True if :func:`_normalize` would leave *props* unchanged."""
+    if isinstance(props.get("depends_on"), dict):
+        return False
+    files = props.get("files")
+    if isinstance(files, dict) and isinstance(files.get("file_info"), dict):
+        return False
+    dc = props.get("document_class")
+    return not (isinstance(dc, dict) and isinstance(dc.get("superclasses"), dict))
 
 
 class ndi_document:
@@ -75,8 +112,9 @@ class ndi_document:
             self._document_properties = deepcopy(document_type)
             self._normalize_depends_on()
         elif isinstance(document_type, ndi_document):
-            # Copy from another ndi_document
-            self._document_properties = deepcopy(document_type.document_properties)
+            # Copy from another ndi_document (views are copied without promoting them)
+            self._document_properties = deepcopy(document_type._properties())
+            self._normalize_depends_on()
         elif DIDDocument is not None and isinstance(document_type, DIDDocument):
             # Convert from DIDDocument
             self._document_properties = deepcopy(document_type.document_properties)
@@ -106,36 +144,41 @@ class ndi_document:
         ``_get_superclass_str`` and all NDI code that iterates over these
         fields) always sees a list.
         """
-        dep = self._document_properties.get("depends_on")
-        if isinstance(dep, dict):
-            self._document_properties["depends_on"] = [dep]
-
-        files = self._document_properties.get("files")
-        if isinstance(files, dict):
-            fi = files.get("file_info")
-            if isinstance(fi, dict):
-                files["file_info"] = [fi]
-
-        dc = self._document_properties.get("document_class")
-        if isinstance(dc, dict):
-            sc = dc.get("superclasses")
-            if isinstance(sc, dict):
-                dc["superclasses"] = [sc]
+        _normalize(self._document_properties)
 
     @property
     def document_properties(self) -> dict:
         """The document's properties as a nested dictionary."""
         return self._document_properties
 
+    def _properties(self) -> dict:
+        """Return the properties for reading only; the result must not be modified.
+
+        Read accessors use this instead of ``_document_properties`` so
+        that they do not promote an :class:`ndi_document_view`.
+        """
+        return self._document_properties
+
+    def read_properties(self) -> dict:
+        """Return the document's properties for reading only.
+
+        Python-specific: no MATLAB equivalent.
+
+        Unlike :attr:`document_properties` this does not copy a document
+        returned by a search (:class:`ndi_document_view`). The result must
+        not be modified.
+        """
+        return self._properties()
+
     @property
     def id(self) -> str:
         """Return the document's unique identifier."""
-        return self._document_properties.get("base", {}).get("id", "")
+        return self._properties().get("base", {}).get("id", "")
 
     @property
     def session_id(self) -> str:
         """Return the document's session identifier."""
-        return self._document_properties.get("base", {}).get("session_id", "")
+        return self._properties().get("base", {}).get("session_id", "")
 
     def set_session_id(self, session_id: str) -> "ndi_document":
         """Set the session ID for this document.
@@ -175,7 +218,7 @@ class ndi_document:
             The property value or default.
         """
         parts = path.split(".")
-        obj = self._document_properties
+        obj = self._properties()
         for part in parts:
             if isinstance(obj, dict) and part in obj:
                 obj = obj[part]
@@ -191,7 +234,7 @@ class ndi_document:
         Returns:
             True if document has files, False otherwise.
         """
-        files = self._document_properties.get("files", {})
+        files = self._properties().get("files", {})
         file_info = files.get("file_info", [])
         return bool(file_info)
 
@@ -342,9 +385,10 @@ class ndi_document:
         Returns:
             List of file names that have been added to the document.
         """
-        if "files" not in self._document_properties:
+        props = self._properties()
+        if "files" not in props:
             return []
-        file_info = self._document_properties["files"].get("file_info", [])
+        file_info = _as_list(props["files"].get("file_info", []))
         return [fi["name"] for fi in file_info]
 
     # === Dependency Management ===
@@ -375,7 +419,7 @@ class ndi_document:
         Raises:
             KeyError: If dependency not found and error_if_not_found is True.
         """
-        depends_on = self._document_properties.get("depends_on", [])
+        depends_on = _as_list(self._properties().get("depends_on", []))
 
         for dep in depends_on:
             if dep["name"].lower() == dependency_name.lower():
@@ -399,7 +443,7 @@ class ndi_document:
         Returns:
             List of dependency values in order.
         """
-        depends_on = self._document_properties.get("depends_on", [])
+        depends_on = _as_list(self._properties().get("depends_on", []))
         values = []
         i = 1
         while True:
@@ -474,7 +518,7 @@ class ndi_document:
         Returns:
             The class name (e.g., 'base', 'element', 'stimulus').
         """
-        return self._document_properties.get("document_class", {}).get("class_name", "")
+        return self._properties().get("document_class", {}).get("class_name", "")
 
     def doc_superclass(self) -> list[str]:
         """Get the document's superclasses.
@@ -482,7 +526,7 @@ class ndi_document:
         Returns:
             List of superclass names.
         """
-        doc_class = self._document_properties.get("document_class", {})
+        doc_class = self._properties().get("document_class", {})
         superclasses = doc_class.get("superclasses", [])
 
         # MATLAB may store superclasses as a single dict instead of a list
@@ -526,8 +570,7 @@ class ndi_document:
         """
 
         Path(filename).parent.mkdir(parents=True, exist_ok=True)
-        with open(filename, "w") as f:
-            json.dump(self._document_properties, f, indent=indent)
+        json_codec.dump(self._properties(), filename, indent=indent)
 
     def remove_dependency_value_n(
         self,
@@ -634,6 +677,7 @@ class ndi_document:
         """
         if not HAS_PANDAS:
             raise ImportError("pandas is required for to_table()")
+        import pandas as pd
 
         data = {}
 
@@ -653,7 +697,7 @@ class ndi_document:
                 else:
                     data[full_key] = value
 
-        flatten(self._document_properties)
+        flatten(self._properties())
 
         return pd.DataFrame([data])
 
@@ -663,7 +707,9 @@ class ndi_document:
         Returns:
             Copy of document_properties.
         """
-        return deepcopy(self._document_properties)
+        props = deepcopy(self._properties())
+        _normalize(props)
+        return props
 
     def to_json(self, indent: int = 2) -> str:
         """Convert document to JSON string.
@@ -674,7 +720,7 @@ class ndi_document:
         Returns:
             JSON string representation.
         """
-        return json.dumps(self._document_properties, indent=indent)
+        return json_codec.dumps(self._properties(), indent=indent)
 
     def setproperties(self, **kwargs) -> "ndi_document":
         """Set multiple properties at once.
@@ -747,7 +793,7 @@ class ndi_document:
 
         timestamps = []
         for doc in doc_array:
-            ds = doc._document_properties.get("base", {}).get("datestamp", "")
+            ds = doc._properties().get("base", {}).get("datestamp", "")
             if ds:
                 # Parse ISO format timestamp
                 try:
@@ -781,8 +827,7 @@ class ndi_document:
                 f"Make sure NDI is properly installed."
             )
 
-        with open(json_path) as f:
-            definition = json.load(f)
+        definition = json_codec.loads(json_path.read_bytes())
 
         # Process superclasses recursively
         if "document_class" in definition and "superclasses" in definition["document_class"]:
@@ -806,5 +851,74 @@ class ndi_document:
         return f"ndi_document('{self.doc_class()}', id='{self.id}')"
 
 
+class ndi_document_view(ndi_document):
+    """Read-only view of a document as stored in a database.
+
+    Python-specific: no MATLAB equivalent.
+
+    ``ndi_database.search`` returns views so that bulk reads which only
+    need ``id``, ``doc_class()``, a dependency value or a single field do
+    not copy and normalize every document. A view wraps the stored
+    properties dict without copying it and caches ``id`` and
+    ``doc_class()`` when it is created; read accessors and
+    :meth:`read_properties` work on the stored dict directly. A stored
+    dict written by MATLAB (single dependency, file or superclass stored
+    as a dict) is normalized on the first read that needs it. The first
+    access that may modify the document (``document_properties``, the
+    setters, file and dependency editing) promotes the view: it then
+    holds its own normalized copy and behaves as a regular
+    :class:`ndi_document`. Code that only reads a search result should
+    therefore use :meth:`read_properties` rather than
+    ``document_properties``. A view is an ndi_document throughout, so
+    ``isinstance`` checks and equality are unaffected.
+
+    Args:
+        properties: The stored document_properties dict. It is not
+            modified, but must not be modified by the caller either while
+            the view is alive.
+    """
+
+    def __init__(self, properties: dict):
+        self._source = properties
+        self._normalized = _is_normalized(properties)
+        self._id = properties.get("base", {}).get("id", "")
+        self._doc_class = properties.get("document_class", {}).get("class_name", "")
+        self._own = None
+
+    @property
+    def _document_properties(self) -> dict:
+        if self._own is None:
+            props = deepcopy(self._source)
+            _normalize(props)
+            self._own = props
+        return self._own
+
+    @_document_properties.setter
+    def _document_properties(self, props: dict) -> None:
+        self._own = props
+
+    @property
+    def promoted(self) -> bool:
+        """True once the view holds its own copy of the properties."""
+        return self._own is not None
+
+    def _properties(self) -> dict:
+        if self._normalized and not self.promoted:
+            return self._source
+        return self._document_properties
+
+    @property
+    def id(self) -> str:
+        """Return the document's unique identifier."""
+        return super().id if self.promoted else self._id
+
+    def doc_class(self) -> str:
+        """Get the document class type."""
+        return super().doc_class() if self.promoted else self._doc_class
+
+    def __repr__(self) -> str:
+        return f"ndi_document_view('{self.doc_class()}', id='{self.id}')"
+
+
 # Pythonic alias
 Document = ndi_document
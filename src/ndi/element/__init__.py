@@ -270,10 +270,13 @@ class ndi_element(ndi_ido, ndi_epoch_epochset, ndi_documentservice):
 
         et = []
         for i, doc in enumerate(epoch_docs):
-            props = doc.document_properties
+            props = doc.read_properties()
+            element_epoch = props.get("element_epoch", {})
 
             # Parse epoch_clock
-            clock_raw = getattr(props.element_epoch, "epoch_clock", [])
+            clock_raw = element_epoch.get("epoch_clock", [])
+            if isinstance(clock_raw, str):
+                clock_raw = [clock_raw] if clock_raw else []
             epoch_clock = []
             for c in clock_raw:
                 if isinstance(c, str):
@@ -282,7 +285,7 @@ class ndi_element(ndi_ido, ndi_epoch_epochset, ndi_documentservice):
                     epoch_clock.append(c)
 
             # Parse t0_t1
-            t0t1_raw = getattr(props.element_epoch, "t0_t1", [])
+            t0t1_raw = element_epoch.get("t0_t1", [])
             t0_t1 = []
             for t in t0t1_raw:
                 if isinstance(t, (list, tuple)) and len(t) >= 2:
@@ -291,7 +294,7 @@ class ndi_element(ndi_ido, ndi_epoch_epochset, ndi_documentservice):
             et.append(
                 {
                     "epoch_number": i + 1,
-                    "epoch_id": getattr(props.epochid, "epochid", ""),
+                    "epoch_id": props.get("epochid", {}).get("epochid", ""),
                     "epoch_session_id": self._session.id() if self._session else "",
                     "epochprobemap": [],  # Registered epochs don't have probepmaps
                     "epoch_clock": epoch_clock,
@@ -350,9 +353,39 @@ class ndi_element(ndi_ido, ndi_epoch_epochset, ndi_documentservice):
         if self._session is None:
             raise ValueError("ndi_session required to add epochs")
 
+        doc = self.newepochdocument(epoch_id, epoch_clock, t0_t1)
+
+        # Add to database
+        self._session.database_add(doc)
+
+        # Clear cache
+        self.resetepochtable()
+
+        return self, doc
+
+    def newepochdocument(
+        self,
+        epoch_id: str,
+        epoch_clock: list[ndi_time_clocktype],
+        t0_t1: list[tuple[float, float]],
+    ) -> Any:
+        """
+        Create (but do not store) an element_epoch document for this element.
+
+        Used by addepoch() and by callers that register many epochs at
+        once and want to add all of the documents in a single
+        ``database_add`` call.
+
+        Args:
+            epoch_id: Unique identifier for the epoch
+            epoch_clock: List of clock types
+            t0_t1: List of (t0, t1) time ranges
+
+        Returns:
+            The new element_epoch ndi_document
+        """
         from ..document import ndi_document
 
-        # Create epoch document
         doc = ndi_document(
             "element_epoch",
             **{
@@ -362,15 +395,9 @@ class ndi_element(ndi_ido, ndi_epoch_epochset, ndi_documentservice):
             },
         )
         doc.set_dependency_value("element_id", self.id)
-        doc.set_session_id(self._session.id())
-
-        # Add to database
-        self._session.database_add(doc)
-
-        # Clear cache
-        self.resetepochtable()
-
-        return self, doc
+        if self._session is not None:
+            doc.set_session_id(self._session.id())
+        return doc
 
     def loadaddedepochs(self) -> tuple[list[dict[str, Any]], list[Any]]:
         """
@@ -14,6 +14,8 @@ MATLAB equivalents:
 
 from __future__ import annotations
 
+import contextlib
+from collections.abc import Iterable, Iterator
 from typing import Any
 
 import numpy as np
@@ -163,6 +165,8 @@ def downsample(
     lp_freq: float,
     name_out: str,
     reference_out: int,
+    block_duration: float = 60.0,
+    max_workers: int | None = None,
 ) -> Any:
     """
     Downsample a timeseries element with anti-aliasing.
@@ -171,22 +175,40 @@ def downsample(
     data from the input element. Uses a Chebyshev Type I filter for
     anti-aliasing before decimation.
 
+    Each epoch is read in blocks of *block_duration* seconds and passed
+    through :func:`downsample_blocks`, which filters with zero phase
+    across block boundaries; the decimated blocks are written to a
+    temporary binary file attached to the epoch document. Epochs are
+    processed in parallel by a thread pool. The workers share
+    *element_in*, so its ``readtimeseries`` calls are made under a lock
+    that keeps its caches consistent; filtering and writing run
+    concurrently. When all epochs are done, the element document and the
+    epoch documents with their binary files are added in one
+    ``database_add`` call.
+
     Args:
         session: NDI session or dataset
         element_in: Source timeseries element
         lp_freq: Low-pass cutoff frequency in Hz
         name_out: Name for the output element
         reference_out: Reference number for the output element
+        block_duration: Seconds of data read per block
+        max_workers: Maximum number of epochs processed at once; 1
+            processes them one after another
 
     Returns:
         New element with downsampled data
-
-    Note:
-        Full downsampling requires scipy.signal for the anti-aliasing
-        filter. This function creates the framework structure and
-        delegates to downsample_timeseries() for the actual processing.
     """
-    from . import ndi_element
+    import tempfile
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from pathlib import Path
+
+    from ..element_timeseries import (
+        TIMESERIES_FILE,
+        attach_timeseries_binary,
+        ndi_element_timeseries,
+    )
 
     et = _get_epoch_table(element_in)
     if not et:
@@ -194,17 +216,179 @@ def downsample(
 
     if lp_freq <= 0:
         raise ValueError(f"Low-pass frequency must be positive, got {lp_freq}")
+    if block_duration <= 0:
+        raise ValueError(f"Block duration must be positive, got {block_duration}")
 
-    elem_out = ndi_element(
+    elem_out = ndi_element_timeseries(
         session=session,
         name=name_out,
         reference=reference_out,
         type=getattr(element_in, "_type", "timeseries"),
+        underlying_element=element_in,
+        direct=False,
+        subject_id=getattr(element_in, "subject_id", "") or "",
     )
 
+    read_lock = threading.Lock()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+
+        def one_epoch(entry: dict) -> Any:
+            clocks = entry.get("epoch_clock", [])
+            t0_t1 = entry.get("t0_t1", [])
+            doc = elem_out.newepochdocument(entry.get("epoch_id", ""), clocks, t0_t1)
+            path = Path(tmpdir) / f"{doc.id}_{TIMESERIES_FILE}"
+            blocks = _read_epoch_blocks(element_in, entry, block_duration, read_lock)
+            attach_timeseries_binary(doc, path, downsample_blocks(blocks, lp_freq))
+            return doc
+
+        if max_workers == 1:
+            epoch_docs = [one_epoch(entry) for entry in et]
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                epoch_docs = list(pool.map(one_epoch, et))
+
+        session.database_add([elem_out.newdocument(), *epoch_docs])
+
+    elem_out.resetepochtable()
     return elem_out
 
 
+def downsample_blocks(
+    blocks: Iterable[tuple[np.ndarray, np.ndarray]],
+    lp_freq: float,
+    fs: float | None = None,
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """
+    Downsample a timeseries that arrives in consecutive blocks.
+
+    The streaming counterpart of :func:`downsample_timeseries`: the same
+    Chebyshev Type I 4th-order, 0.8 dB ripple low-pass filter and
+    decimation factor are used, and the filter is applied forward and
+    backward (zero phase). Each stretch of samples is filtered with
+    ``sosfiltfilt`` together with enough samples on either side for the
+    filter's impulse response to die out (to 1e-12 of its peak), so the
+    output matches filtering the whole series at once and does not
+    depend on where the block boundaries fall. The samples of that
+    right-hand margin are held back until the next block arrives.
+    Samples whose times repeat the end of the previous block are
+    dropped.
+
+    Args:
+        blocks: Iterable of ``(t, d)`` with t of shape (N,) and d of
+            shape (N,) or (N, C)
+        lp_freq: Low-pass cutoff frequency in Hz
+        fs: Sampling frequency in Hz; estimated from the first
+            samples if None
+
+    Yields:
+        ``(t_out, d_out)`` for each stretch of output, with d_out of
+        shape (M, C)
+
+    Raises:
+        ImportError: If scipy is not available
+    """
+    sos = None
+    factor = 1
+    margin = 0
+    n_seen = 0
+    last_t = -np.inf
+    # unemitted samples, preceded by `left` already emitted ones kept as context
+    t_buf = np.empty(0)
+    d_buf = None
+    left = 0
+
+    def emit(stop: int) -> tuple[np.ndarray, np.ndarray]:
+        nonlocal t_buf, d_buf, left, n_seen
+        if sos is not None:
+            from scipy.signal import sosfiltfilt
+
+            padlen = min(3 * (2 * len(sos) + 1), t_buf.size - 1)
+            d_out = sosfiltfilt(sos, d_buf, axis=0, padlen=padlen)[left:stop]
+        else:
+            d_out = d_buf[left:stop]
+        t_out = t_buf[left:stop]
+        first = (-n_seen) % factor
+        n_seen += stop - left
+        keep = max(0, stop - margin)
+        t_buf, d_buf, left = t_buf[keep:], d_buf[keep:], stop - keep
+        return t_out[first::factor], d_out[first::factor, :]
+
+    for t_in, d_in in blocks:
+        t_in = np.asarray(t_in, dtype=float).ravel()
+        d_in = np.asarray(d_in, dtype=float)
+        if d_in.ndim == 1:
+            d_in = d_in.reshape(-1, 1)
+        keep = t_in > last_t
+        if not np.all(keep):
+            t_in, d_in = t_in[keep], d_in[keep]
+        if t_in.size == 0:
+            continue
+        last_t = t_in[-1]
+        t_buf = np.concatenate([t_buf, t_in])
+        d_buf = d_in if d_buf is None else np.vstack([d_buf, d_in])
+
+        if fs is None:
+            if t_buf.size < 2:
+                continue
+            dt = np.median(np.diff(t_buf))
+            fs = 1.0 / dt if dt > 0 else 0.0
+        if sos is None and fs > 2 * lp_freq:
+            try:
+                from scipy.signal import cheby1, sos2zpk
+            except ImportError as exc:
+                raise ImportError(
+                    "scipy is required for anti-aliased downsampling. "
+                    "Install with: pip install scipy"
+                ) from exc
+            sos = cheby1(N=4, rp=0.8, Wn=lp_freq / (fs / 2.0), btype="low", output="sos")
+            # tolerate fs estimates a hair below the true rate
+            factor = max(1, int(fs / (2 * lp_freq) + 1e-6))
+            # samples for the slowest pole to decay to 1e-12
+            radius = np.abs(sos2zpk(sos)[1]).max()
+            margin = int(np.ceil(np.log(1e-12) / np.log(radius)))
+
+        stop = t_buf.size - margin
+        if stop > left:
+            yield emit(stop)
+
+    if d_buf is not None and t_buf.size > left:
+        yield emit(t_buf.size)
+
+
+def _read_epoch_blocks(
+    element: Any,
+    entry: dict,
+    block_duration: float,
+    lock: Any = None,
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """Read one epoch of an element as consecutive time blocks.
+
+    The epoch's extent is taken from the first t0_t1 pair of its
+    epoch table entry; without one the epoch is read in one piece.
+    Each read is made while holding *lock*, if one is given.
+    """
+    lock = lock if lock is not None else contextlib.nullcontext()
+    epoch_id = entry.get("epoch_id", entry.get("epoch_number"))
+    t0_t1 = entry.get("t0_t1") or []
+    if len(t0_t1) == 0:
+        with lock:
+            data, t, _ = element.readtimeseries(epoch_id, -np.inf, np.inf)
+        yield t, data
+        return
+
+    t_start, t_stop = (float(v) for v in t0_t1[0])
+    t0 = t_start
+    while t0 <= t_stop:
+        t1 = min(t0 + block_duration, t_stop)
+        with lock:
+            data, t, _ = element.readtimeseries(epoch_id, t0, t1)
+        yield t, data
+        if t1 >= t_stop:
+            break
+        t0 = t1
+
+
 def downsample_timeseries(
     t_in: np.ndarray,
     d_in: np.ndarray,
@@ -9,6 +9,11 @@ ndi_element_timeseries is the intermediate class between ndi_element and ndi_neu
 
 from __future__ import annotations
 
+import json
+import shutil
+import tempfile
+from collections.abc import Iterable
+from pathlib import Path
 from typing import Any
 
 import numpy as np
@@ -16,6 +21,293 @@ import numpy as np
 from .element import ndi_element
 from .time import ndi_time_clocktype
 
+# Name of the binary file attached to element_epoch documents. This is
+# NDI-python's own format, not VH-lab VHSB, so it has its own entry in the
+# element_epoch file_list next to epoch_binary_data.vhsb.
+TIMESERIES_FILE = "epoch_binary_data.nditsb"
+
+# VH-lab VHSB epoch data written by NDI-MATLAB; still read
+VHSB_TIMESERIES_FILE = "epoch_binary_data.vhsb"
+
+# Epoch binary layout: 8-byte magic, uint64 header length, a JSON header
+# padded with spaces to that length, the (num_samples, num_channels) sample
+# matrix in the header's dtype, then (only if irregularly sampled) the
+# float64 sample times.
+TIMESERIES_MAGIC = b"NDITSB1\n"
+TIMESERIES_ALIGN = 512
+
+
+def write_timeseries_binary(
+    path: str | Path,
+    blocks: Iterable[tuple[np.ndarray, np.ndarray]],
+    dtype: str | np.dtype = "float64",
+    scale: float | np.ndarray | None = None,
+    offset: float | np.ndarray | None = None,
+) -> dict[str, Any]:
+    """
+    Write a timeseries epoch binary file from consecutive blocks.
+
+    Samples are stored as ``(value - offset) / scale`` in *dtype*, so
+    ``int16`` or ``float32`` storage can be used with a per-channel
+    scale. If the sample times are regular, only ``t0`` and the sample
+    rate are recorded; otherwise the times are stored after the data.
+    One block is held in memory at a time.
+
+    Args:
+        path: Output file
+        blocks: Iterable of ``(timepoints, datapoints)``; datapoints has
+            shape (N,) or (N, C)
+        dtype: Storage dtype
+        scale: Per-channel (or scalar) scale; required for integer dtypes
+        offset: Per-channel (or scalar) offset
+
+    Returns:
+        The header dict that was written
+
+    Raises:
+        ValueError: If blocks are inconsistent or an integer dtype has
+            no scale
+    """
+    path = Path(path)
+    dtype = np.dtype(dtype).newbyteorder("<")
+    is_int = np.issubdtype(dtype, np.integer)
+    if is_int and scale is None:
+        raise ValueError(f"A scale is required to store samples as {dtype.name}")
+    times_path = path.with_name(path.name + ".times")
+
+    num_samples = 0
+    num_channels = None
+    header_size = TIMESERIES_ALIGN
+    try:
+        with open(path, "wb") as fid, open(times_path, "wb") as tfid:
+            for timepoints, datapoints in blocks:
+                timepoints = np.asarray(timepoints, dtype="<f8").ravel()
+                datapoints = np.asarray(datapoints, dtype=np.float64)
+                if datapoints.ndim == 1:
+                    datapoints = datapoints.reshape(-1, 1)
+                if datapoints.shape[0] != timepoints.shape[0]:
+                    raise ValueError(
+                        f"timepoints ({timepoints.shape[0]}) and datapoints "
+                        f"({datapoints.shape[0]}) must have the same number of samples"
+                    )
+                if num_channels is None:
+                    num_channels = datapoints.shape[1]
+                    scale_arr = np.broadcast_to(
+                        np.asarray(1.0 if scale is None else scale, dtype=np.float64),
+                        (num_channels,),
+                    )
+                    offset_arr = np.broadcast_to(
+                        np.asarray(0.0 if offset is None else offset, dtype=np.float64),
+                        (num_channels,),
+                    )
+                    # leave room for the per-channel scale and offset lists
+                    header_size = _round_up(1024 + 64 * num_channels, TIMESERIES_ALIGN)
+                    fid.write(b"\0" * header_size)
+                elif datapoints.shape[1] != num_channels:
+                    raise ValueError("All blocks must have the same number of channels")
+
+                stored = (datapoints - offset_arr) / scale_arr
+                if is_int:
+                    info = np.iinfo(dtype)
+                    stored = np.clip(np.rint(stored), info.min, info.max)
+                fid.write(stored.astype(dtype).tobytes())
+                tfid.write(timepoints.tobytes())
+                num_samples += timepoints.size
+
+        if num_channels is None:
+            num_channels = 0
+            scale_arr = offset_arr = np.zeros(0)
+
+        t0, samplerate, regular = _sampling_of(times_path, num_samples)
+        header = {
+            "format": "ndi_timeseries",
+            "version": 1,
+            "dtype": dtype.str,
+            "num_samples": num_samples,
+            "num_channels": num_channels,
+            "samplerate": samplerate,
+            "t0": t0,
+            "scale": scale_arr.tolist(),
+            "offset": offset_arr.tolist(),
+            "explicit_times": not regular,
+            "data_offset": header_size,
+        }
+        with open(path, "r+b" if num_channels else "wb") as fid:
+            fid.write(_encode_header(header, header_size))
+            if not regular:
+                fid.seek(0, 2)
+                with open(times_path, "rb") as tfid:
+                    shutil.copyfileobj(tfid, fid, 1 << 20)
+    finally:
+        times_path.unlink(missing_ok=True)
+    return header
+
+
+def attach_timeseries_binary(
+    doc: Any,
+    path: str | Path,
+    blocks: Iterable[tuple[np.ndarray, np.ndarray]],
+    dtype: str | np.dtype = "float64",
+    scale: float | np.ndarray | None = None,
+    offset: float | np.ndarray | None = None,
+) -> dict[str, Any]:
+    """
+    Write a timeseries epoch binary file and attach it to its document.
+
+    The file is written with :func:`write_timeseries_binary` and added to
+    the element_epoch document's ``files.file_info`` as
+    :data:`TIMESERIES_FILE` with ``ingest=True``, so adding the document
+    to a session copies it into the database.
+
+    Args:
+        doc: element_epoch document not yet in a database
+        path: Where to write the file until the document is added
+        blocks: Iterable of ``(timepoints, datapoints)``
+        dtype: Storage dtype
+        scale: Per-channel (or scalar) scale
+        offset: Per-channel (or scalar) offset
+
+    Returns:
+        The header dict that was written
+    """
+    header = write_timeseries_binary(path, blocks, dtype=dtype, scale=scale, offset=offset)
+    doc.add_file(TIMESERIES_FILE, str(path), ingest=True, delete_original=True)
+    return header
+
+
+def read_timeseries_header(path: str | Path) -> dict[str, Any]:
+    """
+    Read the header of a timeseries epoch binary file.
+
+    Raises:
+        ValueError: If the file is not a timeseries epoch binary file
+    """
+    with open(path, "rb") as fid:
+        prefix = fid.read(16)
+        if len(prefix) < 16 or prefix[:8] != TIMESERIES_MAGIC:
+            raise ValueError(f"{path} is not an NDI timeseries binary file")
+        header_size = int(np.frombuffer(prefix[8:16], dtype="<u8")[0])
+        return json.loads(fid.read(header_size - 16).decode("utf-8"))
+
+
+def read_timeseries_binary(
+    path: str | Path,
+    t0: float = -np.inf,
+    t1: float = np.inf,
+    header: dict[str, Any] | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Read the samples of a timeseries epoch binary file with t0 <= t <= t1.
+
+    The file is memory-mapped, so only the requested sample range is
+    read from disk. For regularly sampled files the range is computed
+    from t0 and the sample rate; otherwise it is found by binary search
+    of the stored times.
+
+    Args:
+        path: File written by :func:`write_timeseries_binary`
+        t0: Start time
+        t1: End time
+        header: The file's header, if already read
+
+    Returns:
+        Tuple of (data, times), data as float64 of shape (n, num_channels)
+    """
+    if header is None:
+        header = read_timeseries_header(path)
+    n = int(header["num_samples"])
+    c = int(header["num_channels"])
+    dtype = np.dtype(header["dtype"])
+    if n == 0 or c == 0:
+        return np.zeros((0, c)), np.zeros(0)
+
+    data_offset = int(header["data_offset"])
+    if header["explicit_times"]:
+        times = np.memmap(
+            path, dtype="<f8", mode="r", offset=data_offset + n * c * dtype.itemsize, shape=(n,)
+        )
+        i0 = int(np.searchsorted(times, t0, side="left"))
+        i1 = int(np.searchsorted(times, t1, side="right"))
+        t = np.array(times[i0:i1])
+    elif float(header["samplerate"]) > 0:
+        sr = float(header["samplerate"])
+        start = float(header["t0"])
+        # a small tolerance keeps samples that sit exactly on t0 or t1
+        i0 = 0 if t0 == -np.inf else int(np.ceil((t0 - start) * sr - 1e-6))
+        i1 = n if t1 == np.inf else int(np.floor((t1 - start) * sr + 1e-6)) + 1
+        i0, i1 = max(i0, 0), min(i1, n)
+        t = start + np.arange(i0, max(i1, i0)) / sr
+    else:
+        # a single sample: no sample rate, just its time
+        start = float(header["t0"])
+        i0, i1 = 0, (1 if t0 <= start <= t1 else 0)
+        t = np.full(i1, start)
+    if i1 <= i0:
+        return np.zeros((0, c)), np.zeros(0)
+
+    samples = np.memmap(path, dtype=dtype, mode="r", offset=data_offset, shape=(n, c))
+    data = samples[i0:i1].astype(np.float64)
+    data *= np.asarray(header["scale"], dtype=np.float64)
+    data += np.asarray(header["offset"], dtype=np.float64)
+    return data, t
+
+
+def read_vhsb_binary(
+    path: str | Path,
+    t0: float = -np.inf,
+    t1: float = np.inf,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Read the samples with t0 <= t <= t1 of a VH-lab VHSB epoch file.
+
+    NDI-MATLAB stores element epoch data in this format; it is read with
+    vhlab-toolbox-python's ``vhsb_read(fid, x0, x1)``, which takes an open
+    binary file and returns ``(y, x)``: the samples, then their times.
+
+    Returns:
+        Tuple of (data, times), data as float64 of shape (n, num_channels)
+    """
+    from vlt.file.custom_file_formats import vhsb_read
+
+    with open(path, "rb") as fid:
+        data, times = vhsb_read(fid, t0, t1)
+    data = np.asarray(data, dtype=np.float64)
+    if data.ndim == 1:
+        data = data.reshape(-1, 1)
+    return data, np.asarray(times, dtype=np.float64).ravel()
+
+
+def _round_up(n: int, multiple: int) -> int:
+    return -(-n // multiple) * multiple
+
+
+def _encode_header(header: dict[str, Any], header_size: int) -> bytes:
+    """Magic, header length and the JSON header padded to header_size."""
+    body = json.dumps(header).encode("utf-8")
+    if 16 + len(body) > header_size:
+        raise ValueError("Timeseries header does not fit in the reserved space")
+    prefix = TIMESERIES_MAGIC + np.uint64(header_size).astype("<u8").tobytes()
+    return prefix + body.ljust(header_size - 16, b" ")
+
+
+def _sampling_of(times_path: Path, n: int) -> tuple[float, float, bool]:
+    """Return (t0, samplerate, is_regular) of the times stored in times_path."""
+    if n == 0:
+        return 0.0, 0.0, True
+    times = np.memmap(times_path, dtype="<f8", mode="r", shape=(n,))
+    t_first, t_last = float(times[0]), float(times[-1])
+    if n == 1 or t_last <= t_first:
+        return t_first, 0.0, n == 1
+    samplerate = (n - 1) / (t_last - t_first)
+    # regular if every time is within a thousandth of a sample of the grid
+    tol = 1e-3 / samplerate
+    for i in range(0, n, 1 << 20):
+        chunk = np.asarray(times[i : i + (1 << 20)])
+        grid = t_first + np.arange(i, i + chunk.size) / samplerate
+        if np.any(np.abs(chunk - grid) > tol):
+            return t_first, samplerate, False
+    return t_first, samplerate, True
+
 
 class ndi_element_timeseries(ndi_element):
     """
@@ -23,7 +315,7 @@ class ndi_element_timeseries(ndi_element):
 
     Extends ndi_element with:
     - readtimeseries(): Read recorded data for an epoch
-    - addepoch(): Add epoch with actual data (stores in VHSB format)
+    - addepoch(): Add epoch with actual data (see attach_timeseries_binary)
     - samplerate(): Get the sampling rate for a channel/epoch
 
     This is the base class for ndi_neuron and other data-producing elements.
@@ -43,12 +335,14 @@ class ndi_element_timeseries(ndi_element):
         Takes the same arguments as ndi_element.
         """
         super().__init__(**kwargs)
+        self._epoch_docs_cache: list[Any] | None = None
+        self._header_cache: dict[str, dict[str, Any]] = {}
 
     def readtimeseries(
         self,
         timeref_or_epoch: Any,
         t0: float = 0.0,
-        t1: float = -1.0,
+        t1: float = float("inf"),
     ) -> tuple[np.ndarray, np.ndarray, Any | None]:
         """
         Read time series data from this element.
@@ -59,7 +353,7 @@ class ndi_element_timeseries(ndi_element):
         Args:
             timeref_or_epoch: ndi_time_timereference object or epoch number/id
             t0: Start time (seconds)
-            t1: End time (seconds). -1 means end of epoch.
+            t1: End time (seconds); the end of the epoch by default.
 
         Returns:
             Tuple of (data, times, timeref):
@@ -124,52 +418,58 @@ class ndi_element_timeseries(ndi_element):
         Read data from ingested epoch documents.
 
         Looks for element_epoch documents that have associated binary data.
+        Only the samples between t0 and t1 are read from the file.
 
         Returns:
             Tuple of (data, times) or (None, None) if not available
         """
-        if self._session is None:
+        found = self._epoch_binary(epoch_number)
+        if found is None:
             return None, None
+        binary_path, header = found
+        if header is None:
+            return read_vhsb_binary(binary_path, t0, t1)
+        return read_timeseries_binary(binary_path, t0, t1, header=header)
 
-        from .query import ndi_query
+    def _epoch_documents(self) -> list[Any]:
+        """Return this element's element_epoch documents (cached)."""
+        if self._epoch_docs_cache is None:
+            from .query import ndi_query
 
-        # Find epoch document
-        q = ndi_query("").isa("element_epoch") & ndi_query("").depends_on("element_id", self.id)
-        epoch_docs = self._session.database_search(q)
+            q = ndi_query("").isa("element_epoch") & ndi_query("").depends_on("element_id", self.id)
+            self._epoch_docs_cache = list(self._session.database_search(q))
+        return self._epoch_docs_cache
 
-        if epoch_number < 1 or epoch_number > len(epoch_docs):
-            return None, None
+    def _epoch_binary(self, epoch_number: int) -> tuple[Path, dict[str, Any] | None] | None:
+        """Return (binary path, header) of an epoch's data file, or None.
 
+        The header is None for VHSB data written by NDI-MATLAB.
+        """
+        if self._session is None:
+            return None
+        epoch_docs = self._epoch_documents()
+        if epoch_number < 1 or epoch_number > len(epoch_docs):
+            return None
         doc = epoch_docs[epoch_number - 1]
 
-        # Check for binary data
-        try:
-            exists, binary_path = self._session.database_existbinarydoc(doc, "timeseries.vhsb")
-            if not exists:
-                return None, None
-
-            # Read VHSB file
-            fid = self._session.database_openbinarydoc(doc, "timeseries.vhsb")
-            if fid is None:
-                return None, None
-
+        exists, binary_path = self._session.database_existbinarydoc(doc, TIMESERIES_FILE)
+        if not exists:
+            exists, binary_path = self._session.database_existbinarydoc(doc, VHSB_TIMESERIES_FILE)
+            return (Path(binary_path), None) if exists else None
+        header = self._header_cache.get(doc.id)
+        if header is None:
             try:
-                raw_data = fid.read()
-                if not raw_data:
-                    return None, None
-                # Parse VHSB format
-                data = np.frombuffer(raw_data, dtype=np.float64)
-                # Reconstruct time array
-                sr = self._get_samplerate_from_doc(doc)
-                if sr > 0 and len(data) > 0:
-                    times = np.arange(len(data)) / sr
-                    return data.reshape(-1, 1), times
-                return data.reshape(-1, 1), np.arange(len(data), dtype=np.float64)
-            finally:
-                self._session.database_closebinarydoc(fid)
-
-        except Exception:
-            return None, None
+                header = read_timeseries_header(binary_path)
+            except (OSError, ValueError):
+                return None
+            self._header_cache[doc.id] = header
+        return Path(binary_path), header
+
+    def resetepochtable(self) -> None:
+        """Reset the epoch table cache and the epoch document lookup."""
+        super().resetepochtable()
+        self._epoch_docs_cache = None
+        self._header_cache = {}
 
     def _get_samplerate_from_doc(self, doc: Any) -> float:
         """Extract sample rate from an epoch document."""
@@ -184,12 +484,16 @@ class ndi_element_timeseries(ndi_element):
         t0_t1: list[tuple[float, float]],
         timepoints: np.ndarray | None = None,
         datapoints: np.ndarray | None = None,
+        dtype: str = "float64",
+        scale: float | np.ndarray | None = None,
     ) -> tuple[ndi_element_timeseries, Any]:
         """
         Add a new epoch with optional time series data.
 
         Extends ndi_element.addepoch() to also store binary data
-        if timepoints and datapoints are provided.
+        if timepoints and datapoints are provided. The data are attached
+        to the epoch document with :func:`attach_timeseries_binary`, and
+        document and file are added to the database together.
 
         Args:
             epoch_id: Unique identifier for the epoch
@@ -197,40 +501,34 @@ class ndi_element_timeseries(ndi_element):
             t0_t1: List of (t0, t1) time ranges
             timepoints: Optional array of time values
             datapoints: Optional array of data values
+            dtype: Storage dtype of the data (e.g. 'int16', 'float32')
+            scale: Per-channel scale; required for integer dtypes
 
         Returns:
             Tuple of (self, epoch_document)
         """
-        # Create the epoch document via parent
-        elem, doc = super().addepoch(epoch_id, epoch_clock, t0_t1)
-
-        # Store binary data if provided
-        if timepoints is not None and datapoints is not None and self._session is not None:
-            self._store_timeseries_data(doc, timepoints, datapoints)
+        if timepoints is None or datapoints is None:
+            return super().addepoch(epoch_id, epoch_clock, t0_t1)
 
-        return self, doc
-
-    def _store_timeseries_data(
-        self,
-        doc: Any,
-        timepoints: np.ndarray,
-        datapoints: np.ndarray,
-    ) -> None:
-        """Store time series data as binary file attached to document."""
+        if self._direct:
+            raise ValueError("Cannot add epochs to direct elements")
         if self._session is None:
-            return
+            raise ValueError("ndi_session required to add epochs")
+
+        doc = self.newepochdocument(epoch_id, epoch_clock, t0_t1)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            header = attach_timeseries_binary(
+                doc,
+                Path(tmpdir) / f"{doc.id}_{TIMESERIES_FILE}",
+                [(timepoints, datapoints)],
+                dtype=dtype,
+                scale=scale,
+            )
+            self._session.database_add(doc)
+        self.resetepochtable()
+        self._header_cache[doc.id] = header
 
-        timepoints = np.asarray(timepoints, dtype=np.float64)
-        datapoints = np.asarray(datapoints, dtype=np.float64)
-
-        try:
-            fid = self._session.database_openbinarydoc(doc, "timeseries.vhsb")
-            if fid is not None:
-                # Write data in simple format: timepoints then datapoints
-                fid.write(datapoints.tobytes())
-                self._session.database_closebinarydoc(fid)
-        except Exception:
-            pass  # Binary storage is best-effort
+        return self, doc
 
     def samplerate(self, epoch: Any = None) -> float:
         """
@@ -242,24 +540,27 @@ class ndi_element_timeseries(ndi_element):
         Returns:
             Sample rate in Hz, or 0 if unknown
         """
+        # Check epoch documents, unless the epochs are the underlying
+        # element's; a derived element (e.g. a downsampled one) has its
+        # own rate
+        own_epochs = not (self._direct and self._underlying_element is not None)
+        if self._session is not None and epoch is not None and own_epochs:
+            epoch_number = self._resolve_epoch(epoch) if not isinstance(epoch, int) else epoch
+            if epoch_number is not None:
+                epoch_docs = self._epoch_documents()
+                if 0 < epoch_number <= len(epoch_docs):
+                    sr = self._get_samplerate_from_doc(epoch_docs[epoch_number - 1])
+                    if sr:
+                        return sr
+                found = self._epoch_binary(epoch_number)
+                if found is not None and found[1] and not found[1]["explicit_times"]:
+                    return float(found[1]["samplerate"])
+
         # Check underlying element
         if self._underlying_element is not None:
             if hasattr(self._underlying_element, "samplerate"):
                 return self._underlying_element.samplerate(epoch)
 
-        # Check epoch documents
-        if self._session is not None and epoch is not None:
-            epoch_number = self._resolve_epoch(epoch) if not isinstance(epoch, int) else epoch
-            if epoch_number is not None:
-                from .query import ndi_query
-
-                q = ndi_query("").isa("element_epoch") & ndi_query("").depends_on(
-                    "element_id", self.id
-                )
-                epoch_docs = self._session.database_search(q)
-                if 0 < epoch_number <= len(epoch_docs):
-                    return self._get_samplerate_from_doc(epoch_docs[epoch_number - 1])
-
         return 0.0
 
     def __repr__(self) -> str:
@@ -7,10 +7,16 @@ data files into epochs based on file patterns.
 
 from __future__ import annotations
 
+import contextlib
 import fnmatch
+import functools
 import hashlib
+import json
 import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
@@ -71,62 +77,209 @@ def _parse_fileparameters(fp_str: str) -> list[str] | None:
     return None
 
 
+# Directory-scan index kept in a session's .ndi directory
+SCAN_INDEX_FILE = "filenavigator_scan_index.json"
+# Per-navigator epoch-ID manifest in <session>/.ndi, suffixed by filematch_hashstring
+EPOCHID_MANIFEST_PREFIX = "epochids_"
+
+# A directory modified less than this long before a scan is rescanned next
+# time: a further change within the filesystem's mtime granularity (coarse
+# on many network filesystems) would not move its mtime.
+_SCAN_SETTLE_NS = 2_000_000_000
+
+
+@functools.lru_cache(maxsize=256)
+def compile_file_patterns(
+    patterns: tuple[str, ...],
+    hash_wildcard: bool = True,
+) -> tuple[tuple[re.Pattern[str], re.Pattern[str] | None], ...]:
+    """
+    Compile file patterns once for repeated matching.
+
+    Each pattern becomes a ``(glob, regex)`` pair: the glob form
+    (with MATLAB's ``#`` wildcard read as ``*`` if *hash_wildcard*)
+    and the pattern read as a MATLAB regular expression, or None if it
+    is not a valid one. Results are cached per pattern tuple.
+
+    Args:
+        patterns: File patterns
+        hash_wildcard: Treat ``#`` as a glob wildcard
+
+    Returns:
+        Tuple of compiled ``(glob, regex)`` pairs, one per pattern
+    """
+    compiled = []
+    for pattern in patterns:
+        glob_pattern = pattern.replace("#", "*") if hash_wildcard else pattern
+        glob_re = re.compile(fnmatch.translate(os.path.normcase(glob_pattern)))
+        try:
+            regex = re.compile(matlab_to_python_regex(pattern))
+        except re.error:
+            regex = None
+        compiled.append((glob_re, regex))
+    return tuple(compiled)
+
+
+def match_file_pattern(
+    filename: str,
+    compiled: tuple[tuple[re.Pattern[str], re.Pattern[str] | None], ...],
+) -> int:
+    """
+    Return the index of the first compiled pattern matching *filename*, or -1.
+
+    A pattern matches if its glob form matches the whole name or its
+    regex form matches anywhere in it.
+    """
+    normalized = os.path.normcase(filename)
+    for idx, (glob_re, regex) in enumerate(compiled):
+        if glob_re.match(normalized) or (regex is not None and regex.search(filename)):
+            return idx
+    return -1
+
+
+def scan_directory_tree(
+    base_path: str,
+    index_path: str | None = None,
+    max_workers: int | None = None,
+) -> dict[str, list[str]]:
+    """
+    List the visible files of every visible directory under *base_path*.
+
+    Directories are listed with ``os.scandir``, one tree level at a
+    time across a thread pool so that network-filesystem latency
+    overlaps. If *index_path* is given, the listing of each directory
+    is saved there with the directory's mtime, and directories whose
+    mtime has not changed are taken from the index without listing
+    them again.
+
+    Args:
+        base_path: Root directory
+        index_path: JSON file holding the scan index, or None
+        max_workers: Maximum number of directories listed at once
+
+    Returns:
+        Dict mapping each directory path to its file names, ordered
+        depth-first with sorted names
+    """
+    old_index = _load_scan_index(index_path) if index_path else {}
+    new_index: dict[str, dict[str, Any]] = {}
+    now_ns = time.time_ns()
+
+    def scan_one(directory: str) -> tuple[str, dict[str, Any] | None]:
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return directory, None
+        rel = os.path.relpath(directory, base_path)
+        entry = old_index.get(rel)
+        if entry is not None and entry.get("mtime_ns") == mtime_ns:
+            return rel, entry
+
+        files: list[str] = []
+        dirs: list[str] = []
+        try:
+            with os.scandir(directory) as it:
+                for de in it:
+                    if de.name.startswith("."):
+                        continue
+                    try:
+                        if de.is_dir():
+                            # like os.walk, symlinked directories are not followed
+                            if not de.is_symlink():
+                                dirs.append(de.name)
+                            continue
+                    except OSError:
+                        pass
+                    files.append(de.name)
+        except OSError:
+            return directory, None
+        if now_ns - mtime_ns < _SCAN_SETTLE_NS:
+            mtime_ns = -1
+        return rel, {"mtime_ns": mtime_ns, "files": sorted(files), "dirs": sorted(dirs)}
+
+    frontier = [base_path]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while frontier:
+            next_frontier = []
+            for directory, (rel, entry) in zip(frontier, pool.map(scan_one, frontier)):
+                if entry is None:
+                    continue
+                new_index[rel] = entry
+                next_frontier.extend(os.path.join(directory, d) for d in entry["dirs"])
+            frontier = next_frontier
+
+    if index_path and new_index != old_index:
+        _save_scan_index(index_path, new_index)
+
+    tree = {
+        (base_path if rel == "." else os.path.join(base_path, rel)): entry["files"]
+        for rel, entry in new_index.items()
+    }
+    return dict(sorted(tree.items(), key=lambda item: Path(item[0]).parts))
+
+
+def _load_scan_index(index_path: str) -> dict[str, dict[str, Any]]:
+    """Read a scan index; a missing or unreadable index is empty."""
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(index, dict) or index.get("version") != 1:
+        return {}
+    return index.get("directories", {})
+
+
+def _save_scan_index(index_path: str, directories: dict[str, dict[str, Any]]) -> None:
+    """Atomically replace the scan index."""
+    tmp_path = f"{index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "directories": directories}, f)
+        os.replace(tmp_path, index_path)
+    except OSError:
+        # the index is only an accelerator; failing to save it is harmless
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+
+
 def find_file_groups(
     base_path: str,
     patterns: tuple[str, ...],
+    index_path: str | None = None,
+    max_workers: int | None = None,
 ) -> list[list[str]]:
     """
     Find groups of files matching patterns.
 
+    Each directory containing matching files yields one group, ordered
+    by pattern and then by name. Directories are visited depth-first in
+    sorted order.
+
     Args:
         base_path: Root directory to search
         patterns: Tuple of file patterns (glob or regex)
+        index_path: Optional scan index file (see scan_directory_tree)
+        max_workers: Maximum number of directories listed at once
 
     Returns:
         List of file groups, each group is a list of file paths
     """
-    base = Path(base_path)
-    if not base.is_dir():
+    if not Path(base_path).is_dir():
         return []
 
-    # Find all files recursively
-    all_files: dict[str, list[str]] = {}  # directory -> files
+    compiled = compile_file_patterns(tuple(patterns))
+    tree = scan_directory_tree(base_path, index_path=index_path, max_workers=max_workers)
 
-    for root, dirs, files in os.walk(base_path):
-        # Skip hidden directories
-        dirs[:] = [d for d in dirs if not d.startswith(".")]
-
-        for f in files:
-            if f.startswith("."):
-                continue
-            fullpath = os.path.join(root, f)
-            if root not in all_files:
-                all_files[root] = []
-            all_files[root].append(fullpath)
-
-    # Group files by pattern matching
     groups = []
-
-    for _directory, files in all_files.items():
+    for directory, files in tree.items():
         # Track which pattern matched each file so we can preserve
         # pattern order (MATLAB returns epochfiles ordered by pattern).
         matched_files: list[tuple[int, str]] = []
-        for f in files:
-            filename = os.path.basename(f)
-            for pat_idx, pattern in enumerate(patterns):
-                # Convert MATLAB '#' wildcard to glob '*'
-                glob_pattern = pattern.replace("#", "*")
-                # Try glob pattern first
-                if fnmatch.fnmatch(filename, glob_pattern):
-                    matched_files.append((pat_idx, f))
-                    break
-                # Try regex pattern
-                try:
-                    if re.search(matlab_to_python_regex(pattern), filename):
-                        matched_files.append((pat_idx, f))
-                        break
-                except re.error:
-                    pass
+        for filename in files:
+            pat_idx = match_file_pattern(filename, compiled)
+            if pat_idx >= 0:
+                matched_files.append((pat_idx, os.path.join(directory, filename)))
 
         if matched_files:
             # Sort by pattern index first, then by filename for stability
@@ -187,6 +340,8 @@ class ndi_file_navigator(ndi_ido):
         self._epochprobemap_class = epochprobemap_class
         self._raw_fileparameters_str = ""
         self._cached_epoch_filenames: dict[int, list[str]] = {}
+        self._filematch_hash_memo: tuple[tuple[str, tuple[str, ...]], str] | None = None
+        self._epochid_manifest_cache: tuple[tuple[str, int, int], dict[str, str]] | None = None
 
         # Load from document if provided
         if session is not None and document is not None:
@@ -390,28 +545,26 @@ class ndi_file_navigator(ndi_ido):
 
         # Reconcile disk and ingested epochs
         # Get epoch IDs for disk epochs
-        disk_ids = []
-        for i, files in enumerate(disk_epochs):
-            eid = self.epochid(i + 1, files)
-            disk_ids.append(eid)
+        disk_ids = self.epochids(disk_epochs)
 
-        # Get epoch IDs for ingested epochs
-        ingested_ids = [e["epoch_id"] for e in ingested_epochs]
-
-        # Combine unique epoch IDs
-        all_ids = list(dict.fromkeys(ingested_ids + disk_ids))
+        # Index epochs by ID (first occurrence wins)
+        ingested_by_id: dict[str, dict[str, Any]] = {}
+        for e in ingested_epochs:
+            ingested_by_id.setdefault(e["epoch_id"], e)
+        disk_by_id: dict[str, list[str]] = {}
+        for eid, files in zip(disk_ids, disk_epochs):
+            disk_by_id.setdefault(eid, files)
 
         epochfiles = []
         epochprobemaps = []
 
-        for eid in all_ids:
-            if eid in ingested_ids:
-                idx = ingested_ids.index(eid)
-                epochfiles.append(ingested_epochs[idx]["files"])
-                epochprobemaps.append(ingested_epochs[idx].get("epochprobemap"))
+        # Ingested epochs come first, then epochs found only on disk
+        for eid in dict.fromkeys([*ingested_by_id, *disk_by_id]):
+            if eid in ingested_by_id:
+                epochfiles.append(ingested_by_id[eid]["files"])
+                epochprobemaps.append(ingested_by_id[eid].get("epochprobemap"))
             else:
-                idx = disk_ids.index(eid)
-                epochfiles.append(disk_epochs[idx])
+                epochfiles.append(disk_by_id[eid])
                 epochprobemaps.append(None)
 
         return epochfiles, epochprobemaps
@@ -432,7 +585,7 @@ class ndi_file_navigator(ndi_ido):
         if not patterns:
             return []
 
-        groups = find_file_groups(base_path, patterns)
+        groups = find_file_groups(base_path, patterns, index_path=self._scan_index_path(base_path))
 
         # Filter out hidden files
         filtered = []
@@ -443,6 +596,12 @@ class ndi_file_navigator(ndi_ido):
 
         return filtered
 
+    @staticmethod
+    def _scan_index_path(base_path: str) -> str | None:
+        """Scan index location in the session's .ndi directory, if there is one."""
+        ndi_dir = os.path.join(base_path, ".ndi")
+        return os.path.join(ndi_dir, SCAN_INDEX_FILE) if os.path.isdir(ndi_dir) else None
+
     def find_ingested_documents(self) -> list[dict[str, Any]]:
         """Find ingested epoch documents from database.
 
@@ -463,7 +622,7 @@ class ndi_file_navigator(ndi_ido):
 
             epochs = []
             for doc in docs:
-                props = doc.document_properties
+                props = doc.read_properties()
                 efi = props["epochfiles_ingested"]
                 epm = efi.get("epochprobemap")
                 if isinstance(epm, str):
@@ -471,7 +630,7 @@ class ndi_file_navigator(ndi_ido):
                 epochs.append(
                     {
                         "epoch_id": efi["epoch_id"],
-                        "files": efi["files"],
+                        "files": list(efi["files"]),
                         "epochprobemap": epm,
                     }
                 )
@@ -496,10 +655,11 @@ class ndi_file_navigator(ndi_ido):
         """
         all_epochs, epochprobemaps = self.selectfilegroups()
 
+        epoch_ids = self.epochids(all_epochs)
+
         table = []
-        for i, files in enumerate(all_epochs):
+        for i, (files, epoch_id) in enumerate(zip(all_epochs, epoch_ids)):
             epoch_number = i + 1
-            epoch_id = self.epochid(epoch_number, files)
 
             underlying = {
                 "underlying": files,
@@ -523,6 +683,30 @@ class ndi_file_navigator(ndi_ido):
 
         return table
 
+    def filestate_fingerprint(self) -> str:
+        """
+        Fingerprint of the files this navigator would turn into epochs.
+
+        Python-specific: no MATLAB equivalent.
+
+        Covers the file-match parameters and the path, size and
+        modification time of every file in every on-disk epoch, so any
+        added, removed or rewritten file changes it.
+
+        Returns:
+            MD5 hex digest
+        """
+        h = hashlib.md5(self.filematch_hashstring().encode())
+        for group in self.selectfilegroups_disk():
+            for f in group:
+                try:
+                    st = os.stat(f)
+                    h.update(f"{f}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+                except OSError:
+                    h.update(f"{f}\0missing\n".encode())
+            h.update(b"\n")
+        return h.hexdigest()
+
     def epochnodes(self) -> list[dict[str, Any]]:
         """Return epoch node structs for this file navigator.
 
@@ -551,6 +735,10 @@ class ndi_file_navigator(ndi_ido):
         """
         Get the epoch ID for an epoch.
 
+        IDs are looked up in the navigator's epoch-ID manifest first and
+        then in the legacy per-epoch ``.epochid.ndi`` sidecar; a new ID is
+        recorded in both so that MATLAB sees the same value.
+
         Args:
             epoch_number: ndi_epoch_epoch number (1-indexed)
             epochfiles: Optional file list (fetched if not provided)
@@ -560,30 +748,145 @@ class ndi_file_navigator(ndi_ido):
         """
         if epochfiles is None:
             epochfiles = self.getepochfiles_number(epoch_number)
+        return self._resolve_epochids([epochfiles])[0]
 
-        # Check if ingested
-        if self.isingested(epochfiles):
-            return self.ingestedfiles_epochid(epochfiles)
+    def epochids(self, epochfiles_list: list[list[str]]) -> list[str]:
+        """
+        Get the epoch IDs for many epochs at once.
 
-        # Try to read from epoch ID file
-        eidfname = self.epochidfilename(epoch_number, epochfiles)
-        if eidfname and Path(eidfname).is_file():
-            with open(eidfname) as f:
-                return f.read().strip()
+        Python-specific: no MATLAB equivalent.
 
-        # Generate new ID
-        from ...ido import ndi_ido
+        The manifest is read at most once and all newly assigned IDs are
+        appended to it in a single write.
 
-        new_id = f"epoch_{ndi_ido().id}"
+        Args:
+            epochfiles_list: File groups, in epoch order
 
-        # Save to file if possible
-        if eidfname:
+        Returns:
+            ndi_epoch_epoch identifier strings, one per file group
+        """
+        # Subclasses that derive IDs directly from file names override
+        # epochid itself; honor those overrides one epoch at a time.
+        if type(self).epochid is not ndi_file_navigator.epochid:
+            return [self.epochid(i + 1, files) for i, files in enumerate(epochfiles_list)]
+        return self._resolve_epochids(epochfiles_list)
+
+    def _resolve_epochids(self, epochfiles_list: list[list[str]]) -> list[str]:
+        """Resolve epoch IDs through the manifest, then the legacy sidecars."""
+        manifest_path = self._epochid_manifest_path()
+        manifest = self._read_epochid_manifest(manifest_path) if manifest_path else {}
+
+        ids: list[str] = []
+        new_entries: dict[str, str] = {}
+        for files in epochfiles_list:
+            if self.isingested(files):
+                ids.append(self.ingestedfiles_epochid(files))
+                continue
+
+            eidfname = self.epochidfilename(0, files)
+            if not eidfname:
+                ids.append(self._new_epochid(files))
+                continue
+
+            key = self._epochid_manifest_key(eidfname)
+            eid = manifest.get(key) or new_entries.get(key)
+            if eid is None:
+                eid = self._read_or_create_sidecar(eidfname, files)
+                new_entries[key] = eid
+            ids.append(eid)
+
+        if new_entries and manifest_path:
+            self._append_epochid_manifest(manifest_path, new_entries)
+        return ids
+
+    def _new_epochid(self, epochfiles: list[str]) -> str:
+        """Generate the ID for an epoch that has none recorded yet."""
+        return f"epoch_{ndi_ido().id}"
+
+    def _read_or_create_sidecar(self, eidfname: str, epochfiles: list[str]) -> str:
+        """Read a legacy epoch-ID sidecar, creating it if it is missing."""
+        with contextlib.suppress(OSError):
+            with open(eidfname) as f:
+                eid = f.read().strip()
+            if eid:
+                return eid
+
+        new_id = self._new_epochid(epochfiles)
+        try:
             Path(eidfname).parent.mkdir(parents=True, exist_ok=True)
-            with open(eidfname, "w") as f:
+            # exclusive create: if another process got there first, its ID wins
+            with open(eidfname, "x") as f:
                 f.write(new_id)
-
+        except FileExistsError:
+            with open(eidfname) as f:
+                return f.read().strip() or new_id
+        except OSError:
+            pass
         return new_id
 
+    def _epochid_manifest_path(self) -> str | None:
+        """Manifest location in the session's .ndi directory, if there is one."""
+        try:
+            base_path = self.path()
+        except ValueError:
+            return None
+        ndi_dir = os.path.join(base_path, ".ndi")
+        if not os.path.isdir(ndi_dir):
+            return None
+        fmstr = self.filematch_hashstring() or "default"
+        return os.path.join(ndi_dir, f"{EPOCHID_MANIFEST_PREFIX}{fmstr}.tsv")
+
+    def _epochid_manifest_key(self, eidfname: str) -> str:
+        """Manifest key for a sidecar: its path relative to the session."""
+        try:
+            rel = os.path.relpath(eidfname, self.path())
+        except ValueError:
+            return eidfname
+        return rel.replace(os.sep, "/")
+
+    def _read_epochid_manifest(self, manifest_path: str) -> dict[str, str]:
+        """Read the manifest, reusing the cached copy while the file is unchanged."""
+        try:
+            st = os.stat(manifest_path)
+        except OSError:
+            return {}
+        stamp = (manifest_path, st.st_mtime_ns, st.st_size)
+        cached = self._epochid_manifest_cache
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        entries: dict[str, str] = {}
+        try:
+            with open(manifest_path, encoding="utf-8") as f:
+                for line in f:
+                    fields = line.rstrip("\n").split("\t")
+                    # skip torn or malformed lines; the first entry for a key wins
+                    if len(fields) == 2 and fields[0] and fields[1]:
+                        entries.setdefault(fields[0], fields[1])
+        except OSError:
+            return {}
+        self._epochid_manifest_cache = (stamp, entries)
+        return entries
+
+    def _append_epochid_manifest(self, manifest_path: str, new_entries: dict[str, str]) -> None:
+        """Append entries to the manifest in one O_APPEND write."""
+        data = "".join(f"{k}\t{v}\n" for k, v in new_entries.items()).encode("utf-8")
+        try:
+            # unbuffered append: readable for the check below, and the
+            # entries still go to the end of the file in a single write
+            with open(manifest_path, "a+b", buffering=0) as f:
+                # terminate a line torn by an interrupted writer
+                size = f.seek(0, os.SEEK_END)
+                if size:
+                    f.seek(size - 1)
+                    if f.read(1) != b"\n":
+                        data = b"\n" + data
+                f.write(data)
+        except OSError:
+            # the manifest is only an accelerator; the sidecars remain authoritative
+            return
+        self._epochid_manifest_cache = None
+
     def epochidfilename(
         self,
         epoch_number: int,
@@ -644,16 +947,12 @@ class ndi_file_navigator(ndi_ido):
             if self.isingested(epochfiles):
                 return None
 
+            compiled = compile_file_patterns(
+                tuple(self._epochprobemap_fileparameters["filematch"]), hash_wildcard=False
+            )
             for f in epochfiles:
-                filename = os.path.basename(f)
-                for pattern in self._epochprobemap_fileparameters["filematch"]:
-                    if fnmatch.fnmatch(filename, pattern):
-                        return f
-                    try:
-                        if re.search(matlab_to_python_regex(pattern), filename):
-                            return f
-                    except re.error:
-                        pass
+                if match_file_pattern(os.path.basename(f), compiled) >= 0:
+                    return f
 
         return self.defaultepochprobemapfilename(epoch_number)
 
@@ -701,25 +1000,19 @@ class ndi_file_navigator(ndi_ido):
         if self.isingested(epochfiles):
             doc = self.getepochingesteddoc(epochfiles)
             if doc:
-                props = doc.document_properties
+                props = doc.read_properties()
                 epm = props["epochfiles_ingested"].get("epochprobemap")
                 if isinstance(epm, str):
                     return self._parse_epochprobemap_tsv(epm)
                 return epm
 
         # Try to find a probe map file within the epoch files
-        epm_patterns = self._epochprobemap_fileparameters.get("filematch", [])
+        compiled = compile_file_patterns(
+            tuple(self._epochprobemap_fileparameters.get("filematch", []))
+        )
         for f in epochfiles:
-            fname = os.path.basename(f)
-            for pat in epm_patterns:
-                glob_pat = pat.replace("#", "*")
-                if fnmatch.fnmatch(fname, glob_pat):
-                    return self._load_epochprobemap_file(f)
-                try:
-                    if re.search(matlab_to_python_regex(pat), fname):
-                        return self._load_epochprobemap_file(f)
-                except re.error:
-                    pass
+            if match_file_pattern(os.path.basename(f), compiled) >= 0:
+                return self._load_epochprobemap_file(f)
 
         # Fall back to generated probe map file
         filename = self.epochprobemapfilename(epoch_number)
@@ -934,17 +1227,25 @@ class ndi_file_navigator(ndi_ido):
         When a navigator is loaded from a document we preserve that
         raw string so the hash matches across languages.
 
+        The hash is memoized until the file parameters change.
+
         Returns:
             MD5 hash of the file-parameter representation
         """
+        key = (self._raw_fileparameters_str, tuple(self._fileparameters.get("filematch", [])))
+        if self._filematch_hash_memo is not None and self._filematch_hash_memo[0] == key:
+            return self._filematch_hash_memo[1]
+
+        raw, patterns = key
         # Prefer the raw document string so epoch-ID filenames match MATLAB
-        if self._raw_fileparameters_str:
-            return hashlib.md5(self._raw_fileparameters_str.encode()).hexdigest()
-        patterns = self._fileparameters.get("filematch", [])
-        if not patterns:
-            return ""
-        concat = "".join(patterns)
-        return hashlib.md5(concat.encode()).hexdigest()
+        if raw:
+            value = hashlib.md5(raw.encode()).hexdigest()
+        elif patterns:
+            value = hashlib.md5("".join(patterns).encode()).hexdigest()
+        else:
+            value = ""
+        self._filematch_hash_memo = (key, value)
+        return value
 
     def ingest(self) -> list[Any]:
         """
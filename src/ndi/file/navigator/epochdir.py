@@ -34,60 +34,32 @@ class ndi_file_navigator_epochdir(ndi_file_navigator):
 
     NDI_FILENAVIGATOR_CLASS = "ndi.file.navigator.epochdir"
 
-    def epochid(
-        self,
-        epoch_number: int,
-        epochfiles: list[str] | None = None,
-    ) -> str:
+    def _new_epochid(self, epochfiles: list[str]) -> str:
         """
-        Get the epoch ID for a directory-based epoch.
+        Generate the ID for a directory-based epoch.
 
         MATLAB equivalent: ndi.file.navigator_epochdir/epochid
 
         Overrides the parent to generate deterministic IDs from the
-        epoch directory name rather than creating random IDs.
+        epoch directory name rather than creating random IDs. Lookup in
+        the epoch-ID manifest and the legacy sidecar is inherited from
+        ``ndi_file_navigator.epochid``.
 
         Args:
-            epoch_number: ndi_epoch_epoch number (1-indexed)
-            epochfiles: Optional file list (fetched if not provided)
+            epochfiles: Files of the epoch
 
         Returns:
             ndi_epoch_epoch identifier string based on directory name
         """
-        if epochfiles is None:
-            epochfiles = self.getepochfiles_number(epoch_number)
-
-        # Check if ingested
-        if self.isingested(epochfiles):
-            return self.ingestedfiles_epochid(epochfiles)
-
-        # Try to read from epoch ID file (parent behavior)
-        eidfname = self.epochidfilename(epoch_number, epochfiles)
-        if eidfname and Path(eidfname).is_file():
-            with open(eidfname) as f:
-                return f.read().strip()
-
-        # Generate ID from directory name (epochdir-specific behavior)
-        if epochfiles:
-            epoch_dir = Path(epochfiles[0]).parent
-            dir_name = epoch_dir.name
-            # Create deterministic ID from directory name + filematch hash
-            fmstr = self.filematch_hashstring()
-            hash_input = f"{dir_name}_{fmstr}"
-            epoch_hash = hashlib.md5(hash_input.encode()).hexdigest()[:16]
-            new_id = f"epoch_{epoch_hash}"
-        else:
-            from ...ido import ndi_ido
-
-            new_id = f"epoch_{ndi_ido().id}"
-
-        # Save to file if possible
-        if eidfname:
-            Path(eidfname).parent.mkdir(parents=True, exist_ok=True)
-            with open(eidfname, "w") as f:
-                f.write(new_id)
-
-        return new_id
+        if not epochfiles:
+            return super()._new_epochid(epochfiles)
+
+        dir_name = Path(epochfiles[0]).parent.name
+        # Create deterministic ID from directory name + filematch hash
+        fmstr = self.filematch_hashstring()
+        hash_input = f"{dir_name}_{fmstr}"
+        epoch_hash = hashlib.md5(hash_input.encode()).hexdigest()[:16]
+        return f"epoch_{epoch_hash}"
 
     def selectfilegroups_disk(self) -> list[list[str]]:
         """
@@ -139,32 +111,19 @@ class ndi_file_navigator_epochdir(ndi_file_navigator):
         Returns:
             List of matched file paths
         """
-        import fnmatch
-        import re
-
-        from ...util.matlab_regex import matlab_to_python_regex
+        from . import compile_file_patterns, match_file_pattern
 
-        matched = []
+        compiled = compile_file_patterns(tuple(patterns), hash_wildcard=False)
         try:
             files = [f for f in directory.iterdir() if f.is_file()]
         except PermissionError:
             return []
 
-        for f in files:
-            if f.name.startswith("."):
-                continue
-            for pattern in patterns:
-                if fnmatch.fnmatch(f.name, pattern):
-                    matched.append(str(f))
-                    break
-                try:
-                    if re.search(matlab_to_python_regex(pattern), f.name):
-                        matched.append(str(f))
-                        break
-                except re.error:
-                    pass
-
-        return matched
+        return [
+            str(f)
+            for f in files
+            if not f.name.startswith(".") and match_file_pattern(f.name, compiled) >= 0
+        ]
 
     def __repr__(self) -> str:
         n_patterns = len(self._fileparameters.get("filematch", []))
@@ -0,0 +1,160 @@
+"""
+ndi.file.transfer - Bulk transfer of binary files between databases.
+
+Python-specific: no MATLAB equivalent.
+
+Files are cloned (reflink) where the filesystem supports it, hardlinked
+when the source and destination share a filesystem, and otherwise copied
+in parallel. Copies are written to a temporary name and renamed into
+place, so a destination that exists with the source's size is complete;
+re-running an interrupted transfer only moves the files that are missing.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import shutil
+import threading
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# ioctl request that clones a file's extents (Linux: btrfs, XFS, ...)
+_FICLONE = 0x40049409
+
+# Default number of concurrent copies across filesystems
+DEFAULT_COPY_WORKERS = 8
+
+
+@dataclass
+class TransferReport:
+    """Summary of a :func:`transfer_files` run."""
+
+    reflinked: int = 0
+    hardlinked: int = 0
+    copied: int = 0
+    skipped: int = 0
+    bytes_copied: int = 0
+    failed: list[tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def transferred(self) -> int:
+        """Number of files placed at their destination by this run."""
+        return self.reflinked + self.hardlinked + self.copied
+
+
+def _reflink(src: Path, dest: Path) -> bool:
+    """Clone *src* to *dest* without copying data, if the filesystem allows it."""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(src, "rb") as fin, open(dest, "wb") as fout:
+            fcntl.ioctl(fout.fileno(), _FICLONE, fin.fileno())
+    except OSError:
+        with contextlib.suppress(OSError):
+            dest.unlink()
+        return False
+    shutil.copystat(src, dest)
+    return True
+
+
+def _is_complete(src: Path, dest: Path) -> bool:
+    """True if *dest* already holds a finished transfer of *src*."""
+    try:
+        return dest.stat().st_size == src.stat().st_size
+    except OSError:
+        return False
+
+
+def _same_filesystem(src: Path, dest_dir: Path) -> bool:
+    try:
+        return src.stat().st_dev == dest_dir.stat().st_dev
+    except OSError:
+        return False
+
+
+def _place(src: Path, dest: Path, link: bool) -> str:
+    """Move one file into place; return how ('reflink', 'hardlink' or 'copy')."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f"{dest.name}.{os.getpid()}.{threading.get_ident()}.part")
+    try:
+        if _reflink(src, tmp):
+            os.replace(tmp, dest)
+            return "reflink"
+        if link and _same_filesystem(src, dest.parent):
+            try:
+                os.link(src, tmp)
+            except OSError:
+                pass  # e.g. a filesystem without hardlinks; copy instead
+            else:
+                os.replace(tmp, dest)
+                return "hardlink"
+        shutil.copy2(src, tmp)
+        os.replace(tmp, dest)
+        return "copy"
+    finally:
+        with contextlib.suppress(OSError):
+            tmp.unlink()
+
+
+def transfer_files(
+    pairs: Iterable[tuple[str | Path, str | Path]],
+    link: bool = True,
+    max_workers: int = DEFAULT_COPY_WORKERS,
+) -> TransferReport:
+    """
+    Place copies of many files at new paths.
+
+    Python-specific: no MATLAB equivalent.
+
+    Each file is cloned if the filesystem supports reflinks, otherwise
+    hardlinked when ``link`` is True and both paths are on the same
+    filesystem, and otherwise copied. Copies run concurrently. Files whose
+    destination already exists with the source's size are skipped, so an
+    interrupted transfer can simply be run again.
+
+    Hardlinked files share their data with the source; NDI never modifies
+    a binary file once it has been added to a database.
+
+    Args:
+        pairs: ``(source, destination)`` paths
+        link: Allow hardlinks between paths on the same filesystem
+        max_workers: Number of concurrent transfers
+
+    Returns:
+        TransferReport counting how each file was placed; files that could
+        not be transferred are listed in ``failed`` with the error message
+    """
+    report = TransferReport()
+    todo = []
+    for src, dest in pairs:
+        src, dest = Path(src), Path(dest)
+        if _is_complete(src, dest):
+            report.skipped += 1
+        else:
+            todo.append((src, dest))
+
+    def run(pair: tuple[Path, Path]) -> tuple[Path, Path, str | None, str]:
+        src, dest = pair
+        try:
+            return src, dest, _place(src, dest, link), ""
+        except OSError as exc:
+            return src, dest, None, str(exc)
+
+    workers = max(1, min(max_workers, len(todo)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for src, dest, how, error in pool.map(run, todo):
+            if how is None:
+                report.failed.append((str(dest), error))
+            elif how == "reflink":
+                report.reflinked += 1
+            elif how == "hardlink":
+                report.hardlinked += 1
+            else:
+                report.copied += 1
+                report.bytes_copied += src.stat().st_size
+    return report
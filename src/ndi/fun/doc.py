@@ -45,6 +45,15 @@ def allTypes() -> list[str]:
     return sorted(types)
 
 
+def _properties(doc: Any) -> Any:
+    """Return a document's properties for reading, without copying search results."""
+    from ndi.document import ndi_document
+
+    if isinstance(doc, ndi_document):
+        return doc.read_properties()
+    return doc.document_properties if hasattr(doc, "document_properties") else doc
+
+
 def findFuid(session: Any, fuid: str) -> tuple[Any | None, str]:
     """Search session for a document containing a file with the given UID.
 
@@ -56,12 +65,18 @@ def findFuid(session: Any, fuid: str) -> tuple[Any | None, str]:
 
     Returns:
         Tuple of ``(document, filename)`` or ``(None, '')`` if not found.
+
+    Sessions and datasets answer from their database file index; other
+    objects are searched document by document.
     """
     from ndi.query import ndi_query
 
+    if hasattr(type(session), "database_find_by_file_uid"):
+        return session.database_find_by_file_uid(fuid)
+
     docs = session.database_search(ndi_query("").isa("base"))
     for doc in docs:
-        props = doc.document_properties if hasattr(doc, "document_properties") else doc
+        props = _properties(doc)
         if not isinstance(props, dict):
             continue
         files = props.get("files", {})
@@ -430,7 +445,7 @@ def ontologyTableRowVars(
     names_set: dict[str, tuple[str, str]] = {}
 
     for doc in docs:
-        props = doc.document_properties if hasattr(doc, "document_properties") else doc
+        props = _properties(doc)
         if not isinstance(props, dict):
             continue
 
@@ -491,7 +506,7 @@ def getDocTypes(
 
     type_counter: Counter[str] = Counter()
     for doc in docs:
-        props = doc.document_properties if hasattr(doc, "document_properties") else doc
+        props = _properties(doc)
         if isinstance(props, dict):
             class_name = props.get("document_class", {}).get("class_name", "unknown")
             type_counter[class_name] += 1
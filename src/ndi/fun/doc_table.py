@@ -8,8 +8,12 @@ Converts NDI documents into pandas DataFrames for analysis.
 
 from __future__ import annotations
 
+import functools
+from collections.abc import Callable
 from typing import Any
 
+from ndi.fun.doc import _properties
+
 try:
     import pandas as pd
 except ImportError:
@@ -24,6 +28,121 @@ def _require_pandas() -> None:
         )
 
 
+# Built tables kept by the ``cache=True`` option: key -> (change token, result)
+_TABLE_CACHE: dict[tuple, tuple[Any, Any]] = {}
+_TABLE_CACHE_SIZE = 64
+
+
+def clear_table_cache() -> None:
+    """Discard all tables kept by the ``cache=True`` option of the builders.
+
+    Python-specific: no MATLAB equivalent.
+    """
+    _TABLE_CACHE.clear()
+
+
+def _copy_result(result: Any) -> Any:
+    if isinstance(result, tuple):
+        return tuple(_copy_result(r) for r in result)
+    if isinstance(result, list):
+        return list(result)
+    if pd is not None and isinstance(result, pd.DataFrame):
+        return result.copy()
+    return result
+
+
+def _cacheable(builder: Callable) -> Callable:
+    """Add a ``cache`` keyword to a table builder.
+
+    With ``cache=True`` the built table is kept in memory and returned
+    again (as a copy) until the database change token of the session or
+    dataset changes. Sessions without a change token are never cached.
+    """
+
+    @functools.wraps(builder)
+    def wrapper(session: Any, *args: Any, cache: bool = False, **kwargs: Any) -> Any:
+        if not cache:
+            return builder(session, *args, **kwargs)
+        try:
+            token = session.database_change_token()
+            session_key = session.id() if callable(getattr(session, "id", None)) else id(session)
+            key = (builder.__name__, session_key, args, tuple(sorted(kwargs.items())))
+            hash(key)
+        except (AttributeError, TypeError):
+            return builder(session, *args, **kwargs)
+        if token is None:
+            return builder(session, *args, **kwargs)
+
+        hit = _TABLE_CACHE.get(key)
+        if hit is not None and hit[0] == token:
+            return _copy_result(hit[1])
+
+        result = builder(session, *args, **kwargs)
+        _TABLE_CACHE.pop(key, None)
+        while len(_TABLE_CACHE) >= _TABLE_CACHE_SIZE:
+            del _TABLE_CACHE[next(iter(_TABLE_CACHE))]
+        _TABLE_CACHE[key] = (token, result)
+        return _copy_result(result)
+
+    return wrapper
+
+
+def _project(session: Any, class_name: str, fields: list[str]) -> list[dict[str, Any]]:
+    """Return selected fields of every document of a class.
+
+    Uses the projection API of sessions and datasets (``database_project``)
+    so that only these fields are read from the database; other objects
+    are searched and the fields picked from the full documents.
+    """
+    from ndi.database import project_properties
+    from ndi.query import ndi_query
+
+    query = ndi_query("").isa(class_name)
+    if hasattr(type(session), "database_project"):
+        return session.database_project(query, fields)
+    rows = []
+    for doc in session.database_search(query):
+        props = _properties(doc)
+        if isinstance(props, dict):
+            rows.append(project_properties(props, fields))
+    return rows
+
+
+def _columns(rows: list[dict[str, Any]], spec: dict[str, tuple[str, Any]]) -> pd.DataFrame:
+    """Build a DataFrame column by column from projected rows.
+
+    Args:
+        rows: Projected rows (field path -> value).
+        spec: Output column -> (field path, default used for missing values).
+    """
+    if not rows:
+        return pd.DataFrame()
+    data = {}
+    for column, (field, default) in spec.items():
+        data[column] = [default if (v := row.get(field)) is None else v for row in rows]
+    return pd.DataFrame(data)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_epochprobemap(epm_str: str) -> tuple[tuple[str, int, str], ...]:
+    """Parse a TSV epochprobemap into (name, reference, type) entries.
+
+    Identical maps are shared by many epochs, so parses are memoized.
+    """
+    import csv
+    import io
+
+    entries = []
+    for probe_entry in csv.DictReader(io.StringIO(epm_str), delimiter="\t"):
+        # Convert reference to int for matching
+        try:
+            ref = int(probe_entry.get("reference", "0"))
+        except (ValueError, TypeError):
+            ref = 0
+        entries.append((probe_entry.get("name", "") or "", ref, probe_entry.get("type", "") or ""))
+    return tuple(entries)
+
+
 def ontologyTableRowDoc2Table(
     documents: list[Any],
     *,
@@ -61,7 +180,7 @@ def ontologyTableRowDoc2Table(
     dependency_id_list: list[str] = []
 
     for doc in documents:
-        props = doc.document_properties if hasattr(doc, "document_properties") else doc
+        props = _properties(doc)
         if not isinstance(props, dict):
             continue
 
@@ -144,25 +263,35 @@ def docCellArray2Table(
     """
     _require_pandas()
 
-    rows: list[dict[str, Any]] = []
+    # Fill columns directly; a cell is NaN where a document lacks the column
+    columns: dict[str, list[Any]] = {}
+    n_rows = 0
     for doc in documents:
-        props = doc.document_properties if hasattr(doc, "document_properties") else doc
+        props = _properties(doc)
         if not isinstance(props, dict):
             continue
 
-        row: dict[str, Any] = {}
         # Flatten top-level sections
         for section, data in props.items():
-            if isinstance(data, dict):
-                for key, val in data.items():
-                    row[f"{section}.{key}"] = val
-            else:
-                row[section] = data
-        rows.append(row)
+            items = (
+                ((f"{section}.{key}", val) for key, val in data.items())
+                if isinstance(data, dict)
+                else ((section, data),)
+            )
+            for name, val in items:
+                column = columns.get(name)
+                if column is None:
+                    column = columns[name] = [float("nan")] * n_rows
+                column.append(val)
+        n_rows += 1
+        for column in columns.values():
+            if len(column) < n_rows:
+                column.append(float("nan"))
 
-    return pd.DataFrame(rows) if rows else pd.DataFrame()
+    return pd.DataFrame(columns, index=range(n_rows)) if n_rows else pd.DataFrame()
 
 
+@_cacheable
 def element(
     session: Any,
 ) -> pd.DataFrame:
@@ -172,31 +301,29 @@ def element(
 
     Args:
         session: NDI session instance.
+        cache: If True, return a copy of the table built by an earlier
+            call until the database changes (Python-specific).
 
     Returns:
         DataFrame with element properties.
     """
     _require_pandas()
-    from ndi.query import ndi_query
-
-    docs = session.database_search(ndi_query("").isa("element"))
-    rows: list[dict[str, Any]] = []
-
-    for doc in docs:
-        props = doc.document_properties
-        el = props.get("element", {})
-        base = props.get("base", {})
-        row = {
-            "id": base.get("id", ""),
-            "name": el.get("name", ""),
-            "reference": el.get("reference", 0),
-            "type": el.get("type", ""),
-        }
-        rows.append(row)
-
-    return pd.DataFrame(rows) if rows else pd.DataFrame()
-
 
+    rows = _project(
+        session, "element", ["base.id", "element.name", "element.reference", "element.type"]
+    )
+    return _columns(
+        rows,
+        {
+            "id": ("base.id", ""),
+            "name": ("element.name", ""),
+            "reference": ("element.reference", 0),
+            "type": ("element.type", ""),
+        },
+    )
+
+
+@_cacheable
 def subjectBasic(
     session: Any,
 ) -> pd.DataFrame:
@@ -206,30 +333,28 @@ def subjectBasic(
 
     Args:
         session: NDI session instance.
+        cache: If True, return a copy of the table built by an earlier
+            call until the database changes (Python-specific).
 
     Returns:
         DataFrame with subject properties.
     """
     _require_pandas()
-    from ndi.query import ndi_query
 
-    docs = session.database_search(ndi_query("").isa("subject"))
-    rows: list[dict[str, Any]] = []
-
-    for doc in docs:
-        props = doc.document_properties
-        subj = props.get("subject", {})
-        base = props.get("base", {})
-        row = {
-            "id": base.get("id", ""),
-            "local_identifier": subj.get("local_identifier", ""),
-            "description": subj.get("description", ""),
-        }
-        rows.append(row)
-
-    return pd.DataFrame(rows) if rows else pd.DataFrame()
+    rows = _project(
+        session, "subject", ["base.id", "subject.local_identifier", "subject.description"]
+    )
+    return _columns(
+        rows,
+        {
+            "id": ("base.id", ""),
+            "local_identifier": ("subject.local_identifier", ""),
+            "description": ("subject.description", ""),
+        },
+    )
 
 
+@_cacheable
 def probe(
     session: Any,
 ) -> pd.DataFrame:
@@ -244,70 +369,59 @@ def probe(
 
     Args:
         session: NDI session or dataset instance.
+        cache: If True, return a copy of the table built by an earlier
+            call until the database changes (Python-specific).
 
     Returns:
         DataFrame with probe properties.
     """
     _require_pandas()
-    from ndi.query import ndi_query
 
     # 1. Get all element docs that are probes
-    docs = session.database_search(ndi_query("").isa("probe"))
+    element_fields = ["base.id", "element.name", "element.type", "element.reference", "depends_on"]
+    docs = _project(session, "probe", element_fields)
     if not docs:
         # Fallback: try all element docs
-        docs = session.database_search(ndi_query("").isa("element"))
+        docs = _project(session, "element", element_fields)
+    if not docs:
+        return pd.DataFrame()
 
     # 2. Build probe_location index: probe_id -> location info
-    probe_loc_docs = session.database_search(ndi_query("").isa("probe_location"))
     loc_by_probe: dict[str, dict] = {}
-    for pld in probe_loc_docs:
-        props = pld.document_properties if hasattr(pld, "document_properties") else pld
-        probe_id = _get_depends_on(props, "probe_id")
+    for pld in _project(session, "probe_location", ["depends_on", "probe_location"]):
+        probe_id = _get_depends_on(pld, "probe_id")
         if probe_id:
-            pl = props.get("probe_location", {})
-            loc_by_probe[probe_id] = pl
+            loc_by_probe[probe_id] = pld["probe_location"] or {}
 
     # 3. Build openminds_element index: element_id -> cell type info
-    om_elem_docs = session.database_search(ndi_query("").isa("openminds_element"))
     ct_by_element: dict[str, dict] = {}
-    for omed in om_elem_docs:
-        props = omed.document_properties if hasattr(omed, "document_properties") else omed
-        element_id = _get_depends_on(props, "element_id")
+    for omed in _project(session, "openminds_element", ["depends_on", "openminds.fields"]):
+        element_id = _get_depends_on(omed, "element_id")
         if element_id:
-            fields = props.get("openminds", {}).get("fields", {})
-            ct_by_element[element_id] = fields
-
-    # 4. Build rows
-    rows: list[dict[str, Any]] = []
-    for doc in docs:
-        props = doc.document_properties if hasattr(doc, "document_properties") else doc
-        el = props.get("element", {})
-        base = props.get("base", {})
-        probe_id = base.get("id", "")
-
-        row: dict[str, Any] = {
-            "SubjectDocumentIdentifier": _get_depends_on(props, "subject_id"),
-            "ProbeDocumentIdentifier": probe_id,
-            "ProbeName": el.get("name", ""),
-            "ProbeType": el.get("type", ""),
-            "ProbeReference": el.get("reference", 0),
-        }
-
-        # ndi_probe location
-        loc = loc_by_probe.get(probe_id, {})
-        row["ProbeLocationName"] = loc.get("name", "")
-        row["ProbeLocationOntology"] = loc.get("ontology_name", "")
-
-        # Cell type
-        ct = ct_by_element.get(probe_id, {})
-        row["CellTypeName"] = ct.get("name", "")
-        row["CellTypeOntology"] = ct.get("preferredOntologyIdentifier", "")
-
-        rows.append(row)
-
-    return pd.DataFrame(rows) if rows else pd.DataFrame()
-
-
+            ct_by_element[element_id] = omed["openminds.fields"] or {}
+
+    # 4. Build columns
+    probe_ids = [d["base.id"] or "" for d in docs]
+    locs = [loc_by_probe.get(pid, {}) for pid in probe_ids]
+    cts = [ct_by_element.get(pid, {}) for pid in probe_ids]
+    table = _columns(
+        docs,
+        {
+            "ProbeDocumentIdentifier": ("base.id", ""),
+            "ProbeName": ("element.name", ""),
+            "ProbeType": ("element.type", ""),
+            "ProbeReference": ("element.reference", 0),
+        },
+    )
+    table.insert(0, "SubjectDocumentIdentifier", [_get_depends_on(d, "subject_id") for d in docs])
+    table["ProbeLocationName"] = [loc.get("name", "") for loc in locs]
+    table["ProbeLocationOntology"] = [loc.get("ontology_name", "") for loc in locs]
+    table["CellTypeName"] = [ct.get("name", "") for ct in cts]
+    table["CellTypeOntology"] = [ct.get("preferredOntologyIdentifier", "") for ct in cts]
+    return table
+
+
+@_cacheable
 def epoch(
     session: Any,
 ) -> pd.DataFrame:
@@ -326,127 +440,105 @@ def epoch(
 
     Args:
         session: NDI session or dataset instance.
+        cache: If True, return a copy of the table built by an earlier
+            call until the database changes (Python-specific).
 
     Returns:
         DataFrame with epoch timing and stimulus information.
     """
     _require_pandas()
-    import csv
-    import io
-
-    from ndi.query import ndi_query
 
     # 1. Build element name → (id, subject_id) map
-    elem_docs = session.database_search(ndi_query("").isa("element"))
-    elem_by_key: dict[str, dict] = {}
-    for doc in elem_docs:
-        props = doc.document_properties if hasattr(doc, "document_properties") else doc
-        el = props.get("element", {})
-        base = props.get("base", {})
-        name = el.get("name", "")
-        ref = el.get("reference", 0)
-        etype = el.get("type", "")
-        key = f"{name}|{ref}|{etype}"
-        elem_by_key[key] = {
-            "id": base.get("id", ""),
-            "subject_id": _get_depends_on(props, "subject_id"),
-        }
-
-    # 2. Build epoch → stimulus_bath mapping
-    sb_docs = session.database_search(ndi_query("").isa("stimulus_bath"))
-    sb_by_epoch: dict[str, list[dict]] = {}
-    for doc in sb_docs:
-        props = doc.document_properties if hasattr(doc, "document_properties") else doc
-        eid = props.get("epochid", {}).get("epochid", "")
-        if eid:
-            sb = props.get("stimulus_bath", {})
-            sb_by_epoch.setdefault(eid, []).append(sb)
-
-    # 3. Build epoch → openminds_stimulus (approach) mapping
-    approach_docs = session.database_search(ndi_query("").isa("openminds_stimulus"))
-    approach_by_epoch: dict[str, list[dict]] = {}
-    for doc in approach_docs:
-        props = doc.document_properties if hasattr(doc, "document_properties") else doc
-        eid = props.get("epochid", {}).get("epochid", "")
-        if eid:
-            fields = props.get("openminds", {}).get("fields", {})
-            approach_by_epoch.setdefault(eid, []).append(fields)
+    elem_by_key: dict[tuple, tuple[str, str]] = {}
+    for el in _project(
+        session,
+        "element",
+        ["base.id", "element.name", "element.reference", "element.type", "depends_on"],
+    ):
+        try:
+            ref = int(el["element.reference"] or 0)
+        except (ValueError, TypeError):
+            ref = 0
+        key = (el["element.name"] or "", ref, el["element.type"] or "")
+        elem_by_key[key] = (el["base.id"] or "", _get_depends_on(el, "subject_id"))
+
+    # 2. Build epoch → first stimulus_bath mixture
+    mixture_by_epoch: dict[str, tuple[str, str]] = {}
+    for sb in _project(session, "stimulus_bath", ["epochid.epochid", "stimulus_bath.location"]):
+        eid = sb["epochid.epochid"]
+        if eid and eid not in mixture_by_epoch:
+            loc = sb["stimulus_bath.location"]
+            if isinstance(loc, dict):
+                mixture_by_epoch[eid] = (loc.get("name", ""), loc.get("ontologyNode", ""))
+            else:
+                mixture_by_epoch[eid] = ("", "")
+
+    # 3. Build epoch → first openminds_stimulus (approach)
+    approach_by_epoch: dict[str, tuple[str, str]] = {}
+    for ap in _project(session, "openminds_stimulus", ["epochid.epochid", "openminds.fields"]):
+        eid = ap["epochid.epochid"]
+        if eid and eid not in approach_by_epoch:
+            fields = ap["openminds.fields"] or {}
+            approach_by_epoch[eid] = (
+                fields.get("name", ""),
+                fields.get("preferredOntologyIdentifier", ""),
+            )
 
     # 4. Parse epochfiles_ingested docs to get epoch → probe mappings
-    efi_docs = session.database_search(ndi_query("").isa("epochfiles_ingested"))
+    efi_docs = _project(
+        session,
+        "epochfiles_ingested",
+        ["epochfiles_ingested.epoch_id", "epochfiles_ingested.epochprobemap"],
+    )
     epoch_counter: dict[str, int] = {}  # probe_id -> running count
-    rows: list[dict[str, Any]] = []
-
-    for doc in efi_docs:
-        props = doc.document_properties if hasattr(doc, "document_properties") else doc
-        ef = props.get("epochfiles_ingested", {})
-        epoch_id = ef.get("epoch_id", "")
-        epm_str = ef.get("epochprobemap", "")
+    columns: dict[str, list[Any]] = {
+        name: []
+        for name in (
+            "EpochNumber",
+            "EpochDocumentIdentifier",
+            "ProbeDocumentIdentifier",
+            "SubjectDocumentIdentifier",
+            "MixtureName",
+            "MixtureOntology",
+            "ApproachName",
+            "ApproachOntology",
+        )
+    }
 
-        if not epm_str or not epoch_id:
+    for efi in efi_docs:
+        epoch_id = efi["epochfiles_ingested.epoch_id"]
+        epm_str = efi["epochfiles_ingested.epochprobemap"]
+        if not epm_str or not epoch_id or not isinstance(epm_str, str):
             continue
 
         # Parse TSV epochprobemap
         try:
-            reader = csv.DictReader(io.StringIO(epm_str), delimiter="\t")
-            probes_in_epoch = list(reader)
+            probes_in_epoch = _parse_epochprobemap(epm_str)
         except Exception:
             continue
 
-        # Mixture info for this epoch
-        sbs = sb_by_epoch.get(epoch_id, [])
-        mixture_name = ""
-        mixture_ont = ""
-        if sbs:
-            loc = sbs[0].get("location", {})
-            if isinstance(loc, dict):
-                mixture_name = loc.get("name", "")
-                mixture_ont = loc.get("ontologyNode", "")
-
-        # Approach info for this epoch
-        approaches = approach_by_epoch.get(epoch_id, [])
-        approach_name = ""
-        approach_ont = ""
-        if approaches:
-            approach_name = approaches[0].get("name", "")
-            approach_ont = approaches[0].get("preferredOntologyIdentifier", "")
-
-        for probe_entry in probes_in_epoch:
-            pname = probe_entry.get("name", "")
-            pref = probe_entry.get("reference", "0")
-            ptype = probe_entry.get("type", "")
-
-            # Convert reference to int for matching
-            try:
-                pref_int = int(pref)
-            except (ValueError, TypeError):
-                pref_int = 0
-
-            key = f"{pname}|{pref_int}|{ptype}"
-            elem_info = elem_by_key.get(key, {})
-            probe_id = elem_info.get("id", "")
-            subject_id = elem_info.get("subject_id", "")
+        mixture_name, mixture_ont = mixture_by_epoch.get(epoch_id, ("", ""))
+        approach_name, approach_ont = approach_by_epoch.get(epoch_id, ("", ""))
+
+        for key in probes_in_epoch:
+            probe_id, subject_id = elem_by_key.get(key, ("", ""))
 
             # ndi_epoch_epoch counter per probe
-            epoch_counter.setdefault(probe_id, 0)
-            epoch_counter[probe_id] += 1
-
-            rows.append(
-                {
-                    "EpochNumber": epoch_counter[probe_id],
-                    "EpochDocumentIdentifier": epoch_id,
-                    "ProbeDocumentIdentifier": probe_id,
-                    "SubjectDocumentIdentifier": subject_id,
-                    "MixtureName": mixture_name,
-                    "MixtureOntology": mixture_ont,
-                    "ApproachName": approach_name,
-                    "ApproachOntology": approach_ont,
-                }
-            )
+            epoch_counter[probe_id] = epoch_counter.get(probe_id, 0) + 1
+
+            columns["EpochNumber"].append(epoch_counter[probe_id])
+            columns["EpochDocumentIdentifier"].append(epoch_id)
+            columns["ProbeDocumentIdentifier"].append(probe_id)
+            columns["SubjectDocumentIdentifier"].append(subject_id)
+            columns["MixtureName"].append(mixture_name)
+            columns["MixtureOntology"].append(mixture_ont)
+            columns["ApproachName"].append(approach_name)
+            columns["ApproachOntology"].append(approach_ont)
 
-    return pd.DataFrame(rows) if rows else pd.DataFrame()
+    return pd.DataFrame(columns) if columns["EpochNumber"] else pd.DataFrame()
 
 
+@_cacheable
 def openminds(
     session: Any,
     doc_type: str = "openminds",
@@ -467,6 +559,8 @@ def openminds(
         errorIfEmpty: If True, raise an error when no documents found.
         depends_on_docs: Pre-fetched dependency documents (optimization).
         allOpenMindsDocs: Pre-fetched openminds documents (optimization).
+        cache: If True, return a copy of the table built by an earlier
+            call until the database changes (Python-specific).
 
     Returns:
         Tuple of ``(table, doc_ids, dependency_ids)`` where *table* is a
@@ -475,18 +569,15 @@ def openminds(
         dependency IDs.
     """
     _require_pandas()
-    from ndi.query import ndi_query
 
-    docs = session.database_search(ndi_query("").isa(doc_type))
+    docs = _project(session, doc_type, ["base.id", doc_type, "depends_on"])
     rows: list[dict[str, Any]] = []
     doc_ids: list[str] = []
     dependency_ids: list[str] = []
 
     for doc in docs:
-        props = doc.document_properties
-        base = props.get("base", {})
-        om = props.get(doc_type, {})
-        doc_id = base.get("id", "")
+        om = doc[doc_type]
+        doc_id = doc["base.id"] or ""
         row = {"id": doc_id}
         if isinstance(om, dict):
             row.update(om)
@@ -495,7 +586,7 @@ def openminds(
 
         # Extract primary dependency
         dep_id = ""
-        dep_list = props.get("depends_on", [])
+        dep_list = doc["depends_on"]
         if isinstance(dep_list, list) and dep_list:
             first = dep_list[0]
             if isinstance(first, dict):
@@ -509,6 +600,7 @@ def openminds(
     return table, doc_ids, dependency_ids
 
 
+@_cacheable
 def treatment(
     session: Any,
     *,
@@ -528,6 +620,8 @@ def treatment(
         depends_on_docs: Pre-fetched dependency documents (optimization).
         hideMixtureTable: If True (default), exclude mixture-related
             columns from the output table.
+        cache: If True, return a copy of the table built by an earlier
+            call until the database changes (Python-specific).
 
     Returns:
         Tuple of ``(table, doc_ids, dependency_ids)`` where *table* is a
@@ -535,18 +629,15 @@ def treatment(
         of document IDs, and *dependency_ids* is a list of dependency IDs.
     """
     _require_pandas()
-    from ndi.query import ndi_query
 
-    docs = session.database_search(ndi_query("").isa("treatment"))
+    docs = _project(session, "treatment", ["base.id", "treatment", "depends_on"])
     rows: list[dict[str, Any]] = []
     doc_ids: list[str] = []
     dependency_ids: list[str] = []
 
     for doc in docs:
-        props = doc.document_properties
-        base = props.get("base", {})
-        treat = props.get("treatment", {})
-        doc_id = base.get("id", "")
+        treat = doc["treatment"]
+        doc_id = doc["base.id"] or ""
         row = {"id": doc_id}
         if isinstance(treat, dict):
             row.update(treat)
@@ -555,7 +646,7 @@ def treatment(
 
         # Extract dependency
         dep_id = ""
-        dep_list = props.get("depends_on", [])
+        dep_list = doc["depends_on"]
         if isinstance(dep_list, list):
             for dep in dep_list:
                 if isinstance(dep, dict) and dep.get("name") == depends_on:
@@ -576,6 +667,19 @@ def treatment(
     return table, doc_ids, dependency_ids
 
 
+def _is_datetime(value: str) -> bool:
+    """Return True if a treatment string value parses as a date/time."""
+    if not value:
+        return False
+    try:
+        from dateutil.parser import parse as _date_parse
+
+        _date_parse(value)
+        return True
+    except Exception:
+        return False
+
+
 def _get_depends_on(props: dict, name: str) -> str:
     """Extract a depends_on value by name from document properties."""
     deps = props.get("depends_on", [])
@@ -590,6 +694,7 @@ def _get_depends_on(props: dict, name: str) -> str:
     return ""
 
 
+@_cacheable
 def subject(
     session: Any,
     *,
@@ -607,6 +712,8 @@ def subject(
         session: NDI session or dataset instance.
         hideMixtureTable: If True (default), exclude mixture-related
             columns from the output table.
+        cache: If True, return a copy of the table built by an earlier
+            call until the database changes (Python-specific).
 
     Returns:
         DataFrame with columns: SubjectDocumentIdentifier,
@@ -617,42 +724,32 @@ def subject(
         Treatment_FoodRestrictionOnsetTime, Treatment_FoodRestrictionOffsetTime.
     """
     _require_pandas()
-    from ndi.query import ndi_query
 
     # 1. Get all subject docs — build subject_id → base info
-    subject_docs = session.database_search(ndi_query("").isa("subject"))
     subject_info: dict[str, dict[str, str]] = {}
-    for doc in subject_docs:
-        props = doc.document_properties if hasattr(doc, "document_properties") else doc
-        if not isinstance(props, dict):
-            continue
-        base = props.get("base", {})
-        subj = props.get("subject", {})
-        sid = base.get("id", "")
+    for subj in _project(
+        session, "subject", ["base.id", "base.session_id", "subject.local_identifier"]
+    ):
+        sid = subj["base.id"]
         if sid:
             subject_info[sid] = {
                 "SubjectDocumentIdentifier": sid,
-                "SessionDocumentIdentifier": base.get("session_id", ""),
-                "SubjectLocalIdentifier": subj.get("local_identifier", ""),
+                "SessionDocumentIdentifier": subj["base.session_id"] or "",
+                "SubjectLocalIdentifier": subj["subject.local_identifier"] or "",
             }
 
     if not subject_info:
         return pd.DataFrame()
 
     # 2. Get all openminds_subject docs — index by subject_id and type
-    om_docs = session.database_search(ndi_query("").isa("openminds_subject"))
-
     # Per-subject openminds data: {subject_id: {type: [doc_props, ...]}}
     om_by_subject: dict[str, dict[str, list[dict]]] = {sid: {} for sid in subject_info}
 
-    for doc in om_docs:
-        props = doc.document_properties if hasattr(doc, "document_properties") else doc
-        if not isinstance(props, dict):
-            continue
-        subj_id = _get_depends_on(props, "subject_id")
+    for doc in _project(session, "openminds_subject", ["depends_on", "openminds"]):
+        subj_id = _get_depends_on(doc, "subject_id")
         if subj_id not in om_by_subject:
             continue
-        om = props.get("openminds", {})
+        om = doc["openminds"]
         if not isinstance(om, dict):
             continue
         om_type = om.get("openminds_type", "")
@@ -661,25 +758,39 @@ def subject(
 
     # 3. Get all treatment/measurement docs — index by subject_id
     # MATLAB queries: treatment | treatment_drug | virus_injection | measurement
-    treat_docs = session.database_search(ndi_query("").isa("treatment"))
+    treat_fields = ["depends_on", "treatment", "measurement"]
+    treat_docs = _project(session, "treatment", treat_fields)
     for extra_type in ("treatment_drug", "virus_injection", "measurement"):
         try:
-            treat_docs.extend(session.database_search(ndi_query("").isa(extra_type)))
+            treat_docs.extend(_project(session, extra_type, treat_fields))
         except Exception:
             pass
     treat_by_subject: dict[str, list[dict]] = {sid: [] for sid in subject_info}
 
     for doc in treat_docs:
-        props = doc.document_properties if hasattr(doc, "document_properties") else doc
-        if not isinstance(props, dict):
-            continue
-        subj_id = _get_depends_on(props, "subject_id")
+        subj_id = _get_depends_on(doc, "subject_id")
         if subj_id in treat_by_subject:
             # Try treatment, then measurement property
-            treat = props.get("treatment", props.get("measurement", {}))
+            treat = doc["treatment"] if doc["treatment"] is not None else doc["measurement"]
             if isinstance(treat, dict):
                 treat_by_subject[subj_id].append(treat)
 
+    # Resolve every ontology term used by the treatments in one batch;
+    # the per-row lookups below are then answered from the lookup cache
+    terms = []
+    for treatments in treat_by_subject.values():
+        for t in treatments:
+            terms.append(t.get("ontologyName") or "")
+            terms.append((t.get("string_value") or "").strip())
+    terms = [term for term in terms if ":" in term and not _is_datetime(term)]
+    if terms:
+        try:
+            from ndi.ontology import lookup_many
+
+            lookup_many(terms)
+        except Exception:
+            pass
+
     # 4. Build rows
     rows: list[dict[str, Any]] = []
     for sid, info in subject_info.items():
@@ -785,15 +896,7 @@ def subject(
             # MATLAB priority: 1) datetime check, 2) ontology ":" check
             # Datetime strings (e.g. "03-Nov-2023 07:53:00") contain ":"
             # but should NOT be treated as ontology references.
-            is_datetime = False
-            if string_value:
-                try:
-                    from dateutil.parser import parse as _date_parse
-
-                    _date_parse(string_value)
-                    is_datetime = True
-                except Exception:
-                    pass
+            is_datetime = _is_datetime(string_value)
 
             ontology_resolved = False
             if string_value and not is_datetime and ":" in string_value:
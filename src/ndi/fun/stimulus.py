@@ -4,6 +4,9 @@ ndi.fun.stimulus - Stimulus analysis utility functions.
 MATLAB equivalents: +ndi/+fun/+stimulus/f0_f1_responses.m,
     findMixtureName.m, tuning_curve_to_response_type.m,
     +ndi/+fun/stimulustemporalfrequency.m
+
+Python-specific: windowed_responses, the array engine behind
+ndi_app_stimulus_tuning__response, and presentation_stimulus_index.
 """
 
 from __future__ import annotations
@@ -12,6 +15,8 @@ import json
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
 
 def tuning_curve_to_response_type(
     session: Any,
@@ -295,6 +300,112 @@ def stimulus_tuningcurve_log(
     return ""
 
 
+def windowed_responses(
+    t: np.ndarray,
+    x: np.ndarray | None,
+    onsets: np.ndarray,
+    offsets: np.ndarray,
+    frequencies: np.ndarray | None = None,
+    harmonics: tuple[int, ...] = (1, 2),
+    isspike: bool = False,
+) -> dict[str, np.ndarray]:
+    """Mean and Fourier responses of a signal in many time windows at once.
+
+    Python-specific: no MATLAB equivalent. Computes, for every window
+    ``[onsets[i], offsets[i]]``, what MATLAB's stimulus_response_scalar
+    computes one presentation at a time. Window sums are taken from
+    cumulative sums located with ``np.searchsorted``, so the cost is
+    O(samples + windows) per frequency rather than O(samples x windows);
+    for each frequency only the samples its windows span are summed.
+
+    For a sampled signal, the mean is the average sample value in the
+    window and harmonic *h* is ``(2/n) * sum(x * exp(-2j*pi*h*f*(t - onset)))``.
+    For spike times (``isspike=True``, *x* ignored) the mean is the
+    firing rate and harmonic *h* is
+    ``(2/T) * sum(exp(-2j*pi*h*f*(t - onset)))`` with T the window length.
+
+    Args:
+        t: Sorted sample or spike times, shape (N,).
+        x: Sample values, shape (N,); ignored when *isspike* is True.
+        onsets: Window start times, shape (P,).
+        offsets: Window end times, shape (P,).
+        frequencies: Per-window temporal frequency, shape (P,). Windows
+            with NaN or non-positive frequency get NaN Fourier responses.
+        harmonics: Harmonics to compute; each becomes key ``'F<h>'``.
+        isspike: Treat *t* as spike times.
+
+    Returns:
+        Dict with ``'mean'`` (real, shape (P,)) and one complex array per
+        harmonic (``'F1'``, ``'F2'``, ...).
+    """
+    t = np.asarray(t, dtype=np.float64).ravel()
+    onsets = np.asarray(onsets, dtype=np.float64).ravel()
+    offsets = np.asarray(offsets, dtype=np.float64).ravel()
+    if not isspike:
+        x = np.asarray(x, dtype=np.float64).ravel()
+
+    i0 = np.searchsorted(t, onsets, side="left")
+    i1 = np.searchsorted(t, offsets, side="right")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if isspike:
+            norm = offsets - onsets
+            mean = (i1 - i0) / norm
+        else:
+            norm = (i1 - i0).astype(np.float64)
+            cs = np.concatenate(([0.0], np.cumsum(x)))
+            mean = (cs[i1] - cs[i0]) / norm
+    norm = np.where(norm > 0, norm, np.nan)
+    out: dict[str, np.ndarray] = {"mean": np.where(np.isfinite(mean), mean, np.nan)}
+
+    if frequencies is None:
+        return out
+    frequencies = np.broadcast_to(np.asarray(frequencies, dtype=np.float64), onsets.shape)
+    valid = np.isfinite(frequencies) & (frequencies > 0)
+    groups = [np.flatnonzero(frequencies == f) for f in np.unique(frequencies[valid])]
+    for h in harmonics:
+        F = np.full(onsets.shape, complex(np.nan, np.nan))
+        for sel in groups:
+            f = frequencies[sel[0]]
+            # only the samples spanned by this frequency's windows are summed
+            lo, hi = i0[sel].min(), max(i0[sel].min(), i1[sel].max())
+            t_ref = t[lo] if hi > lo else 0.0
+            w = np.exp(-2j * np.pi * h * f * (t[lo:hi] - t_ref))
+            if not isspike:
+                w *= x[lo:hi]
+            cs = np.concatenate(([0j], np.cumsum(w)))
+            # inverted windows have a NaN norm; clipping keeps them in range
+            window_sum = cs[np.clip(i1[sel], lo, hi) - lo] - cs[i0[sel] - lo]
+            phase = np.exp(2j * np.pi * h * f * (onsets[sel] - t_ref))
+            F[sel] = 2.0 * window_sum * phase / norm[sel]
+        out[f"F{h}"] = F
+    return out
+
+
+def presentation_stimulus_index(
+    presentation_order: Any,
+    num_stimuli: int,
+) -> np.ndarray:
+    """Convert a presentation_order to 0-based indexes into the stimuli.
+
+    Python-specific: no MATLAB equivalent. The presentation_order of a
+    stimulus_presentation document holds 1-based stimulus numbers, as
+    MATLAB writes them; entry *i* names the stimulus shown in
+    presentation *i*. Entries outside ``1..num_stimuli`` become -1.
+
+    Args:
+        presentation_order: The document's presentation_order.
+        num_stimuli: Number of stimuli in the document.
+
+    Returns:
+        Integer array of 0-based stimulus indexes, one per presentation.
+    """
+    order = np.asarray(presentation_order, dtype=np.float64).ravel()
+    valid = np.isfinite(order) & (order >= 1) & (order <= num_stimuli)
+    index = np.full(order.shape, -1, dtype=np.int64)
+    index[valid] = order[valid].astype(np.int64) - 1
+    return index
+
+
 # Backward-compatible aliases
 find_mixture_name = findMixtureName
 stimulus_temporal_frequency = stimulustemporalfrequency
@@ -7,18 +7,26 @@ Unified interface for looking up terms across multiple biomedical ontologies.
 
 Usage::
 
-    from ndi.ontology import lookup
+    from ndi.ontology import lookup, lookup_many
     result = lookup('CL:0000540')  # Cell Ontology: neuron
     result = lookup('NDIC:1')      # NDI Controlled Vocabulary
+    results = lookup_many(['CL:0000540', 'NCBITaxon:10090'])
+
+Resolved terms are also kept in a persistent SQLite cache shared across
+processes (see :mod:`ndi.ontology.cache`).
 """
 
 from __future__ import annotations
 
 import json
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any
 
 import pydantic
 
+from .cache import DEFAULT_TTL, SNAPSHOT_VERSION, OntologyCache, default_cache_path
 from .providers import PROVIDER_REGISTRY
 
 # ---------------------------------------------------------------------------
@@ -63,6 +71,10 @@ class OntologyResult:
             "short_name": self.short_name,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> OntologyResult:
+        return cls(**{k: data[k] for k in cls.__slots__ if k in data})
+
 
 # ---------------------------------------------------------------------------
 # Prefix registry
@@ -88,8 +100,14 @@ _PREFIX_MAP: dict[str, str] = {
 }
 
 
+_prefix_map_loaded = False
+
+
 def _load_prefix_map() -> dict[str, str]:
-    """Load prefix mappings from ontology_list.json if available."""
+    """Load prefix mappings from ontology_list.json if available (once)."""
+    global _prefix_map_loaded
+    if _prefix_map_loaded:
+        return _PREFIX_MAP
     try:
         from ndi.common import ndi_common_PathConstants
 
@@ -104,38 +122,182 @@ def _load_prefix_map() -> dict[str, str]:
                     _PREFIX_MAP[prefix] = name
     except Exception:
         pass
+    _prefix_map_loaded = True
     return _PREFIX_MAP
 
 
 # ---------------------------------------------------------------------------
-# Main lookup (with LRU cache)
+# Caches
 # ---------------------------------------------------------------------------
 
 _lookup_cache: dict[str, OntologyResult] = {}
 _CACHE_MAX = 100
 
+# Persistent cache; None until configured explicitly or from the environment
+_persistent_cache: OntologyCache | None = None
+_persistent_cache_explicit = False
 
-@pydantic.validate_call
-def lookup(lookup_string: str) -> OntologyResult:
-    """Look up a term in the appropriate ontology.
+# Entries loaded from an offline snapshot, and whether remote lookups are off
+_snapshot_results: dict[str, dict[str, Any]] = {}
+_offline = False
 
-    MATLAB equivalent: ndi.ontology.lookup
+
+def _get_persistent_cache() -> OntologyCache | None:
+    """Return the persistent cache for the configured location, if any."""
+    global _persistent_cache
+    if _persistent_cache_explicit:
+        return _persistent_cache
+    path = default_cache_path()
+    if path is None:
+        return None
+    if _persistent_cache is None or _persistent_cache.path != path:
+        _persistent_cache = OntologyCache(path)
+    return _persistent_cache
+
+
+def set_cache_path(path: str | Path | None, ttl: float = DEFAULT_TTL) -> None:
+    """Choose the persistent ontology cache file.
+
+    Python-specific: no MATLAB equivalent. By default the cache lives at
+    ``~/.ndi/ontology_cache.sqlite`` (or ``$NDI_ONTOLOGY_CACHE``).
 
     Args:
-        lookup_string: Prefixed string like ``'CL:0000540'`` or ``'NDIC:1'``.
-            Use ``'clear'`` to flush the cache.
+        path: SQLite file to use, or None to disable the persistent cache.
+        ttl: Seconds after which cached results are fetched again.
+    """
+    global _persistent_cache, _persistent_cache_explicit
+    _persistent_cache = OntologyCache(path, ttl=ttl) if path is not None else None
+    _persistent_cache_explicit = True
+
+
+def _default_snapshot_path() -> Path | None:
+    try:
+        from ndi.common import ndi_common_PathConstants
+
+        return ndi_common_PathConstants.COMMON_FOLDER / "ontology" / "ontology_snapshot.json"
+    except Exception:
+        return None
+
+
+def load_snapshot(path: str | Path | None = None) -> int:
+    """Preload ontology results from a JSON snapshot.
+
+    Python-specific: no MATLAB equivalent. The entries are kept in memory
+    for this process and written to the persistent cache, if enabled.
+
+    Args:
+        path: Snapshot written by :func:`save_snapshot`. Defaults to
+            ``ndi_common/ontology/ontology_snapshot.json``.
 
     Returns:
-        OntologyResult with id, name, prefix, definition, synonyms.
+        Number of entries loaded (0 if the snapshot does not exist).
     """
-    if lookup_string == "clear":
-        _lookup_cache.clear()
-        return OntologyResult()
+    path = Path(path) if path is not None else _default_snapshot_path()
+    if path is None:
+        return 0
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return 0
+    if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+        return 0
+    entries = {k: v for k, v in data.get("entries", {}).items() if isinstance(v, dict)}
+    _snapshot_results.update(entries)
+    cache = _get_persistent_cache()
+    if cache is not None:
+        cache.put_many(entries)
+    return len(entries)
+
+
+def save_snapshot(path: str | Path) -> int:
+    """Write every known ontology result to a JSON snapshot.
+
+    Python-specific: no MATLAB equivalent. Combines the persistent cache
+    (including stale entries), loaded snapshot entries and this process's
+    in-memory results, so a snapshot can be built on a connected machine
+    and shipped for offline use.
 
-    # Check cache
+    Returns:
+        Number of entries written.
+    """
+    entries: dict[str, dict[str, Any]] = dict(_snapshot_results)
+    cache = _get_persistent_cache()
+    if cache is not None:
+        entries.update(cache.all_entries())
+    entries.update({k: r.to_dict() for k, r in _lookup_cache.items() if r})
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(
+            {"version": SNAPSHOT_VERSION, "entries": dict(sorted(entries.items()))}, f, indent=1
+        )
+    return len(entries)
+
+
+def set_offline(offline: bool = True, snapshot: str | Path | None = None) -> int:
+    """Turn offline mode on or off.
+
+    Python-specific: no MATLAB equivalent. In offline mode lookups are
+    answered from the caches, including stale persistent entries, and from
+    local providers (such as NDIC); remote providers are never queried.
+    Turning offline mode on preloads the snapshot at ``snapshot`` (by
+    default ``ndi_common/ontology/ontology_snapshot.json``, which is not
+    shipped with NDI: build one with :func:`save_snapshot`). A warning is
+    issued if the snapshot provides no entries. Turning it off forgets the
+    loaded snapshot entries; those also written to the persistent cache
+    stay available from there.
+
+    Returns:
+        Number of snapshot entries loaded.
+    """
+    global _offline
+    _offline = bool(offline)
+    if not _offline:
+        _snapshot_results.clear()
+        return 0
+    n_loaded = load_snapshot(snapshot)
+    if n_loaded == 0:
+        where = snapshot if snapshot is not None else _default_snapshot_path()
+        warnings.warn(
+            f"Offline ontology mode started without snapshot entries (none loaded from "
+            f"{where}); remote ontology terms resolve only from the persistent cache. "
+            f"Create a snapshot with ndi.ontology.save_snapshot on a connected machine.",
+            stacklevel=2,
+        )
+    return n_loaded
+
+
+def _remember(lookup_string: str, result: OntologyResult) -> None:
+    """Store a result in the in-memory cache (with FIFO eviction)."""
     if lookup_string in _lookup_cache:
-        return _lookup_cache[lookup_string]
+        return
+    if len(_lookup_cache) >= _CACHE_MAX:
+        # Remove oldest entry
+        oldest = next(iter(_lookup_cache))
+        del _lookup_cache[oldest]
+    _lookup_cache[lookup_string] = result
+
+
+def _cached_results(lookup_strings: list[str]) -> dict[str, OntologyResult]:
+    """Return results held by the persistent cache or a loaded snapshot."""
+    found: dict[str, dict[str, Any]] = {}
+    cache = _get_persistent_cache()
+    if cache is not None:
+        found.update(cache.get_many(lookup_strings, ignore_ttl=_offline))
+    for key in lookup_strings:
+        if key not in found and key in _snapshot_results:
+            found[key] = _snapshot_results[key]
+    return {k: OntologyResult.from_dict(v) for k, v in found.items()}
+
+
+def _resolve(lookup_string: str) -> OntologyResult | None:
+    """Ask the provider for a lookup string, bypassing every cache.
 
+    Returns:
+        The provider's result, or None if offline mode skipped a remote
+        provider.
+    """
     # Parse prefix
     if ":" not in lookup_string:
         return OntologyResult()
@@ -159,29 +321,145 @@ def lookup(lookup_string: str) -> OntologyResult:
     provider_cls = PROVIDER_REGISTRY.get(provider_name)
     if provider_cls is None:
         return OntologyResult()
+    if _offline and provider_cls.remote:
+        return None
 
     provider = provider_cls()
     try:
-        result = provider.lookup_term(remainder, prefix)
+        return provider.lookup_term(remainder, prefix)
     except Exception:
-        result = OntologyResult()
+        return OntologyResult()
 
-    # ndi_cache (with eviction)
-    if len(_lookup_cache) >= _CACHE_MAX:
-        # Remove oldest entry
-        oldest = next(iter(_lookup_cache))
-        del _lookup_cache[oldest]
-    _lookup_cache[lookup_string] = result
 
+# ---------------------------------------------------------------------------
+# Main lookup
+# ---------------------------------------------------------------------------
+
+
+@pydantic.validate_call
+def lookup(lookup_string: str) -> OntologyResult:
+    """Look up a term in the appropriate ontology.
+
+    MATLAB equivalent: ndi.ontology.lookup
+
+    Results are cached in memory and, when found, in the persistent cache
+    shared across processes.
+
+    Args:
+        lookup_string: Prefixed string like ``'CL:0000540'`` or ``'NDIC:1'``.
+            Use ``'clear'`` to flush the in-memory cache (see
+            :func:`clearCache`).
+
+    Returns:
+        OntologyResult with id, name, prefix, definition, synonyms.
+    """
+    if lookup_string == "clear":
+        clearCache()
+        return OntologyResult()
+
+    # Check caches
+    if lookup_string in _lookup_cache:
+        return _lookup_cache[lookup_string]
+    cached = _cached_results([lookup_string])
+    if lookup_string in cached:
+        result = cached[lookup_string]
+        _remember(lookup_string, result)
+        return result
+
+    result = _resolve(lookup_string)
+    if result is None:
+        return OntologyResult()
+    if result:
+        cache = _get_persistent_cache()
+        if cache is not None:
+            cache.put(lookup_string, result.to_dict())
+    _remember(lookup_string, result)
     return result
 
 
+@pydantic.validate_call
+def lookup_many(lookup_strings: list[str], max_workers: int = 8) -> list[OntologyResult]:
+    """Look up many terms, resolving cache misses concurrently.
+
+    Python-specific: no MATLAB equivalent. Duplicate lookup strings are
+    resolved once, cached terms are read from the in-memory and persistent
+    caches in one pass, and the remaining terms are sent to their providers
+    from a thread pool. New results are written to the persistent cache in
+    a single transaction.
+
+    Args:
+        lookup_strings: Prefixed strings like ``'CL:0000540'``.
+        max_workers: Maximum number of concurrent provider requests.
+
+    Returns:
+        One OntologyResult per input string, in input order.
+    """
+    unique = list(dict.fromkeys(lookup_strings))
+    results: dict[str, OntologyResult] = {}
+    pending = []
+    for key in unique:
+        if key in _lookup_cache:
+            results[key] = _lookup_cache[key]
+        else:
+            pending.append(key)
+
+    if pending:
+        cached = _cached_results(pending)
+        for key, result in cached.items():
+            results[key] = result
+            _remember(key, result)
+        pending = [key for key in pending if key not in cached]
+
+    if pending:
+        _load_prefix_map()
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as pool:
+            resolved = dict(zip(pending, pool.map(_resolve, pending)))
+        fresh = {key: r.to_dict() for key, r in resolved.items() if r}
+        cache = _get_persistent_cache()
+        if cache is not None and fresh:
+            cache.put_many(fresh)
+        for key, result in resolved.items():
+            if result is None:
+                # Remote provider skipped in offline mode; do not remember
+                results[key] = OntologyResult()
+            else:
+                results[key] = result
+                _remember(key, result)
+
+    return [results[key] for key in lookup_strings]
+
+
 def clearCache() -> None:
-    """Clear all ontology caches.
+    """Clear the in-memory ontology cache.
 
     MATLAB equivalent: ndi.ontology.clearCache
+
+    The persistent cache, which other processes share, and loaded
+    snapshot entries are kept; see :func:`clear_persistent_cache`.
     """
     _lookup_cache.clear()
 
 
-__all__ = ["OntologyResult", "lookup", "clearCache"]
+def clear_persistent_cache() -> None:
+    """Remove every entry from the persistent ontology cache.
+
+    Python-specific: no MATLAB equivalent. The cache file is shared by
+    every process using it, so this affects them all. The in-memory cache
+    is left alone; see :func:`clearCache`.
+    """
+    cache = _get_persistent_cache()
+    if cache is not None:
+        cache.clear()
+
+
+__all__ = [
+    "OntologyResult",
+    "lookup",
+    "lookup_many",
+    "clearCache",
+    "clear_persistent_cache",
+    "set_cache_path",
+    "set_offline",
+    "load_snapshot",
+    "save_snapshot",
+]
@@ -0,0 +1,160 @@
+"""
+ndi.ontology.cache - Persistent on-disk cache of ontology lookups.
+
+Python-specific: no MATLAB equivalent.
+
+Resolved lookups are stored in a SQLite database so that repeated runs,
+and several processes working on the same machine, share remote ontology
+results instead of querying the providers again. Entries expire after a
+time-to-live; snapshots can be exported to and imported from JSON for
+offline use (see ``ndi.ontology.save_snapshot`` and ``load_snapshot``).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Iterable
+from contextlib import closing
+from pathlib import Path
+from typing import Any
+
+# Default time-to-live of cached lookups (30 days)
+DEFAULT_TTL = 30 * 24 * 3600.0
+
+# Format version of JSON snapshots written by ndi.ontology.save_snapshot
+SNAPSHOT_VERSION = 1
+
+# SQLite limits the number of bound parameters per statement
+_MAX_PARAMS = 500
+
+
+def default_cache_path() -> Path | None:
+    """Return the persistent cache location, or None if it is disabled.
+
+    The location is ``~/.ndi/ontology_cache.sqlite`` unless the
+    ``NDI_ONTOLOGY_CACHE`` environment variable names another file. Setting
+    the variable to an empty string, ``off`` or ``none`` disables the
+    persistent cache.
+    """
+    env = os.environ.get("NDI_ONTOLOGY_CACHE")
+    if env is None:
+        return Path.home() / ".ndi" / "ontology_cache.sqlite"
+    if env.strip().lower() in ("", "off", "none"):
+        return None
+    return Path(env).expanduser()
+
+
+class OntologyCache:
+    """SQLite-backed store of ontology lookup results keyed by lookup string.
+
+    Every operation opens its own short-lived connection, so one instance
+    can be used from several threads, and WAL journaling lets several
+    processes read and write the same file. Storage errors (read-only
+    home directory, locked database) are treated as cache misses.
+
+    Args:
+        path: Location of the SQLite database file.
+        ttl: Seconds after which an entry is considered stale.
+    """
+
+    def __init__(self, path: str | Path, ttl: float = DEFAULT_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS lookups ("
+                "key TEXT PRIMARY KEY, result TEXT NOT NULL, fetched REAL NOT NULL)"
+            )
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    def get_many(self, keys: Iterable[str], ignore_ttl: bool = False) -> dict[str, dict[str, Any]]:
+        """Return the cached result dicts of the given lookup strings.
+
+        Args:
+            keys: Lookup strings to fetch.
+            ignore_ttl: If True, stale entries are returned as well.
+
+        Returns:
+            Dict mapping each cached lookup string to its result dict;
+            missing and expired keys are absent.
+        """
+        keys = list(dict.fromkeys(keys))
+        found: dict[str, dict[str, Any]] = {}
+        if not keys:
+            return found
+        oldest = 0.0 if ignore_ttl else time.time() - self.ttl
+        try:
+            with closing(self._connect()) as conn:
+                for i in range(0, len(keys), _MAX_PARAMS):
+                    chunk = keys[i : i + _MAX_PARAMS]
+                    marks = ",".join("?" * len(chunk))
+                    rows = conn.execute(
+                        f"SELECT key, result FROM lookups WHERE key IN ({marks}) AND fetched >= ?",
+                        (*chunk, oldest),
+                    ).fetchall()
+                    for key, result in rows:
+                        found[key] = json.loads(result)
+        except (sqlite3.Error, OSError, ValueError):
+            return {}
+        return found
+
+    def get(self, key: str, ignore_ttl: bool = False) -> dict[str, Any] | None:
+        """Return the cached result dict of one lookup string, or None."""
+        return self.get_many([key], ignore_ttl=ignore_ttl).get(key)
+
+    def put_many(self, items: dict[str, dict[str, Any]], fetched: float | None = None) -> None:
+        """Store result dicts keyed by lookup string, replacing older entries."""
+        if not items:
+            return
+        fetched = time.time() if fetched is None else fetched
+        rows = [(key, json.dumps(result), fetched) for key, result in items.items()]
+        try:
+            with closing(self._connect()) as conn:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO lookups (key, result, fetched) VALUES (?, ?, ?)",
+                        rows,
+                    )
+        except (sqlite3.Error, OSError):
+            pass  # A failed write only costs a future remote lookup
+
+    def put(self, key: str, result: dict[str, Any]) -> None:
+        """Store the result dict of one lookup string."""
+        self.put_many({key: result})
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        try:
+            with closing(self._connect()) as conn:
+                with conn:
+                    conn.execute("DELETE FROM lookups")
+        except (sqlite3.Error, OSError):
+            pass
+
+    def __len__(self) -> int:
+        try:
+            with closing(self._connect()) as conn:
+                return int(conn.execute("SELECT COUNT(*) FROM lookups").fetchone()[0])
+        except (sqlite3.Error, OSError):
+            return 0
+
+    def all_entries(self) -> dict[str, dict[str, Any]]:
+        """Return every cached result dict, including stale entries."""
+        try:
+            with closing(self._connect()) as conn:
+                rows = conn.execute("SELECT key, result FROM lookups").fetchall()
+        except (sqlite3.Error, OSError):
+            return {}
+        return {key: json.loads(result) for key, result in rows}
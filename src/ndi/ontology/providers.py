@@ -23,6 +23,8 @@ class OntologyProvider:
     """Base class for ontology providers."""
 
     name: str = ""
+    # False for providers answering from bundled files (usable offline)
+    remote: bool = True
 
     @pydantic.validate_call
     def lookup_term(self, term: str, prefix: str = "") -> Any:
@@ -180,6 +182,7 @@ class NDICProvider(OntologyProvider):
     """NDI Controlled Vocabulary — local TSV file."""
 
     name = "NDIC"
+    remote = False
 
     _data: list[dict[str, str]] | None = None
 
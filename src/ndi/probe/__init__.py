@@ -80,11 +80,36 @@ class ndi_probe(ndi_element):
             identifier=identifier,
             document=document,
         )
+        # session epoch-table generation the cached table was built at
+        self._epochtable_generation: int | None = None
 
     # =========================================================================
     # ndi_epoch_epochset Overrides
     # =========================================================================
 
+    def epochtable(
+        self,
+        force_rebuild: bool = False,
+    ) -> tuple[list[dict[str, Any]], str]:
+        """
+        Get the epoch table, rebuilding it after DAQ system tables change.
+
+        The cached table is dropped whenever the session invalidates its
+        DAQ system epoch tables (ingest, deleteepoch, daqsystem_add, or a
+        DAQ system table whose fingerprint changed).
+
+        Args:
+            force_rebuild: If True, ignore cache and rebuild
+
+        Returns:
+            Tuple of (epoch_table, hash_value)
+        """
+        generation = getattr(self._session, "epochtable_generation", None)
+        if isinstance(generation, int) and generation != self._epochtable_generation:
+            force_rebuild = True
+            self._epochtable_generation = generation
+        return super().epochtable(force_rebuild=force_rebuild)
+
     def buildepochtable(self) -> list[dict[str, Any]]:
         """
         Build epoch table from DAQ system epochprobemaps.
@@ -76,6 +76,7 @@ class ndi_session(ABC):
         self._identifier = ndi_ido().id
         self._syncgraph: ndi_time_syncgraph | None = None
         self._cache = ndi_cache()
+        self._epochtable_generation = 0
         self._database: ndi_database | None = None
         self._cloud_client: Any = None
 
@@ -191,6 +192,7 @@ class ndi_session(ABC):
         else:
             raise ValueError(f"DAQ system '{dev.name}' or one with same ID already exists")
 
+        self.epochtable_clearcache(dev.id)
         return self
 
     def daqsystem_rm(self, dev: Any) -> ndi_session:
@@ -230,6 +232,7 @@ class ndi_session(ABC):
                         self.database_rm(dep_doc)
                 # Remove the document itself
                 self.database_rm(doc)
+            self.epochtable_clearcache(daq.id)
 
         return self
 
@@ -299,6 +302,35 @@ class ndi_session(ABC):
                 self.daqsystem_rm(dev)
         return self
 
+    @property
+    def epochtable_generation(self) -> int:
+        """Counter bumped whenever cached DAQ system epoch tables are invalidated."""
+        return self._epochtable_generation
+
+    def epochtable_clearcache(self, daqsystem_id: str | None = None) -> ndi_session:
+        """
+        Invalidate cached DAQ system epoch tables and probe inventories.
+
+        Python-specific: no MATLAB equivalent.
+
+        Probe epoch tables, which are derived from DAQ system tables,
+        are always rebuilt on their next use. DAQ system tables not
+        dropped here are still revalidated against their fingerprint.
+
+        Args:
+            daqsystem_id: ID of the DAQ system whose cached table to drop
+
+        Returns:
+            self for chaining
+        """
+        from ..daq.system import EPOCHTABLE_CACHE_TYPE, PROBE_INVENTORY_CACHE_TYPE
+
+        if daqsystem_id is not None:
+            self._cache.remove(daqsystem_id, EPOCHTABLE_CACHE_TYPE)
+            self._cache.remove(daqsystem_id, PROBE_INVENTORY_CACHE_TYPE)
+        self._epochtable_generation += 1
+        return self
+
     # =========================================================================
     # ndi_database Methods
     # =========================================================================
@@ -307,6 +339,12 @@ class ndi_session(ABC):
         """
         Add a document to the session database.
 
+        A list of documents is added as one unit (Python-specific): the
+        documents and their ingested binary files are written together
+        when the list has been processed, and if any document is rejected
+        nothing is written. The write itself is not atomic; see
+        :meth:`ndi_database.transaction`.
+
         Args:
             document: ndi_document or list of Documents to add
 
@@ -322,22 +360,23 @@ class ndi_session(ABC):
         if not isinstance(document, list):
             document = [document]
 
-        # Validate and set session IDs
-        for doc in document:
-            session_id = doc.session_id
-            if session_id and session_id != self.id() and session_id != empty_id():
-                raise ValueError(
-                    f"ndi_document session_id '{session_id}' doesn't match "
-                    f"session id '{self.id()}'"
-                )
-            # Set session ID if empty or unset
-            if not session_id or session_id == empty_id():
-                doc = doc.set_session_id(self.id())
+        with self._database.transaction():
+            # Validate and set session IDs
+            for doc in document:
+                session_id = doc.session_id
+                if session_id and session_id != self.id() and session_id != empty_id():
+                    raise ValueError(
+                        f"ndi_document session_id '{session_id}' doesn't match "
+                        f"session id '{self.id()}'"
+                    )
+                # Set session ID if empty or unset
+                if not session_id or session_id == empty_id():
+                    doc = doc.set_session_id(self.id())
 
-            self._database.add(doc)
+                self._database.add(doc)
 
-            # Ingest binary files: copy from original location to binary dir
-            self._ingest_binary_files(doc)
+                # Ingest binary files: copy from original location to binary dir
+                self._ingest_binary_files(doc)
 
         return self
 
@@ -346,10 +385,9 @@ class ndi_session(ABC):
 
         For each file location with ``ingest=True``, the source file is
         copied to ``<binary_dir>/<doc.id>_<filename>`` so that
-        ``database_openbinarydoc`` can find it.
+        ``database_openbinarydoc`` can find it. Inside a database
+        transaction the copies are staged until it commits.
         """
-        import shutil
-
         if self._database is None:
             return
         props = doc.document_properties
@@ -372,8 +410,7 @@ class ndi_session(ABC):
                 if not src_path.exists():
                     continue
                 dest_path = self._database.get_binary_path(doc, name)
-                dest_path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(str(src_path), str(dest_path))
+                self._database.copy_binary_file(src_path, dest_path)
 
     def database_rm(
         self,
@@ -424,6 +461,69 @@ class ndi_session(ABC):
         in_session = ndi_query("base.session_id") == self.id()
         return self._database.search(query & in_session)
 
+    def database_project(self, query: ndi_query, fields: list[str]) -> list[dict[str, Any]]:
+        """
+        Return selected fields of the session documents matching a query.
+
+        Python-specific: no MATLAB equivalent. Like :meth:`database_search`
+        but returns one dict of field values per document instead of
+        ndi_document objects (see ``ndi_database.project``).
+
+        Args:
+            query: ndi_query to match
+            fields: Dotted field paths to return, e.g. ``'element.name'``
+
+        Returns:
+            List of dicts mapping each field path to its value
+        """
+        if self._database is None:
+            return []
+
+        in_session = ndi_query("base.session_id") == self.id()
+        return self._database.project(query & in_session, fields)
+
+    def database_find_by_file_uids(self, uids: list[str]) -> dict[str, tuple[ndi_document, str]]:
+        """
+        Find the session documents that hold files with the given UIDs.
+
+        Python-specific: no MATLAB equivalent. Answered from the database
+        file index (see ``ndi_database.find_by_file_uids``).
+
+        Args:
+            uids: File UIDs to look up
+
+        Returns:
+            Dict mapping each UID that was found to ``(document, file_name)``
+        """
+        if self._database is None:
+            return {}
+        return self._database.find_by_file_uids(uids, session_id=self.id())
+
+    def database_find_by_file_uid(self, uid: str) -> tuple[ndi_document | None, str]:
+        """
+        Find the session document that holds a file with the given UID.
+
+        Python-specific: no MATLAB equivalent.
+
+        Args:
+            uid: File UID to look up
+
+        Returns:
+            Tuple ``(document, file_name)``, or ``(None, '')`` if not found
+        """
+        return self.database_find_by_file_uids([uid]).get(uid, (None, ""))
+
+    def database_change_token(self) -> Any:
+        """
+        Return a value that changes whenever the session database changes.
+
+        Python-specific: no MATLAB equivalent. Used to key caches of
+        tables and other results derived from the database.
+        """
+        if self._database is None:
+            return None
+        return self._database.change_token()
+
     def database_clear(self, areyousure: str) -> ndi_session:
         """
         Delete all documents from the database.
@@ -574,7 +674,7 @@ class ndi_session(ABC):
         except ImportError:
             return False
 
-        props = doc.document_properties
+        props = doc.read_properties()
         files = props.get("files", {})
         if not isinstance(files, dict):
             return False
@@ -696,6 +796,12 @@ class ndi_session(ABC):
         """
         Ingest all raw data and sync info into the database.
 
+        Python-specific: the DAQ systems only build their documents; when
+        all of them have succeeded, their documents and the syncgraph
+        documents are written with one :meth:`database_add`, so a failed
+        DAQ system leaves nothing behind. Nothing is staged while the DAQ
+        systems run, so their searches see the database as it is.
+
         Returns:
             Tuple of (success, error_message)
         """
@@ -713,12 +819,12 @@ class ndi_session(ABC):
             daqs = [daqs]
 
         # Ingest each DAQ system
-        daq_docs = []
+        new_docs = []
         success = True
         for daq in daqs:
             try:
-                b, docs = daq.ingest()
-                daq_docs.append(docs)
+                b, docs = daq.ingest(add=False)
+                new_docs.extend(docs)
                 if not b:
                     success = False
                     errmsg = f"Error in DAQ {daq.name}"
@@ -726,18 +832,18 @@ class ndi_session(ABC):
                 success = False
                 errmsg = str(e)
 
-        if not success:
-            # Clean up on failure
-            for docs in daq_docs:
-                if docs:
-                    for doc in docs if isinstance(docs, list) else [docs]:
-                        self.database_rm(doc)
-        else:
+        if success:
             # Add syncgraph documents
             if self._syncgraph is not None:
                 for doc in d_syncgraph:
-                    doc = doc.set_session_id(self.id())
-                    self.database_add(doc)
+                    new_docs.append(doc.set_session_id(self.id()))
+            try:
+                self.database_add(new_docs)
+            except (OSError, ValueError) as e:
+                success = False
+                errmsg = str(e)
+
+        self.epochtable_clearcache()
 
         return success, errmsg
 
@@ -797,7 +903,7 @@ class ndi_session(ABC):
         docs = self._database.search(q)
 
         for doc in docs:
-            props = doc.document_properties
+            props = doc.read_properties()
             sia = props.get("session_in_a_dataset", {})
             is_linked = sia.get("is_linked", True)
             if isinstance(is_linked, (int, float)):
@@ -824,70 +930,65 @@ class ndi_session(ABC):
         """
         from ..probe import ndi_probe
 
-        # Get probe structs from all DAQ systems
-        probestructs = []
+        # Get probe structs from all DAQ systems, resolving each distinct
+        # subjectstring only once and dropping duplicates by key
+        subject_ids: dict[str, str] = {}
+        unique_probes: dict[tuple[str, Any, str], dict[str, Any]] = {}
         devs = self.daqsystem_load(name="(.*)")
         if devs is not None:
             if not isinstance(devs, list):
                 devs = [devs]
             for dev in devs:
                 if hasattr(dev, "getprobes"):
-                    ps = dev.getprobes()
-                    if ps:
-                        probestructs.extend(ps)
-
-        # Remove duplicates
-        seen = set()
-        unique_probes = []
-        for ps in probestructs:
-            key = (ps.get("name", ""), ps.get("reference", 0), ps.get("type", ""))
-            if key not in seen:
-                seen.add(key)
-                unique_probes.append(ps)
-
-        # Get existing probes from database
+                    for ps in dev.getprobes(subject_ids=subject_ids) or []:
+                        key = _probe_key(
+                            ps.get("name", ""), ps.get("reference", 0), ps.get("type", "")
+                        )
+                        unique_probes.setdefault(key, ps)
+
+        # Index existing probes from their documents; objects are only
+        # constructed for documents that pass the name/reference/type filters
         existing_docs = self.database_search(
             ndi_query("element.ndi_element_class").contains("probe")
         )
+        existing_keys = set()
+        for doc in existing_docs:
+            elem = doc.read_properties().get("element", {})
+            existing_keys.add(
+                _probe_key(elem.get("name", ""), elem.get("reference", 0), elem.get("type", ""))
+            )
 
-        # Convert existing docs to probe objects
-        existing_probes = []
+        # Create new probe objects for those not in database
+        probes = []
+        new_docs = []
+        for key, ps in unique_probes.items():
+            if key in existing_keys:
+                continue
+            probe = ndi_probe(
+                session=self,
+                name=ps.get("name", ""),
+                reference=ps.get("reference", 0),
+                type=ps.get("type", ""),
+                subject_id=ps.get("subject_id", ""),
+            )
+            new_docs.append(probe.newdocument())
+            probes.append(probe)
+        # Persist the element documents to the database, matching
+        # MATLAB's getprobes behavior (ndi_session_dir.m).
+        if new_docs:
+            self.database_add(new_docs)
+
+        # Convert the matching existing docs to probe objects
         for doc in existing_docs:
+            if not _element_doc_matches(doc, kwargs):
+                continue
             try:
                 obj = self._document_to_object(doc)
                 if obj is not None:
-                    existing_probes.append(obj)
+                    probes.append(obj)
             except Exception:
                 pass
 
-        # Create new probe objects for those not in database
-        probes = []
-        for ps in unique_probes:
-            # Check if already in existing_probes
-            found = False
-            for ep in existing_probes:
-                if (
-                    ep.name == ps.get("name")
-                    and ep.reference == ps.get("reference")
-                    and ep.type == ps.get("type")
-                ):
-                    found = True
-                    break
-            if not found:
-                probe = ndi_probe(
-                    session=self,
-                    name=ps.get("name", ""),
-                    reference=ps.get("reference", 0),
-                    type=ps.get("type", ""),
-                    subject_id=ps.get("subject_id", ""),
-                )
-                # Persist the element document to the database, matching
-                # MATLAB's getprobes behavior (ndi_session_dir.m).
-                self.database_add(probe.newdocument())
-                probes.append(probe)
-
-        probes.extend(existing_probes)
-
         # Filter by class
         if classmatch is not None:
             from ..element import ndi_element
@@ -1108,7 +1209,7 @@ class ndi_session(ABC):
 
         # Check document type
         if document.doc_isa("daqsystem"):
-            props = document.document_properties
+            props = document.read_properties()
             daq_class_name = ""
             if isinstance(props, dict):
                 daq_class_name = props.get("daqsystem", {}).get("ndi_daqsystem_class", "")
@@ -1125,7 +1226,7 @@ class ndi_session(ABC):
             return ndi_daq_system(session=self, document=document)
 
         if document.doc_isa("element"):
-            props = document.document_properties
+            props = document.read_properties()
             ndi_class = props.get("element", {}).get("ndi_element_class", "")
             cls = get_class(ndi_class)
             if cls is None:
@@ -1180,3 +1281,25 @@ class ndi_session(ABC):
     def __repr__(self) -> str:
         """String representation."""
         return f"{self.__class__.__name__}(reference='{self._reference}', id='{self._identifier}')"
+
+
+def _probe_key(name: str, reference: Any, type: str) -> tuple[str, Any, str]:
+    """Probe identity key; references compare as integers, as elements store them."""
+    try:
+        reference = int(reference) if reference != "" else 0
+    except (TypeError, ValueError):
+        pass
+    return (name, reference, type)
+
+
+def _element_doc_matches(doc: ndi_document, kwargs: dict[str, Any]) -> bool:
+    """Check the element name/reference/type filters against a document."""
+    elem = doc.read_properties().get("element", {})
+    for prop in ("name", "reference", "type"):
+        if prop in kwargs:
+            value = elem.get(prop, 0 if prop == "reference" else "")
+            if prop == "reference":
+                value = _probe_key("", value, "")[1]
+            if value != kwargs[prop]:
+                return False
+    return True
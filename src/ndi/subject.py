@@ -97,7 +97,7 @@ class ndi_subject(ndi_ido, ndi_documentservice):
         else:
             raise TypeError(f"Expected ndi_document or document ID string, got {type(doc_or_id)}")
 
-        props = doc.document_properties
+        props = doc.read_properties()
         subject_props = props.get("subject", {})
 
         self._local_identifier = subject_props.get("local_identifier", "")
@@ -7,17 +7,15 @@ across epochs and devices using a graph-based approach.
 
 from __future__ import annotations
 
+import importlib.util
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
 import numpy as np
 
-try:
-    import networkx as nx
-
-    HAS_NETWORKX = True
-except ImportError:
-    HAS_NETWORKX = False
+# networkx is imported where the graph is built, so that importing ndi
+# does not pay for it
+HAS_NETWORKX = importlib.util.find_spec("networkx") is not None
 
 from ..ido import ndi_ido
 from ..util.classname import ndi_matlab_classname
@@ -149,6 +147,7 @@ class ndi_time_syncgraph(ndi_ido):
         self._session = session
         self._rules: list[ndi_time_syncrule] = []
         self._cached_ginfo: ndi_time_graphinfo | None = None
+        self._daqsystems_by_name: dict[str, Any] = {}
 
         # Load from document if provided
         if document is not None and session is not None:
@@ -239,6 +238,11 @@ class ndi_time_syncgraph(ndi_ido):
         ginfo = ndi_time_graphinfo()
         ginfo.syncrule_ids = [rule.id for rule in self._rules]
 
+        # Rules may keep per-build state (epoch tables, triggers); start fresh
+        self._daqsystems_by_name = {}
+        for rule in self._rules:
+            rule.clear_cache()
+
         # Load all DAQ systems from session
         if self._session is None:
             return ginfo
@@ -279,6 +283,10 @@ class ndi_time_syncgraph(ndi_ido):
         if not newnodes:
             return ginfo
 
+        name = getattr(daqsystem, "name", None)
+        if name:
+            self._daqsystems_by_name[name] = daqsystem
+
         # Get the DAQ system's internal graph
         if hasattr(daqsystem, "epochgraph"):
             newcost, newmapping = daqsystem.epochgraph()
@@ -362,9 +370,10 @@ class ndi_time_syncgraph(ndi_ido):
 
         node_i = ginfo.nodes[i].to_dict()
         node_j = ginfo.nodes[j].to_dict()
+        daqsystem_i = self._daqsystems_by_name.get(node_i.get("objectname", ""))
 
         for k, rule in enumerate(self._rules):
-            cost, mapping = rule.apply(node_i, node_j)
+            cost, mapping = rule.apply(node_i, node_j, daqsystem_i)
             if cost is not None and cost < best_cost:
                 best_cost = cost
                 best_mapping = mapping
@@ -381,6 +390,8 @@ class ndi_time_syncgraph(ndi_ido):
         if not HAS_NETWORKX:
             return None
 
+        import networkx as nx
+
         # Replace inf with 0 for graph construction (no edge)
         G_table = G.copy()
         G_table[np.isinf(G_table)] = 0
@@ -446,6 +457,8 @@ class ndi_time_syncgraph(ndi_ido):
         if ginfo.diG is None:
             return None, None, "Graph not built"
 
+        import networkx as nx
+
         best_path = None
         best_dist = np.inf
 
@@ -70,8 +70,11 @@ def _sync_triggers(t1: np.ndarray, t2: np.ndarray) -> tuple[float, float]:
 
 
 def _get_underlying_files(epochnode: dict[str, Any]) -> list[str]:
-    """Extract underlying file paths from an epoch node."""
-    underlying = epochnode.get("underlying_epochs")
+    """Extract underlying file paths from an epoch node or epoch table entry."""
+    if isinstance(epochnode, dict):
+        underlying = epochnode.get("underlying_epochs")
+    else:
+        underlying = getattr(epochnode, "underlying_epochs", None)
     if not underlying:
         return []
     if isinstance(underlying, dict):
@@ -85,6 +88,113 @@ def _get_underlying_files(epochnode: dict[str, Any]) -> list[str]:
     return []
 
 
+def _epoch_field(entry: Any, field: str, default: Any = None) -> Any:
+    """Read a field from an epoch table entry that may be a dict or an object."""
+    if isinstance(entry, dict):
+        return entry.get(field, default)
+    return getattr(entry, field, default)
+
+
+def _clock_type_name(clock: Any) -> str:
+    """Return the clock type string of an epoch node's ``epoch_clock``."""
+    if isinstance(clock, str):
+        return clock
+    if isinstance(clock, dict):
+        return clock.get("type", "")
+    value = getattr(clock, "value", None)
+    if isinstance(value, str):
+        return value
+    return getattr(clock, "type", "")
+
+
+def _overlap_groups(
+    epochs_1: list[Any], epochs_2: list[Any], min_overlap: float
+) -> tuple[list[int], list[int], set[tuple[int, int]]]:
+    """
+    Partition two epoch tables into groups of overlapping embedded epochs.
+
+    Two epochs overlap when at least ``min_overlap`` files of one sit in a
+    directory embedded in a parent directory of the other (see
+    ``_count_embedded_matches``). Groups are the connected components of that
+    relation, found with a single pass over the files of both tables instead
+    of comparing every pair of epochs.
+
+    Returns:
+        Tuple of (group_1, group_2, edges). ``group_1[i]`` and ``group_2[j]``
+        are component labels for epoch ``i`` of table 1 and epoch ``j`` of
+        table 2; ``edges`` holds the directly overlapping ``(i, j)`` pairs.
+    """
+    files_1 = [_get_underlying_files(ep) for ep in epochs_1]
+    files_2 = [_get_underlying_files(ep) for ep in epochs_2]
+
+    def _by_parent(files_list: list[list[str]]) -> dict[str, list[int]]:
+        index: dict[str, list[int]] = {}
+        for k, files in enumerate(files_list):
+            for parent in _get_parents(files):
+                index.setdefault(parent, []).append(k)
+        return index
+
+    def _counts(deep: list[list[str]], shallow_index: dict[str, list[int]]) -> dict:
+        counts: dict[tuple[int, int], int] = {}
+        for k, files in enumerate(deep):
+            for f in files:
+                for m in shallow_index.get(os.path.dirname(os.path.dirname(f)), ()):
+                    counts[(k, m)] = counts.get((k, m), 0) + 1
+        return counts
+
+    counts_12 = _counts(files_1, _by_parent(files_2))
+    counts_21 = _counts(files_2, _by_parent(files_1))
+
+    edges = {pair for pair, c in counts_12.items() if c >= min_overlap}
+    edges.update((i, j) for (j, i), c in counts_21.items() if c >= min_overlap)
+
+    # Union-find over table-1 nodes [0, n1) and table-2 nodes [n1, n1 + n2)
+    n1 = len(epochs_1)
+    parent = list(range(n1 + len(epochs_2)))
+
+    def _find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j in edges:
+        ri, rj = _find(i), _find(n1 + j)
+        if ri != rj:
+            parent[rj] = ri
+
+    group_1 = [_find(i) for i in range(n1)]
+    group_2 = [_find(n1 + j) for j in range(len(epochs_2))]
+    return group_1, group_2, edges
+
+
+def _read_trigger_times(
+    daqsystem: Any, channeltype: str, channel: int, epoch_entry: Any
+) -> np.ndarray:
+    """Read all event times of one channel in one epoch as a flat array."""
+    if hasattr(daqsystem, "readevents"):
+        ts, _ = daqsystem.readevents(
+            [channeltype],
+            channel,
+            _epoch_field(epoch_entry, "epoch_id", ""),
+            float("-inf"),
+            float("inf"),
+        )
+    else:
+        ts, _ = daqsystem.readevents_epochsamples(
+            [channeltype],
+            [channel],
+            _epoch_field(epoch_entry, "epoch_number"),
+            float("-inf"),
+            float("inf"),
+        )
+    if isinstance(ts, list):
+        ts = ts[0] if ts else np.array([])
+    if ts is None:
+        return np.array([], dtype=float)
+    return np.asarray(ts, dtype=float).flatten()
+
+
 class ndi_time_syncrule_commonTriggersOverlappingEpochs(ndi_time_syncrule):
     """
     Synchronization rule based on common triggers in overlapping embedded epochs.
@@ -126,8 +236,33 @@ class ndi_time_syncrule_commonTriggersOverlappingEpochs(ndi_time_syncrule):
                 "minEmbeddedFileOverlap": 1,
                 "errorOnFailure": True,
             }
+        self.clear_cache()
         super().__init__(parameters, identifier)
 
+    def set_parameters(self, parameters: dict[str, Any]) -> None:
+        super().set_parameters(parameters)
+        self.clear_cache()
+
+    def clear_cache(self) -> None:
+        """
+        Discard the state memoized while building a sync graph.
+
+        Python-specific: no MATLAB equivalent. Within one build the rule keeps
+        the loaded DAQ systems, their epoch tables, the overlap groups of the
+        two tables, trigger times keyed by ``(daqsystem id, channel,
+        epoch_id)``, the fitted mapping of each group, and the session's
+        existing ``syncrule_mapping`` documents. The state is also dropped
+        whenever the session's ``epochtable_generation`` changes.
+        """
+        self._build_session: Any = None
+        self._build_generation: Any = None
+        self._daqsystems: dict[str, Any] = {}
+        self._epochtables: dict[str, tuple[list[Any], dict[str, int]]] = {}
+        self._overlap: tuple[list[int], list[int], set[tuple[int, int]], dict] | None = None
+        self._triggers: dict[tuple[str, str, str], np.ndarray] = {}
+        self._group_fits: dict[int, tuple[float, float]] = {}
+        self._existing_mappings: dict[tuple[str, str, str, str], Any] | None = None
+
     def is_valid_parameters(self, parameters: dict[str, Any]) -> tuple[bool, str]:
         if not isinstance(parameters, dict):
             return False, "Parameters must be a dictionary"
@@ -188,6 +323,10 @@ class ndi_time_syncrule_commonTriggersOverlappingEpochs(ndi_time_syncrule):
         """
         Apply the sync rule to obtain a cost and mapping between two epoch nodes.
 
+        Epoch tables, overlap groups, trigger times, and fitted mappings are
+        memoized between calls (see :meth:`clear_cache`), so every group of
+        overlapping epochs is read and fitted once per sync graph build.
+
         Args:
             epochnode_a: First epoch node dict.
             epochnode_b: Second epoch node dict.
@@ -211,226 +350,76 @@ class ndi_time_syncrule_commonTriggersOverlappingEpochs(ndi_time_syncrule):
             return None, None
 
         # Check epoch clock type
-        clock_a = epochnode_a.get("epoch_clock", {})
-        clock_b = epochnode_b.get("epoch_clock", {})
-        clock_type_a = (
-            clock_a.get("type", "") if isinstance(clock_a, dict) else getattr(clock_a, "type", "")
-        )
-        clock_type_b = (
-            clock_b.get("type", "") if isinstance(clock_b, dict) else getattr(clock_b, "type", "")
-        )
+        clock_type_a = _clock_type_name(epochnode_a.get("epoch_clock", {}))
+        clock_type_b = _clock_type_name(epochnode_b.get("epoch_clock", {}))
 
         if clock_type_a != p["epochclocktype"] or clock_type_b != p["epochclocktype"]:
             return None, None
 
+        session = getattr(daqsystem_a, "session", None)
+        if session is None:
+            return None, None
+        self._start_build(session)
+
         # Assign roles
         if node_a_is_1:
-            daqsystem1 = daqsystem_a
-            session = getattr(daqsystem1, "session", None)
-            if session is None:
-                return None, None
-            daqsystem2 = session.daqsystem_load("name", p["daqsystem2_name"])
+            self._daqsystems.setdefault(p["daqsystem1_name"], daqsystem_a)
         else:
-            daqsystem2 = daqsystem_a
-            session = getattr(daqsystem2, "session", None)
-            if session is None:
-                return None, None
-            daqsystem1 = session.daqsystem_load("name", p["daqsystem1_name"])
+            self._daqsystems.setdefault(p["daqsystem2_name"], daqsystem_a)
+        daqsystem1 = self._load_daqsystem(session, p["daqsystem1_name"])
+        daqsystem2 = self._load_daqsystem(session, p["daqsystem2_name"])
 
         if daqsystem1 is None or daqsystem2 is None:
             if p.get("errorOnFailure", True):
                 raise RuntimeError("Could not load both DAQ systems.")
             return None, None
 
-        if isinstance(daqsystem1, list):
-            daqsystem1 = daqsystem1[0]
-        if isinstance(daqsystem2, list):
-            daqsystem2 = daqsystem2[0]
-
         # 2. Check for existing syncrule_mapping in database
-        try:
-            from ndi.query import ndi_query
-
-            q_existing = (
-                ndi_query("").isa("syncrule_mapping")
-                & ndi_query(
-                    "syncrule_mapping.epochnode_a.epoch_id",
-                    "exact_string",
-                    epochnode_a.get("epoch_id", ""),
-                )
-                & ndi_query(
-                    "syncrule_mapping.epochnode_b.epoch_id",
-                    "exact_string",
-                    epochnode_b.get("epoch_id", ""),
-                )
-                & ndi_query(
-                    "syncrule_mapping.epochnode_a.objectname",
-                    "exact_string",
-                    name_a,
-                )
-                & ndi_query(
-                    "syncrule_mapping.epochnode_b.objectname",
-                    "exact_string",
-                    name_b,
-                )
+        existing = self._existing_mapping(
+            session,
+            epochnode_a.get("epoch_id", ""),
+            epochnode_b.get("epoch_id", ""),
+            name_a,
+            name_b,
+        )
+        if existing is not None:
+            return existing
+
+        # 3. Check embedded file overlap of the seed pair
+        epochs_1, index_1 = self._epochtable(p["daqsystem1_name"], daqsystem1)
+        epochs_2, index_2 = self._epochtable(p["daqsystem2_name"], daqsystem2)
+        if self._overlap is None:
+            group_1, group_2, edges = _overlap_groups(
+                epochs_1, epochs_2, p.get("minEmbeddedFileOverlap", 1)
             )
-            existing_docs = session.database_search(q_existing)
-            if existing_docs:
-                doc = existing_docs[0]
-                props = doc.document_properties
-                sm = props.get("syncrule_mapping", {})
-                cost = sm.get("cost", 1.0)
-                mapping = ndi_time_timemapping(sm.get("mapping", [1, 0]))
-                return cost, mapping
-        except Exception:
-            pass  # No cached mapping, compute fresh
-
-        # 3. Check initial embedded file overlap
-        files_a = _get_underlying_files(epochnode_a)
-        files_b = _get_underlying_files(epochnode_b)
-
-        count1 = _count_embedded_matches(files_a, files_b)
-        count2 = _count_embedded_matches(files_b, files_a)
+            members: dict[int, tuple[list[int], list[int]]] = {}
+            for i, g in enumerate(group_1):
+                members.setdefault(g, ([], []))[0].append(i)
+            for j, g in enumerate(group_2):
+                members.setdefault(g, ([], []))[1].append(j)
+            self._overlap = (group_1, group_2, edges, members)
+        group_1, _, edges, members = self._overlap
 
-        min_overlap = p.get("minEmbeddedFileOverlap", 1)
-        if max(count1, count2) < min_overlap:
-            return None, None
-
-        # 4. Expand epoch group by finding all connected overlapping epochs
-        epochs_a_all = daqsystem_a.epochtable() if daqsystem_a is not None else []
         if node_a_is_1:
-            epochs_b_all = daqsystem2.epochtable()
+            id_1, id_2 = epochnode_a.get("epoch_id", ""), epochnode_b.get("epoch_id", "")
         else:
-            epochs_b_all = daqsystem1.epochtable()
-
-        id_a_seed = epochnode_a.get("epoch_id", "")
-        id_b_seed = epochnode_b.get("epoch_id", "")
-
-        def _find_epoch_index(epoch_table: list, epoch_id: str) -> int | None:
-            for i, ep in enumerate(epoch_table):
-                eid = (
-                    ep.get("epoch_id", "") if isinstance(ep, dict) else getattr(ep, "epoch_id", "")
-                )
-                if eid == epoch_id:
-                    return i
-            return None
-
-        idx_a_seed = _find_epoch_index(epochs_a_all, id_a_seed)
-        idx_b_seed = _find_epoch_index(epochs_b_all, id_b_seed)
-
-        if idx_a_seed is None or idx_b_seed is None:
+            id_1, id_2 = epochnode_b.get("epoch_id", ""), epochnode_a.get("epoch_id", "")
+        idx_1 = index_1.get(id_1)
+        idx_2 = index_2.get(id_2)
+        if idx_1 is None or idx_2 is None or (idx_1, idx_2) not in edges:
             return None, None
 
-        group_a: set[int] = {idx_a_seed}
-        group_b: set[int] = {idx_b_seed}
-
-        def _get_epoch_files(epoch_table: list, idx: int) -> list[str]:
-            ep = epoch_table[idx]
-            if isinstance(ep, dict):
-                ue = ep.get("underlying_epochs", {})
-            elif hasattr(ep, "underlying_epochs"):
-                ue = ep.underlying_epochs
-            else:
-                return []
-            if isinstance(ue, dict):
-                return [str(f) for f in ue.get("underlying", [])]
-            elif hasattr(ue, "underlying"):
-                return [str(f) for f in ue.underlying]
-            return []
-
-        # Iteratively expand groups
-        added = True
-        while added:
-            added = False
-            for i in range(len(epochs_a_all)):
-                if i in group_a:
-                    continue
-                f_a = _get_epoch_files(epochs_a_all, i)
-                for j in group_b:
-                    f_b = _get_epoch_files(epochs_b_all, j)
-                    c1 = _count_embedded_matches(f_a, f_b)
-                    c2 = _count_embedded_matches(f_b, f_a)
-                    if max(c1, c2) >= min_overlap:
-                        group_a.add(i)
-                        added = True
-                        break
-
-            for i in range(len(epochs_b_all)):
-                if i in group_b:
-                    continue
-                f_b = _get_epoch_files(epochs_b_all, i)
-                for j in group_a:
-                    f_a = _get_epoch_files(epochs_a_all, j)
-                    c1 = _count_embedded_matches(f_b, f_a)
-                    c2 = _count_embedded_matches(f_a, f_b)
-                    if max(c1, c2) >= min_overlap:
-                        group_b.add(i)
-                        added = True
-                        break
-
         try:
-            # 5. Read triggers from expanded groups
-            type1, ch1 = _parse_channel(p["daqsystem_ch1"])
-            type2, ch2 = _parse_channel(p["daqsystem_ch2"])
-
-            if node_a_is_1:
-                indices_1 = group_a
-                indices_2 = group_b
-                epochs_1 = epochs_a_all
-                epochs_2 = epochs_b_all
-            else:
-                indices_1 = group_b
-                indices_2 = group_a
-                epochs_1 = epochs_b_all
-                epochs_2 = epochs_a_all
-
-            def _get_t0(epoch_table: list, idx: int) -> float:
-                ep = epoch_table[idx]
-                t0_t1 = ep.get("t0_t1") if isinstance(ep, dict) else getattr(ep, "t0_t1", None)
-                if isinstance(t0_t1, list) and len(t0_t1) > 0:
-                    val = t0_t1[0]
-                    if isinstance(val, (list, tuple, np.ndarray)):
-                        return float(val[0])
-                    return float(val)
-                return 0.0
-
-            def _get_epoch_id(epoch_table: list, idx: int) -> str:
-                ep = epoch_table[idx]
-                if isinstance(ep, dict):
-                    return ep.get("epoch_id", "")
-                return getattr(ep, "epoch_id", "")
-
-            sorted_1 = sorted(indices_1, key=lambda i: _get_t0(epochs_1, i))
-            sorted_2 = sorted(indices_2, key=lambda i: _get_t0(epochs_2, i))
-
-            # Read T1
-            t1_total: list[float] = []
-            for idx in sorted_1:
-                eid = _get_epoch_id(epochs_1, idx)
-                ts, _ = daqsystem1.readevents([type1], ch1, eid, float("-inf"), float("inf"))
-                if isinstance(ts, list):
-                    ts = ts[0] if ts else np.array([])
-                if isinstance(ts, np.ndarray):
-                    t1_total.extend(ts.flatten().tolist())
-                elif ts is not None:
-                    t1_total.extend(list(ts))
-
-            # Read T2
-            t2_total: list[float] = []
-            for idx in sorted_2:
-                eid = _get_epoch_id(epochs_2, idx)
-                ts, _ = daqsystem2.readevents([type2], ch2, eid, float("-inf"), float("inf"))
-                if isinstance(ts, list):
-                    ts = ts[0] if ts else np.array([])
-                if isinstance(ts, np.ndarray):
-                    t2_total.extend(ts.flatten().tolist())
-                elif ts is not None:
-                    t2_total.extend(list(ts))
-
-            # 6. Compute mapping
-            t1_arr = np.sort(np.array(t1_total))
-            t2_arr = np.sort(np.array(t2_total))
-            shift, scale = _sync_triggers(t1_arr, t2_arr)
+            # 4. Read triggers of the whole overlap group and fit once per group
+            group = group_1[idx_1]
+            if group not in self._group_fits:
+                type1, ch1 = _parse_channel(p["daqsystem_ch1"])
+                type2, ch2 = _parse_channel(p["daqsystem_ch2"])
+                indices_1, indices_2 = members[group]
+                t1 = self._group_triggers(daqsystem1, type1, ch1, epochs_1, indices_1)
+                t2 = self._group_triggers(daqsystem2, type2, ch2, epochs_2, indices_2)
+                self._group_fits[group] = _sync_triggers(t1, t2)
+            shift, scale = self._group_fits[group]
 
             if node_a_is_1:
                 # T2 = scale * T1 + shift -> map A(1) to B(2)
@@ -445,3 +434,81 @@ class ndi_time_syncrule_commonTriggersOverlappingEpochs(ndi_time_syncrule):
             if p.get("errorOnFailure", True):
                 raise
             return None, None
+
+    def _start_build(self, session: Any) -> None:
+        """Reset memoized state if the session or its epoch tables changed."""
+        generation = getattr(session, "epochtable_generation", None)
+        if self._build_session is not session or self._build_generation != generation:
+            self.clear_cache()
+            self._build_session = session
+            self._build_generation = generation
+
+    def _load_daqsystem(self, session: Any, name: str) -> Any:
+        """Load a DAQ system by name once per build."""
+        if name not in self._daqsystems:
+            daqsystem = session.daqsystem_load(name=name)
+            if isinstance(daqsystem, list):
+                daqsystem = daqsystem[0] if daqsystem else None
+            self._daqsystems[name] = daqsystem
+        return self._daqsystems[name]
+
+    def _epochtable(self, name: str, daqsystem: Any) -> tuple[list[Any], dict[str, int]]:
+        """Return a DAQ system's epoch table and an epoch_id -> index map."""
+        if name not in self._epochtables:
+            table = list(daqsystem.epochtable())
+            index: dict[str, int] = {}
+            for i, entry in enumerate(table):
+                index.setdefault(_epoch_field(entry, "epoch_id", ""), i)
+            self._epochtables[name] = (table, index)
+        return self._epochtables[name]
+
+    def _existing_mapping(
+        self, session: Any, epoch_id_a: str, epoch_id_b: str, name_a: str, name_b: str
+    ) -> tuple[float, ndi_time_timemapping] | None:
+        """Look up a stored syncrule_mapping, prefetching all of them on first use."""
+        if self._existing_mappings is None:
+            self._existing_mappings = {}
+            try:
+                from ndi.query import ndi_query
+
+                docs = session.database_search(ndi_query("").isa("syncrule_mapping"))
+            except Exception:
+                docs = []  # No cached mappings, compute fresh
+            for doc in docs or []:
+                sm = doc.read_properties().get("syncrule_mapping", {})
+                node_a = sm.get("epochnode_a", {}) or {}
+                node_b = sm.get("epochnode_b", {}) or {}
+                key = (
+                    node_a.get("epoch_id", ""),
+                    node_b.get("epoch_id", ""),
+                    node_a.get("objectname", ""),
+                    node_b.get("objectname", ""),
+                )
+                self._existing_mappings.setdefault(key, sm)
+
+        sm = self._existing_mappings.get((epoch_id_a, epoch_id_b, name_a, name_b))
+        if sm is None:
+            return None
+        return sm.get("cost", 1.0), ndi_time_timemapping(sm.get("mapping", [1, 0]))
+
+    def _group_triggers(
+        self,
+        daqsystem: Any,
+        channeltype: str,
+        channel: int,
+        epochs: list[Any],
+        indices: list[int],
+    ) -> np.ndarray:
+        """Return the sorted trigger times of a channel across a group of epochs."""
+        daq_id = getattr(daqsystem, "id", "")
+        channel_str = f"{channeltype}{channel}"
+        parts = []
+        for idx in indices:
+            entry = epochs[idx]
+            key = (daq_id, channel_str, _epoch_field(entry, "epoch_id", ""))
+            if key not in self._triggers:
+                self._triggers[key] = _read_trigger_times(daqsystem, channeltype, channel, entry)
+            parts.append(self._triggers[key])
+        if not parts:
+            return np.array([], dtype=float)
+        return np.sort(np.concatenate(parts))
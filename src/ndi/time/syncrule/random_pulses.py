@@ -27,60 +27,270 @@ def _parse_channel(ch_str: str) -> tuple[str, int]:
     return ch_str[:idx], int(ch_str[idx:])
 
 
-def _sync_random_triggers(t1: np.ndarray, t2: np.ndarray) -> tuple[float, float]:
+# Number of two-point line hypotheses tried by the robust fit
+_RANSAC_ITERATIONS = 200
+# Candidate pairs scored per hypothesis (a random subsample for long trains)
+_RANSAC_MAX_EVAL = 20000
+# Pulses per window used to seed alignments locally
+_WINDOW_PULSES = 128
+# Maximum number of windows tried after the whole-train seed
+_MAX_WINDOWS = 8
+# Matched fraction at which no further seeds are tried
+_GOOD_MATCH_FRACTION = 0.9
+
+
+def _ransac_line(
+    x: np.ndarray, y: np.ndarray, tol: float, rng: np.random.Generator
+) -> tuple[float, float, np.ndarray] | None:
     """
-    Find a linear mapping T1 = scale * T2 + shift by matching random pulses.
+    Robustly fit ``y = scale * x + shift`` to candidate pairs with outliers.
 
-    Uses inter-pulse interval cross-correlation to find the best alignment,
-    then performs a least-squares fit.
+    Two-point hypotheses are scored by how many pairs they place within
+    ``tol``; the best hypothesis is refined by least squares on its inliers.
 
     Returns:
-        Tuple of (shift, scale) where T1 ~ scale * T2 + shift.
+        Tuple of (scale, shift, inlier_mask), or None if no hypothesis has
+        two inliers.
+    """
+    n = len(x)
+    if n < 2:
+        return None
+    if n > _RANSAC_MAX_EVAL:
+        sample = np.sort(rng.choice(n, _RANSAC_MAX_EVAL, replace=False))
+        x_eval, y_eval = x[sample], y[sample]
+    else:
+        x_eval, y_eval = x, y
+
+    best_count = 1
+    best: tuple[float, float] | None = None
+    first = rng.integers(0, n, size=_RANSAC_ITERATIONS)
+    second = rng.integers(0, n, size=_RANSAC_ITERATIONS)
+    for i, j in zip(first, second):
+        if x[j] == x[i]:
+            continue
+        scale = (y[j] - y[i]) / (x[j] - x[i])
+        shift = y[i] - scale * x[i]
+        count = int(np.count_nonzero(np.abs(y_eval - (scale * x_eval + shift)) < tol))
+        if count > best_count:
+            best_count, best = count, (scale, shift)
+
+    if best is None:
+        return None
+    inliers = np.abs(y - (best[0] * x + best[1])) < tol
+    if np.count_nonzero(inliers) < 2:
+        return None
+    coeffs = np.polyfit(x[inliers], y[inliers], 1)
+    return float(coeffs[0]), float(coeffs[1]), inliers
+
+
+def _match_pulses(
+    t1: np.ndarray, t2: np.ndarray, scale: float, shift: float, tol: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pair every pulse of ``t2`` with the nearest pulse of ``t1`` under a mapping.
+
+    Pulses whose mapped time has no ``t1`` pulse within ``tol`` are dropped,
+    so missing and extra pulses on either side simply go unmatched. Each
+    ``t1`` pulse is used at most once.
+
+    Returns:
+        Tuple of (t1_matched, t2_matched) arrays of equal length.
+    """
+    predicted = scale * t2 + shift
+    idx = np.clip(np.searchsorted(t1, predicted), 1, len(t1) - 1)
+    left_closer = np.abs(predicted - t1[idx - 1]) <= np.abs(t1[idx] - predicted)
+    nearest = np.where(left_closer, idx - 1, idx)
+    error = np.abs(t1[nearest] - predicted)
+    ok = np.flatnonzero(error < tol)
+    # Keep the closest t2 pulse when two map onto the same t1 pulse
+    ok = ok[np.argsort(error[ok], kind="stable")]
+    _, first = np.unique(nearest[ok], return_index=True)
+    ok = np.sort(ok[first])
+    return t1[nearest[ok]], t2[ok]
+
+
+def _grow_alignment(
+    t1: np.ndarray,
+    t2: np.ndarray,
+    scale: float,
+    shift: float,
+    t2_range: tuple[float, float],
+    tol: float,
+) -> tuple[float, float, np.ndarray, np.ndarray]:
+    """
+    Extend a locally fitted mapping to the whole recording.
+
+    The window of ``t2`` pulses used for matching starts at ``t2_range`` and
+    doubles around its center after every refit, so the extrapolation error
+    of the current line stays small relative to ``tol`` even with clock
+    drift.
+
+    Returns:
+        Tuple of (scale, shift, t1_matched, t2_matched).
+    """
+    center = 0.5 * (t2_range[0] + t2_range[1])
+    half_span = max(0.5 * (t2_range[1] - t2_range[0]), tol)
+    t1_matched = t2_matched = np.array([], dtype=float)
+    while True:
+        lo, hi = np.searchsorted(t2, [center - half_span, center + half_span])
+        t1_matched, t2_matched = _match_pulses(t1, t2[lo:hi], scale, shift, tol)
+        if len(t1_matched) >= 2:
+            scale, shift = (float(c) for c in np.polyfit(t2_matched, t1_matched, 1))
+        if lo == 0 and hi == len(t2):
+            break
+        half_span *= 2
+    # Re-match with the final mapping so early windows use the refined line,
+    # then drop chance matches of extra pulses (residual far beyond jitter)
+    t1_matched, t2_matched = _match_pulses(t1, t2, scale, shift, tol)
+    if len(t1_matched) >= 2:
+        residuals = t1_matched - (scale * t2_matched + shift)
+        mad = float(np.median(np.abs(residuals - np.median(residuals))))
+        keep = np.abs(residuals) <= max(5 * 1.4826 * mad, 1e-3 * tol)
+        if np.count_nonzero(keep) >= 2:
+            t1_matched, t2_matched = t1_matched[keep], t2_matched[keep]
+        scale, shift = (float(c) for c in np.polyfit(t2_matched, t1_matched, 1))
+    return scale, shift, t1_matched, t2_matched
+
+
+def align_random_pulses(
+    t1: np.ndarray,
+    t2: np.ndarray,
+    tolerance: float | None = None,
+    seed: int = 0,
+) -> dict[str, Any]:
     """
+    Align two recordings of a shared random pulse train.
+
+    Python-specific: no MATLAB equivalent. Inter-pulse intervals are
+    z-scored and cross-correlated with an FFT, first for the whole trains
+    and then, if that does not explain most pulses, for short windows of
+    ``t2`` against all of ``t1``. Each correlation peak proposes candidate
+    pulse pairs; a RANSAC line fit rejects pairs broken by dropped or extra
+    pulses, and the mapping is grown from the inlier pairs to the whole
+    recording by matching pulses within a tolerance window and refitting
+    by least squares. The seed that matches the most pulses wins.
+
+    Args:
+        t1: Sorted pulse times on clock 1.
+        t2: Sorted pulse times on clock 2.
+        tolerance: Maximum distance (in clock 1 units) between a pulse and
+            its mapped partner. Defaults to a quarter of the median
+            inter-pulse interval of ``t1``.
+        seed: Seed for the random hypotheses of the robust fit.
+
+    Returns:
+        Dict with ``shift`` and ``scale`` (``T1 ~ scale * T2 + shift``) and
+        diagnostics: ``lag`` (pulse index offset of the winning seed),
+        ``n_matched``, ``matched_fraction`` (of the shorter train),
+        ``rms_residual``, ``max_residual``, ``median_ipi``, ``tolerance``
+        and ``n_seeds`` (alignments tried).
+
+    Raises:
+        ValueError: If either train has fewer than 2 pulses or no alignment
+            matches at least 2 pulses.
+    """
+    from scipy.signal import correlate
+
+    t1 = np.sort(np.asarray(t1, dtype=float).ravel())
+    t2 = np.sort(np.asarray(t2, dtype=float).ravel())
     if len(t1) < 2 or len(t2) < 2:
         raise ValueError("Need at least 2 triggers in each sequence to synchronize.")
 
-    # Compute inter-pulse intervals
     ipi1 = np.diff(t1)
     ipi2 = np.diff(t2)
+    median_ipi = float(np.median(ipi1))
+    if tolerance is None:
+        tolerance = 0.25 * median_ipi
 
-    # Normalize for cross-correlation
     ipi1_norm = (ipi1 - np.mean(ipi1)) / (np.std(ipi1) + 1e-15)
     ipi2_norm = (ipi2 - np.mean(ipi2)) / (np.std(ipi2) + 1e-15)
 
-    # Cross-correlate to find best offset
-    corr = np.correlate(ipi1_norm, ipi2_norm, mode="full")
-    best_lag = int(np.argmax(corr)) - (len(ipi2_norm) - 1)
+    def _seeds():
+        # Whole trains: lag of t1 relative to t2 in pulse indices
+        corr = correlate(ipi1_norm, ipi2_norm, mode="full", method="fft")
+        yield int(np.argmax(corr)) - (len(ipi2_norm) - 1), 0, len(t2)
+        # Windows of t2 spread over the recording
+        w = min(_WINDOW_PULSES, len(ipi2_norm))
+        n_windows = min(_MAX_WINDOWS, len(ipi2_norm) // w)
+        if w >= len(ipi2_norm) or w > len(ipi1_norm):
+            return
+        for a in np.linspace(0, len(ipi2_norm) - w, n_windows).astype(int):
+            window = ipi2_norm[a : a + w]
+            window = (window - np.mean(window)) / (np.std(window) + 1e-15)
+            corr = correlate(ipi1_norm, window, mode="valid", method="fft")
+            yield int(np.argmax(corr)) - int(a), int(a), int(a) + w + 1
+
+    rng = np.random.default_rng(seed)
+    best: dict[str, Any] | None = None
+    n_seeds = 0
+    for lag, k0, k1 in _seeds():
+        n_seeds += 1
+        # Candidate pairs t1[k + lag] <-> t2[k]
+        k0 = max(k0, -lag)
+        k1 = min(k1, len(t1) - lag)
+        if k1 - k0 < 2:
+            continue
+        x, y = t2[k0:k1], t1[k0 + lag : k1 + lag]
+        model = _ransac_line(x, y, tolerance, rng)
+        if model is None:
+            continue
+        scale, shift, inliers = model
+        x_in = x[inliers]
+        scale, shift, t1_matched, t2_matched = _grow_alignment(
+            t1, t2, scale, shift, (float(x_in[0]), float(x_in[-1])), tolerance
+        )
+        if len(t1_matched) < 2:
+            continue
+
+        residuals = t1_matched - (scale * t2_matched + shift)
+        result = {
+            "shift": shift,
+            "scale": scale,
+            "lag": lag,
+            "n_matched": int(len(t1_matched)),
+            "matched_fraction": len(t1_matched) / min(len(t1), len(t2)),
+            "rms_residual": float(np.sqrt(np.mean(residuals**2))),
+            "max_residual": float(np.max(np.abs(residuals))),
+            "median_ipi": median_ipi,
+            "tolerance": float(tolerance),
+        }
+        if best is None or (result["n_matched"], -result["rms_residual"]) > (
+            best["n_matched"],
+            -best["rms_residual"],
+        ):
+            best = result
+        if best["matched_fraction"] >= _GOOD_MATCH_FRACTION:
+            break
+
+    if best is None:
+        raise ValueError("Not enough overlapping triggers to compute mapping.")
+    best["n_seeds"] = n_seeds
+    return best
 
-    # Determine overlapping region
-    if best_lag >= 0:
-        n_overlap = min(len(t1) - best_lag, len(t2))
-        t1_matched = t1[best_lag : best_lag + n_overlap]
-        t2_matched = t2[:n_overlap]
-    else:
-        n_overlap = min(len(t1), len(t2) + best_lag)
-        t1_matched = t1[:n_overlap]
-        t2_matched = t2[-best_lag : -best_lag + n_overlap]
 
-    if n_overlap < 2:
-        raise ValueError("Not enough overlapping triggers to compute mapping.")
+def _sync_random_triggers(t1: np.ndarray, t2: np.ndarray) -> tuple[float, float]:
+    """
+    Find a linear mapping T1 = scale * T2 + shift by matching random pulses.
+
+    Uses :func:`align_random_pulses`, then rejects alignments whose matched
+    pulses do not fit a line well.
 
-    # Least-squares fit: T1 = scale * T2 + shift
-    coeffs = np.polyfit(t2_matched, t1_matched, 1)
-    scale = float(coeffs[0])
-    shift = float(coeffs[1])
+    Returns:
+        Tuple of (shift, scale) where T1 ~ scale * T2 + shift.
+    """
+    result = align_random_pulses(t1, t2)
 
     # Validate fit quality
-    residuals = t1_matched - (scale * t2_matched + shift)
-    rms_error = float(np.sqrt(np.mean(residuals**2)))
-    median_ipi = float(np.median(np.concatenate([ipi1, ipi2])))
+    median_ipi = result["median_ipi"]
+    rms_error = result["rms_residual"]
     if median_ipi > 0 and rms_error > 0.1 * median_ipi:
         raise ValueError(
             f"Poor fit quality (RMS={rms_error:.4f}, "
-            f"median IPI={median_ipi:.4f}). Sequences may not match."
+            f"median IPI={median_ipi:.4f}, matched={result['n_matched']}). "
+            "Sequences may not match."
         )
 
-    return shift, scale
+    return result["shift"], result["scale"]
 
 
 class ndi_time_syncrule_randomPulses(ndi_time_syncrule):
@@ -88,8 +298,10 @@ class ndi_time_syncrule_randomPulses(ndi_time_syncrule):
     Synchronization rule based on random pulse sequences on a shared channel.
 
     This sync rule synchronizes two DAQ systems that recorded a shared random
-    pulse sequence. It uses inter-pulse interval cross-correlation to find the
-    best alignment, then computes a linear time mapping via least-squares fit.
+    pulse sequence. It uses FFT cross-correlation of inter-pulse intervals to
+    find candidate alignments, fits them robustly so dropped or extra pulses
+    are tolerated, and refines the linear time mapping by least squares (see
+    :func:`align_random_pulses`).
 
     Parameters:
         daqsystem1_name (str): Name of the first DAQ system.
@@ -269,7 +481,7 @@ class ndi_time_syncrule_randomPulses(ndi_time_syncrule):
             existing_docs = session.database_search(q_existing)
             if existing_docs:
                 doc = existing_docs[0]
-                props = doc.document_properties
+                props = doc.read_properties()
                 sm = props.get("syncrule_mapping", {})
                 cost = sm.get("cost", 1.0)
                 mapping = ndi_time_timemapping(sm.get("mapping", [1, 0]))
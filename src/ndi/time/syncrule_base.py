@@ -167,6 +167,14 @@ class ndi_time_syncrule(ndi_ido, ABC):
         """
         return None, None
 
+    def clear_cache(self) -> None:
+        """
+        Discard any state the rule memoized while a sync graph was built.
+
+        Python-specific: no MATLAB equivalent. ``ndi_time_syncgraph`` calls
+        this at the start of every build. The base rule keeps no state.
+        """
+
     def __eq__(self, other: object) -> bool:
         """Check equality of two sync rules."""
         if not isinstance(other, ndi_time_syncrule):
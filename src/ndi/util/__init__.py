@@ -13,20 +13,45 @@ The ``+openminds`` sub-package is ported separately in
 ``ndi.openminds_convert``.
 """
 
-from .classname import ndi_matlab_classname, ndi_python_classname
-from .compare_dataset_summary import compareDatasetSummary
-from .compare_session_summary import compareSessionSummary
-from .dataset_summary import datasetSummary
-from .datestamp2datetime import datestamp2datetime
-from .downsampleTimeseries import downsampleTimeseries
-from .getHexDiffFromFileObj import getHexDiffFromFileObj
-from .hexDiff import hexDiff
-from .hexDiffBytes import hexDiffBytes
-from .hexDump import hexDump
-from .matlab_regex import matlab_to_python_regex
-from .rehydrateJSONNanNull import rehydrateJSONNanNull
-from .session_summary import sessionSummary
-from .unwrapTableCellContent import unwrapTableCellContent
+from typing import TYPE_CHECKING
+
+from .. import _lazy
+
+# Imported on first access: several helpers need pydantic, numpy or
+# pandas, which ``ndi.util.classname`` users should not pay for.
+_LAZY_IMPORTS = {
+    "ndi_matlab_classname": (".classname", "ndi_matlab_classname"),
+    "ndi_python_classname": (".classname", "ndi_python_classname"),
+    "compareDatasetSummary": (".compare_dataset_summary", "compareDatasetSummary"),
+    "compareSessionSummary": (".compare_session_summary", "compareSessionSummary"),
+    "datasetSummary": (".dataset_summary", "datasetSummary"),
+    "datestamp2datetime": (".datestamp2datetime", "datestamp2datetime"),
+    "downsampleTimeseries": (".downsampleTimeseries", "downsampleTimeseries"),
+    "getHexDiffFromFileObj": (".getHexDiffFromFileObj", "getHexDiffFromFileObj"),
+    "hexDiff": (".hexDiff", "hexDiff"),
+    "hexDiffBytes": (".hexDiffBytes", "hexDiffBytes"),
+    "hexDump": (".hexDump", "hexDump"),
+    "matlab_to_python_regex": (".matlab_regex", "matlab_to_python_regex"),
+    "rehydrateJSONNanNull": (".rehydrateJSONNanNull", "rehydrateJSONNanNull"),
+    "sessionSummary": (".session_summary", "sessionSummary"),
+    "unwrapTableCellContent": (".unwrapTableCellContent", "unwrapTableCellContent"),
+}
+
+if TYPE_CHECKING:
+    from .classname import ndi_matlab_classname, ndi_python_classname
+    from .compare_dataset_summary import compareDatasetSummary
+    from .compare_session_summary import compareSessionSummary
+    from .dataset_summary import datasetSummary
+    from .datestamp2datetime import datestamp2datetime
+    from .downsampleTimeseries import downsampleTimeseries
+    from .getHexDiffFromFileObj import getHexDiffFromFileObj
+    from .hexDiff import hexDiff
+    from .hexDiffBytes import hexDiffBytes
+    from .hexDump import hexDump
+    from .matlab_regex import matlab_to_python_regex
+    from .rehydrateJSONNanNull import rehydrateJSONNanNull
+    from .session_summary import sessionSummary
+    from .unwrapTableCellContent import unwrapTableCellContent
 
 __all__ = [
     "ndi_matlab_classname",
@@ -45,3 +70,5 @@ __all__ = [
     "sessionSummary",
     "unwrapTableCellContent",
 ]
+
+_lazy.install(__name__)
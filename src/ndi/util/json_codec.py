@@ -0,0 +1,283 @@
+"""
+ndi.util.json_codec - Fast JSON encoding and decoding of NDI documents.
+
+Python-specific: no MATLAB equivalent.
+
+Document JSON is parsed and written through :func:`loads` and
+:func:`dumps`, which use `orjson <https://github.com/ijl/orjson>`_ when it
+is installed (``pip install ndi[fastjson]``) and the standard library
+``json`` module otherwise. Either backend writes equivalent JSON that
+parses to the same values, with the same layout: UTF-8 without ``\\u``
+escapes, no spaces in compact output, and a space after ``:`` only in
+indented output. The text is not always byte-identical, because the
+backends may spell floats in exponent notation differently.
+Where orjson cannot be used the standard library takes over with the
+same layout:
+
+* Text that orjson rejects (``NaN``/``Infinity`` literals, integers
+  beyond 64 bits, ...) is handed to the standard library, which accepts
+  it as before.
+* Documents holding non-finite floats are written by the standard
+  library, because orjson would turn ``NaN`` into ``null``.
+* Objects orjson cannot encode (non-string keys, unsupported types)
+  fall back to the standard library and its ``default`` handling.
+
+The backend is chosen with :func:`set_backend` or the ``NDI_JSON_BACKEND``
+environment variable (``orjson`` or ``json``).
+
+Run ``python -m ndi.util.json_codec [FILE_OR_DIR ...]`` to compare the
+parse and dump throughput of the backends on a document corpus (by
+default the document definitions shipped with NDI).
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import warnings
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import IO, Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Sentinels NDI Cloud uses for non-finite numbers; see ndi.util.rehydrateJSONNanNull
+_SENTINELS = (
+    ('"__NDI__NaN__"', "NaN"),
+    ('"__NDI__Infinity__"', "Infinity"),
+    ('"__NDI__-Infinity__"', "-Infinity"),
+)
+
+BACKENDS = ("orjson", "json")
+
+_backend = "json"
+
+
+def backend() -> str:
+    """Return the name of the backend in use (``'orjson'`` or ``'json'``)."""
+    return _backend
+
+
+def set_backend(name: str | None = None) -> str:
+    """Select the JSON backend.
+
+    Args:
+        name: ``'orjson'``, ``'json'``, or None for the default (the
+            ``NDI_JSON_BACKEND`` environment variable, else orjson if it
+            is installed).
+
+    Returns:
+        The name of the backend now in use.
+
+    Raises:
+        ValueError: If *name* is not a known backend.
+        ImportError: If ``'orjson'`` is requested but not installed.
+    """
+    global _backend
+    if name is None:
+        name = os.environ.get("NDI_JSON_BACKEND", "").strip().lower() or None
+        if name is None:
+            name = "orjson" if orjson is not None else "json"
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend {name!r}; expected one of {BACKENDS}")
+    if name == "orjson" and orjson is None:
+        raise ImportError("orjson is not installed; pip install ndi[fastjson]")
+    _backend = name
+    return _backend
+
+
+def rehydrate(text: str | bytes) -> str | bytes:
+    """Replace NDI Cloud's NaN/Infinity sentinel strings with JSON literals.
+
+    Same replacements as :func:`ndi.util.rehydrateJSONNanNull` with its
+    default sentinels, for ``str`` or ``bytes`` text.
+    """
+    for sentinel, literal in _SENTINELS:
+        if isinstance(text, (bytes, bytearray)):
+            text = text.replace(sentinel.encode(), literal.encode())
+        else:
+            text = text.replace(sentinel, literal)
+    return text
+
+
+def loads(text: str | bytes | bytearray, rehydrate_nan: bool = False) -> Any:
+    """Parse JSON text.
+
+    Args:
+        text: The JSON text.
+        rehydrate_nan: Replace NDI Cloud's NaN/Infinity sentinel strings
+            with the numbers they stand for (see :func:`rehydrate`).
+
+    Returns:
+        The decoded object.
+
+    Raises:
+        json.JSONDecodeError: If the text is not valid JSON.
+    """
+    marker = b"__NDI__" if isinstance(text, (bytes, bytearray)) else "__NDI__"
+    if rehydrate_nan and marker in text:
+        # Non-finite literals: only the standard library reads them
+        return json.loads(rehydrate(text))
+    if _backend == "orjson":
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+
+def load(fp: IO) -> Any:
+    """Parse JSON from an open file (text or binary)."""
+    return loads(fp.read())
+
+
+def _finite(obj: Any) -> bool:
+    """True if *obj* holds no NaN or infinite floats."""
+    if isinstance(obj, float):
+        return math.isfinite(obj)
+    if isinstance(obj, dict):
+        return all(_finite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return all(_finite(v) for v in obj)
+    return True
+
+
+def dumpb(
+    obj: Any,
+    indent: int | None = None,
+    sort_keys: bool = False,
+    default: Callable[[Any], Any] | None = None,
+) -> bytes:
+    """Encode *obj* as UTF-8 JSON bytes.
+
+    Args:
+        obj: The object to encode.
+        indent: Indentation, as for ``json.dumps``. orjson is used only
+            for None (compact) and 2.
+        sort_keys: Sort object keys.
+        default: Called for objects that cannot otherwise be encoded.
+
+    Returns:
+        The encoded JSON. Non-ASCII characters are written as UTF-8
+        rather than ``\\u`` escapes, and compact output (*indent* None)
+        has no spaces after separators, as orjson writes it. Floats in
+        exponent notation are spelled as the backend writes them.
+    """
+    if _backend == "orjson" and indent in (None, 2):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if indent == 2:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            data = orjson.dumps(obj, default=default, option=option)
+        except TypeError:
+            pass  # e.g. non-string keys: the standard library converts them
+        else:
+            # orjson writes non-finite floats as null; only then is the walk needed
+            if b"null" not in data or _finite(obj):
+                return data
+    return json.dumps(
+        obj,
+        indent=indent,
+        separators=(",", ":") if indent is None else None,
+        sort_keys=sort_keys,
+        default=default,
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+
+def dumps(
+    obj: Any,
+    indent: int | None = None,
+    sort_keys: bool = False,
+    default: Callable[[Any], Any] | None = None,
+) -> str:
+    """Encode *obj* as a JSON string; arguments as for :func:`dumpb`."""
+    return dumpb(obj, indent=indent, sort_keys=sort_keys, default=default).decode("utf-8")
+
+
+def dump(
+    obj: Any,
+    path: str | Path,
+    indent: int | None = None,
+    sort_keys: bool = False,
+    default: Callable[[Any], Any] | None = None,
+) -> None:
+    """Write *obj* as UTF-8 JSON to the file *path*; arguments as for :func:`dumpb`."""
+    Path(path).write_bytes(dumpb(obj, indent=indent, sort_keys=sort_keys, default=default))
+
+
+def _corpus(paths: Iterable[str | Path]) -> list[bytes]:
+    texts = []
+    for p in map(Path, paths):
+        files = sorted(p.rglob("*.json")) if p.is_dir() else [p]
+        texts.extend(f.read_bytes() for f in files)
+    return texts
+
+
+def benchmark(
+    paths: Iterable[str | Path] | None = None, repeat: int = 5
+) -> dict[str, dict[str, float]]:
+    """Compare parse and dump throughput of the available backends.
+
+    Args:
+        paths: JSON files, or directories searched recursively for
+            ``*.json`` (default: NDI's document definitions).
+        repeat: Number of passes over the corpus; the fastest is kept.
+
+    Returns:
+        Dict mapping each backend name to ``{'loads_mb_s', 'dumps_mb_s',
+        'dumps_indent_mb_s'}`` throughputs in megabytes per second of
+        JSON text.
+    """
+    import time
+
+    if paths is None:
+        from ndi.common import ndi_common_PathConstants
+
+        paths = [ndi_common_PathConstants.DOCUMENT_PATH]
+    texts = _corpus(paths)
+    docs = [json.loads(t) for t in texts]
+    size = sum(len(t) for t in texts) / 1e6
+
+    def best(fn: Callable[[], Any]) -> float:
+        times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - t0)
+        return size / max(min(times), 1e-9)
+
+    previous = _backend
+    results = {}
+    try:
+        for name in BACKENDS:
+            if name == "orjson" and orjson is None:
+                continue
+            set_backend(name)
+            results[name] = {
+                "loads_mb_s": best(lambda: [loads(t) for t in texts]),
+                "dumps_mb_s": best(lambda: [dumpb(d) for d in docs]),
+                "dumps_indent_mb_s": best(lambda: [dumpb(d, indent=2) for d in docs]),
+            }
+    finally:
+        set_backend(previous)
+    return results
+
+
+try:
+    set_backend()
+except (ValueError, ImportError) as exc:
+    warnings.warn(f"{exc}; using the standard json module", stacklevel=2)
+
+
+if __name__ == "__main__":
+    import sys
+
+    for name, rates in benchmark(sys.argv[1:] or None).items():
+        print(f"{name:>7}: " + ", ".join(f"{k} {v:8.1f}" for k, v in rates.items()))
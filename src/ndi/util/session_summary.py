@@ -44,7 +44,7 @@ def sessionSummary(session_obj: Any) -> dict[str, Any]:
     # 3. Files in .ndi folder
     dot_ndi_path = os.path.join(session_path, ".ndi")
     if os.path.isdir(dot_ndi_path):
-        entries = os.listdir(dot_ndi_path)
+        entries = [e for e in os.listdir(dot_ndi_path) if not _is_python_cache_file(e)]
         summary["filesInDotNDI"] = sorted(entries)
     else:
         summary["filesInDotNDI"] = []
@@ -117,3 +117,14 @@ def sessionSummary(session_obj: Any) -> dict[str, Any]:
     summary["probes"] = probe_structs
 
     return summary
+
+
+def _is_python_cache_file(name: str) -> bool:
+    """True for navigator and DAQ system caches that only the Python implementation writes."""
+    from ..daq.reader_base import HEADER_CACHE_FILE
+    from ..daq.system import PROBE_INVENTORY_FILE
+    from ..file.navigator import EPOCHID_MANIFEST_PREFIX, SCAN_INDEX_FILE
+
+    return name in (SCAN_INDEX_FILE, PROBE_INVENTORY_FILE, HEADER_CACHE_FILE) or (
+        name.startswith(EPOCHID_MANIFEST_PREFIX) and name.endswith(".tsv")
+    )
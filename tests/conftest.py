@@ -1 +1,18 @@
 """Pytest configuration and fixtures for NDI tests."""
+
+import os
+
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _isolated_ontology_cache(tmp_path_factory):
+    """Keep the persistent ontology cache out of the user's home directory."""
+    previous = os.environ.get("NDI_ONTOLOGY_CACHE")
+    path = tmp_path_factory.mktemp("ontology") / "ontology_cache.sqlite"
+    os.environ["NDI_ONTOLOGY_CACHE"] = str(path)
+    yield
+    if previous is None:
+        os.environ.pop("NDI_ONTOLOGY_CACHE", None)
+    else:
+        os.environ["NDI_ONTOLOGY_CACHE"] = previous
@@ -8,6 +8,8 @@ remove_dependency_value_n(), and ndi_session_mock.
 import json
 import os
 
+import numpy as np
+
 # ============================================================================
 # ndi_document.write() Tests
 # ============================================================================
@@ -159,6 +161,40 @@ class TestIntanReader:
         reader = ndi_daq_reader_mfdaq_intan()
         assert "ndi_daq_reader_mfdaq_intan" in repr(reader)
 
+    def test_t0_t1_many_reads_headers_in_threads(self, tmp_path, monkeypatch):
+        import threading
+        import time
+
+        from ndi.daq.reader.mfdaq import intan
+        from ndi.daq.reader.mfdaq.intan import ndi_daq_reader_mfdaq_intan
+
+        threads = set()
+
+        def read_header(filepath):
+            threads.add(threading.get_ident())
+            time.sleep(0.01)
+            return {"frequency_parameters": {"amplifier_sample_rate": 1000.0}}
+
+        def blockinfo(filepath, header):
+            n_blocks = int(os.path.basename(filepath)[1])
+            return {"samples_per_block": 60}, None, None, n_blocks
+
+        monkeypatch.setattr(intan, "read_Intan_RHD2000_header", read_header)
+        monkeypatch.setattr(intan, "Intan_RHD2000_blockinfo", blockinfo)
+
+        files = []
+        for n in (1, 2, 3):
+            path = tmp_path / f"e{n}.rhd"
+            path.write_bytes(b"x")
+            files.append([str(path)])
+
+        reader = ndi_daq_reader_mfdaq_intan()
+        assert reader.threadsafe_t0_t1
+        result = reader.t0_t1_many(files, max_workers=3)
+        assert result == [[(0.0, (60 * n - 1) / 1000.0)] for n in (1, 2, 3)]
+        assert len(threads) > 1
+        assert threading.get_ident() not in threads
+
 
 class TestBlackrockReader:
     """Tests for ndi_daq_reader_mfdaq_blackrock."""
@@ -236,6 +272,202 @@ class TestSpikeGadgetsReader:
         assert "ndi_daq_reader_mfdaq_spikegadgets" in repr(ndi_daq_reader_mfdaq_spikegadgets())
 
 
+class TestExtractorPool:
+    """Tests for the shared SpikeInterface extractor pool."""
+
+    class _Recording:
+        def __init__(self, path):
+            self.path = path
+            self.closed = False
+
+        def close(self):
+            self.closed = True
+
+    def _pool(self, max_size=2):
+        from ndi.daq.reader.spikeinterface_adapter import ExtractorPool
+
+        opened = []
+
+        def opener(path, stream_id):
+            opened.append((path, stream_id))
+            return None if path.endswith(".nev") else self._Recording(path)
+
+        return ExtractorPool(max_size=max_size, opener=opener), opened
+
+    def test_hits_misses_and_eviction(self, tmp_path):
+        files = []
+        for name in ("a.ns5", "b.ns5", "c.ns5"):
+            (tmp_path / name).write_bytes(b"x")
+            files.append(str(tmp_path / name))
+        pool, opened = self._pool()
+
+        a = pool.get(files[0])
+        assert pool.get(files[0]) is a
+        pool.get(files[1])
+        pool.get(files[2])  # evicts a, the least recently used
+        assert a.closed
+        assert pool.stats() == {
+            "hits": 1,
+            "misses": 3,
+            "evictions": 1,
+            "size": 2,
+            "max_size": 2,
+            "unreadable": 0,
+        }
+        assert len(opened) == 3
+
+        # streams are pooled separately; missing files are not opened
+        pool.get(files[2], stream_id="1")
+        assert pool.get(str(tmp_path / "missing.ns5")) is None
+        assert opened[-1] == (files[2], "1")
+        pool.clear()
+        assert len(pool) == 0
+
+    def test_unreadable_and_modified_files(self, tmp_path):
+        nev = tmp_path / "a.nev"
+        nev.write_bytes(b"x")
+        ns5 = tmp_path / "a.ns5"
+        ns5.write_bytes(b"x")
+        pool, opened = self._pool(max_size=4)
+
+        assert pool.get(str(nev)) is None
+        assert pool.get(str(nev)) is None
+        assert len(opened) == 1
+        # unreadable files do not take pool slots
+        assert len(pool) == 0
+        assert pool.stats()["unreadable"] == 1
+
+        first = pool.get(str(ns5))
+        st = os.stat(ns5)
+        os.utime(ns5, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        second = pool.get(str(ns5))
+        assert second is not first
+        assert first.closed
+        assert len(pool) == 1
+
+        st = os.stat(nev)
+        os.utime(nev, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert pool.get(str(nev)) is None
+        assert len(opened) == 4
+        assert pool.stats()["unreadable"] == 1
+
+    def test_unreadable_files_do_not_evict(self, tmp_path):
+        ns5 = tmp_path / "a.ns5"
+        ns5.write_bytes(b"x")
+        pool, _ = self._pool(max_size=1)
+        recording = pool.get(str(ns5))
+        for i in range(3):
+            (tmp_path / f"{i}.nev").write_bytes(b"x")
+            assert pool.get(str(tmp_path / f"{i}.nev")) is None
+        assert pool.get(str(ns5)) is recording
+        assert not recording.closed
+        assert pool.stats()["evictions"] == 0
+
+    def test_held_extractor_closed_on_release(self, tmp_path):
+        files = []
+        for name in ("a.ns5", "b.ns5"):
+            (tmp_path / name).write_bytes(b"x")
+            files.append(str(tmp_path / name))
+        pool, _ = self._pool(max_size=1)
+
+        with pool.use(files[0]) as a:
+            with pool.use(files[0]) as again:
+                assert again is a
+            pool.get(files[1])  # evicts a while it is held
+            assert pool.stats()["evictions"] == 1
+            assert not a.closed
+        assert a.closed
+
+        b = pool.acquire(files[1])
+        pool.clear()
+        assert not b.closed
+        pool.release(b)
+        assert b.closed
+
+    def test_readers_reuse_their_adapter(self):
+        from ndi.daq.reader.mfdaq.blackrock import ndi_daq_reader_mfdaq_blackrock
+        from ndi.daq.reader.spikeinterface_adapter import extractor_pool
+
+        made = []
+        reader = ndi_daq_reader_mfdaq_blackrock()
+        adapter = reader._adapter(lambda: made.append(1) or object())
+        assert reader._adapter(lambda: made.append(1) or object()) is adapter
+        assert made == [1]
+        assert extractor_pool() is extractor_pool()
+
+
+class TestSpikeInterfaceEvents:
+    """Tests for native event reading in ndi_daq_reader_SpikeInterfaceReader."""
+
+    class _RawIO:
+        def __init__(self):
+            self.header = {
+                "event_channels": [
+                    {"name": "digital_input_port", "id": "0", "type": b"event"},
+                    {"name": "comments", "id": "1", "type": b"event"},
+                ]
+            }
+            self.reads = 0
+
+        def get_event_timestamps(
+            self, block_index, seg_index, event_channel_index, t_start, t_stop
+        ):
+            self.reads += 1
+            if event_channel_index == 0:
+                return [30000, 45000, 90000], None, ["1", "2", "4"]
+            return [60000], None, ["start"]
+
+        def rescale_event_timestamp(self, timestamps, dtype, event_channel_index):
+            return [t / 30000.0 for t in timestamps]
+
+    class _Recording:
+        def __init__(self):
+            self.neo_reader = TestSpikeInterfaceEvents._RawIO()
+
+        def get_channel_ids(self):
+            return ["0", "1"]
+
+        def get_sampling_frequency(self):
+            return 30000.0
+
+        def has_channel_property(self, ch_id, name):
+            return False
+
+        def get_start_time(self, segment_index=0):
+            return 0.5
+
+        def get_traces(self, **kwargs):
+            raise AssertionError("continuous data must not be read")
+
+    def test_native_events(self, tmp_path, monkeypatch):
+        from ndi.daq.reader import spikeinterface_adapter as sia
+
+        recording = self._Recording()
+        monkeypatch.setattr(sia, "HAS_SPIKEINTERFACE", True)
+        monkeypatch.setattr(
+            sia, "_EXTRACTOR_POOL", sia.ExtractorPool(opener=lambda f, s: recording)
+        )
+        (tmp_path / "a.ns5").write_bytes(b"x")
+        files = [str(tmp_path / "a.ns5")]
+
+        reader = sia.ndi_daq_reader_SpikeInterfaceReader()
+        events = [c for c in reader.getchannelsepoch(files) if c.type == "event"]
+        assert [(c.name, c.number) for c in events] == [("e1", 1), ("e2", 2)]
+
+        T, D = reader.readevents_epochsamples_native(["event", "event"], [1, 2], files, 0.0, 10.0)
+        np.testing.assert_allclose(T[0], [0.5, 1.0, 2.5])
+        np.testing.assert_allclose(D[0], [1, 2, 4])
+        assert list(D[1]) == ["start"]
+
+        T, D = reader.readevents_epochsamples_native(["event"], [1], files, 0.75, 2.0)
+        np.testing.assert_allclose(T[0], [1.0])
+        # decoded once per channel, then served from the pool
+        assert recording.neo_reader.reads == 2
+
+        T, D = reader.readevents_epochsamples_native(["event"], [3], files, 0.0, 10.0)
+        assert T[0].size == 0 and D[0].size == 0
+
+
 class TestReaderPackageImports:
     """Test that format-specific readers are importable from expected paths."""
 
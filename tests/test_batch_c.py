@@ -7,6 +7,7 @@ ndi_app_stimulus_tuning__response, ndi_app_oridirtuning, and ndi_calc_stimulus_t
 
 from types import SimpleNamespace
 
+import numpy as np
 import pytest
 
 from ndi.app import ndi_app
@@ -243,14 +244,14 @@ class TestSpikeSorter:
         assert params["min_clusters"] == 1
         assert params["max_clusters"] == 5
 
-    def test_spike_sort_raises(self):
+    def test_spike_sort_no_session_raises(self):
         app = ndi_app_spikesorter()
-        with pytest.raises(NotImplementedError):
+        with pytest.raises(RuntimeError, match="No session"):
             app.spike_sort(SimpleNamespace())
 
-    def test_clusters2neurons_raises(self):
+    def test_clusters2neurons_no_session_raises(self):
         app = ndi_app_spikesorter()
-        with pytest.raises(NotImplementedError):
+        with pytest.raises(RuntimeError, match="No session"):
             app.clusters2neurons(SimpleNamespace())
 
     def test_isvalid_struct_valid(self):
@@ -286,6 +287,154 @@ class TestSpikeSorter:
         assert "ndi_app_spikesorter" in repr(ndi_app_spikesorter())
 
 
+class TestSpikeSorterEngine:
+    """Tests for the spike sorter's waveform I/O and clustering functions."""
+
+    @staticmethod
+    def _write_vsw(path, waveforms, S0=-10, samplingrate=30000.0):
+        header = bytearray(512)
+        header[0] = waveforms.shape[1]
+        header[1:2] = np.int8(S0).tobytes()
+        header[2:3] = np.int8(S0 + waveforms.shape[2] - 1).tobytes()
+        header[164:168] = np.float32(samplingrate).tobytes()
+        path.write_bytes(bytes(header) + waveforms.astype("<f4").tobytes())
+
+    def test_read_vsw_header(self, tmp_path):
+        from ndi.app.spikesorter import read_vsw_header
+
+        path = tmp_path / "w.vsw"
+        self._write_vsw(path, np.zeros((3, 2, 32)))
+        header = read_vsw_header(path)
+        assert header["numchannels"] == 2
+        assert header["S0"] == -10
+        assert header["S1"] == 21
+        assert header["num_samples"] == 32
+        assert header["samplingrate"] == 30000.0
+
+    def test_memmap_vsw(self, tmp_path):
+        from ndi.app.spikesorter import memmap_vsw
+
+        waveforms = np.random.default_rng(0).normal(size=(5, 2, 32))
+        path = tmp_path / "w.vsw"
+        self._write_vsw(path, waveforms)
+        mapped = memmap_vsw(path)
+        assert isinstance(mapped, np.memmap)
+        np.testing.assert_allclose(mapped, waveforms.astype(np.float32))
+
+    def test_pca_minibatch_matches_full(self):
+        from ndi.app.spikesorter import pca_minibatch
+
+        rng = np.random.default_rng(1)
+        X = rng.normal(size=(1000, 6)) * np.array([5, 3, 1, 1, 1, 1])
+        mean, comps = pca_minibatch(X, 2, block_size=97)
+        np.testing.assert_allclose(mean, X.mean(axis=0))
+        _, _, vt = np.linalg.svd(X - X.mean(axis=0), full_matrices=False)
+        np.testing.assert_allclose(np.abs(comps.T @ vt[:2].T), np.eye(2), atol=1e-6)
+
+    def test_cluster_features_finds_clusters(self):
+        from ndi.app.spikesorter import cluster_features
+
+        rng = np.random.default_rng(2)
+        centers = np.array([[0.0, 0.0], [12.0, 0.0], [0.0, 12.0]])
+        X = np.vstack([c + rng.normal(size=(500, 2)) for c in centers])
+        labels = cluster_features(X, 1, 6, num_start=2, seed=0, block_size=128)
+        assert labels.min() == 1
+        assert labels.max() == 3
+        for i in range(3):
+            assert len(np.unique(labels[i * 500 : (i + 1) * 500])) == 1
+
+    def test_cluster_features_empty(self):
+        from ndi.app.spikesorter import cluster_features
+
+        assert cluster_features(np.zeros((0, 3)), 1, 3).size == 0
+
+
+class TestSpikeSorterSession:
+    """loadwaveforms -> spike_sort -> clusters2neurons on a mock session."""
+
+    def test_sort_and_make_neurons(self):
+        from ndi.document import ndi_document
+        from ndi.element_timeseries import (
+            TIMESERIES_FILE,
+            ndi_element_timeseries,
+            read_timeseries_binary,
+        )
+        from ndi.query import ndi_query
+        from ndi.session import ndi_session_mock
+
+        rng = np.random.default_rng(3)
+        # two units with clearly different amplitudes, alternating spikes
+        shapes = [np.sin(np.linspace(0, np.pi, 32)) * a for a in (-50.0, -200.0)]
+
+        with ndi_session_mock("spikesort") as session:
+            element = ndi_element_timeseries(
+                session=session, name="ntrode", reference=1, type="n-trode", direct=False
+            )
+            extraction = ndi_document(
+                "apps/spikeextractor/spike_extraction_parameters", **{"base.name": "default"}
+            )
+            session.database_add(extraction)
+
+            for epoch_id, n in (("epoch1", 40), ("epoch2", 60)):
+                element.addepoch(epoch_id, ["dev_local_time"], [(0, 10)])
+                unit = np.arange(n) % 2
+                waves = np.stack([shapes[u] for u in unit])[:, None, :]
+                waves = waves + rng.normal(scale=2.0, size=waves.shape)
+                doc = ndi_document(
+                    "apps/spikeextractor/spikewaves", **{"epochid.epochid": epoch_id}
+                )
+                doc.set_dependency_value("element_id", element.id)
+                doc.set_dependency_value("extraction_parameters_id", extraction.id)
+                session.database_add(doc)
+                _, path = session.database_existbinarydoc(doc, "spikewaves.vsw")
+                TestSpikeSorterEngine._write_vsw(path, waves)
+                _, path = session.database_existbinarydoc(doc, "spiketimes.bin")
+                np.sort(rng.uniform(0, 10, n)).astype("<f4").tofile(path)
+
+            sorter = ndi_app_spikesorter(session)
+            waveforms, params, spiketimes, epochinfo, _, _ = sorter.loadwaveforms(element)
+            assert waveforms.shape == (32, 1, 100)
+            assert params["numchannels"] == 1
+            assert spiketimes.shape == (100,)
+            assert [(e["epoch_id"], e["num_spikes"]) for e in epochinfo] == [
+                ("epoch1", 40),
+                ("epoch2", 60),
+            ]
+
+            (cluster_doc,) = sorter.spike_sort(element)
+            file_info = cluster_doc.document_properties["files"]["file_info"]
+            assert [fi["name"] for fi in file_info] == ["spike_cluster.bin"]
+            records = session.database.file_locations(doc_ids=[cluster_doc.id])
+            assert [r["name"] for r in records] == ["spike_cluster.bin"]
+            clusterinfo = cluster_doc.document_properties["spike_clusters"]["clusterinfo"]
+            assert sorted(c["number_of_spikes"] for c in clusterinfo) == [50, 50]
+            assert sorter.spike_sort(element)[0].id == cluster_doc.id
+
+            sorter.clusters2neurons(element)
+            neurons = session.database_search(
+                ndi_query("").isa("element")
+                & ndi_query("").depends_on("underlying_element_id", element.id)
+            )
+            assert sorted(d.document_properties["element"]["name"] for d in neurons) == [
+                "ntrode_1",
+                "ntrode_2",
+            ]
+
+            total = 0
+            for neuron in neurons:
+                epoch_docs = session.database_search(
+                    ndi_query("").isa("element_epoch")
+                    & ndi_query("").depends_on("element_id", neuron.id)
+                )
+                assert len(epoch_docs) == 2
+                for doc in epoch_docs:
+                    exists, path = session.database_existbinarydoc(doc, TIMESERIES_FILE)
+                    assert exists
+                    _, times = read_timeseries_binary(path)
+                    total += times.size
+            assert total == 100
+
+
 # ===========================================================================
 # ndi_app_stimulus_decoder
 # ===========================================================================
@@ -365,11 +514,89 @@ class TestTuningResponse:
     def test_inherits_app(self):
         assert issubclass(ndi_app_stimulus_tuning__response, ndi_app)
 
-    def test_stimulus_responses_raises(self):
+    def test_stimulus_responses_requires_session(self):
         app = ndi_app_stimulus_tuning__response()
-        with pytest.raises(NotImplementedError):
+        with pytest.raises(RuntimeError, match="No session"):
             app.stimulus_responses(SimpleNamespace(), SimpleNamespace())
 
+    def test_compute_stimulus_response_scalar_requires_session(self):
+        app = ndi_app_stimulus_tuning__response()
+        with pytest.raises(RuntimeError, match="No session"):
+            app.compute_stimulus_response_scalar(
+                SimpleNamespace(), SimpleNamespace(), SimpleNamespace()
+            )
+
+    def test_compute_stimulus_response_scalar(self, monkeypatch):
+        import ndi.app.stimulus.tuning_response as tuning_response
+        import ndi.fun.stimulus
+
+        # stimulus 1 drifts at 4 Hz, stimulus 2 is a blank
+        monkeypatch.setattr(
+            ndi.fun.stimulus,
+            "stimulustemporalfrequency",
+            lambda p: (p["tf"], "tf") if p.get("tf") else (None, ""),
+        )
+        monkeypatch.setattr(tuning_response, "_MAX_READ_SECONDS", 10.0)
+
+        t = np.arange(0, 40, 0.001)
+        x = 3 + np.cos(2 * np.pi * 4 * t)
+        reads = []
+
+        def readtimeseries(timeref, t0, t1):
+            reads.append((t0, t1))
+            keep = (t >= t0) & (t <= t1)
+            return x[keep], t[keep], None
+
+        session = SimpleNamespace(
+            id=lambda: "s1",
+            syncgraph=SimpleNamespace(
+                time_convert=lambda ref, times, obj, clock: (
+                    times,
+                    SimpleNamespace(epoch="e1"),
+                    None,
+                )
+            ),
+        )
+        app = ndi_app_stimulus_tuning__response(session)
+        stim = SimpleNamespace(id="stim1", session=session)
+        neuron = SimpleNamespace(id="elem1", type="lfp", readtimeseries=readtimeseries)
+        onsets = [1.0, 5.0, 21.0, 25.0]
+        stim_doc = SimpleNamespace(
+            id="pres1",
+            document_properties={
+                "epochid": {"epochid": "e1"},
+                "stimulus_presentation": {
+                    "presentation_order": [1, 2, 1, 2],
+                    "stimuli": [{"parameters": {"tf": 4.0}}, {"parameters": {"tf": 0}}],
+                    "presentation_time": [
+                        {"clocktype": "dev_local_time", "onset": on, "offset": on + 1.9995}
+                        for on in onsets
+                    ],
+                },
+            },
+        )
+        control_doc = SimpleNamespace(
+            id="ctrl1",
+            document_properties={"control_stimulus_ids": {"control_stimulus_ids": [2, 2, 4, 4]}},
+        )
+        params = SimpleNamespace(
+            id="params1",
+            document_properties={"stimulus_response_scalar_parameters_basic": {}},
+        )
+
+        docs = app.compute_stimulus_response_scalar(
+            stim, neuron, stim_doc, control_doc, parameters_doc=params, do_add=False
+        )
+
+        # the presentations are read in two runs, not as one 40 s span
+        assert reads == [(1.0, 6.9995), (21.0, 26.9995)]
+        f1 = docs[1].document_properties["stimulus_response_scalar"]["responses"]
+        np.testing.assert_allclose(f1["response_real"][::2], [1.0, 1.0], atol=1e-6)
+        # the blank control is analyzed at its stimulus's 4 Hz
+        np.testing.assert_allclose(f1["control_response_real"][::2], [1.0, 1.0], atol=1e-6)
+        assert np.all(np.isnan(f1["response_real"][1::2]))
+        assert np.all(np.isnan(f1["control_response_real"][1::2]))
+
     def test_tuning_curve_raises(self):
         app = ndi_app_stimulus_tuning__response()
         with pytest.raises(NotImplementedError):
@@ -2,10 +2,12 @@
 Tests for Batch D: ndi_gui_Lab-specific + advanced.
 
 Tests ndi_daq_metadatareader_NewStimStims, ndi_daq_metadatareader_NielsenLabStims,
-ndi_probe_timeseries_stimulator, downsample, downsample_timeseries.
+ndi_probe_timeseries_stimulator, downsample, downsample_timeseries,
+downsample_blocks.
 """
 
 import os
+import shutil
 import tempfile
 from types import SimpleNamespace
 
@@ -26,7 +28,7 @@ from ndi.daq.metadatareader.newstim_stims import (
 from ndi.daq.metadatareader.nielsenlab_stims import (
     ndi_daq_metadatareader_NielsenLabStims as NielsenDirect,
 )
-from ndi.element.functions import downsample, downsample_timeseries
+from ndi.element.functions import downsample, downsample_blocks, downsample_timeseries
 from ndi.probe.timeseries_stimulator import ndi_probe_timeseries_stimulator
 
 
@@ -333,6 +335,19 @@ class TestProbeTimeseriesStimulator:
 # ===========================================================================
 
 
+def _copying_session(directory, added):
+    """A session stand-in whose database_add copies attached files into directory."""
+
+    def database_add(docs):
+        for doc in docs:
+            added.append(doc)
+            for fi in doc.document_properties.get("files", {}).get("file_info", []):
+                for loc in fi["locations"]:
+                    shutil.copy(loc["location"], directory / f"{doc.id}_{fi['name']}")
+
+    return SimpleNamespace(id=lambda: "s1", database_add=database_add)
+
+
 class TestDownsample:
     """Tests for the element downsample function."""
 
@@ -351,16 +366,98 @@ class TestDownsample:
         with pytest.raises(ValueError, match="positive"):
             downsample(session, element_in, -10.0, "ds_out", 1)
 
-    def test_downsample_returns_element(self):
+    def test_downsample_returns_element(self, tmp_path):
+        pytest.importorskip("scipy")
         from ndi.element import ndi_element
 
-        session = SimpleNamespace(id=lambda: "s1")
+        fs = 10000.0
+        t = np.arange(0, 2, 1 / fs)
+        d = np.sin(2 * np.pi * 10 * t)
+
+        def readtimeseries(epoch, t0, t1):
+            keep = (t >= t0) & (t <= t1)
+            return d[keep], t[keep], None
+
+        added = []
+        session = _copying_session(tmp_path, added)
         element_in = SimpleNamespace(
-            epochtable=lambda: [{"epoch_id": "e1"}],
+            id="elem_in",
+            subject_id="subj",
+            epochtable=lambda: [
+                {"epoch_id": "e1", "epoch_clock": ["dev_local_time"], "t0_t1": [(0, t[-1])]}
+            ],
+            readtimeseries=readtimeseries,
             _type="timeseries",
         )
-        result = downsample(session, element_in, 100.0, "ds_out", 1)
+        result = downsample(session, element_in, 100.0, "ds_out", 1, block_duration=0.3)
         assert isinstance(result, ndi_element)
+        assert result.underlying_element is element_in
+        assert len(added) == 2
+        assert added[0].dependency_value("underlying_element_id") == "elem_in"
+        file_info = added[1].document_properties["files"]["file_info"]
+        assert [fi["name"] for fi in file_info] == ["epoch_binary_data.nditsb"]
+
+        from scipy.signal import cheby1, sosfiltfilt
+
+        from ndi.element_timeseries import read_timeseries_binary
+
+        data, times = read_timeseries_binary(tmp_path / f"{added[1].id}_epoch_binary_data.nditsb")
+        assert data.shape == (400, 1)
+        np.testing.assert_allclose(times, t[::50])
+        # zero phase: no lag against the input
+        sos = cheby1(N=4, rp=0.8, Wn=100.0 / (fs / 2), btype="low", output="sos")
+        np.testing.assert_allclose(data[:, 0], sosfiltfilt(sos, d)[::50], atol=1e-9)
+
+    def test_parallel_epochs_match_serial(self, tmp_path):
+        pytest.importorskip("scipy")
+        import threading
+
+        from ndi.element_timeseries import read_timeseries_binary
+
+        fs = 2000.0
+        t = np.arange(0, 1, 1 / fs)
+        signals = {f"e{i}": np.sin(2 * np.pi * (5 + i) * t) for i in range(6)}
+        reading = threading.Lock()
+
+        def readtimeseries(epoch, t0, t1):
+            # reads of the shared element must never overlap
+            assert reading.acquire(blocking=False)
+            try:
+                keep = (t >= t0) & (t <= t1)
+                return signals[epoch][keep], t[keep], None
+            finally:
+                reading.release()
+
+        element_in = SimpleNamespace(
+            id="elem_in",
+            subject_id="subj",
+            epochtable=lambda: [
+                {"epoch_id": e, "epoch_clock": ["dev_local_time"], "t0_t1": [(0, t[-1])]}
+                for e in signals
+            ],
+            readtimeseries=readtimeseries,
+            _type="timeseries",
+        )
+
+        def run(max_workers):
+            out_dir = tmp_path / f"workers{max_workers}"
+            out_dir.mkdir()
+            added = []
+            session = _copying_session(out_dir, added)
+            downsample(
+                session, element_in, 50.0, "ds_out", 1, block_duration=0.1, max_workers=max_workers
+            )
+            return [
+                read_timeseries_binary(out_dir / f"{doc.id}_epoch_binary_data.nditsb")
+                for doc in added[1:]
+            ]
+
+        serial = run(1)
+        parallel = run(4)
+        assert len(serial) == len(parallel) == len(signals)
+        for (d_s, t_s), (d_p, t_p) in zip(serial, parallel):
+            np.testing.assert_array_equal(t_p, t_s)
+            np.testing.assert_array_equal(d_p, d_s)
 
 
 # ===========================================================================
@@ -440,3 +537,57 @@ class TestDownsampleTimeseries:
         # The downsampled signal should still look like a sine wave
         assert d_out.max() > 0.8
         assert d_out.min() < -0.8
+
+
+# ===========================================================================
+# downsample_blocks
+# ===========================================================================
+
+
+class TestDownsampleBlocks:
+    """Tests for the streaming block downsampler."""
+
+    def test_block_boundaries_do_not_matter(self):
+        pytest.importorskip("scipy")
+        fs = 10000.0
+        t = np.arange(0, 3, 1 / fs)
+        d = np.random.randn(t.size, 2)
+
+        whole = list(downsample_blocks([(t, d)], 200.0))
+        edges = [0, 1234, 1235, 17000, t.size]
+        parts = [(t[a:b], d[a:b]) for a, b in zip(edges[:-1], edges[1:])]
+        split = list(downsample_blocks(parts, 200.0))
+
+        np.testing.assert_array_equal(
+            np.concatenate([b[0] for b in whole]), np.concatenate([b[0] for b in split])
+        )
+        np.testing.assert_allclose(
+            np.vstack([b[1] for b in whole]), np.vstack([b[1] for b in split]), atol=1e-9
+        )
+
+    def test_matches_zero_phase_filter(self):
+        scipy_signal = pytest.importorskip("scipy.signal")
+        fs = 10000.0
+        t = np.arange(0, 2, 1 / fs)
+        d = np.random.randn(t.size)
+        sos = scipy_signal.cheby1(N=4, rp=0.8, Wn=200.0 / (fs / 2), btype="low", output="sos")
+        expected = scipy_signal.sosfiltfilt(sos, d)[::25]
+
+        parts = [(t[a : a + 997], d[a : a + 997]) for a in range(0, t.size, 997)]
+        d_out = np.vstack([b[1] for b in downsample_blocks(parts, 200.0)])
+        np.testing.assert_allclose(d_out[:, 0], expected, atol=1e-9)
+
+    def test_overlapping_samples_dropped(self):
+        pytest.importorskip("scipy")
+        t = np.arange(1000) / 1000.0
+        d = np.ones(1000)
+        out = list(downsample_blocks([(t[:600], d[:600]), (t[599:], d[599:])], 400.0))
+        t_out = np.concatenate([b[0] for b in out])
+        assert np.all(np.diff(t_out) > 0)
+
+    def test_no_downsample_below_nyquist(self):
+        t = np.arange(100) / 100.0
+        d = np.random.randn(100)
+        ((t_out, d_out),) = downsample_blocks([(t, d)], 60.0)
+        np.testing.assert_array_equal(t_out, t)
+        np.testing.assert_array_equal(d_out[:, 0], d)
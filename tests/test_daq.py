@@ -10,7 +10,10 @@ Tests cover:
 """
 
 import os
+import shutil
 import tempfile
+import threading
+import time
 from pathlib import Path
 from unittest.mock import MagicMock
 
@@ -267,6 +270,53 @@ class TestMFDAQReader:
         assert size == 64
         assert poly.shape == (2, 2)
 
+    def test_t0_t1_many_header_cache(self):
+        """t0_t1_many reads each unchanged epoch once, across reader instances."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            files = []
+            for name in ("a", "b", "c"):
+                (Path(tmpdir) / f"{name}.dat").write_bytes(b"x")
+                files.append([str(Path(tmpdir) / f"{name}.dat")])
+            cache_path = str(Path(tmpdir) / "headers.json")
+
+            reader = ConcreteMFDAQReader(identifier="reader1")
+            reader.t0_t1 = MagicMock(wraps=reader.t0_t1)
+            result = reader.t0_t1_many(files, cache_path=cache_path, max_workers=2)
+            assert result == [[(0.0, 9999 / 30000.0)]] * 3
+            assert reader.t0_t1.call_count == 3
+            reader.t0_t1_many(files)
+            assert reader.t0_t1.call_count == 3
+
+            # a new reader with the same ID uses the persisted cache; a
+            # rewritten file is read again
+            (Path(tmpdir) / "b.dat").write_bytes(b"xy")
+            reader2 = ConcreteMFDAQReader(identifier="reader1")
+            reader2.t0_t1 = MagicMock(wraps=reader2.t0_t1)
+            assert reader2.t0_t1_many(files, cache_path=cache_path) == result
+            reader2.t0_t1.assert_called_once_with(files[1])
+
+    def test_t0_t1_many_threads_only_when_threadsafe(self):
+        """Epoch headers are read serially unless the reader opts in to threads."""
+        files = [["a.dat"], ["b.dat"], ["c.dat"]]
+        reader = ConcreteMFDAQReader()
+        threads = set()
+
+        def t0_t1(epochfiles):
+            threads.add(threading.get_ident())
+            time.sleep(0.01)
+            return [(0.0, 1.0)]
+
+        reader.t0_t1 = t0_t1
+        assert reader.t0_t1_many(files, max_workers=3) == [[(0.0, 1.0)]] * 3
+        assert threads == {threading.get_ident()}
+
+        reader = ConcreteMFDAQReader()
+        reader.threadsafe_t0_t1 = True
+        reader.t0_t1 = t0_t1
+        threads.clear()
+        assert reader.t0_t1_many(files, max_workers=3) == [[(0.0, 1.0)]] * 3
+        assert threading.get_ident() not in threads
+
 
 # =============================================================================
 # ndi_daq_system Tests
@@ -459,6 +509,69 @@ class TestFileNavigator:
         hash3 = nav3.filematch_hashstring()
         assert hash1 != hash3  # Different patterns = different hash
 
+        nav3.setfileparameters(["*.dat", "*.bin"])
+        assert nav3.filematch_hashstring() == hash1  # memo follows the parameters
+
+    def test_filenavigator_epochid_manifest(self):
+        """Epoch IDs are recorded in the manifest and in the legacy sidecars."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / ".ndi").mkdir()
+            for name in ("a", "b"):
+                (Path(tmpdir) / name).mkdir()
+                (Path(tmpdir) / name / "x.dat").touch()
+            session = MagicMock()
+            session.getpath.return_value = tmpdir
+            session.database_search.return_value = []
+
+            nav = ndi_file_navigator(session, "#.dat")
+            groups = nav.selectfilegroups_disk()
+            ids = nav.epochids(groups)
+            assert len(set(ids)) == 2
+            assert [e["epoch_id"] for e in nav.epochtable()] == ids
+
+            fmstr = nav.filematch_hashstring()
+            sidecar = f".x.dat.{fmstr}.epochid.ndi"
+            manifest = Path(tmpdir) / ".ndi" / f"epochids_{fmstr}.tsv"
+            assert manifest.read_text().splitlines() == [
+                f"a/{sidecar}\t{ids[0]}",
+                f"b/{sidecar}\t{ids[1]}",
+            ]
+            assert (Path(tmpdir) / "a" / sidecar).read_text() == ids[0]
+
+            # the manifest wins over the sidecar; a new navigator sees the same IDs
+            (Path(tmpdir) / "a" / sidecar).write_text("epoch_other")
+            assert ndi_file_navigator(session, "#.dat").epochid(1, groups[0]) == ids[0]
+
+    def test_filenavigator_epochid_legacy_sidecar(self):
+        """Existing sidecars are imported into the manifest."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / ".ndi").mkdir()
+            (Path(tmpdir) / "a.dat").touch()
+            session = MagicMock()
+            session.getpath.return_value = tmpdir
+
+            nav = ndi_file_navigator(session, "#.dat")
+            fmstr = nav.filematch_hashstring()
+            (Path(tmpdir) / f".a.dat.{fmstr}.epochid.ndi").write_text("epoch_matlab\n")
+            files = [str(Path(tmpdir) / "a.dat")]
+            assert nav.epochid(1, files) == "epoch_matlab"
+            manifest = Path(tmpdir) / ".ndi" / f"epochids_{fmstr}.tsv"
+            assert manifest.read_text() == f".a.dat.{fmstr}.epochid.ndi\tepoch_matlab\n"
+
+    def test_filenavigator_epochid_manifest_appends(self):
+        """Each append adds its lines; a torn last line is terminated first."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manifest = Path(tmpdir) / "epochids.tsv"
+            nav = ndi_file_navigator()
+            nav._append_epochid_manifest(str(manifest), {"a": "epoch_a"})
+            nav._append_epochid_manifest(str(manifest), {"b": "epoch_b"})
+            assert manifest.read_text().splitlines() == ["a\tepoch_a", "b\tepoch_b"]
+
+            with open(manifest, "a") as f:
+                f.write("c\tepo")
+            nav._append_epochid_manifest(str(manifest), {"d": "epoch_d"})
+            assert manifest.read_text().splitlines()[-2:] == ["c\tepo", "d\tepoch_d"]
+
     def test_filenavigator_isingested(self):
         """Test isingested static method."""
         assert ndi_file_navigator.isingested(["epochid://abc123", "file.dat"]) is True
@@ -543,6 +656,58 @@ class TestFindFileGroups:
             groups = find_file_groups(tmpdir, ("*.dat",))
             assert len(groups) == 0
 
+    def test_find_file_groups_sorted_and_hidden_skipped(self):
+        """Groups come out in sorted directory order; hidden entries are skipped."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name in ("b", "a", ".hidden"):
+                (Path(tmpdir) / name).mkdir()
+                (Path(tmpdir) / name / "x.dat").touch()
+            (Path(tmpdir) / "a" / ".x.dat").touch()
+
+            groups = find_file_groups(tmpdir, ("#.dat",))
+            assert [os.path.relpath(g[0], tmpdir) for g in groups] == [
+                os.path.join("a", "x.dat"),
+                os.path.join("b", "x.dat"),
+            ]
+
+    def test_find_file_groups_scan_index(self):
+        """Unchanged directories are taken from the scan index."""
+        import json
+        import time
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "d1").mkdir()
+            (Path(tmpdir) / "d1" / "data.dat").touch()
+            index = str(Path(tmpdir) / "index.json")
+            past = time.time() - 100
+            for d in (tmpdir, str(Path(tmpdir) / "d1")):
+                os.utime(d, (past, past))
+
+            assert len(find_file_groups(tmpdir, ("*.dat",), index_path=index)) == 1
+            saved = json.loads(Path(index).read_text())
+            assert saved["directories"]["d1"]["files"] == ["data.dat"]
+
+            # a stale listing is trusted while the directory mtime is unchanged
+            saved["directories"]["d1"]["files"] = ["data.dat", "ghost.dat"]
+            Path(index).write_text(json.dumps(saved))
+            groups = find_file_groups(tmpdir, ("*.dat",), index_path=index)
+            assert len(groups[0]) == 2
+
+            # touching the directory forces a rescan
+            os.utime(str(Path(tmpdir) / "d1"), (past + 10, past + 10))
+            groups = find_file_groups(tmpdir, ("*.dat",), index_path=index)
+            assert len(groups[0]) == 1
+
+    def test_compile_file_patterns(self):
+        from ndi.file.navigator import compile_file_patterns, match_file_pattern
+
+        compiled = compile_file_patterns(("*.dat", "#.rhd", "^trial_[0-9]+\\.bin$"))
+        assert compile_file_patterns(("*.dat", "#.rhd", "^trial_[0-9]+\\.bin$")) is compiled
+        assert match_file_pattern("a.dat", compiled) == 0
+        assert match_file_pattern("a.rhd", compiled) == 1
+        assert match_file_pattern("trial_12.bin", compiled) == 2
+        assert match_file_pattern("a.txt", compiled) == -1
+
 
 # =============================================================================
 # ChannelInfo Tests
@@ -804,5 +969,388 @@ class TestDAQSystemDeleteEpoch:
             nav.deleteepoch.assert_called_once_with(1)
 
 
+class ndi_session_cache_mock(ndi_session_mock):
+    """Mock session with an epoch-table cache."""
+
+    def __init__(self, path):
+        from ndi.cache import ndi_cache
+
+        super().__init__(path)
+        self.cache = ndi_cache()
+        self.epochtable_generation = 0
+        self.cleared = []
+
+    def epochtable_clearcache(self, daqsystem_id=None):
+        from ndi.daq.system import EPOCHTABLE_CACHE_TYPE, PROBE_INVENTORY_CACHE_TYPE
+
+        self.cleared.append(daqsystem_id)
+        if daqsystem_id is not None:
+            self.cache.remove(daqsystem_id, EPOCHTABLE_CACHE_TYPE)
+            self.cache.remove(daqsystem_id, PROBE_INVENTORY_CACHE_TYPE)
+        self.epochtable_generation += 1
+        return self
+
+
+class TestDAQSystemEpochTableCache:
+    """Tests for the session-scoped ndi_daq_system epoch table cache."""
+
+    def _system(self, tmpdir):
+        session = ndi_session_cache_mock(tmpdir)
+        nav = ndi_file_navigator(session=session, fileparameters="#.dat")
+        sys = ndi_daq_system(name="test", filenavigator=nav)
+        sys._buildepochtable = MagicMock(wraps=sys._buildepochtable)
+        return session, sys
+
+    def test_epochtable_shared_until_files_change(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "e1").mkdir()
+            (Path(tmpdir) / "e1" / "data.dat").touch()
+            session, sys = self._system(tmpdir)
+
+            et1 = sys.epochtable()
+            et1[0]["epoch_id"] = "modified"
+            et1[0]["epoch_clock"].append("modified")
+            et1[0]["underlying_epochs"]["underlying"].append("modified")
+            et2 = sys.epochtable()
+            assert sys._buildepochtable.call_count == 1
+            assert et2[0]["epoch_id"] != "modified"
+            assert "modified" not in et2[0]["epoch_clock"]
+            assert "modified" not in et2[0]["underlying_epochs"]["underlying"]
+
+            (Path(tmpdir) / "e2").mkdir()
+            (Path(tmpdir) / "e2" / "data.dat").touch()
+            assert len(sys.epochtable()) == 2
+            assert sys._buildepochtable.call_count == 2
+            # a changed table invalidates derived (probe) tables
+            assert session.cleared == [sys.id]
+            assert len(session.cache) == 1
+
+    def test_epochtable_explicit_invalidation(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "data.dat").touch()
+            session, sys = self._system(tmpdir)
+            nav = sys.filenavigator
+            nav.deleteepoch = MagicMock()
+
+            sys.epochtable()
+            assert sys.deleteepoch(1)[0] is True
+            assert session.cleared == [sys.id]
+            sys.epochtable()
+            assert sys._buildepochtable.call_count == 2
+
+    def test_probe_inventory_persisted(self):
+        from types import SimpleNamespace
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / ".ndi").mkdir()
+            (Path(tmpdir) / "data.dat").touch()
+            session, sys = self._system(tmpdir)
+            epm = [
+                SimpleNamespace(name="p1", reference=1, type="n-trode", devicestring="test:ai1"),
+                SimpleNamespace(name="p1", reference=1, type="n-trode", devicestring="test:ai2"),
+                SimpleNamespace(name="p2", reference=1, type="n-trode", devicestring="other:ai1"),
+            ]
+            sys._buildepochtable = MagicMock(
+                return_value=[{"epoch_id": "e1", "epochprobemap": epm}]
+            )
+
+            probes = sys.getprobes()
+            assert probes == [{"name": "p1", "reference": 1, "type": "n-trode", "subject_id": ""}]
+            assert (Path(tmpdir) / ".ndi" / "probe_inventory.json").is_file()
+
+            # a fresh session reads the inventory without building the epoch table
+            session2, sys2 = self._system(tmpdir)
+            sys2._id = sys.id
+            sys2._buildepochtable = MagicMock()
+            assert sys2.probe_inventory()[0]["name"] == "p1"
+            sys2._buildepochtable.assert_not_called()
+
+            # explicit invalidation drops the persisted entry
+            sys2.clearepochtablecache()
+            sys2._buildepochtable.return_value = []
+            assert sys2.probe_inventory() == []
+
+
+# =============================================================================
+# Streaming ingestion Tests
+# =============================================================================
+
+
+class RampMFDAQReader(ConcreteMFDAQReader):
+    """Reader whose samples are 100 * (sample number) + channel number."""
+
+    def readchannels_epochsamples(self, channeltype, channel, epochfiles, s0, s1):
+        samples = np.arange(s0, s1 + 1)[:, None]
+        return 100.0 * samples + np.asarray(channel)[None, :]
+
+
+class TestStreamingIngest:
+    """Tests for ndi.daq.ingest."""
+
+    def test_assign_channel_groups(self):
+        from ndi.daq.ingest import assign_channel_groups
+
+        channels = [
+            ChannelInfo(f"ai{i}", "analog_in", number=i, sample_rate=30000) for i in (1, 2, 3)
+        ]
+        channels += [
+            ChannelInfo("ai4", "analog_in", number=4, sample_rate=1000),
+            ChannelInfo("di1", "digital_in", number=1, sample_rate=30000),
+            ChannelInfo("e1", "event", number=1),
+            ChannelInfo("mk1", "marker", number=1),
+        ]
+        grouped = assign_channel_groups(channels, analog_per_group=2)
+        assert [c.group for c in grouped] == [1, 1, 2, 3, 1, 1, 1]
+        assert [c.dataclass for c in grouped[3:6]] == ["ephys", "digital", "eventmarktext"]
+
+        # never more groups than the document's file_list allows
+        many = [ChannelInfo(f"ai{i}", "analog_in", number=i, sample_rate=1) for i in range(1, 51)]
+        assert max(c.group for c in assign_channel_groups(many, analog_per_group=2)) == 10
+
+        with pytest.raises(ValueError):
+            assign_channel_groups([ChannelInfo("x1", "bogus", number=1)])
+
+    def _reader(self):
+        channels = [
+            ChannelInfo("ai1", "analog_in", number=1, sample_rate=30000),
+            ChannelInfo("ai2", "analog_in", number=2, sample_rate=30000),
+            ChannelInfo("ai3", "analog_in", number=3, sample_rate=30000),
+            ChannelInfo("t1", "time", number=1, sample_rate=30000),
+        ]
+        reader = RampMFDAQReader(channels=channels)
+        reader._num_samples = 2500
+        return reader
+
+    def test_ingest_epoch_round_trip(self):
+        from ndi.daq.ingest import ingest_epoch, ingested_document
+
+        reader = self._reader()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = ingest_epoch(
+                reader, ["a.dat"], "epoch1", tmpdir, {"sample_analog_segment": 1000}
+            )
+            assert sorted(result["files"]) == [
+                "ai_group1_seg.nbf_1",
+                "ai_group1_seg.nbf_2",
+                "ai_group1_seg.nbf_3",
+                "channel_list.bin",
+                "ti_group1_seg.nbf_1",
+                "ti_group1_seg.nbf_2",
+                "ti_group1_seg.nbf_3",
+            ]
+            assert result["samples"] == 2500 * 4
+
+            doc = ingested_document(reader, result)
+            props = doc.document_properties
+            assert props["daqreader_mfdaq_epochdata_ingested"]["parameters"] == {
+                "sample_analog_segment": 1000,
+                "sample_digital_segment": 1_000_000,
+            }
+            assert props["epochid"]["epochid"] == "epoch1"
+
+            session = MagicMock()
+            session.database_openbinarydoc = lambda d, name: open(result["files"][name], "rb")
+            reader.getingesteddocument = MagicMock(return_value=doc)
+            data = reader.readchannels_epochsamples_ingested(
+                "ai", [3, 1], ["epochid://epoch1"], 990, 1010, session
+            )
+            # ingested samples are 0-based, the raw reader's are 1-based
+            expected = 100.0 * np.arange(991, 1012)[:, None] + np.array([3, 1])
+            np.testing.assert_allclose(data, expected)
+
+    def test_ingest_epochs_parallel(self):
+        from ndi.daq.ingest import ingest_epochs
+
+        reader = self._reader()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            epochs = [(["a.dat"], "epoch1"), (["b.dat"], "epoch2"), (["c.dat"], "epoch3")]
+            docs, report = ingest_epochs(
+                reader, epochs, directory=tmpdir, max_workers=2, max_memory=1 << 30
+            )
+            assert [d.document_properties["epochid"]["epochid"] for d in docs] == [
+                "epoch1",
+                "epoch2",
+                "epoch3",
+            ]
+            assert report.epochs == 3
+            assert report.workers == 2
+            assert report.samples == 3 * 2500 * 4
+            assert report.bytes_written > 0
+
+            # the memory budget limits the number of workers
+            _, report = ingest_epochs(
+                reader,
+                epochs,
+                directory=Path(tmpdir) / "again",
+                max_workers=2,
+                max_memory=1,
+            )
+            assert report.workers == 1
+
+    def test_mfdaq_ingest_epochfiles_streams(self):
+        """mfdaq readers write the compressed sample data by default."""
+        reader = self._reader()
+        doc = reader.ingest_epochfiles(["a.dat"], "epoch1")
+        file_info = doc.document_properties["files"]["file_info"]
+        try:
+            assert doc.doc_class() == "daqreader_mfdaq_epochdata_ingested"
+            names = [f["name"] for f in file_info]
+            assert "channel_list.bin" in names
+            assert "ai_group1_seg.nbf_1" in names
+        finally:
+            shutil.rmtree(Path(file_info[0]["locations"][0]["location"]).parent)
+
+    def test_ingest_epochs_without_streaming(self):
+        """stream=False records only the epoch table."""
+        from ndi.daq.ingest import ingest_epochs
+
+        reader = self._reader()
+        docs, report = ingest_epochs(
+            reader, [(["a.dat"], "epoch1"), (["b.dat"], "epoch2")], stream=False
+        )
+        assert [d.document_properties["epochid"]["epochid"] for d in docs] == [
+            "epoch1",
+            "epoch2",
+        ]
+        assert [d.doc_class() for d in docs] == ["daqreader_epochdata_ingested"] * 2
+        assert report.epochs == 2
+        assert report.bytes_written == 0
+
+    def test_system_ingest_plain_reader(self):
+        """Readers without streaming ingestion keep their own documents."""
+        reader = MagicMock(spec=ndi_daq_reader)
+        reader.ingest_epochfiles.side_effect = lambda files, eid: eid
+        sys = ndi_daq_system(name="test", daqreader=reader)
+        sys.epochtable = MagicMock(
+            return_value=[
+                {"epoch_id": "e1", "underlying_epochs": {"underlying": ["a.dat"]}},
+                {"epoch_id": "e2", "underlying_epochs": {"underlying": ["epochid://e2"]}},
+            ]
+        )
+        b, docs = sys.ingest()
+        assert b is True
+        assert docs == ["e1"]
+        assert sys.ingest_report.epochs == 1
+
+    def test_system_ingest_without_add(self):
+        """add=False returns the documents and leaves the database alone."""
+        reader = MagicMock(spec=ndi_daq_reader)
+        reader.ingest_epochfiles.side_effect = lambda files, eid: MagicMock(name=eid)
+        session = MagicMock()
+        sys = ndi_daq_system(name="test", session=session, daqreader=reader)
+        sys.epochtable = MagicMock(
+            return_value=[{"epoch_id": "e1", "underlying_epochs": {"underlying": ["a.dat"]}}]
+        )
+        b, docs = sys.ingest(add=False)
+        assert b is True
+        assert len(docs) == 1
+        session.database_add.assert_not_called()
+
+        sys.ingest()
+        session.database_add.assert_called_once()
+
+
+class StepMFDAQReader(ConcreteMFDAQReader):
+    """Reader returning a fixed analog trace and a time channel."""
+
+    def __init__(self, trace, **kwargs):
+        super().__init__(**kwargs)
+        self.trace = trace
+        self._num_samples = len(trace)
+        self.reads = []
+
+    def readchannels_epochsamples(self, channeltype, channel, epochfiles, s0, s1):
+        self.reads.append((channeltype, s0, s1))
+        if channeltype == "time":
+            return (np.arange(s0, s1 + 1) / self._sample_rate)[:, None]
+        return self.trace[s0 : s1 + 1, None]
+
+
+class TestAnalogEvents:
+    """Tests for the block-wise analog event detector."""
+
+    @staticmethod
+    def _whole_trace(x, thresh):
+        below = x[:-1] < thresh
+        above = x[1:] >= thresh
+        return 1 + np.where(below & above)[0], 1 + np.where(~below & ~above)[0]
+
+    def test_blocks_match_whole_trace(self):
+        from ndi.daq.mfdaq import threshold_crossings
+
+        x = np.random.default_rng(0).normal(size=5000)
+        up, down = self._whole_trace(x, 0.3)
+        for block in (1, 7, 1000, 10_000):
+            rising, falling = threshold_crossings(
+                lambda a, b: x[a : b + 1], 0, len(x) - 1, 0.3, block_size=block
+            )
+            np.testing.assert_array_equal(rising, up)
+            np.testing.assert_array_equal(falling, down)
+
+    def test_hysteresis_and_native_dtype(self):
+        from ndi.daq.mfdaq import threshold_crossings
+
+        x = np.array([0, 10, 4, 10, 4, 1, 10, 0], dtype=np.int16)
+        blocks = []
+
+        def read(a, b):
+            blocks.append(x[a : b + 1].dtype)
+            return x[a : b + 1]
+
+        # a dip to 4 stays above 5 - 2, so it is not a new crossing
+        rising, falling = threshold_crossings(read, 0, 7, 5.0, hysteresis=2.0, block_size=3)
+        np.testing.assert_array_equal(rising, [1, 6])
+        np.testing.assert_array_equal(falling, [5, 7])
+        assert set(blocks) == {np.dtype(np.int16)}
+
+        rising, falling = threshold_crossings(read, 0, 7, 5.0, block_size=3)
+        np.testing.assert_array_equal(rising, [1, 3, 6])
+        np.testing.assert_array_equal(falling, [2, 4, 7])
+
+    def test_readevents(self):
+        x = np.tile([0.0, 0.0, 1.0, 1.0, 1.0], 20)
+        channels = [ChannelInfo("ai1", "analog_in", number=1, sample_rate=30000)]
+        reader = StepMFDAQReader(x, channels=channels)
+        reader.analog_event_block = 16
+
+        ts, d = reader.readevents_epochsamples("aimp_t0.5", 1, ["a.dat"], 0, 99 / 30000)
+        up, down = self._whole_trace(x, 0.5)
+        np.testing.assert_allclose(ts, np.sort(np.concatenate([up, down])) / 30000)
+        assert d[0] == 1 and d[1] == -1 and len(d) == 39
+
+        ts, d = reader.readevents_epochsamples("aen_t0.5", 1, ["a.dat"], 0, 99 / 30000)
+        np.testing.assert_allclose(ts, down / 30000)
+        np.testing.assert_array_equal(d, -np.ones(len(down)))
+        # only the analog blocks are all read; the time channel where events are
+        assert max(s1 - s0 for _, s0, s1 in reader.reads) < 16
+
+    def test_event_cache(self):
+        x = np.tile([0.0, 1.0], 50)
+        channels = [ChannelInfo("ai1", "analog_in", number=1, sample_rate=30000)]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.makedirs(os.path.join(tmpdir, ".ndi"))
+            datafile = os.path.join(tmpdir, "a.dat")
+            Path(datafile).write_bytes(b"data")
+            session = MagicMock()
+            session.getpath.return_value = tmpdir
+            reader = StepMFDAQReader(x, channels=channels, session=session)
+
+            first = reader.readevents_epochsamples("aep_t0.5", 1, [datafile], 0, 99 / 30000)
+            reader.reads.clear()
+            second = reader.readevents_epochsamples("aep_t0.5", 1, [datafile], 0, 99 / 30000)
+            assert reader.reads == []
+            np.testing.assert_array_equal(first[0], second[0])
+            assert len(os.listdir(os.path.join(tmpdir, ".ndi", "analog_event_cache"))) == 1
+
+            # another threshold is another entry
+            reader.readevents_epochsamples("aep_t0.7", 1, [datafile], 0, 99 / 30000)
+            assert reader.reads != []
+
+            reader.reads.clear()
+            reader.analog_event_cache = False
+            reader.readevents_epochsamples("aep_t0.5", 1, [datafile], 0, 99 / 30000)
+            assert reader.reads != []
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
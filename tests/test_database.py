@@ -288,6 +288,153 @@ class TestDatabaseSearch:
         assert results == []
 
 
+class TestDatabaseProject:
+    """Test ndi_database field projection and change tracking."""
+
+    def _add_named(self, db, names):
+        for name in names:
+            doc = ndi_document(
+                {
+                    "base": {
+                        "id": ndi_ido().id,
+                        "datestamp": timestamp(),
+                        "name": name,
+                        "session_id": "",
+                    },
+                    "document_class": {"class_name": "base", "superclasses": []},
+                    "depends_on": [{"name": "subject_id", "value": f"subj_{name}"}],
+                }
+            )
+            db.add(doc)
+
+    def test_project_matches_search(self, temp_session):
+        """Test projected fields equal the fields of the full documents."""
+        db = ndi_database(temp_session)
+        self._add_named(db, ["alpha", "beta", "gamma"])
+
+        fields = ["base.id", "base.name", "depends_on", "base.missing"]
+        rows = db.project(fields=fields)
+        docs = db.search()
+        assert len(rows) == 3
+        by_id = {d.id: d.document_properties for d in docs}
+        for row in rows:
+            props = by_id[row["base.id"]]
+            assert row["base.name"] == props["base"]["name"]
+            assert row["depends_on"][0]["value"] == f"subj_{row['base.name']}"
+            assert row["base.missing"] is None
+
+    def test_project_with_query(self, temp_session):
+        """Test projection honors the query."""
+        db = ndi_database(temp_session)
+        self._add_named(db, ["alpha", "beta"])
+
+        rows = db.project(ndi_query("base.name") == "beta", fields=["base.name"])
+        assert rows == [{"base.name": "beta"}]
+        assert db.project(ndi_query("base.name") == "none", fields=["base.name"]) == []
+
+    def test_project_after_update(self, temp_session, sample_doc):
+        """Test projection returns the current version of an updated document."""
+        db = ndi_database(temp_session)
+        db.add(sample_doc)
+        sample_doc.document_properties["base"]["name"] = "renamed"
+        db.update(sample_doc)
+
+        assert db.project(fields=["base.name"]) == [{"base.name": "renamed"}]
+
+    def test_change_token(self, temp_session, sample_doc):
+        """Test the change token changes on every write."""
+        db = ndi_database(temp_session)
+        token0 = db.change_token()
+        assert db.change_token() == token0
+
+        db.add(sample_doc)
+        token1 = db.change_token()
+        assert token1 != token0
+        assert db.change_counter == 1
+
+        db.remove(sample_doc)
+        assert db.change_token() != token1
+        assert db.change_counter == 2
+
+
+class TestDatabaseFileIndex:
+    """Test the file UID index of ndi_database."""
+
+    def _file_doc(self, name, uids, session_id="session_123"):
+        doc = ndi_document(
+            {
+                "base": {
+                    "id": ndi_ido().id,
+                    "datestamp": timestamp(),
+                    "name": name,
+                    "session_id": session_id,
+                },
+                "document_class": {"class_name": "base", "superclasses": []},
+                "files": {
+                    "file_list": ["data.bin"],
+                    "file_info": [
+                        {
+                            "name": "data.bin",
+                            "locations": [
+                                {"uid": uid, "location": f"/data/{uid}", "ingest": True}
+                                for uid in uids
+                            ],
+                        }
+                    ],
+                },
+            }
+        )
+        return doc
+
+    def test_find_by_file_uid(self, temp_session, sample_doc):
+        """Test a file UID resolves to its document and file name."""
+        db = ndi_database(temp_session)
+        db.add(sample_doc)
+        doc = self._file_doc("with_file", ["uid_a", "uid_b"])
+        db.add(doc)
+
+        found, name = db.find_by_file_uid("uid_b")
+        assert found.id == doc.id
+        assert name == "data.bin"
+        assert db.find_by_file_uid("missing") == (None, "")
+        assert db.find_by_file_uid("uid_a", session_id="other") == (None, "")
+        assert db.docs_with_files() == [doc.id]
+
+    def test_index_follows_writes(self, temp_session):
+        """Test the index reflects adds, updates and removes."""
+        db = ndi_database(temp_session)
+        doc = self._file_doc("d1", ["uid_1"])
+        db.add(doc)
+        assert db.find_by_file_uid("uid_1")[0].id == doc.id
+
+        other = self._file_doc("d2", ["uid_2"])
+        db.add(other)
+        assert set(db.find_by_file_uids(["uid_1", "uid_2", "nope"])) == {"uid_1", "uid_2"}
+
+        doc.document_properties["files"]["file_info"][0]["locations"][0]["uid"] = "uid_1b"
+        db.update(doc)
+        assert db.find_by_file_uid("uid_1") == (None, "")
+        assert db.find_by_file_uid("uid_1b")[0].id == doc.id
+
+        db.remove(other)
+        assert db.find_by_file_uid("uid_2") == (None, "")
+        records = db.file_locations(doc_ids=[doc.id])
+        assert [r["uid"] for r in records] == ["uid_1b"]
+        assert records[0]["ingest"] is True
+
+    def test_index_rebuilt_after_outside_write(self, temp_session):
+        """Test writes made through another database object are picked up."""
+        db = ndi_database(temp_session)
+        db.add(self._file_doc("d1", ["uid_1"]))
+        assert db.find_by_file_uid("uid_1")[0] is not None
+
+        other_db = ndi_database(temp_session)
+        late = self._file_doc("late", ["uid_late"])
+        other_db.add(late)
+
+        assert db.find_by_file_uid("uid_late")[0].id == late.id
+
+
 class TestDatabaseCounts:
     """Test ndi_database counting operations."""
 
@@ -343,6 +490,47 @@ class TestDatabaseCounts:
         for id in added_ids:
             assert id in all_ids
 
+    def test_iter_documents_pages(self, temp_session):
+        """Documents are yielded in the order of the requested IDs."""
+        db = ndi_database(temp_session)
+        ids = []
+        for i in range(5):
+            doc = ndi_document(
+                {
+                    "base": {
+                        "id": ndi_ido().id,
+                        "datestamp": timestamp(),
+                        "name": f"doc_{i}",
+                        "session_id": "",
+                    },
+                    "document_class": {"class_name": "base", "superclasses": []},
+                }
+            )
+            db.add(doc)
+            ids.append(doc.id)
+
+        assert sorted(d.id for d in db.iter_documents(page_size=2)) == sorted(ids)
+        wanted = [ids[3], "missing", ids[0]]
+        assert [d.id for d in db.iter_documents(wanted, page_size=2)] == [ids[3], ids[0]]
+
+    def test_bulk_add_skips_present(self, temp_session, sample_doc):
+        """bulk_add skips IDs already in the database."""
+        db = ndi_database(temp_session)
+        db.add(sample_doc)
+        other = ndi_document(
+            {
+                "base": {
+                    "id": ndi_ido().id,
+                    "datestamp": timestamp(),
+                    "name": "other",
+                    "session_id": "session_123",
+                },
+                "document_class": {"class_name": "base", "superclasses": []},
+            }
+        )
+        assert db.bulk_add([sample_doc, other, other]) == (1, 2)
+        assert db.numdocs() == 2
+
 
 class TestDatabaseDependencies:
     """Test ndi_database dependency operations."""
@@ -485,3 +673,144 @@ class TestDatabaseRemoveMany:
         count = db.remove_many(query=query)
         assert count == 2
         assert db.numdocs() == 1
+
+
+def _new_doc(name):
+    return ndi_document(
+        {
+            "base": {
+                "id": ndi_ido().id,
+                "datestamp": timestamp(),
+                "name": name,
+                "session_id": "",
+            },
+            "document_class": {"class_name": "base", "superclasses": []},
+        }
+    )
+
+
+class TestDatabaseTransaction:
+    """Test ndi_database.transaction()."""
+
+    def test_commit_writes_documents_and_files(self, temp_session):
+        db = ndi_database(temp_session)
+        docs = [_new_doc(f"doc_{i}") for i in range(3)]
+        src = temp_session / "raw.bin"
+        src.write_bytes(b"data")
+        dest = db.get_binary_path(docs[0], "raw.bin")
+
+        with db.transaction():
+            for doc in docs:
+                db.add(doc)
+            db.copy_binary_file(src, dest)
+            assert db.in_transaction
+            assert db.numdocs() == 0
+            assert not dest.exists()
+
+        assert not db.in_transaction
+        assert db.numdocs() == 3
+        assert dest.read_bytes() == b"data"
+
+    def test_exception_discards_everything(self, temp_session):
+        db = ndi_database(temp_session)
+        src = temp_session / "raw.bin"
+        src.write_bytes(b"data")
+        doc = _new_doc("a")
+        dest = db.get_binary_path(doc, "raw.bin")
+
+        with pytest.raises(KeyError), db.transaction():
+            db.add(doc)
+            db.copy_binary_file(src, dest)
+            raise KeyError("boom")
+
+        assert db.numdocs() == 0
+        assert not dest.exists()
+        assert not db.in_transaction
+
+    def test_rollback(self, temp_session):
+        db = ndi_database(temp_session)
+        with db.transaction() as tx:
+            db.add(_new_doc("a"))
+            tx.rollback()
+        assert db.numdocs() == 0
+
+    def test_duplicate_raises_when_staged(self, temp_session, sample_doc):
+        db = ndi_database(temp_session)
+        db.add(sample_doc)
+        with pytest.raises(ValueError, match="already exists"), db.transaction():
+            db.add(_new_doc("a"))
+            db.add(sample_doc)
+        assert db.numdocs() == 1
+
+        doc = _new_doc("b")
+        with pytest.raises(ValueError, match="already exists"), db.transaction():
+            db.add(doc)
+            db.add(doc)
+        assert db.numdocs() == 1
+
+    def test_failed_copy_writes_nothing(self, temp_session):
+        db = ndi_database(temp_session)
+        doc = _new_doc("a")
+        good = temp_session / "good.bin"
+        good.write_bytes(b"data")
+        good_dest = db.get_binary_path(doc, "good.bin")
+
+        with pytest.raises(OSError), db.transaction():
+            db.add(doc)
+            db.copy_binary_file(good, good_dest)
+            db.copy_binary_file(temp_session / "missing.bin", db.get_binary_path(doc, "x"))
+
+        assert db.numdocs() == 0
+        assert not good_dest.exists()
+
+    def test_failed_write_removes_written_documents(self, temp_session, monkeypatch):
+        db = ndi_database(temp_session)
+        docs = [_new_doc(f"doc_{i}") for i in range(3)]
+        src = temp_session / "raw.bin"
+        src.write_bytes(b"data")
+        dest = db.get_binary_path(docs[0], "raw.bin")
+        add_docs = db._driver._db.add_docs
+
+        def add_some_then_fail(did_docs, branch_id):
+            add_docs(did_docs[:1], branch_id)
+            raise OSError("disk full")
+
+        monkeypatch.setattr(db._driver._db, "add_docs", add_some_then_fail)
+        with pytest.raises(OSError, match="disk full"), db.transaction():
+            for doc in docs:
+                db.add(doc)
+            db.copy_binary_file(src, dest)
+
+        assert db.numdocs() == 0
+        assert not dest.exists()
+
+    def test_nested_transaction_joins_outer(self, temp_session):
+        db = ndi_database(temp_session)
+        with db.transaction() as outer:
+            with db.transaction() as inner:
+                db.add(_new_doc("a"))
+            assert inner is outer
+            assert db.numdocs() == 0
+        assert db.numdocs() == 1
+
+    def test_other_writes_refused(self, temp_session, sample_doc):
+        db = ndi_database(temp_session)
+        db.add(sample_doc)
+        with db.transaction():
+            for call in (
+                lambda: db.update(sample_doc),
+                lambda: db.remove(sample_doc),
+                lambda: db.add_or_replace(sample_doc),
+                lambda: db.bulk_add([_new_doc("a")]),
+            ):
+                with pytest.raises(RuntimeError, match="transaction"):
+                    call()
+        assert db.numdocs() == 1
+
+    def test_copy_binary_file_outside_transaction(self, temp_session, sample_doc):
+        db = ndi_database(temp_session)
+        src = temp_session / "raw.bin"
+        src.write_bytes(b"data")
+        dest = db.get_binary_path(sample_doc, "raw.bin")
+        db.copy_binary_file(src, dest)
+        assert dest.read_bytes() == b"data"
@@ -544,3 +544,210 @@ class TestDocumentRepr:
         assert "ndi_document" in r
         assert "ndi_element" in r
         assert "my_id" in r
+
+
+class TestDocumentView:
+    """Test ndi_document_view, the read-only view returned by searches."""
+
+    @staticmethod
+    def _stored():
+        # As written by MATLAB: single dependency and file stored as dicts
+        return {
+            "base": {"id": "view_id", "datestamp": "", "session_id": "sess", "name": "v"},
+            "document_class": {"class_name": "element", "superclasses": []},
+            "depends_on": {"name": "subject_id", "value": "subj_1"},
+            "files": {"file_list": ["data.bin"], "file_info": {"name": "data.bin"}},
+        }
+
+    def test_reads_do_not_copy(self):
+        from ndi.document import ndi_document_view
+
+        stored = ndi_document(self._stored()).document_properties
+        doc = ndi_document_view(stored)
+        assert isinstance(doc, ndi_document)
+        assert doc.id == "view_id"
+        assert doc.session_id == "sess"
+        assert doc.doc_class() == "element"
+        assert doc.dependency_value("subject_id") == "subj_1"
+        assert doc.current_file_list() == ["data.bin"]
+        assert doc._get_nested_property("base.name") == "v"
+        assert doc.read_properties() is stored
+        assert not doc.promoted
+
+    def test_cached_accessors(self):
+        from ndi.document import ndi_document_view
+
+        stored = self._stored()
+        doc = ndi_document_view(stored)
+        stored["base"]["id"] = "changed"
+        stored["document_class"]["class_name"] = "changed"
+        assert doc.id == "view_id"
+        assert doc.doc_class() == "element"
+
+    def test_subject_load_does_not_promote(self):
+        from unittest.mock import MagicMock
+
+        from ndi.document import ndi_document_view
+        from ndi.subject import ndi_subject
+
+        stored = ndi_document(
+            "subject", **{"subject.local_identifier": "mouse@lab.org"}
+        ).document_properties
+        doc = ndi_document_view(stored)
+        subject = ndi_subject(MagicMock(), doc)
+        assert subject.local_identifier == "mouse@lab.org"
+        assert not doc.promoted
+
+    def test_matlab_layout_normalized_lazily(self):
+        from ndi.document import ndi_document_view
+
+        stored = self._stored()
+        doc = ndi_document_view(stored)
+        assert not doc.promoted
+        props = doc.read_properties()
+        assert props is not stored
+        assert props["depends_on"] == [{"name": "subject_id", "value": "subj_1"}]
+        assert props["files"]["file_info"] == [{"name": "data.bin"}]
+        assert doc.dependency_value("subject_id") == "subj_1"
+        assert stored == self._stored()
+
+    def test_promoted_on_write(self):
+        from ndi.document import ndi_document_view
+
+        stored = self._stored()
+        doc = ndi_document_view(stored)
+        doc.set_dependency_value("subject_id", "subj_2")
+        assert type(doc) is ndi_document_view
+        assert doc.promoted
+        assert doc.dependency_value("subject_id") == "subj_2"
+        assert isinstance(doc.document_properties["depends_on"], list)
+        assert stored == self._stored()
+
+    def test_id_follows_promoted_copy(self):
+        from ndi.document import ndi_document_view
+
+        doc = ndi_document_view(self._stored())
+        doc.document_properties["base"]["id"] = "new_id"
+        doc.document_properties["document_class"]["class_name"] = "probe"
+        assert doc.id == "new_id"
+        assert doc.doc_class() == "probe"
+        assert "new_id" in repr(doc)
+
+    def test_document_properties_is_normalized_copy(self):
+        from ndi.document import ndi_document_view
+
+        stored = self._stored()
+        doc = ndi_document_view(stored)
+        props = doc.document_properties
+        assert props is not stored
+        assert props["files"]["file_info"] == [{"name": "data.bin"}]
+        props["base"]["name"] = "changed"
+        assert doc.document_properties["base"]["name"] == "changed"
+        assert stored["base"]["name"] == "v"
+
+    def test_copy_and_equality(self):
+        from ndi.document import ndi_document_view
+
+        stored = self._stored()
+        view = ndi_document_view(stored)
+        copy = ndi_document(view)
+        assert type(view) is ndi_document_view
+        assert copy == view
+        assert copy.document_properties["depends_on"] == [{"name": "subject_id", "value": "subj_1"}]
+        assert view.to_dict()["depends_on"] == copy.document_properties["depends_on"]
+        assert json.loads(view.to_json()) == copy.document_properties
+
+
+@pytest.fixture(params=["json", "orjson"])
+def json_backend(request):
+    """Run a test with each available ndi.util.json_codec backend."""
+    from ndi.util import json_codec
+
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    previous = json_codec.backend()
+    json_codec.set_backend(request.param)
+    yield json_codec
+    json_codec.set_backend(previous)
+
+
+class TestJsonCodec:
+    """Test ndi.util.json_codec with each backend."""
+
+    def test_round_trip(self, json_backend):
+        props = {"base": {"id": "x", "name": "é"}, "values": [1, 2.5, None, True]}
+        for indent in (None, 2, 4):
+            assert json_backend.loads(json_backend.dumps(props, indent=indent)) == props
+        assert json_backend.dumps(props, indent=2) == json.dumps(
+            props, indent=2, ensure_ascii=False
+        )
+
+    def test_same_bytes_with_either_backend(self, json_backend):
+        props = {"base": {"id": "x", "name": "é"}, "values": [1, 2.5, None, True], "e": {}}
+        assert json_backend.dumpb(props) == '{"base":{"id":"x","name":"é"},'.encode() + (
+            b'"values":[1,2.5,null,true],"e":{}}'
+        )
+        assert json_backend.dumps({"a": float("nan"), "b": 1}) == '{"a":NaN,"b":1}'
+        assert json_backend.dumps({1: "é"}) == '{"1":"é"}'
+
+    def test_small_and_large_floats(self, json_backend):
+        values = [1e-7, 2.5e-12, 1e-5, 1e16, 1e22, -3.75e300, 5e-324, 0.1]
+        for indent in (None, 2):
+            text = json_backend.dumps({"v": values}, indent=indent)
+            assert json_backend.loads(text)["v"] == values
+            assert json.loads(text)["v"] == values
+
+    def test_non_finite_numbers(self, json_backend):
+        text = json_backend.dumps({"a": float("nan"), "b": float("inf"), "c": None})
+        assert "NaN" in text and "Infinity" in text
+        data = json_backend.loads(text)
+        assert data["a"] != data["a"] and data["b"] == float("inf") and data["c"] is None
+
+    def test_rehydrate_matches_util(self, json_backend):
+        from ndi.util import rehydrateJSONNanNull
+
+        text = '{"a": "__NDI__NaN__", "b": ["__NDI__-Infinity__", 1]}'
+        expected = json.loads(rehydrateJSONNanNull(text))
+        for source in (text, text.encode()):
+            data = json_backend.loads(source, rehydrate_nan=True)
+            assert data["b"] == expected["b"]
+            assert data["a"] != data["a"]
+        assert json_backend.loads(text) == json.loads(text)
+
+    def test_fallbacks(self, json_backend):
+        from datetime import datetime
+
+        assert json_backend.loads(json_backend.dumps({1: "a"})) == {"1": "a"}
+        assert json_backend.loads(str(2**70)) == 2**70
+        stamp = datetime(2024, 1, 1)
+        assert json_backend.loads(json_backend.dumps({"t": stamp}, default=str)) == {
+            "t": str(stamp)
+        }
+        with pytest.raises(TypeError):
+            json_backend.dumps({"t": stamp})
+        with pytest.raises(json.JSONDecodeError):
+            json_backend.loads("{not json")
+
+    def test_document_write(self, json_backend, tmp_path):
+        props = {
+            "base": {"id": "doc_1", "datestamp": "", "session_id": "", "name": "ü"},
+            "document_class": {"class_name": "base", "superclasses": []},
+        }
+        doc = ndi_document(props)
+        doc.write(str(tmp_path / "doc.json"))
+        assert json.loads((tmp_path / "doc.json").read_text(encoding="utf-8")) == props
+        assert json.loads(doc.to_json()) == props
+
+    def test_set_backend_rejects_unknown(self):
+        from ndi.util import json_codec
+
+        with pytest.raises(ValueError):
+            json_codec.set_backend("yaml")
+
+    def test_benchmark(self, tmp_path):
+        from ndi.util import json_codec
+
+        (tmp_path / "a.json").write_text(json.dumps({"base": {"id": "a"}, "x": list(range(50))}))
+        results = json_codec.benchmark([tmp_path], repeat=1)
+        assert "json" in results
+        assert all(rate > 0 for rates in results.values() for rate in rates.values())
@@ -602,6 +602,51 @@ class TestStimulusTemporalFrequency:
         assert name == ""
 
 
+class TestWindowedResponses:
+    """Tests for stimulus.windowed_responses."""
+
+    def test_continuous_mean_and_f1(self):
+        from ndi.fun.stimulus import windowed_responses
+
+        t = np.arange(0, 10, 0.001)
+        x = 3 + 2 * np.cos(2 * np.pi * 4 * t)
+        r = windowed_responses(t, x, [1.0, 5.0], [2.9995, 6.9995], [4.0, 4.0])
+        np.testing.assert_allclose(r["mean"], [3.0, 3.0], atol=1e-9)
+        np.testing.assert_allclose(r["F1"], [2.0, 2.0], atol=1e-6)
+        np.testing.assert_allclose(np.abs(r["F2"]), [0.0, 0.0], atol=1e-6)
+
+    def test_spike_rate(self):
+        from ndi.fun.stimulus import windowed_responses
+
+        spikes = np.arange(0.05, 4, 0.1)
+        r = windowed_responses(spikes, None, [0.0, 2.0], [1.0, 4.0], isspike=True)
+        np.testing.assert_allclose(r["mean"], [10.0, 10.0])
+        assert set(r) == {"mean"}
+
+    def test_invalid_frequency_gives_nan(self):
+        from ndi.fun.stimulus import windowed_responses
+
+        t = np.arange(0, 2, 0.01)
+        r = windowed_responses(t, np.ones_like(t), [0.0, 1.0], [1.0, 2.0], [np.nan, 0.0])
+        assert np.all(np.isnan(r["F1"]))
+
+
+class TestPresentationStimulusIndex:
+    """Tests for stimulus.presentation_stimulus_index."""
+
+    def test_one_based_order(self):
+        from ndi.fun.stimulus import presentation_stimulus_index
+
+        index = presentation_stimulus_index([1, 3, 2, 3], 3)
+        np.testing.assert_array_equal(index, [0, 2, 1, 2])
+
+    def test_out_of_range_is_minus_one(self):
+        from ndi.fun.stimulus import presentation_stimulus_index
+
+        index = presentation_stimulus_index([0, 1, 4, float("nan")], 3)
+        np.testing.assert_array_equal(index, [-1, 0, -1, -1])
+
+
 # ===========================================================================
 # ndi.fun.session and dataset tests
 # ===========================================================================
@@ -0,0 +1,67 @@
+"""Tests for the lazy imports of ndi and ndi.util (ndi._lazy)."""
+
+import subprocess
+import sys
+
+import pytest
+
+
+def _imported_by(statement: str) -> set[str]:
+    """Return the modules a fresh interpreter imports to run *statement*."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    return {
+        line.rsplit("|", 1)[1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "|" in line
+    }
+
+
+class TestLazyImport:
+    """``import ndi`` defers its submodules and heavy dependencies."""
+
+    HEAVY = ("pandas", "networkx", "scipy", "openminds", "pydantic", "numpy", "did")
+
+    def test_import_ndi_skips_heavy_dependencies(self):
+        loaded = _imported_by("import ndi")
+        assert "ndi" in loaded
+        heavy = sorted(m for m in loaded if m.split(".")[0] in self.HEAVY)
+        assert heavy == []
+        assert not any(m.startswith("ndi.") and m != "ndi._lazy" for m in loaded)
+
+    def test_util_classname_skips_heavy_dependencies(self):
+        loaded = _imported_by("import ndi.util.classname")
+        assert not any(m.split(".")[0] in ("pandas", "pydantic", "numpy") for m in loaded)
+
+    def test_public_names_resolve(self):
+        import ndi
+
+        for name in ndi.__all__:
+            assert getattr(ndi, name) is not None
+        assert "ndi_document" in dir(ndi)
+
+    def test_query_is_the_class(self):
+        import ndi
+        import ndi.query
+        from ndi.query import ndi_query
+
+        assert ndi.query is ndi_query
+        assert ndi.ndi_query is ndi_query
+
+    def test_util_exports_functions_not_modules(self):
+        import ndi.util
+        import ndi.util.hexDump
+        from ndi.util.hexDump import hexDump
+
+        assert ndi.util.hexDump is hexDump
+
+    def test_unknown_attribute(self):
+        import ndi
+
+        with pytest.raises(AttributeError):
+            _ = ndi.no_such_name
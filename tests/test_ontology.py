@@ -2,6 +2,8 @@
 
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 # ---------------------------------------------------------------------------
 # OntologyResult tests
 # ---------------------------------------------------------------------------
@@ -95,9 +97,10 @@ class TestLookup:
     """Tests for the lookup() function."""
 
     def setup_method(self):
-        from ndi.ontology import clearCache
+        from ndi.ontology import clear_persistent_cache, clearCache
 
         clearCache()
+        clear_persistent_cache()
 
     def test_no_colon_returns_empty(self):
         from ndi.ontology import lookup
@@ -167,6 +170,162 @@ class TestLookup:
             assert not result
 
 
+# ---------------------------------------------------------------------------
+# Persistent cache, batched lookup and offline mode
+# ---------------------------------------------------------------------------
+
+
+class TestOntologyCache:
+    """Tests for the persistent ontology cache and lookup_many()."""
+
+    def setup_method(self):
+        from ndi.ontology import clear_persistent_cache, clearCache, set_offline
+
+        set_offline(False)
+        clearCache()
+        clear_persistent_cache()
+
+    def teardown_method(self):
+        import ndi.ontology
+
+        ndi.ontology.set_offline(False)
+        ndi.ontology._persistent_cache = None
+        ndi.ontology._persistent_cache_explicit = False
+        ndi.ontology.clearCache()
+
+    def test_cache_roundtrip_and_ttl(self, tmp_path):
+        from ndi.ontology.cache import OntologyCache
+
+        path = tmp_path / "cache.sqlite"
+        OntologyCache(path).put("CL:1", {"id": "CL:1", "name": "cell"})
+
+        # A second instance (as in another process) sees the entry
+        assert OntologyCache(path).get("CL:1")["name"] == "cell"
+        # Expired entries are misses unless the TTL is ignored
+        stale = OntologyCache(path, ttl=-1)
+        assert stale.get("CL:1") is None
+        assert stale.get("CL:1", ignore_ttl=True)["name"] == "cell"
+
+    def test_lookup_uses_persistent_cache(self, tmp_path):
+        from ndi.ontology import OntologyResult, _lookup_cache, lookup, set_cache_path
+
+        set_cache_path(tmp_path / "cache.sqlite")
+        with patch("ndi.ontology.providers.OLSProvider.lookup_term") as mock_lt:
+            mock_lt.return_value = OntologyResult(id="CL:0000540", name="neuron")
+            lookup("CL:0000540")
+            _lookup_cache.clear()
+            result = lookup("CL:0000540")
+        assert mock_lt.call_count == 1
+        assert result.name == "neuron"
+
+    def test_empty_results_not_persisted(self, tmp_path):
+        from ndi.ontology import OntologyResult, _lookup_cache, lookup, set_cache_path
+
+        set_cache_path(tmp_path / "cache.sqlite")
+        with patch("ndi.ontology.providers.OLSProvider.lookup_term") as mock_lt:
+            mock_lt.return_value = OntologyResult()
+            lookup("CL:404")
+            _lookup_cache.clear()
+            lookup("CL:404")
+        assert mock_lt.call_count == 2
+
+    def test_lookup_many_deduplicates(self, tmp_path):
+        from ndi.ontology import OntologyResult, _lookup_cache, lookup_many, set_cache_path
+
+        set_cache_path(tmp_path / "cache.sqlite")
+
+        def fake_lookup(self, term, prefix=""):
+            return OntologyResult(id=f"{prefix}:{term}", name=f"term {term}")
+
+        with patch(
+            "ndi.ontology.providers.OLSProvider.lookup_term",
+            side_effect=fake_lookup,
+            autospec=True,
+        ) as mock_lt:
+            results = lookup_many(["CL:1", "CL:2", "CL:1", "nocolon", "CL:3"])
+        assert [r.name for r in results] == ["term 1", "term 2", "term 1", "", "term 3"]
+        assert mock_lt.call_count == 3
+
+        # Everything resolved is now served from the persistent cache
+        _lookup_cache.clear()
+        with patch("ndi.ontology.providers.OLSProvider.lookup_term") as mock_lt:
+            results = lookup_many(["CL:3", "CL:2"])
+        assert not mock_lt.called
+        assert [r.id for r in results] == ["CL:3", "CL:2"]
+
+    def test_clearCache_keeps_persistent_cache(self, tmp_path):
+        from ndi.ontology import (
+            OntologyResult,
+            clear_persistent_cache,
+            clearCache,
+            lookup,
+            set_cache_path,
+        )
+
+        set_cache_path(tmp_path / "cache.sqlite")
+        with patch("ndi.ontology.providers.OLSProvider.lookup_term") as mock_lt:
+            mock_lt.return_value = OntologyResult(id="CL:1", name="cell")
+            lookup("CL:1")
+            clearCache()
+            lookup("clear")
+            assert lookup("CL:1").name == "cell"
+            assert mock_lt.call_count == 1
+
+            clearCache()
+            clear_persistent_cache()
+            lookup("CL:1")
+            assert mock_lt.call_count == 2
+
+    def test_offline_without_snapshot_warns(self, tmp_path):
+        from ndi.ontology import set_cache_path, set_offline
+
+        set_cache_path(None)
+        with pytest.warns(UserWarning, match="without snapshot entries"):
+            assert set_offline(True, tmp_path / "missing.json") == 0
+
+    def test_offline_snapshot(self, tmp_path):
+        import json
+
+        from ndi.ontology import OntologyResult, clearCache, lookup, set_cache_path, set_offline
+
+        set_cache_path(None)
+        snapshot = tmp_path / "snapshot.json"
+        snapshot.write_text(
+            json.dumps(
+                {"version": 1, "entries": {"CL:0000540": {"id": "CL:0000540", "name": "neuron"}}}
+            )
+        )
+
+        with patch("ndi.ontology.providers.OLSProvider.lookup_term") as mock_lt:
+            assert set_offline(True, snapshot) == 1
+            assert lookup("CL:0000540").name == "neuron"
+            assert not lookup("CL:0000999")
+            # Local providers still answer offline
+            assert lookup("NDIC:1")
+        assert not mock_lt.called
+
+        # Going back online forgets the snapshot entries
+        set_offline(False)
+        with patch("ndi.ontology.providers.OLSProvider.lookup_term") as mock_lt:
+            mock_lt.return_value = OntologyResult()
+            clearCache()
+            assert not lookup("CL:0000540")
+        assert mock_lt.called
+
+    def test_save_snapshot(self, tmp_path):
+        import json
+
+        from ndi.ontology import OntologyResult, lookup, save_snapshot, set_cache_path
+
+        set_cache_path(tmp_path / "cache.sqlite")
+        with patch("ndi.ontology.providers.OLSProvider.lookup_term") as mock_lt:
+            mock_lt.return_value = OntologyResult(id="CL:1", name="cell")
+            lookup("CL:1")
+        assert save_snapshot(tmp_path / "snap.json") == 1
+        data = json.loads((tmp_path / "snap.json").read_text())
+        assert data["entries"]["CL:1"]["name"] == "cell"
+
+
 # ---------------------------------------------------------------------------
 # Provider registry
 # ---------------------------------------------------------------------------
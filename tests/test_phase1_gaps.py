@@ -67,7 +67,7 @@ class TestTuningCurveAnalysis:
                     {"parameters": {"angle": 90}},
                     {"parameters": {"angle": 180}},
                 ],
-                "presentation_order": [0, 1, 2, 0, 1, 2],
+                "presentation_order": [1, 2, 3, 1, 2, 3],
             },
             "base": {"id": "stim_pres_123"},
         }
@@ -127,6 +127,114 @@ class TestTuningCurveAnalysis:
         pva2 = calc.property_value_array(resp_doc, "contrast")
         assert set(pva2) == {1, 0.5}
 
+    def test_property_value_array_equal_values_of_other_types(self):
+        calc = self._make_calc()
+        session = MagicMock()
+        calc._session = session
+
+        stim_pres_doc = MagicMock()
+        stim_pres_doc.document_properties = {
+            "stimulus_presentation": {
+                "stimuli": [
+                    {"parameters": {"contrast": 1}},
+                    {"parameters": {"contrast": 1.0}},
+                    {"parameters": {"contrast": True}},
+                    {"parameters": {"contrast": [1, 2]}},
+                    {"parameters": {"contrast": 1}},
+                    {"parameters": {"contrast": [1, 2]}},
+                ],
+            },
+        }
+        session.database_search.return_value = [stim_pres_doc]
+        resp_doc = MagicMock()
+        resp_doc.dependency_value.return_value = "pres1"
+
+        pva = calc.property_value_array(resp_doc, "contrast")
+        assert pva == [1, [1, 2]]
+        assert type(pva[0]) is int
+
+    def test_best_value_empirical_one_based_order(self):
+        calc = self._make_calc()
+        session = MagicMock()
+        calc._session = session
+
+        stim_pres_doc = MagicMock()
+        stim_pres_doc.document_properties = {
+            "stimulus_presentation": {
+                "stimuli": [
+                    {"parameters": {"angle": 0}},
+                    {"parameters": {"angle": 90}},
+                    {"parameters": {"contrast": 0}},
+                ],
+                "presentation_order": [1, 2, 3, 3, 2, 1],
+            },
+        }
+        session.database_search.return_value = [stim_pres_doc]
+
+        resp_doc = MagicMock()
+        resp_doc.document_properties = {
+            "stimulus_response_scalar": {
+                "responses": {
+                    "response_real": [1.0, 4.0, 20.0, 20.0, 6.0, 3.0],
+                    "response_imaginary": [0] * 6,
+                    "control_response_real": [1.0] * 6,
+                    "control_response_imaginary": [0] * 6,
+                },
+            },
+        }
+        resp_doc.dependency_value.return_value = "pres1"
+
+        # the blank (stimulus 2) has no angle and is skipped
+        n, v, pv = calc.best_value_empirical(resp_doc, "angle")
+        assert n == 1
+        assert v == pytest.approx(4.0)
+        assert pv == 90
+
+    def test_tuning_curves_batch(self):
+        calc = self._make_calc()
+        session = MagicMock()
+        calc._session = session
+
+        stim_pres_doc = MagicMock()
+        stim_pres_doc.id = "pres1"
+        stim_pres_doc.document_properties = {
+            "stimulus_presentation": {
+                "stimuli": [
+                    {"parameters": {"angle": 0}},
+                    {"parameters": {"angle": 90}},
+                    {"parameters": {"contrast": 0}},
+                ],
+                "presentation_order": [1, 2, 3, 1, 2, 3],
+            },
+        }
+        session.database_search.return_value = [stim_pres_doc]
+
+        def resp(real):
+            doc = MagicMock()
+            doc.document_properties = {
+                "stimulus_response_scalar": {
+                    "responses": {
+                        "response_real": real,
+                        "response_imaginary": [0] * 6,
+                        "control_response_real": [float("nan")] * 6,
+                        "control_response_imaginary": [0] * 6,
+                    },
+                },
+            }
+            doc.dependency_value.return_value = "pres1"
+            return doc
+
+        docs = [resp([1, 2, 0, 3, 4, 0]), resp([5, 6, 0, float("nan"), 8, 0])]
+        curves = calc.tuning_curves(docs, "angle")
+
+        assert session.database_search.call_count == 1
+        assert len(curves) == 2
+        assert curves[0]["independent_variable"] == [0, 90]
+        np.testing.assert_allclose(curves[0]["response_mean"].real, [2.0, 3.0])
+        np.testing.assert_allclose(curves[0]["response_stderr"], [1.0, 1.0])
+        np.testing.assert_allclose(curves[1]["response_mean"].real, [5.0, 7.0])
+        np.testing.assert_array_equal(curves[1]["count"], [1, 2])
+
     def test_default_parameters_query(self):
         calc = self._make_calc()
         result = calc.default_parameters_query({})
@@ -352,6 +460,118 @@ class TestDocTable:
         df = docCellArray2Table([])
         assert len(df) == 0
 
+    def test_doc_cell_array_missing_fields(self):
+        import math
+
+        from ndi.fun.doc_table import docCellArray2Table
+
+        df = docCellArray2Table(
+            [
+                {"base": {"id": "a"}, "element": {"name": "e1"}},
+                {"base": {"id": "b"}, "depends_on": []},
+            ]
+        )
+        assert list(df.columns) == ["base.id", "element.name", "depends_on"]
+        assert df["base.id"].tolist() == ["a", "b"]
+        assert math.isnan(df["element.name"][1])
+        assert df["depends_on"][1] == []
+
+    @staticmethod
+    def _table_session(projection):
+        """Fake session holding a probe, its subject link and one epoch."""
+        from ndi.database import project_properties
+
+        epm = "name\treference\ttype\nctx\t1\tn-trode\n"
+        docs = {
+            "probe": [
+                {
+                    "base": {"id": "p1"},
+                    "element": {"name": "ctx", "reference": 1, "type": "n-trode"},
+                    "depends_on": [{"name": "subject_id", "value": "s1"}],
+                }
+            ],
+            "probe_location": [
+                {
+                    "probe_location": {"name": "V1", "ontology_name": "UBERON:0002436"},
+                    "depends_on": [{"name": "probe_id", "value": "p1"}],
+                }
+            ],
+            "epochfiles_ingested": [
+                {"epochfiles_ingested": {"epoch_id": f"ep{i}", "epochprobemap": epm}}
+                for i in (1, 2)
+            ],
+        }
+        docs["element"] = docs["probe"]
+
+        class SearchSession:
+            calls = 0
+            token = 0
+
+            def database_search(self, query):
+                type(self).calls += 1
+                return [MagicMock(document_properties=d) for d in docs.get(query.cls, [])]
+
+        class ProjectSession(SearchSession):
+            def database_project(self, query, fields):
+                type(self).calls += 1
+                return [project_properties(d, fields) for d in docs.get(query.cls, [])]
+
+            def database_change_token(self):
+                return self.token
+
+            def id(self):
+                return "session_1"
+
+        return ProjectSession() if projection else SearchSession()
+
+    @pytest.fixture
+    def isa_query(self, monkeypatch):
+        import ndi.query
+
+        class _Query:
+            def __init__(self, field=""):
+                self.cls = None
+
+            def isa(self, cls):
+                q = _Query()
+                q.cls = cls
+                return q
+
+        monkeypatch.setattr(ndi.query, "ndi_query", _Query)
+
+    @pytest.mark.parametrize("projection", [False, True])
+    def test_probe_and_epoch_tables(self, isa_query, projection):
+        from ndi.fun.doc_table import epoch, probe
+
+        session = self._table_session(projection)
+        probes = probe(session)
+        assert probes["ProbeDocumentIdentifier"].tolist() == ["p1"]
+        assert probes["SubjectDocumentIdentifier"].tolist() == ["s1"]
+        assert probes["ProbeLocationName"].tolist() == ["V1"]
+
+        epochs = epoch(session)
+        assert epochs["EpochDocumentIdentifier"].tolist() == ["ep1", "ep2"]
+        assert epochs["EpochNumber"].tolist() == [1, 2]
+        assert epochs["ProbeDocumentIdentifier"].tolist() == ["p1", "p1"]
+
+    def test_table_cache(self, isa_query):
+        from ndi.fun.doc_table import clear_table_cache, probe
+
+        clear_table_cache()
+        session = self._table_session(True)
+        first = probe(session, cache=True)
+        calls = type(session).calls
+
+        first["ProbeName"] = "changed"
+        again = probe(session, cache=True)
+        assert type(session).calls == calls
+        assert again["ProbeName"].tolist() == ["ctx"]
+
+        type(session).token += 1
+        probe(session, cache=True)
+        assert type(session).calls == 2 * calls
+        clear_table_cache()
+
 
 # =========================================================================
 # Batch 6: Table utilities
@@ -493,6 +713,51 @@ class TestCopySessionToDataset:
         dataset.database_add.assert_called_once()
 
 
+class TestTransferFiles:
+
+    def test_link_copy_and_resume(self, tmp_path):
+        import os
+
+        from ndi.file.transfer import transfer_files
+
+        src = tmp_path / "src"
+        src.mkdir()
+        pairs = []
+        for i in range(5):
+            f = src / f"f{i}.bin"
+            f.write_bytes(bytes([i]) * (100 + i))
+            pairs.append((f, tmp_path / "dest" / f.name))
+        # a finished file is skipped, a partial one is replaced
+        pairs[0][1].parent.mkdir()
+        pairs[0][1].write_bytes(pairs[0][0].read_bytes())
+        pairs[1][1].write_bytes(b"x")
+
+        report = transfer_files(pairs, max_workers=3)
+        assert report.skipped == 1
+        assert report.transferred == 4
+        assert report.failed == []
+        for a, b in pairs:
+            assert b.read_bytes() == a.read_bytes()
+        if report.hardlinked:
+            assert os.path.samefile(pairs[2][0], pairs[2][1])
+
+        report = transfer_files(pairs, link=False)
+        assert report.skipped == 5
+
+        copied = transfer_files([(a, tmp_path / "copies" / a.name) for a, _ in pairs], link=False)
+        assert copied.hardlinked == 0
+        assert copied.reflinked + copied.copied == 5
+        assert not os.path.samefile(pairs[2][0], tmp_path / "copies" / "f2.bin")
+
+    def test_missing_source_reported(self, tmp_path):
+        from ndi.file.transfer import transfer_files
+
+        report = transfer_files([(tmp_path / "nope", tmp_path / "out" / "nope")])
+        assert report.transferred == 0
+        assert len(report.failed) == 1
+        assert not (tmp_path / "out" / "nope").exists()
+
+
 # =========================================================================
 # Batch 8: Presentation time read/write
 # =========================================================================
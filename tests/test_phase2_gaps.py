@@ -219,6 +219,80 @@ class TestDatabaseToJson:
             count = database2json(session, tmpdir)
             assert count == 0
 
+    @staticmethod
+    def _session_with_binary(tmpdir):
+        data = Path(tmpdir) / "stored.bin"
+        data.write_bytes(b"\x00\x01binary" * 1000)
+        doc = MagicMock()
+        doc.document_properties = {
+            "base": {"id": "doc-bin"},
+            "files": {"file_list": ["data.bin", "missing.bin"]},
+        }
+        session = MagicMock()
+        session.database_search.return_value = [doc]
+
+        def openbinary(d, name):
+            if name != "data.bin":
+                raise FileNotFoundError(name)
+            return open(data, "rb")
+
+        session.database_openbinarydoc.side_effect = openbinary
+        return session, data.read_bytes()
+
+    def test_compact_dir_with_files(self):
+        from ndi.database_fun import database2json
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            session, payload = self._session_with_binary(tmpdir)
+            out = Path(tmpdir) / "out"
+            count = database2json(session, str(out), indent=None, include_files=True)
+            assert count == 1
+            text = (out / "doc-bin.json").read_text()
+            assert "\n" not in text
+            assert json.loads(text)["base"]["id"] == "doc-bin"
+            assert (out / "doc-bin" / "data.bin").read_bytes() == payload
+            assert not (out / "doc-bin" / "missing.bin").exists()
+
+    def test_jsonl(self):
+        from ndi.database_fun import database2json
+
+        docs = []
+        for i in range(5):
+            doc = MagicMock()
+            doc.document_properties = {"base": {"id": f"doc-{i}"}, "text": "a\nb"}
+            docs.append(doc)
+        session = MagicMock()
+        session.database_search.return_value = docs
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            out = Path(tmpdir) / "docs.jsonl"
+            count = database2json(session, str(out), output_format="jsonl", page_size=2)
+            assert count == 5
+            lines = out.read_text().splitlines()
+            assert [json.loads(line)["base"]["id"] for line in lines] == [
+                f"doc-{i}" for i in range(5)
+            ]
+            with pytest.raises(ValueError):
+                database2json(session, str(out), output_format="jsonl", include_files=True)
+            with pytest.raises(ValueError):
+                database2json(session, str(out), output_format="zip")
+
+    def test_tar_with_files(self):
+        import tarfile
+
+        from ndi.database_fun import database2json
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            session, payload = self._session_with_binary(tmpdir)
+            out = Path(tmpdir) / "export.tar.gz"
+            count = database2json(session, str(out), output_format="tar", include_files=True)
+            assert count == 1
+            with tarfile.open(out) as archive:
+                assert sorted(archive.getnames()) == ["doc-bin.json", "doc-bin/data.bin"]
+                assert archive.extractfile("doc-bin/data.bin").read() == payload
+                loaded = json.load(archive.extractfile("doc-bin.json"))
+            assert loaded["base"]["id"] == "doc-bin"
+
 
 class TestCopyDocFileToTemp:
     """Tests for ndi.database_fun.copydocfile2temp."""
@@ -266,6 +340,21 @@ class TestCopyDocFileToTemp:
             if os.path.exists(tname):
                 os.unlink(tname)
 
+    def test_copies_open_file(self):
+        from ndi.database_fun import copydocfile2temp
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            src = Path(tmpdir) / "stored.bin"
+            src.write_bytes(b"abc" * 10000)
+            session = MagicMock()
+            session.database_openbinarydoc.return_value = open(src, "rb")
+
+            tname, _ = copydocfile2temp(MagicMock(), session, "data.bin", ".bin")
+            try:
+                assert Path(tname).read_bytes() == src.read_bytes()
+            finally:
+                os.unlink(tname)
+
 
 class TestExtractDocsFiles:
     """Tests for ndi.database_fun.extract_doc_files."""
@@ -4,6 +4,9 @@ Tests for Phase 8: ndi.subject, ndi.element_timeseries, ndi.neuron, ndi.dataset
 316 existing tests + Phase 8 tests.
 """
 
+from pathlib import Path
+
+import numpy as np
 import pytest
 
 from ndi import (
@@ -282,6 +285,135 @@ class TestElementTimeseries:
             ts.readtimeseries(1)
 
 
+class TestTimeseriesBinary:
+    """Test the epoch binary format of ndi_element_timeseries."""
+
+    def test_regular_roundtrip_reads_range(self, temp_dir):
+        from ndi.element_timeseries import (
+            read_timeseries_binary,
+            read_timeseries_header,
+            write_timeseries_binary,
+        )
+
+        t = 2.0 + np.arange(3000) / 1000.0
+        d = np.random.randn(3000, 3)
+        path = temp_dir / "ts.nditsb"
+        write_timeseries_binary(path, [(t[:1234], d[:1234]), (t[1234:], d[1234:])])
+
+        header = read_timeseries_header(path)
+        assert header["num_samples"] == 3000
+        assert header["num_channels"] == 3
+        assert header["samplerate"] == pytest.approx(1000.0)
+        assert not header["explicit_times"]
+
+        data, times = read_timeseries_binary(path, 3.0, 3.5)
+        keep = (t >= 3.0) & (t <= 3.5)
+        np.testing.assert_allclose(times, t[keep])
+        np.testing.assert_array_equal(data, d[keep])
+
+    def test_irregular_times_stored(self, temp_dir):
+        from ndi.element_timeseries import read_timeseries_binary, write_timeseries_binary
+
+        spikes = np.array([0.1, 0.15, 0.7, 1.3, 2.9])
+        path = temp_dir / "spikes.nditsb"
+        header = write_timeseries_binary(path, [(spikes, np.ones(5))])
+        assert header["explicit_times"]
+
+        data, times = read_timeseries_binary(path, 0.5, 2.0)
+        np.testing.assert_array_equal(times, [0.7, 1.3])
+        assert data.shape == (2, 1)
+
+    def test_single_sample_window(self, temp_dir):
+        from ndi.element_timeseries import read_timeseries_binary, write_timeseries_binary
+
+        path = temp_dir / "one.nditsb"
+        write_timeseries_binary(path, [(np.array([5.0]), np.array([[1.0, 2.0]]))])
+
+        data, times = read_timeseries_binary(path, 4.0, 6.0)
+        np.testing.assert_array_equal(times, [5.0])
+        np.testing.assert_array_equal(data, [[1.0, 2.0]])
+
+        data, times = read_timeseries_binary(path, 0.0, 1.0)
+        assert data.shape == (0, 2)
+        assert times.size == 0
+
+    def test_int16_with_scale(self, temp_dir):
+        from ndi.element_timeseries import read_timeseries_binary, write_timeseries_binary
+
+        t = np.arange(100) / 100.0
+        d = np.sin(2 * np.pi * t)
+        path = temp_dir / "int.nditsb"
+        header = write_timeseries_binary(path, [(t, d)], dtype="int16", scale=1e-4)
+        assert path.stat().st_size == header["data_offset"] + 100 * 2
+        data, _ = read_timeseries_binary(path)
+        np.testing.assert_allclose(data[:, 0], d, atol=1e-4)
+
+        with pytest.raises(ValueError, match="scale"):
+            write_timeseries_binary(path, [(t, d)], dtype="int16")
+
+    def test_addepoch_then_readtimeseries(self, session):
+        ts = ndi_element_timeseries(
+            session=session,
+            name="signal1",
+            reference=1,
+            type="voltage",
+            direct=False,
+        )
+        t = np.arange(0, 10, 0.01)
+        d = np.cos(t)
+        _, doc = ts.addepoch("epoch1", ["dev_local_time"], [(0, t[-1])], timepoints=t, datapoints=d)
+
+        data, times, _ = ts.readtimeseries(1, 2.0, 3.0)
+        keep = (t >= 2.0) & (t <= 3.0)
+        np.testing.assert_allclose(times, t[keep])
+        np.testing.assert_allclose(data[:, 0], d[keep])
+        assert ts.samplerate(1) == pytest.approx(100.0)
+
+        # the file is recorded on the document, so the file index sees it
+        names = [fi["name"] for fi in doc.document_properties["files"]["file_info"]]
+        assert names == ["epoch_binary_data.nditsb"]
+        records = session.database.file_locations(doc_ids=[doc.id])
+        assert [r["name"] for r in records] == ["epoch_binary_data.nditsb"]
+
+    def test_reads_matlab_vhsb_epochs(self, session, monkeypatch):
+        from ndi import element_timeseries
+
+        ts = ndi_element_timeseries(
+            session=session, name="signal1", reference=1, type="voltage", direct=False
+        )
+        _, doc = ts.addepoch("epoch1", ["dev_local_time"], [(0, 1)])
+        _, path = session.database_existbinarydoc(doc, "epoch_binary_data.vhsb")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"vhsb")
+
+        calls = []
+
+        def read_vhsb_binary(p, t0, t1):
+            calls.append((Path(p), t0, t1))
+            return np.ones((2, 1)), np.array([0.25, 0.5])
+
+        monkeypatch.setattr(element_timeseries, "read_vhsb_binary", read_vhsb_binary)
+        data, times, _ = ts.readtimeseries(1, 0.0, 1.0)
+        assert calls == [(path, 0.0, 1.0)]
+        np.testing.assert_array_equal(times, [0.25, 0.5])
+
+    def test_read_vhsb_binary_with_vhlab_toolbox(self, tmp_path):
+        formats = pytest.importorskip("vlt.file.custom_file_formats")
+        from ndi.element_timeseries import read_vhsb_binary
+
+        x = np.arange(0, 1, 0.01)
+        y = np.column_stack([np.sin(x), np.cos(x)])
+        path = tmp_path / "epoch_binary_data.vhsb"
+        formats.vhsb_write(str(path), x, y)
+
+        data, times = read_vhsb_binary(path, 0.2, 0.5)
+        assert data.shape == (len(times), 2)
+        assert len(times) > 0
+        assert times.min() >= 0.2 - 1e-9 and times.max() <= 0.5 + 1e-9
+        # data and times are not swapped: each row is (sin, cos) of its time
+        np.testing.assert_allclose(data, np.column_stack([np.sin(times), np.cos(times)]))
+
+
 # ===========================================================================
 # ndi_neuron Tests
 # ===========================================================================
@@ -535,6 +667,33 @@ class TestDatasetIngestion:
         refs, session_ids, *_ = ds.session_list()
         assert len(session_ids) == 0
 
+    def test_add_ingested_session_transfers_binaries(self, temp_dir, session):
+        """Binary files are placed in the dataset, and a repeated ingestion resumes."""
+        data = temp_dir / "data.bin"
+        data.write_bytes(b"0123456789" * 100)
+        doc = ndi_document(
+            {
+                "base": {"id": "", "datestamp": "", "session_id": session.id()},
+                "document_class": {"class_name": "base", "superclasses": []},
+                "files": {"file_list": ["data.bin"], "file_info": []},
+            }
+        )
+        doc = doc.add_file("data.bin", str(data), ingest=True, delete_original=False)
+        session.database_add(doc)
+
+        ds = ndi_dataset(temp_dir / "dataset1", "Test")
+        dest = ds._session._database.get_binary_path(doc, "data.bin")
+        # an interrupted ingestion left the document and a partial file behind
+        ds._session._database.bulk_add([doc])
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        dest.write_bytes(b"01234")
+
+        ds.add_ingested_session(session)
+        assert dest.read_bytes() == data.read_bytes()
+        assert len(ds.database_search(ndi_query("base.id") == doc.id)) == 1
+        refs, session_ids, *_ = ds.session_list()
+        assert session.id() in session_ids
+
     def test_delete_linked_session_raises(self, temp_dir, session):
         """Test that deleting a linked session raises error."""
         ds = ndi_dataset(temp_dir / "dataset1", "Test")
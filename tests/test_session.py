@@ -454,6 +454,24 @@ class TestDirSession:
         except FileNotFoundError:
             pytest.skip("Schema not available")
 
+    def test_database_add_list_is_atomic(self, temp_dir):
+        """A list with one bad document adds none of them."""
+        session = ndi_session_dir("Test", temp_dir)
+
+        try:
+            good = session.newdocument("base", **{"base.name": "good"})
+            bad = session.newdocument("base", **{"base.name": "bad"})
+        except FileNotFoundError:
+            pytest.skip("Schema not available")
+        bad = bad.set_session_id("another_session")
+
+        with pytest.raises(ValueError, match="session_id"):
+            session.database_add([good, bad])
+        assert session.database_search(ndi_query("base.name") == "good") == []
+
+        session.database_add(good)
+        assert len(session.database_search(ndi_query("base.name") == "good")) == 1
+
     def test_reopen_session(self, temp_dir):
         """Test reopening an existing session."""
         # Create session
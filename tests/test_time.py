@@ -2,6 +2,8 @@
 Tests for ndi.time module (Phase 4).
 """
 
+import time
+
 import numpy as np
 import pytest
 
@@ -12,7 +14,12 @@ from ndi.time import (
     ndi_time_timemapping,
     ndi_time_timereference,
 )
-from ndi.time.syncrule import ndi_time_syncrule_filefind, ndi_time_syncrule_filematch
+from ndi.time.syncrule import (
+    ndi_time_syncrule_commonTriggersOverlappingEpochs,
+    ndi_time_syncrule_filefind,
+    ndi_time_syncrule_filematch,
+)
+from ndi.time.syncrule.random_pulses import _sync_random_triggers, align_random_pulses
 
 
 class TestClockType:
@@ -434,6 +441,211 @@ class TestFileFind:
         assert cost is None
 
 
+class TestCommonTriggersOverlappingEpochs:
+    """Tests for ndi_time_syncrule_commonTriggersOverlappingEpochs sync rule."""
+
+    @pytest.fixture
+    def daq_pair(self):
+        """Two mock DAQ systems whose epochs overlap in two directory groups."""
+
+        class ndi_session_mock:
+            epochtable_generation = 0
+
+            def __init__(self):
+                self.daqsystems = {}
+                self.searches = 0
+
+            def daqsystem_load(self, name=None):
+                return self.daqsystems.get(name)
+
+            def database_search(self, query):
+                self.searches += 1
+                return []
+
+        class MockDAQ:
+            def __init__(self, name, session, epochs, events):
+                self.name = name
+                self.id = f"id_{name}"
+                self.session = session
+                self._epochs = epochs
+                self._events = events
+                self.reads = []
+
+            def epochtable(self):
+                return [
+                    {
+                        "epoch_id": eid,
+                        "underlying_epochs": {"underlying": files},
+                    }
+                    for eid, files in self._epochs
+                ]
+
+            def readevents(self, channeltype, channel, epoch_id, t0, t1):
+                self.reads.append(epoch_id)
+                return np.array(self._events[epoch_id]), None
+
+        session = ndi_session_mock()
+        # daq2 records in subdirectories embedded in daq1's epoch directories;
+        # in every group T2 = 2 * T1 + 5
+        daq1 = MockDAQ(
+            "daq1",
+            session,
+            [("a1", ["/d/s1/a.rhd"]), ("a2", ["/d/s2/a.rhd"])],
+            {"a1": [1.0, 2.0, 3.0, 4.0], "a2": [10.0, 11.0]},
+        )
+        daq2 = MockDAQ(
+            "daq2",
+            session,
+            [
+                ("b1", ["/d/s1/x/b.dat"]),
+                ("b2", ["/d/s1/y/b.dat"]),
+                ("b3", ["/d/s2/x/b.dat"]),
+            ],
+            {"b1": [7.0, 9.0], "b2": [11.0, 13.0], "b3": [25.0, 27.0]},
+        )
+        session.daqsystems = {"daq1": daq1, "daq2": daq2}
+        rule = ndi_time_syncrule_commonTriggersOverlappingEpochs(
+            {
+                "daqsystem1_name": "daq1",
+                "daqsystem2_name": "daq2",
+                "daqsystem_ch1": "dep1",
+                "daqsystem_ch2": "mk1",
+                "epochclocktype": "dev_local_time",
+                "minEmbeddedFileOverlap": 1,
+                "errorOnFailure": True,
+            }
+        )
+        return rule, session, daq1, daq2
+
+    @staticmethod
+    def _node(daq, epoch_id, files):
+        return {
+            "epoch_id": epoch_id,
+            "epoch_clock": "dev_local_time",
+            "objectname": daq.name,
+            "objectclass": "ndi.daq.system",
+            "underlying_epochs": {"underlying": files},
+        }
+
+    def test_apply_group_mapping(self, daq_pair):
+        """Test that triggers of the whole overlap group are fitted."""
+        rule, _, daq1, daq2 = daq_pair
+        node_1 = self._node(daq1, "a1", ["/d/s1/a.rhd"])
+        node_2 = self._node(daq2, "b2", ["/d/s1/y/b.dat"])
+
+        cost, mapping = rule.apply(node_1, node_2, daq1)
+        assert cost == 1.0
+        assert mapping(3.0) == pytest.approx(11.0)
+
+        cost, mapping = rule.apply(node_2, node_1, daq2)
+        assert cost == 1.0
+        assert mapping(11.0) == pytest.approx(3.0)
+
+    def test_apply_reads_each_epoch_once(self, daq_pair):
+        """Test that all pairs of a build share triggers and stored mappings."""
+        rule, session, daq1, daq2 = daq_pair
+        nodes_1 = [self._node(daq1, eid, files) for eid, files in daq1._epochs]
+        nodes_2 = [self._node(daq2, eid, files) for eid, files in daq2._epochs]
+
+        costs = {}
+        for n1 in nodes_1:
+            for n2 in nodes_2:
+                costs[(n1["epoch_id"], n2["epoch_id"])] = rule.apply(n1, n2, daq1)[0]
+                rule.apply(n2, n1, daq2)
+
+        assert costs == {
+            ("a1", "b1"): 1.0,
+            ("a1", "b2"): 1.0,
+            ("a1", "b3"): None,
+            ("a2", "b1"): None,
+            ("a2", "b2"): None,
+            ("a2", "b3"): 1.0,
+        }
+        assert sorted(daq1.reads) == ["a1", "a2"]
+        assert sorted(daq2.reads) == ["b1", "b2", "b3"]
+        assert session.searches == 1
+
+        # A new epoch table generation invalidates the memoized state
+        session.epochtable_generation += 1
+        rule.apply(nodes_1[0], nodes_2[0], daq1)
+        assert daq1.reads.count("a1") == 2
+
+    def test_apply_no_overlap(self, daq_pair):
+        """Test that epochs in unrelated directories are not synchronized."""
+        rule, _, daq1, daq2 = daq_pair
+        node_1 = self._node(daq1, "a2", ["/d/s2/a.rhd"])
+        node_2 = self._node(daq2, "b1", ["/d/s1/x/b.dat"])
+
+        cost, mapping = rule.apply(node_1, node_2, daq1)
+        assert cost is None
+        assert mapping is None
+        assert daq1.reads == []
+
+
+def _random_pulse_trains(n, seed=1, scale=1.0001, shift=12.5, disrupt=0.005):
+    """Shared random pulse train seen by two clocks with dropped/extra pulses."""
+    rng = np.random.default_rng(seed)
+    true = np.cumsum(rng.uniform(0.2, 1.0, n))
+    t1 = true[rng.random(n) >= disrupt]
+    t2 = (true - shift) / scale + rng.normal(0, 1e-4, n)
+    t2 = t2[rng.random(n) >= disrupt]
+    t2 = np.sort(np.concatenate([t2, rng.uniform(t2[0], t2[-1], int(disrupt * n))]))
+    # Recordings start and stop at different points of the train
+    return t1[n // 20 :], t2[: -(n // 20)]
+
+
+class TestRandomPulses:
+    """Tests for the random pulse alignment used by ndi_time_syncrule_randomPulses."""
+
+    def test_align_exact_trains(self):
+        """Test alignment of identical trains on linearly related clocks."""
+        true = np.cumsum(np.random.default_rng(3).uniform(0.2, 1.0, 500))
+        shift, scale = _sync_random_triggers(2.0 * true + 3.0, true)
+        assert scale == pytest.approx(2.0)
+        assert shift == pytest.approx(3.0)
+
+    def test_align_with_dropped_and_extra_pulses(self):
+        """Test that missing and extra pulses do not break the alignment."""
+        t1, t2 = _random_pulse_trains(5000, disrupt=0.01)
+        result = align_random_pulses(t1, t2)
+
+        assert result["scale"] == pytest.approx(1.0001, abs=1e-7)
+        assert result["shift"] == pytest.approx(12.5, abs=1e-3)
+        assert result["matched_fraction"] > 0.85
+        assert result["rms_residual"] < 5e-4
+        assert result["max_residual"] <= result["tolerance"]
+
+    def test_unrelated_trains_raise(self):
+        """Test that independent pulse trains are rejected."""
+        rng = np.random.default_rng(5)
+        t1 = np.cumsum(rng.uniform(0.2, 1.0, 2000))
+        t2 = np.cumsum(rng.uniform(0.2, 1.0, 2000))
+        with pytest.raises(ValueError, match="Poor fit quality"):
+            _sync_random_triggers(t1, t2)
+
+    def test_too_few_pulses_raise(self):
+        """Test that trains with fewer than 2 pulses are rejected."""
+        with pytest.raises(ValueError):
+            align_random_pulses(np.array([1.0]), np.array([1.0, 2.0]))
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize("n", [1_000, 10_000, 100_000, 1_000_000])
+    def test_benchmark_alignment(self, n):
+        """Benchmark alignment of synthetic pulse trains of 1k to 1M events."""
+        t1, t2 = _random_pulse_trains(n)
+        start = time.perf_counter()
+        result = align_random_pulses(t1, t2)
+        elapsed = time.perf_counter() - start
+        print(
+            f"\n{n} pulses: {elapsed:.3f} s, matched={result['n_matched']}, "
+            f"rms={result['rms_residual']:.2e}, seeds={result['n_seeds']}"
+        )
+
+        assert result["scale"] == pytest.approx(1.0001, abs=1e-7)
+        assert result["shift"] == pytest.approx(12.5, abs=1e-3)
+        assert result["matched_fraction"] > 0.9
+
+
 class TestEpochNode:
     """Tests for ndi_time_epochnode dataclass."""
 